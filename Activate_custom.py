@@ -18,7 +18,7 @@
 import sys
 
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from Common_Foundation import PathEx                                        # type: ignore  # pylint: disable=import-error,unused-import
 from Common_Foundation.Shell import Commands                                # type: ignore  # pylint: disable=import-error,unused-import
@@ -32,23 +32,98 @@ from RepositoryBootstrap.ActivateActivity import ActivateActivity           # ty
 
 
 # ----------------------------------------------------------------------
-from _install_data import GRCOV_VERSIONS, LLVM_VERSIONS
+from _install_data import GRCOV_VERSIONS, InstallDeferred, IsInstallDeferred, LLVM_VERSIONS
 del sys.modules["_install_data"]
 
+from _compile_cache import COMPILE_CACHE_ENV_VAR, CreateWrappers as CreateCompileCacheWrappers, IsEnabled as IsCompileCacheEnabled
+del sys.modules["_compile_cache"]
+
+from _activation_cache import ACTIVATION_CACHE_FILENAME, ActivationCacheEntry, CreateActivationCacheKey, LoadActivationCacheEntry, SaveActivationCacheEntry
+del sys.modules["_activation_cache"]
+
+from _precompiled_headers import GetEnvironmentVariables as GetPrecompiledHeaderEnvironmentVariables
+del sys.modules["_precompiled_headers"]
+
+from _trace import Nested as TraceNested, Session as TraceSession
+del sys.modules["_trace"]
+
 
 # ----------------------------------------------------------------------
 def GetCustomActions(                                                       # pylint: disable=too-many-arguments
     # Note that it is safe to remove any parameters that are not used
     dm: DoneManager,
     repositories: List[DataTypes.ConfiguredRepoDataWithPath],               # pylint: disable=unused-argument
-    generated_dir: Path,                                                    # pylint: disable=unused-argument
+    generated_dir: Path,
     configuration: Optional[str],
     version_specs: Configuration.VersionSpecs,
-    force: bool,                                                            # pylint: disable=unused-argument
+    force: bool,
     is_mixin_repo: bool,                                                    # pylint: disable=unused-argument
 ) -> List[Commands.Command]:
     assert configuration
 
+    # Phases are traced when `COMMON_LLVM_TRACE` is set (see `_trace.py`)
+    with TraceSession("activate", dm):
+        return _GetCustomActions(
+            dm,
+            generated_dir,
+            configuration,
+            version_specs,
+            force=force,
+        )
+
+
+# ----------------------------------------------------------------------
+# Note that it is safe to remove this function if it will never be used.
+def GetCustomActionsEpilogue(                                               # pylint: disable=too-many-arguments
+    # Note that it is safe to remove any parameters that are not used
+    dm: DoneManager,                                                        # pylint: disable=unused-argument
+    repositories: List[DataTypes.ConfiguredRepoDataWithPath],               # pylint: disable=unused-argument
+    generated_dir: Path,                                                    # pylint: disable=unused-argument
+    configuration: Optional[str],                                           # pylint: disable=unused-argument
+    version_specs: Configuration.VersionSpecs,                              # pylint: disable=unused-argument
+    force: bool,                                                            # pylint: disable=unused-argument
+    is_mixin_repo: bool,                                                    # pylint: disable=unused-argument
+) -> List[Commands.Command]:
+    """\
+    Returns a list of actions that should be invoked as part of the activation process. Note
+    that this is called after `GetCustomActions` has been called for each repository in the dependency
+    list.
+
+    ********************************************************************************************
+    Note that it is very rare to have the need to implement this method. In most cases, it is
+    safe to delete the entire method. However, keeping the default implementation (that
+    essentially does nothing) is not a problem.
+    ********************************************************************************************
+    """
+
+    return []
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _GetCustomActions(
+    dm: DoneManager,
+    generated_dir: Path,
+    configuration: str,
+    version_specs: Configuration.VersionSpecs,
+    *,
+    force: bool,
+) -> List[Commands.Command]:
+    # Activation happens frequently, so use the cached results of a previous activation when the
+    # tools haven't changed since then.
+    activation_cache_filename = generated_dir / ACTIVATION_CACHE_FILENAME
+    is_compile_cache_enabled = CurrentShell.family_name != "Windows" and IsCompileCacheEnabled()
+
+    activation_cache_key = CreateActivationCacheKey(configuration, version_specs.tools, is_compile_cache_enabled)
+
+    if not force:
+        activation_cache_entry = LoadActivationCacheEntry(activation_cache_filename, activation_cache_key)
+
+        if activation_cache_entry is not None:
+            dm.WriteVerbose("Using cached activation information from '{}'.\n".format(activation_cache_filename))
+            return _CreateCommands(activation_cache_entry)
+
     this_root = Path(__file__).parent
     assert this_root.is_dir(), this_root
 
@@ -58,7 +133,7 @@ def GetCustomActions(                                                       # py
     # Validate the dynamically installed content
     dm.WriteLine("")
 
-    with dm.Nested("Validating 'grcov'...") as grcov_dm:
+    with TraceNested(dm, "Validating 'grcov'...") as grcov_dm:
         _, grcov_version = ActivateActivity.GetVersionedDirectoryEx(
             tools_dir / "grcov",
             version_specs.tools,
@@ -71,8 +146,9 @@ def GetCustomActions(                                                       # py
 
         install_data.installer.ShouldInstall(None, lambda reason: grcov_dm.WriteError(reason))
 
+        grcov_tool_dir = install_data.installer.output_dir
 
-    with dm.Nested("Validating 'LLVM'...") as llvm_dm:
+    with TraceNested(dm, "Validating 'LLVM'...") as llvm_dm:
         llvm_tool_dir, llvm_version = ActivateActivity.GetVersionedDirectoryEx(
             tools_dir / "LLVM",
             version_specs.tools,
@@ -83,21 +159,31 @@ def GetCustomActions(                                                       # py
         install_data_items = LLVM_VERSIONS.get(install_data_items_key, None)
         assert install_data_items is not None
 
-        validated = False
+        validated_tool_dir: Optional[Path] = None
 
         for install_data_item in install_data_items:
             if install_data_item.name in configuration or len(install_data_items) == 1:
-                install_data_item.installer.ShouldInstall(None, lambda reason: llvm_dm.WriteError(reason))
-
-                validated = True
+                if IsInstallDeferred(install_data_item) and install_data_item.installer.ShouldInstall(None, None):
+                    with TraceNested(llvm_dm, "Installing (deferred by setup)...") as install_dm:
+                        InstallDeferred(install_dm, install_data_items_key, install_data_item)
+
+                    # The environment can't be calculated for a toolchain that wasn't installed (and
+                    # the deferred installation is attempted again during the next activation)
+                    if install_dm.result != 0:
+                        return []
+                else:
+                    install_data_item.installer.ShouldInstall(None, lambda reason: llvm_dm.WriteError(reason))
+
+                validated_tool_dir = install_data_item.installer.output_dir
                 break
 
-        assert validated
+        assert validated_tool_dir is not None
 
-    # Create the commands
-    commands: List[Commands.Command] = []
-
-    assert configuration
+    # Calculate the environment
+    tool_dirs: List[Path] = [grcov_tool_dir, validated_tool_dir]
+    path_dirs: List[str] = []
+    augmented_vars: Dict[str, str] = {}
+    set_vars: Dict[str, str] = {}
 
     if CurrentShell.family_name == "Windows":
         if "mingw" in configuration:
@@ -113,52 +199,61 @@ def GetCustomActions(                                                       # py
             # Calculate the shared lib dir
             shared_lib_dir = mingw_dir / "x86_64-w64-mingw32" / "bin"
 
-            commands += [
-                Commands.AugmentPath.Create(
-                    [
-                        str(PathEx.EnsureDir(mingw_dir / "bin")),
-                        str(PathEx.EnsureDir(shared_lib_dir)),
-                    ],
-                ),
+            path_dirs += [
+                str(PathEx.EnsureDir(mingw_dir / "bin")),
+                str(PathEx.EnsureDir(shared_lib_dir)),
             ]
 
         elif "msvc" in configuration:
-            commands.append(Commands.AugmentPath.Create(str(PathEx.EnsureDir(llvm_tool_dir / "msvc" / "bin"))))
+            path_dirs.append(str(PathEx.EnsureDir(llvm_tool_dir / "msvc" / "bin")))
 
         else:
             assert False, configuration  # pragma: no cover
 
     else:
-        commands += [
-            Commands.AugmentPath.Create(str(PathEx.EnsureDir(llvm_tool_dir / "bin"))),
-            Commands.Augment("LD_LIBRARY_PATH", str(PathEx.EnsureDir(llvm_tool_dir / "lib" / "x86_64-unknown-linux-gnu"))),
-        ]
+        path_dirs.append(str(PathEx.EnsureDir(llvm_tool_dir / "bin")))
+        augmented_vars["LD_LIBRARY_PATH"] = str(PathEx.EnsureDir(llvm_tool_dir / "lib" / "x86_64-unknown-linux-gnu"))
+
+        if is_compile_cache_enabled:
+            # The wrappers must be found before the compilers that they wrap
+            wrapper_dir = generated_dir / "compile_cache"
+
+            with TraceNested(dm, "Creating compile cache wrappers (disable by unsetting '{}')...".format(COMPILE_CACHE_ENV_VAR)):
+                CreateCompileCacheWrappers(wrapper_dir, llvm_tool_dir / "bin")
+
+            path_dirs.insert(0, str(wrapper_dir))
+            tool_dirs.append(wrapper_dir)
+
+        # Precompiled libc++ headers and module cache created during setup (projects opt into these)
+        set_vars.update(GetPrecompiledHeaderEnvironmentVariables(validated_tool_dir))
+
+    activation_cache_entry = ActivationCacheEntry(
+        tool_dirs,
+        path_dirs,
+        augmented_vars,
+        set_vars,
+    )
+
+    # Only cache activations for tools that are known to be good
+    if dm.result == 0:
+        SaveActivationCacheEntry(activation_cache_filename, activation_cache_key, activation_cache_entry)
+
+    return _CreateCommands(activation_cache_entry)
 
-    return commands
 
 
 # ----------------------------------------------------------------------
-# Note that it is safe to remove this function if it will never be used.
-def GetCustomActionsEpilogue(                                               # pylint: disable=too-many-arguments
-    # Note that it is safe to remove any parameters that are not used
-    dm: DoneManager,                                                        # pylint: disable=unused-argument
-    repositories: List[DataTypes.ConfiguredRepoDataWithPath],               # pylint: disable=unused-argument
-    generated_dir: Path,                                                    # pylint: disable=unused-argument
-    configuration: Optional[str],                                           # pylint: disable=unused-argument
-    version_specs: Configuration.VersionSpecs,                              # pylint: disable=unused-argument
-    force: bool,                                                            # pylint: disable=unused-argument
-    is_mixin_repo: bool,                                                    # pylint: disable=unused-argument
+def _CreateCommands(
+    activation_cache_entry: ActivationCacheEntry,
 ) -> List[Commands.Command]:
-    """\
-    Returns a list of actions that should be invoked as part of the activation process. Note
-    that this is called after `GetCustomActions` has been called for each repository in the dependency
-    list.
+    commands: List[Commands.Command] = [
+        Commands.AugmentPath.Create(activation_cache_entry.path_dirs),
+    ]
 
-    ********************************************************************************************
-    Note that it is very rare to have the need to implement this method. In most cases, it is
-    safe to delete the entire method. However, keeping the default implementation (that
-    essentially does nothing) is not a problem.
-    ********************************************************************************************
-    """
+    for name, value in activation_cache_entry.augmented_vars.items():
+        commands.append(Commands.Augment(name, value))
 
-    return []
+    for name, value in activation_cache_entry.set_vars.items():
+        commands.append(Commands.Set(name, value))
+
+    return commands
@@ -0,0 +1,144 @@
+# ----------------------------------------------------------------------
+# |
+# |  Activation.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-17 16:05:44
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Measures the latency of `Activate_custom.GetCustomActions` with a cold and a warm activation cache.
+Run this script within an activated environment.
+"""
+
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import typer
+
+from typer.core import TyperGroup
+
+from Common_Foundation.Streams.DoneManager import DoneManager, DoneManagerFlags             # type: ignore  # pylint: disable=import-error,unused-import
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import Activate_custom                                                      # pylint: disable=wrong-import-position
+import Setup_custom                                                         # pylint: disable=wrong-import-position
+
+from _activation_cache import ACTIVATION_CACHE_FILENAME                     # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
+
+
+# ----------------------------------------------------------------------
+app                                         = typer.Typer(
+    cls=NaturalOrderGrouper,
+    help=__doc__,
+    no_args_is_help=False,
+    pretty_exceptions_show_locals=False,
+    pretty_exceptions_enable=False,
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("EntryPoint", help=__doc__, no_args_is_help=False)
+def EntryPoint(
+    configuration: Optional[str]=typer.Argument(None, help="Configuration to activate; the first configuration is used if not provided."),
+    iterations: int=typer.Option(20, "--iterations", min=1, help="Number of activations in each mode."),
+    output_filename: Path=typer.Option(None, "--output", dir_okay=False, help="Write the results as JSON to this file."),
+) -> None:
+    configurations = Setup_custom.GetConfigurations()
+    assert isinstance(configurations, dict)
+
+    if configuration is None:
+        configuration = next(iter(configurations.keys()))
+
+    version_specs = configurations[configuration].version_specs
+
+    results: Dict[str, Any] = {
+        "configuration": configuration,
+    }
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        generated_dir = Path(temp_directory)
+
+        for mode in ["cold", "warm"]:
+            times: List[float] = []
+
+            for _ in range(iterations):
+                if mode == "cold":
+                    (generated_dir / ACTIVATION_CACHE_FILENAME).unlink(missing_ok=True)
+
+                with DoneManager.Create(
+                    io.StringIO(),
+                    "",
+                    output_flags=DoneManagerFlags.Create(),
+                ) as dm:
+                    start_time = time.perf_counter()
+
+                    Activate_custom.GetCustomActions(
+                        dm,
+                        [],
+                        generated_dir,
+                        configuration,
+                        version_specs,
+                        force=False,
+                        is_mixin_repo=False,
+                    )
+
+                    times.append(time.perf_counter() - start_time)
+
+                    assert dm.result == 0, dm.result
+
+            results[mode] = {
+                "min_ms": min(times) * 1000,
+                "median_ms": statistics.median(times) * 1000,
+                "max_ms": max(times) * 1000,
+            }
+
+    sys.stdout.write("Configuration: {}\n\n".format(configuration))
+    sys.stdout.write("{:<6} {:>10} {:>12} {:>10}\n".format("Mode", "Min (ms)", "Median (ms)", "Max (ms)"))
+
+    for mode in ["cold", "warm"]:
+        sys.stdout.write(
+            "{:<6} {:>10.2f} {:>12.2f} {:>10.2f}\n".format(
+                mode,
+                results[mode]["min_ms"],
+                results[mode]["median_ms"],
+                results[mode]["max_ms"],
+            ),
+        )
+
+    if output_filename is not None:
+        with output_filename.open("w") as f:
+            json.dump(results, f, indent=2)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    app()
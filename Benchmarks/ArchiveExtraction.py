@@ -0,0 +1,211 @@
+# ----------------------------------------------------------------------
+# |
+# |  ArchiveExtraction.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 09:14:52
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Compares the extraction throughput (MB/s) and cores used of a 7z archive with a seekable, multi-frame
+zstd tar archive (extracted with 1 and N workers) created from the same content.
+"""
+
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import typer
+
+from typer.core import TyperGroup
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _zstd_archive import ExtractSeekableArchive                            # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+_root_dir                                   = Path(__file__).parent.parent
+
+
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
+
+
+# ----------------------------------------------------------------------
+app                                         = typer.Typer(
+    cls=NaturalOrderGrouper,
+    help=__doc__,
+    no_args_is_help=False,
+    pretty_exceptions_show_locals=False,
+    pretty_exceptions_enable=False,
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("EntryPoint", help=__doc__, no_args_is_help=False)
+def EntryPoint(
+    archive_filename: Path=typer.Argument(_root_dir / "Tools" / "grcov" / "v0.8.12" / "Linux" / "install.7z", exists=True, dir_okay=False, resolve_path=True, help="7z archive used as the source content."),
+    workers: int=typer.Option(os.cpu_count() or 1, "--workers", min=1, help="Number of workers used by the multi-core extraction."),
+    frame_size: int=typer.Option(4, "--frame-size", min=1, help="Approximate uncompressed size of each zstd frame (in MB)."),
+    level: int=typer.Option(19, "--level", help="zstd compression level."),
+    iterations: int=typer.Option(3, "--iterations", min=1, help="Number of times to run each extraction."),
+    output_filename: Path=typer.Option(None, "--output", dir_okay=False, help="Write the results as JSON to this file."),
+) -> None:
+    seven_zip = next((name for name in ["7z", "7za", "7zz"] if shutil.which(name)), None)
+    if seven_zip is None:
+        sys.stdout.write("A 7z executable (7z, 7za, or 7zz) is required.\n")
+        raise typer.Exit(-1)
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        working_dir = Path(temp_directory)
+
+        content_dir = working_dir / "content"
+        _Extract7z(seven_zip, archive_filename, content_dir)
+
+        uncompressed_bytes = sum(
+            (Path(root) / filename).stat().st_size
+            for root, _, filenames in os.walk(content_dir)
+            for filename in filenames
+        )
+
+        zstd_filename = working_dir / "install.tar.zst"
+
+        subprocess.run(
+            [
+                sys.executable,
+                str(_root_dir / "Tools" / "LLVM" / "CreateSeekableArchive.py"),
+                str(content_dir),
+                str(zstd_filename),
+                "--frame-size",
+                str(frame_size),
+                "--level",
+                str(level),
+            ],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+        results: Dict[str, Any] = {
+            "uncompressed_bytes": uncompressed_bytes,
+            "7z_bytes": archive_filename.stat().st_size,
+            "zstd_bytes": zstd_filename.stat().st_size,
+        }
+
+        for name, func in [
+            ("7z", lambda output_dir: _Extract7z(seven_zip, archive_filename, output_dir)),
+            ("zstd_1", lambda output_dir: ExtractSeekableArchive(zstd_filename, output_dir, max_workers=1)),
+            ("zstd_{}".format(workers), lambda output_dir: ExtractSeekableArchive(zstd_filename, output_dir, max_workers=workers)),
+        ]:
+            results[name] = _Measure(func, working_dir / name, uncompressed_bytes, iterations)
+
+    sys.stdout.write(
+        "Content: {:,} bytes (7z: {:,} bytes, zstd: {:,} bytes)\n\n".format(
+            results["uncompressed_bytes"],
+            results["7z_bytes"],
+            results["zstd_bytes"],
+        ),
+    )
+
+    sys.stdout.write("{:<10} {:>14} {:>10} {:>12}\n".format("Archive", "Min Time (s)", "MB/s", "Cores Used"))
+
+    for name in ["7z", "zstd_1", "zstd_{}".format(workers)]:
+        sys.stdout.write(
+            "{:<10} {:>14.3f} {:>10.1f} {:>12.2f}\n".format(
+                name,
+                results[name]["wall_time_min"],
+                results[name]["mb_per_second"],
+                results[name]["cores_used"],
+            ),
+        )
+
+    if output_filename is not None:
+        with output_filename.open("w") as f:
+            json.dump(results, f, indent=2)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Extract7z(
+    seven_zip: str,
+    archive_filename: Path,
+    output_dir: Path,
+) -> None:
+    subprocess.run(
+        [seven_zip, "x", "-y", "-o{}".format(output_dir), str(archive_filename)],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+# ----------------------------------------------------------------------
+def _Measure(
+    func: Callable[[Path], Any],
+    output_dir: Path,
+    uncompressed_bytes: int,
+    iterations: int,
+) -> Dict[str, Any]:
+    wall_times: List[float] = []
+    cpu_times: List[float] = []
+
+    for _ in range(iterations):
+        cpu_start = _CpuTime()
+        start_time = time.perf_counter()
+
+        func(output_dir)
+
+        wall_times.append(time.perf_counter() - start_time)
+        cpu_times.append(_CpuTime() - cpu_start)
+
+        shutil.rmtree(output_dir)
+
+    best_index = min(range(iterations), key=lambda index: wall_times[index])
+
+    return {
+        "wall_time_min": wall_times[best_index],
+        "mb_per_second": uncompressed_bytes / (1024 * 1024) / wall_times[best_index],
+        "cores_used": cpu_times[best_index] / wall_times[best_index],
+    }
+
+
+# ----------------------------------------------------------------------
+def _CpuTime() -> float:
+    """Returns the user and system time of this process and its (completed) child processes"""
+
+    total = 0.0
+
+    for who in [resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN]:
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+
+    return total
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    app()
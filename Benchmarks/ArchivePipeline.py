@@ -0,0 +1,271 @@
+# ----------------------------------------------------------------------
+# |
+# |  ArchivePipeline.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-17 12:20:07
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Compares the bytes read and wall time of the multi-pass installation (download to disk, read back to
+verify the sha256, read again to extract) with the single-pass streaming pipeline.
+"""
+
+import functools
+import hashlib
+import http.server
+import io
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+import typer
+
+from typer.core import TyperGroup
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _archive_pipeline import CHUNK_SIZE, CreateStagingDirectory, DownloadFile, PromoteStagingDirectory, StreamingExtractor
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
+
+
+# ----------------------------------------------------------------------
+app                                         = typer.Typer(
+    cls=NaturalOrderGrouper,
+    help=__doc__,
+    no_args_is_help=False,
+    pretty_exceptions_show_locals=False,
+    pretty_exceptions_enable=False,
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("EntryPoint", help=__doc__, no_args_is_help=False)
+def EntryPoint(
+    size_mb: int=typer.Option(64, "--size-mb", min=1, help="Uncompressed size of the synthetic archive."),
+    iterations: int=typer.Option(3, "--iterations", min=1, help="Number of times to run each pipeline."),
+    output_filename: Path=typer.Option(None, "--output", dir_okay=False, help="Write the results as JSON to this file."),
+) -> None:
+    with tempfile.TemporaryDirectory() as temp_directory:
+        working_dir = Path(temp_directory)
+
+        served_dir = working_dir / "served"
+        served_dir.mkdir()
+
+        archive_filename = served_dir / "install.tar.gz"
+        _CreateArchive(archive_filename, size_mb)
+
+        sha256 = hashlib.sha256(archive_filename.read_bytes()).hexdigest()
+
+        with _ServeDirectory(served_dir) as url_root:
+            url = "{}/{}".format(url_root, archive_filename.name)
+
+            results: Dict[str, Any] = {
+                "archive_bytes": archive_filename.stat().st_size,
+                "uncompressed_bytes": size_mb * 1024 * 1024,
+            }
+
+            for name, func in [
+                ("multi_pass", _MultiPass),
+                ("streaming", _Streaming),
+            ]:
+                wall_times = []
+                disk_bytes_read = 0
+                peak_memory = 0
+
+                for iteration in range(iterations):
+                    output_dir = working_dir / name / str(iteration) / "install"
+
+                    tracemalloc.start()
+                    start_time = time.perf_counter()
+
+                    disk_bytes_read = func(url, sha256, output_dir)
+
+                    wall_times.append(time.perf_counter() - start_time)
+                    peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+                    tracemalloc.stop()
+
+                    shutil.rmtree(output_dir.parent)
+
+                results[name] = {
+                    "wall_time_min": min(wall_times),
+                    "wall_time_avg": sum(wall_times) / len(wall_times),
+                    "disk_bytes_read": disk_bytes_read,
+                    "peak_python_memory": peak_memory,
+                }
+
+    sys.stdout.write(
+        "{:<12} {:>14} {:>14} {:>18} {:>18}\n".format("Pipeline", "Min Time (s)", "Avg Time (s)", "Disk Bytes Read", "Peak Memory (B)"),
+    )
+
+    for name in ["multi_pass", "streaming"]:
+        sys.stdout.write(
+            "{:<12} {:>14.3f} {:>14.3f} {:>18,} {:>18,}\n".format(
+                name,
+                results[name]["wall_time_min"],
+                results[name]["wall_time_avg"],
+                results[name]["disk_bytes_read"],
+                results[name]["peak_python_memory"],
+            ),
+        )
+
+    if output_filename is not None:
+        with output_filename.open("w") as f:
+            json.dump(results, f, indent=2)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CreateArchive(
+    archive_filename: Path,
+    size_mb: int,
+) -> None:
+    # Half random (incompressible) content and half repetitive content, which approximates the mix of
+    # binaries and headers in a toolchain.
+    with tarfile.open(archive_filename, "w:gz", compresslevel=1) as tar:
+        for index in range(size_mb):
+            if index % 2:
+                content = os.urandom(1024 * 1024)
+            else:
+                content = (b"#include <type_traits>\n" * (1024 * 1024 // 23 + 1))[:1024 * 1024]
+
+            tar_info = tarfile.TarInfo("install/file{:04}.bin".format(index))
+            tar_info.size = len(content)
+
+            tar.addfile(tar_info, io.BytesIO(content))
+
+
+# ----------------------------------------------------------------------
+@contextmanager
+def _ServeDirectory(
+    directory: Path,
+) -> Iterator[str]:
+    # ----------------------------------------------------------------------
+    class QuietHandler(http.server.SimpleHTTPRequestHandler):
+        def log_message(self, *args, **kwargs):  # pylint: disable=unused-argument
+            pass
+
+    # ----------------------------------------------------------------------
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=str(directory)))
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield "http://127.0.0.1:{}".format(server.server_address[1])
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+# ----------------------------------------------------------------------
+class _CountingReader(object):
+    # ----------------------------------------------------------------------
+    def __init__(self, f):
+        self._f                             = f
+        self.num_bytes                      = 0
+
+    # ----------------------------------------------------------------------
+    def read(self, size: int=-1) -> bytes:
+        data = self._f.read(size)
+        self.num_bytes += len(data)
+        return data
+
+
+# ----------------------------------------------------------------------
+def _MultiPass(
+    url: str,
+    sha256: str,
+    output_dir: Path,
+) -> int:
+    output_dir.parent.mkdir(parents=True)
+    archive_filename = output_dir.parent / "install.tar.gz"
+
+    # Pass 1: download
+    DownloadFile(url, archive_filename)
+
+    # Pass 2: verify
+    hasher = hashlib.sha256()
+
+    with archive_filename.open("rb") as f:
+        verify_reader = _CountingReader(f)
+
+        while True:
+            chunk = verify_reader.read(CHUNK_SIZE)
+            if not chunk:
+                break
+
+            hasher.update(chunk)
+
+    assert hasher.hexdigest() == sha256
+
+    # Pass 3: extract
+    with archive_filename.open("rb") as f:
+        extract_reader = _CountingReader(f)
+
+        with tarfile.open(fileobj=extract_reader, mode="r|gz") as tar:  # type: ignore
+            tar.extractall(output_dir)
+
+    return verify_reader.num_bytes + extract_reader.num_bytes
+
+
+# ----------------------------------------------------------------------
+def _Streaming(
+    url: str,
+    sha256: str,
+    output_dir: Path,
+) -> int:
+    output_dir.parent.mkdir(parents=True)
+
+    staging_dir = CreateStagingDirectory(output_dir)
+    extractor = StreamingExtractor(staging_dir)
+
+    try:
+        result = DownloadFile(url, output_dir.parent / "install.tar.gz", on_chunk=extractor.Write)
+        extractor.Close()
+    except:
+        extractor.Abort()
+        raise
+
+    assert result.sha256 == sha256
+
+    PromoteStagingDirectory(staging_dir, output_dir)
+
+    # The archive is never read back from disk
+    return 0
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    app()
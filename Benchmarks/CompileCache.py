@@ -0,0 +1,291 @@
+# ----------------------------------------------------------------------
+# |
+# |  CompileCache.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 20:56:40
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Builds a sample project through the compilation cache (`_compile_cache.py`) with an empty cache, again
+with a warm cache, and again after a change to a single translation unit. The build fails if the
+cache doesn't behave as expected (all misses, all hits, a single miss), the cached objects differ from
+those created by the compiler, or the resulting executable doesn't run. Run this script within an
+activated environment.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+import typer
+
+from typer.core import TyperGroup
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import _compile_cache                                                       # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
+
+
+# ----------------------------------------------------------------------
+app                                         = typer.Typer(
+    cls=NaturalOrderGrouper,
+    help=__doc__,
+    no_args_is_help=False,
+    pretty_exceptions_show_locals=False,
+    pretty_exceptions_enable=False,
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("EntryPoint", help=__doc__, no_args_is_help=False)
+def EntryPoint(
+    compiler: str=typer.Option("clang++", "--compiler", help="C++ compiler invoked through the cache."),
+    num_translation_units: int=typer.Option(16, "--translation-units", min=1, help="Number of translation units in the sample project."),
+    jobs: int=typer.Option(os.cpu_count() or 1, "--jobs", min=1, help="Number of concurrent compilations."),
+    output_filename: Path=typer.Option(None, "--output", dir_okay=False, help="Write the results as JSON to this file."),
+) -> None:
+    results: Dict[str, Any] = {
+        "compiler": compiler,
+        "translation_units": num_translation_units,
+        "builds": {},
+    }
+
+    errors: List[str] = []
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        working_dir = Path(temp_directory)
+
+        cache = _compile_cache.CompileCache(working_dir / "cache", _compile_cache.DEFAULT_MAX_SIZE)
+
+        env = {
+            **os.environ,
+            _compile_cache.COMPILE_CACHE_DIR_ENV_VAR: str(cache.root),
+        }
+
+        env.pop(_compile_cache.COMPILE_CACHE_MAX_SIZE_ENV_VAR, None)
+
+        source_filenames = _CreateProject(working_dir / "src", num_translation_units)
+
+        # The objects created by the compiler without the cache, which the cached objects must match
+        reference_dir = working_dir / "reference"
+        reference_dir.mkdir()
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            list(
+                executor.map(
+                    lambda source_filename: _Compile([compiler], source_filename, reference_dir, env),
+                    source_filenames,
+                ),
+            )
+
+        for build, expected_hits, expected_misses in [
+            ("cold", 0, num_translation_units + 1),
+            ("warm", num_translation_units + 1, 0),
+            ("modified", num_translation_units, 1),
+        ]:
+            sys.stdout.write("Running '{}'...\n".format(build))
+
+            if build == "modified":
+                with source_filenames[0].open("a") as f:
+                    f.write("\nint modified() { return 0; }\n")
+
+                # The reference object for the modified file must be created again
+                _Compile([compiler], source_filenames[0], reference_dir, env)
+
+            cache.ZeroStats()
+
+            object_dir = working_dir / build
+            object_dir.mkdir()
+
+            start_time = time.perf_counter()
+
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                object_filenames = list(
+                    executor.map(
+                        lambda source_filename: _Compile(
+                            [sys.executable, _compile_cache.__file__, compiler],
+                            source_filename,
+                            object_dir,
+                            env,
+                        ),
+                        source_filenames,
+                    ),
+                )
+
+            wall_time = time.perf_counter() - start_time
+
+            executable_filename = object_dir / "app"
+
+            subprocess.run(
+                [sys.executable, _compile_cache.__file__, compiler, *(str(filename) for filename in object_filenames), "-o", str(executable_filename)],
+                env=env,
+                check=True,
+            )
+
+            stats = cache.GetStats()
+
+            results["builds"][build] = {
+                "wall_time": wall_time,
+                "hits": stats.hits,
+                "misses": stats.misses,
+            }
+
+            sys.stdout.write("    {:.2f}s: {}\n".format(wall_time, stats))
+
+            if stats.hits != expected_hits or stats.misses != expected_misses:
+                errors.append(
+                    "'{}': {} hit(s) and {} miss(es) were expected.".format(build, expected_hits, expected_misses),
+                )
+
+            for object_filename in object_filenames:
+                if object_filename.read_bytes() != (reference_dir / object_filename.name).read_bytes():
+                    errors.append("'{}': '{}' differs from the compiler's output.".format(build, object_filename.name))
+
+            result = subprocess.run([str(executable_filename)], capture_output=True, text=True, check=False)
+
+            if result.returncode != 0 or result.stdout != "{}\n".format(num_translation_units):
+                errors.append("'{}': the executable failed ({}): {}".format(build, result.returncode, result.stdout))
+
+    if output_filename is not None:
+        with output_filename.open("w") as f:
+            json.dump(results, f, indent=2)
+
+    if errors:
+        sys.stdout.write("\nFAILED\n{}\n".format("\n".join("    - {}".format(error) for error in errors)))
+        raise typer.Exit(-1)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Compile(
+    command: List[str],
+    source_filename: Path,
+    output_dir: Path,
+    env: Dict[str, str],
+) -> Path:
+    object_filename = output_dir / "{}.o".format(source_filename.stem)
+
+    # Relative paths are used so that the objects created in different directories are identical
+    subprocess.run(
+        [
+            *command,
+            "-std=c++17",
+            "-O2",
+            "-MD",
+            "-MF", "{}.d".format(object_filename),
+            "-c", source_filename.name,
+            "-o", str(object_filename),
+        ],
+        cwd=source_filename.parent,
+        env=env,
+        check=True,
+    )
+
+    return object_filename
+
+
+# ----------------------------------------------------------------------
+def _CreateProject(
+    output_dir: Path,
+    num_translation_units: int,
+) -> List[Path]:
+    output_dir.mkdir(parents=True)
+
+    (output_dir / "common.h").write_text(
+        textwrap.dedent(
+            """\
+            #pragma once
+
+            #include <string>
+            #include <vector>
+
+            int Count(std::vector<std::string> const &values);
+            """,
+        ),
+    )
+
+    source_filenames: List[Path] = []
+
+    for index in range(num_translation_units):
+        source_filename = output_dir / "tu_{}.cpp".format(index)
+
+        source_filename.write_text(
+            textwrap.dedent(
+                """\
+                #include "common.h"
+
+                int tu_{index}() {{
+                    return Count({{"tu_{index}"}});
+                }}
+                """,
+            ).format(
+                index=index,
+            ),
+        )
+
+        source_filenames.append(source_filename)
+
+    main_filename = output_dir / "main.cpp"
+
+    main_filename.write_text(
+        textwrap.dedent(
+            """\
+            #include <iostream>
+
+            #include "common.h"
+
+            {declarations}
+
+            int Count(std::vector<std::string> const &values) {{
+                return static_cast<int>(values.size());
+            }}
+
+            int main() {{
+                std::cout << ({calls}) << "\\n";
+                return 0;
+            }}
+            """,
+        ).format(
+            declarations="\n".join("int tu_{}();".format(index) for index in range(num_translation_units)),
+            calls=" + ".join("tu_{}()".format(index) for index in range(num_translation_units)),
+        ),
+    )
+
+    source_filenames.append(main_filename)
+
+    return source_filenames
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,201 @@
+# ----------------------------------------------------------------------
+# |
+# |  ConcurrentInstall.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 13:02:18
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Spawns concurrent processes that install the same archive into the same directory (as parallel CI jobs
+on a single agent do) and verifies that exactly one process extracts the archive, the others reuse the
+result, and no staging content is left behind. Optionally kills the first process during its
+installation to verify that subsequent installations recover. Run this script within an activated
+environment.
+"""
+
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import typer
+
+from typer.core import TyperGroup
+
+from Common_Foundation.Streams.DoneManager import DoneManager, DoneManagerFlags             # type: ignore  # pylint: disable=import-error,unused-import
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _archive_pipeline import RecoverStagingDirectories                     # pylint: disable=wrong-import-position
+from _install_lock import InstallLock                                       # pylint: disable=wrong-import-position
+from _installers import LocalArchiveInstaller                               # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+_root_dir                                   = Path(__file__).parent.parent
+
+
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
+
+
+# ----------------------------------------------------------------------
+app                                         = typer.Typer(
+    cls=NaturalOrderGrouper,
+    help=__doc__,
+    no_args_is_help=False,
+    pretty_exceptions_show_locals=False,
+    pretty_exceptions_enable=False,
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("EntryPoint", help=__doc__, no_args_is_help=False)
+def EntryPoint(
+    archive_filename: Path=typer.Argument(_root_dir / "Tools" / "grcov" / "v0.8.12" / "Linux" / "install.7z", exists=True, dir_okay=False, resolve_path=True, help="Archive to install."),
+    processes: int=typer.Option(8, "--processes", min=2, help="Number of concurrent installations."),
+    kill_first: bool=typer.Option(False, "--kill-first", help="Kill the first process during its installation."),
+    output_filename: Path=typer.Option(None, "--output", dir_okay=False, help="Write the results as JSON to this file."),
+) -> None:
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        output_dir = Path(temp_directory) / "install"
+        results_queue = context.Queue()
+
+        if kill_first:
+            # The lock is held for the duration of the installation, so killing the process while it
+            # holds the lock interrupts it before promotion.
+            process = context.Process(target=_Install, args=(archive_filename, output_dir, results_queue, 30.0))
+            process.start()
+
+            while not any(item.name.startswith(".install.staging-") for item in output_dir.parent.iterdir()):
+                time.sleep(0.01)
+
+            process.kill()
+            process.join()
+
+        start_time = time.perf_counter()
+
+        processes_list = [
+            context.Process(target=_Install, args=(archive_filename, output_dir, results_queue, 0.0))
+            for _ in range(processes)
+        ]
+
+        for process in processes_list:
+            process.start()
+
+        for process in processes_list:
+            process.join()
+
+        wall_time = time.perf_counter() - start_time
+
+        process_results: List[Dict[str, Any]] = [results_queue.get() for _ in range(processes)]
+
+        leftovers = [
+            item.name
+            for item in output_dir.parent.iterdir()
+            if item.name.startswith(".install.staging-") or item.name.startswith(".install.previous-")
+        ]
+
+        results: Dict[str, Any] = {
+            "processes": processes,
+            "wall_time": wall_time,
+            "extractions": sum(1 for result in process_results if result["installed"]),
+            "failures": sum(1 for result in process_results if result["result"] != 0),
+            "leftovers": leftovers,
+            "is_installed": (output_dir / LocalArchiveInstaller.INSTALL_INFO_FILENAME).is_file(),
+            "max_wait_time": max(result["wait_time"] for result in process_results),
+        }
+
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    sys.stdout.write(
+        "Processes: {processes}\nExtractions: {extractions}\nFailures: {failures}\nLeftover staging dirs: {num_leftovers}\nMax wait time: {max_wait_time:.3f}s\nWall time: {wall_time:.3f}s\n".format(
+            num_leftovers=len(results["leftovers"]),
+            **results,
+        ),
+    )
+
+    if output_filename is not None:
+        with output_filename.open("w") as f:
+            json.dump(results, f, indent=2)
+
+    if results["extractions"] != 1 or results["failures"] or results["leftovers"] or not results["is_installed"]:
+        sys.stdout.write("\nFAILED\n")
+        raise typer.Exit(-1)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Install(
+    archive_filename: Path,
+    output_dir: Path,
+    results_queue: Any,
+    delay: float,
+) -> None:
+    with DoneManager.Create(
+        io.StringIO(),
+        "",
+        output_flags=DoneManagerFlags.Create(),
+    ) as dm:
+        installer = LocalArchiveInstaller(archive_filename, output_dir, "benchmark")
+
+        start_time = time.perf_counter()
+
+        with InstallLock(output_dir):
+            wait_time = time.perf_counter() - start_time
+
+            RecoverStagingDirectories(output_dir)
+
+            installed = installer.ShouldInstall(None, None)
+
+            if installed and delay:
+                # Create the staging directory and wait to be killed
+                os.makedirs(output_dir.parent / ".install.staging-{}".format(os.getpid()))
+                time.sleep(delay)
+
+            installer.Install(
+                dm,
+                force=False,
+                prompt_for_interactive=False,
+                interactive=None,
+            )
+
+    results_queue.put(
+        {
+            "installed": installed,
+            "result": dm.result,
+            "wait_time": wait_time,
+        },
+    )
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    app()
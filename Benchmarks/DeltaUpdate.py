@@ -0,0 +1,359 @@
+# ----------------------------------------------------------------------
+# |
+# |  DeltaUpdate.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 00:12:37
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Publishes two synthetic revisions of a toolchain with `Tools/LLVM/CreateFileManifest.py`, serves them
+with a local HTTP server, and updates an installation of the first revision to the second revision
+with `_delta_update.py`. The update fails if the updated installation doesn't match the second
+revision exactly, if an update of a current installation downloads anything, or if a locally modified
+file isn't repaired. Requires the `zstd` executable.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import random
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import typer
+
+from typer.core import TyperGroup
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import _delta_update                                                        # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
+
+
+# ----------------------------------------------------------------------
+app                                         = typer.Typer(
+    cls=NaturalOrderGrouper,
+    help=__doc__,
+    no_args_is_help=False,
+    pretty_exceptions_show_locals=False,
+    pretty_exceptions_enable=False,
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("EntryPoint", help=__doc__, no_args_is_help=False)
+def EntryPoint(
+    binary_size_mb: int=typer.Option(8, "--binary-size", min=1, help="Size of the synthetic binary (in MB) that changes slightly between revisions."),
+    num_headers: int=typer.Option(200, "--headers", min=1, help="Number of synthetic headers."),
+    output_filename: Path=typer.Option(None, "--output", dir_okay=False, help="Write the results as JSON to this file."),
+) -> None:
+    if shutil.which("zstd") is None:
+        raise typer.BadParameter("The 'zstd' executable is required.")
+
+    results: Dict[str, Any] = {}
+    errors: List[str] = []
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        working_dir = Path(temp_directory)
+
+        rev1_dir = working_dir / "rev1"
+        rev2_dir = working_dir / "rev2"
+        publish_dir = working_dir / "publish"
+        install_dir = working_dir / "install"
+
+        _CreateRevisions(rev1_dir, rev2_dir, binary_size_mb, num_headers)
+
+        sys.stdout.write("Publishing...\n")
+
+        for name, input_dir, previous_dirs in [
+            ("rev1", rev1_dir, []),
+            ("rev2", rev2_dir, [rev1_dir]),
+        ]:
+            subprocess.run(
+                [
+                    sys.executable,
+                    str(Path(__file__).parent.parent / "Tools" / "LLVM" / "CreateFileManifest.py"),
+                    str(input_dir),
+                    str(publish_dir),
+                    name,
+                    "--level", "3",
+                    *(arg for previous_dir in previous_dirs for arg in ["--previous-dir", str(previous_dir)]),
+                ],
+                check=True,
+            )
+
+            os.replace(publish_dir / "files.json", publish_dir / "{}.json".format(name))
+
+        rev1_manifest = _delta_update.FileManifest.FromJson(json.loads((publish_dir / "rev1.json").read_text()))
+
+        with _Serve(publish_dir) as (base_url, served_bytes):
+            manifest_url = "{}/rev2.json".format(base_url)
+            manifest_sha256 = hashlib.sha256((publish_dir / "rev2.json").read_bytes()).hexdigest()
+
+            rev2_manifest = _delta_update.DownloadManifest(manifest_url, manifest_sha256)
+
+            full_bytes = sum(
+                (publish_dir / "files" / sha256[:2] / "{}.zst".format(sha256)).stat().st_size
+                for sha256 in {entry.sha256 for entry in rev2_manifest.files.values() if entry.sha256 is not None}
+            )
+
+            for scenario, expected_downloaded, expected_patched in [
+                ("update", 3, 1),
+                ("current", 0, 0),
+                ("modified", 1, 0),
+            ]:
+                sys.stdout.write("Running '{}'...\n".format(scenario))
+
+                if scenario == "update":
+                    # Simulate an installation of the first revision from its complete archive
+                    shutil.copytree(rev1_dir, install_dir, symlinks=True)
+                    rev1_manifest.Save(install_dir)
+
+                    installed = rev1_manifest
+
+                elif scenario == "current":
+                    installed = rev2_manifest
+
+                elif scenario == "modified":
+                    # The installed manifest is out of date and a file has been modified locally
+                    with (install_dir / "bin" / "tool").open("r+b") as f:
+                        f.write(b"modified")
+
+                    installed = rev1_manifest
+
+                else:
+                    assert False, scenario  # pragma: no cover
+
+                served_bytes.clear()
+
+                start_time = time.perf_counter()
+
+                update_result = _delta_update.ApplyUpdate(install_dir, installed, rev2_manifest, manifest_url)
+
+                wall_time = time.perf_counter() - start_time
+
+                sys.stdout.write("    {:.2f}s: {}\n".format(wall_time, update_result))
+
+                results[scenario] = {
+                    "wall_time": wall_time,
+                    "downloaded_bytes": update_result.downloaded_bytes,
+                    "served_bytes": sum(served_bytes),
+                    "full_bytes": full_bytes,
+                    "patched": update_result.num_patched,
+                    "downloaded": update_result.num_downloaded,
+                    "removed": update_result.num_removed,
+                }
+
+                if (update_result.num_downloaded, update_result.num_patched) != (expected_downloaded, expected_patched):
+                    errors.append(
+                        "'{}': {} downloaded and {} patched file(s) were expected ({} downloaded, {} patched).".format(
+                            scenario,
+                            expected_downloaded,
+                            expected_patched,
+                            update_result.num_downloaded,
+                            update_result.num_patched,
+                        ),
+                    )
+
+                errors += ["'{}': {}".format(scenario, error) for error in _Compare(rev2_dir, install_dir)]
+
+    update_results = results["update"]
+
+    sys.stdout.write(
+        "\n{:,} bytes downloaded to update ({:.1f}% of the {:,} bytes of the compressed files).\n".format(
+            update_results["downloaded_bytes"],
+            100.0 * update_results["downloaded_bytes"] / update_results["full_bytes"],
+            update_results["full_bytes"],
+        ),
+    )
+
+    if output_filename is not None:
+        with output_filename.open("w") as f:
+            json.dump(results, f, indent=2)
+
+    if errors:
+        sys.stdout.write("\nFAILED\n{}\n".format("\n".join("    - {}".format(error) for error in errors)))
+        raise typer.Exit(-1)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+class _Serve(object):
+    """Serves a directory over HTTP on a background thread, recording the number of bytes served"""
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        directory: Path,
+    ):
+        served_bytes: List[int] = []
+
+        # ----------------------------------------------------------------------
+        class Handler(SimpleHTTPRequestHandler):
+            # ----------------------------------------------------------------------
+            def copyfile(self, source, outputfile):
+                start = source.tell()
+                super(Handler, self).copyfile(source, outputfile)
+                served_bytes.append(source.tell() - start)
+
+            # ----------------------------------------------------------------------
+            def log_message(self, *args, **kwargs):  # pylint: disable=unused-argument
+                pass
+
+        # ----------------------------------------------------------------------
+
+        self._served_bytes                  = served_bytes
+        self._server                        = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(Handler, directory=str(directory)))
+        self._thread                        = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    # ----------------------------------------------------------------------
+    def __enter__(self) -> Tuple[str, List[int]]:
+        self._thread.start()
+        return "http://127.0.0.1:{}".format(self._server.server_address[1]), self._served_bytes
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._thread.join()
+        self._server.server_close()
+
+
+# ----------------------------------------------------------------------
+def _CreateRevisions(
+    rev1_dir: Path,
+    rev2_dir: Path,
+    binary_size_mb: int,
+    num_headers: int,
+) -> None:
+    """\
+    The second revision:
+        - changes a few bytes of a large binary (which is updated with a delta)
+        - replaces a library (which is downloaded)
+        - adds a binary and retargets a symbolic link to it (which is downloaded)
+        - adds a header (which is downloaded)
+        - removes a file
+        - changes the permissions of a file (which isn't downloaded)
+    """
+
+    generator = random.Random(0)
+
+    # ----------------------------------------------------------------------
+    def Write(
+        filename: Path,
+        content: bytes,
+        mode: int=0o644,
+    ) -> None:
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        filename.write_bytes(content)
+        filename.chmod(mode)
+
+    # ----------------------------------------------------------------------
+
+    binary = bytearray(generator.randbytes(binary_size_mb * 1024 * 1024))
+
+    Write(rev1_dir / "bin" / "tool", bytes(binary), 0o755)
+    (rev1_dir / "bin" / "tool-link").symlink_to("tool")
+
+    for index in range(num_headers):
+        Write(
+            rev1_dir / "include" / "header_{}.h".format(index),
+            "#pragma once\n\n{}\n".format("\n".join("int function_{}_{}();".format(index, i) for i in range(100))).encode("utf-8"),
+        )
+
+    Write(rev1_dir / "lib" / "library.a", generator.randbytes(512 * 1024))
+    Write(rev1_dir / "lib" / "removed.txt", b"This file is removed by the second revision.\n")
+    Write(rev1_dir / "share" / "script.sh", b"#!/bin/sh\necho script\n")
+
+    shutil.copytree(rev1_dir, rev2_dir, symlinks=True)
+
+    for offset in range(0, len(binary), len(binary) // 8):
+        binary[offset:offset + 16] = generator.randbytes(16)
+
+    Write(rev2_dir / "bin" / "tool", bytes(binary), 0o755)
+    Write(rev2_dir / "bin" / "tool2", generator.randbytes(64 * 1024), 0o755)
+
+    (rev2_dir / "bin" / "tool-link").unlink()
+    (rev2_dir / "bin" / "tool-link").symlink_to("tool2")
+
+    Write(rev2_dir / "include" / "added.h", b"#pragma once\n\nint added();\n")
+    Write(rev2_dir / "lib" / "library.a", generator.randbytes(512 * 1024))
+
+    (rev2_dir / "lib" / "removed.txt").unlink()
+    (rev2_dir / "share" / "script.sh").chmod(0o755)
+
+
+# ----------------------------------------------------------------------
+def _Compare(
+    expected_dir: Path,
+    actual_dir: Path,
+) -> List[str]:
+    # ----------------------------------------------------------------------
+    def Describe(
+        directory: Path,
+    ) -> Dict[str, Tuple[Any, ...]]:
+        result: Dict[str, Tuple[Any, ...]] = {}
+
+        for root, directories, filenames in os.walk(directory):
+            for name in filenames + [directory for directory in directories if os.path.islink(os.path.join(root, directory))]:
+                filename = Path(root) / name
+                relative_path = filename.relative_to(directory).as_posix()
+
+                if relative_path == _delta_update.FILE_MANIFEST_FILENAME:
+                    continue
+
+                if filename.is_symlink():
+                    result[relative_path] = ("link", os.readlink(filename))
+                else:
+                    result[relative_path] = (
+                        hashlib.sha256(filename.read_bytes()).hexdigest(),
+                        stat.S_IMODE(filename.stat().st_mode),
+                    )
+
+        return result
+
+    # ----------------------------------------------------------------------
+
+    expected = Describe(expected_dir)
+    actual = Describe(actual_dir)
+
+    return [
+        "'{}' differs from the second revision ({} != {}).".format(relative_path, actual.get(relative_path), expected.get(relative_path))
+        for relative_path in sorted(set(expected) | set(actual))
+        if expected.get(relative_path) != actual.get(relative_path)
+    ]
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,179 @@
+# ----------------------------------------------------------------------
+# |
+# |  ImportTime.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-17 17:11:26
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Measures the import time of the activation entry point (`Activate_custom`) with `python -X importtime`
+and fails if it exceeds the budget or imports modules that activation should never need. Run this
+script within an activated environment.
+"""
+
+import json
+import re
+import subprocess
+import sys
+import textwrap
+
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import typer
+
+from typer.core import TyperGroup
+
+
+# ----------------------------------------------------------------------
+# Modules that are imported by the activation framework before `Activate_custom` is imported; they are
+# imported before the measurement so that only the cost attributable to this repository is measured.
+FRAMEWORK_MODULES                           = [
+    "Common_Foundation.Shell.All",
+    "Common_Foundation.Streams.DoneManager",
+    "RepositoryBootstrap.ActivateActivity",
+    "RepositoryBootstrap.Configuration",
+    "RepositoryBootstrap.DataTypes",
+]
+
+# Modules that must not be imported during activation
+FORBIDDEN_MODULE_PREFIXES                   = [
+    "RepositoryBootstrap.SetupAndActivate.Installers",
+    "_archive_cache",
+    "_archive_pipeline",
+    "_components",
+    "_install_lock",
+    "_installers",
+    "_ranged_download",
+    "_zstd_archive",
+]
+
+
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
+
+
+# ----------------------------------------------------------------------
+app                                         = typer.Typer(
+    cls=NaturalOrderGrouper,
+    help=__doc__,
+    no_args_is_help=False,
+    pretty_exceptions_show_locals=False,
+    pretty_exceptions_enable=False,
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("EntryPoint", help=__doc__, no_args_is_help=False)
+def EntryPoint(
+    max_ms: float=typer.Option(25.0, "--max-ms", min=0.0, help="Maximum cumulative import time (in milliseconds) of the activation entry point."),
+    iterations: int=typer.Option(5, "--iterations", min=1, help="Number of measurements; the fastest is compared against the budget."),
+    output_filename: Path=typer.Option(None, "--output", dir_okay=False, help="Write the results as JSON to this file."),
+) -> None:
+    measurements: List[Tuple[float, List[str]]] = [_Measure() for _ in range(iterations)]
+
+    cumulative_ms = min(measurement[0] for measurement in measurements)
+    imported_modules = measurements[0][1]
+
+    forbidden_modules = [
+        module_name
+        for module_name in imported_modules
+        if any(module_name.startswith(prefix) for prefix in FORBIDDEN_MODULE_PREFIXES)
+    ]
+
+    results: Dict[str, Any] = {
+        "cumulative_ms": cumulative_ms,
+        "max_ms": max_ms,
+        "num_imported_modules": len(imported_modules),
+        "forbidden_modules": forbidden_modules,
+    }
+
+    sys.stdout.write(
+        textwrap.dedent(
+            """\
+            Cumulative import time:     {:.2f} ms (budget: {:.2f} ms)
+            Modules imported:           {}
+            Forbidden modules imported: {}
+            """,
+        ).format(
+            cumulative_ms,
+            max_ms,
+            len(imported_modules),
+            ", ".join(forbidden_modules) or "<None>",
+        ),
+    )
+
+    if output_filename is not None:
+        with output_filename.open("w") as f:
+            json.dump(results, f, indent=2)
+
+    if cumulative_ms > max_ms or forbidden_modules:
+        sys.stdout.write("\nFAILED\n")
+        raise typer.Exit(-1)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_importtime_regex                           = re.compile(r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|(?P<indent>\s+)(?P<name>\S+)$")
+
+
+# ----------------------------------------------------------------------
+def _Measure() -> Tuple[float, List[str]]:
+    """Returns the cumulative import time (in milliseconds) and the modules imported by `Activate_custom`"""
+
+    root = Path(__file__).parent.parent
+
+    command = "; ".join(
+        ["import sys", "sys.path.insert(0, {})".format(repr(str(root)))]
+        + ["import {}".format(module_name) for module_name in FRAMEWORK_MODULES]
+        + ["sys.stderr.write('__ACTIVATE_CUSTOM__\\n')", "import Activate_custom"],
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", command],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    if result.returncode != 0:
+        raise Exception("Unable to import 'Activate_custom':\n{}".format(result.stderr))
+
+    lines = result.stderr.split("__ACTIVATE_CUSTOM__\n", 1)[-1].splitlines()
+
+    cumulative_ms = None
+    imported_modules: List[str] = []
+
+    for line in lines:
+        match = _importtime_regex.match(line)
+        if not match:
+            continue
+
+        imported_modules.append(match.group("name"))
+
+        if match.group("name") == "Activate_custom":
+            cumulative_ms = int(match.group("cumulative")) / 1000
+
+    if cumulative_ms is None:
+        raise Exception("The import time of 'Activate_custom' was not found.")
+
+    return cumulative_ms, imported_modules
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,232 @@
+# ----------------------------------------------------------------------
+# |
+# |  PrecompiledHeaders.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 19:02:36
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Measures the time to parse translation units that include the common libc++ headers without and with
+the precompiled headers and module cache created during setup. Run this script within an activated
+environment.
+
+Modes:
+    none:       Headers are parsed from scratch.
+    pch:        The precompiled header in $COMMON_LLVM_LIBCXX_PCH_DIR is used (`-include-pch`).
+    modules:    The module cache in $COMMON_LLVM_MODULE_CACHE_DIR is used (`-fmodules`).
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import typer
+
+from typer.core import TyperGroup
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _precompiled_headers import GetPrecompiledHeaderFilename, MODULE_CACHE_ENV_VAR, PCH_DIR_ENV_VAR, VARIANTS    # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
+
+
+# ----------------------------------------------------------------------
+app                                         = typer.Typer(
+    cls=NaturalOrderGrouper,
+    help=__doc__,
+    no_args_is_help=False,
+    pretty_exceptions_show_locals=False,
+    pretty_exceptions_enable=False,
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("EntryPoint", help=__doc__, no_args_is_help=False)
+def EntryPoint(
+    compiler: str=typer.Option("clang++", "--compiler", help="C++ compiler to benchmark."),
+    standard: str=typer.Option("c++17", "--standard", help="Language standard; a precompiled header must exist for it."),
+    optimization: str=typer.Option("O0", "--optimization", help="Optimization level; a precompiled header must exist for it."),
+    num_translation_units: int=typer.Option(8, "--translation-units", min=1, help="Number of translation units parsed in each mode."),
+    iterations: int=typer.Option(3, "--iterations", min=1, help="Number of times to parse each translation unit; the fastest is recorded."),
+    output_filename: Path=typer.Option(None, "--output", dir_okay=False, help="Write the results as JSON to this file."),
+) -> None:
+    if (standard, optimization) not in VARIANTS:
+        raise typer.BadParameter(
+            "Precompiled headers are available for: {}.".format(
+                ", ".join("{} -{}".format(*variant) for variant in VARIANTS),
+            ),
+        )
+
+    pch_dir = os.getenv(PCH_DIR_ENV_VAR)
+    module_cache_dir = os.getenv(MODULE_CACHE_ENV_VAR)
+
+    if pch_dir is None or module_cache_dir is None:
+        raise typer.BadParameter(
+            "'{}' and '{}' are not defined; run setup and activate the environment.".format(PCH_DIR_ENV_VAR, MODULE_CACHE_ENV_VAR),
+        )
+
+    modes: Dict[str, List[str]] = {
+        "none": [],
+        "pch": ["-include-pch", str(GetPrecompiledHeaderFilename(Path(pch_dir), standard, optimization))],
+        "modules": ["-fmodules", "-fmodules-cache-path={}".format(module_cache_dir)],
+    }
+
+    results: Dict[str, Any] = {
+        "compiler": compiler,
+        "standard": standard,
+        "optimization": optimization,
+        "translation_units": num_translation_units,
+        "modes": {},
+    }
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        source_filenames = _CreateCorpus(Path(temp_directory), num_translation_units)
+
+        for mode, flags in modes.items():
+            sys.stdout.write("Running '{}'...\n".format(mode))
+
+            times = [
+                min(
+                    _Parse([compiler, "-std={}".format(standard), "-{}".format(optimization), *flags, "-fsyntax-only", str(source_filename)])
+                    for _ in range(iterations)
+                )
+                for source_filename in source_filenames
+            ]
+
+            results["modes"][mode] = {
+                "min_ms": min(times) * 1000,
+                "median_ms": statistics.median(times) * 1000,
+                "max_ms": max(times) * 1000,
+            }
+
+    baseline_ms = results["modes"]["none"]["median_ms"]
+
+    sys.stdout.write("\n{:<8} {:>10} {:>12} {:>10} {:>9}\n".format("Mode", "Min (ms)", "Median (ms)", "Max (ms)", "Speedup"))
+
+    for mode, mode_results in results["modes"].items():
+        sys.stdout.write(
+            "{:<8} {:>10.1f} {:>12.1f} {:>10.1f} {:>8.2f}x\n".format(
+                mode,
+                mode_results["min_ms"],
+                mode_results["median_ms"],
+                mode_results["max_ms"],
+                baseline_ms / mode_results["median_ms"],
+            ),
+        )
+
+    if output_filename is not None:
+        with output_filename.open("w") as f:
+            json.dump(results, f, indent=2)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Parse(
+    command: List[str],
+) -> float:
+    start_time = time.perf_counter()
+
+    result = subprocess.run(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        check=False,
+    )
+
+    wall_time = time.perf_counter() - start_time
+
+    if result.returncode != 0:
+        raise Exception("'{}' failed:\n{}".format(" ".join(command), result.stdout.decode("utf-8", errors="replace")))
+
+    return wall_time
+
+
+# ----------------------------------------------------------------------
+def _CreateCorpus(
+    output_dir: Path,
+    num_translation_units: int,
+) -> List[Path]:
+    """Creates translation units that include common headers (as most translation units do) with a small amount of code"""
+
+    source_filenames: List[Path] = []
+
+    for index in range(num_translation_units):
+        source_filename = output_dir / "tu_{}.cpp".format(index)
+
+        source_filename.write_text(
+            textwrap.dedent(
+                """\
+                #include <algorithm>
+                #include <map>
+                #include <memory>
+                #include <string>
+                #include <unordered_map>
+                #include <vector>
+
+                namespace tu_{index} {{
+
+                std::map<std::string, std::vector<int>> Group(std::vector<std::pair<std::string, int>> const &items) {{
+                    std::map<std::string, std::vector<int>> result;
+
+                    for(auto const &item : items)
+                        result[item.first].push_back(item.second * {index});
+
+                    for(auto &pair : result)
+                        std::sort(pair.second.begin(), pair.second.end());
+
+                    return result;
+                }}
+
+                std::unique_ptr<std::unordered_map<int, std::string>> Index(std::vector<std::string> const &values) {{
+                    auto result = std::make_unique<std::unordered_map<int, std::string>>();
+
+                    for(size_t i = 0; i < values.size(); ++i)
+                        result->emplace(static_cast<int>(i), values[i]);
+
+                    return result;
+                }}
+
+                }} // namespace tu_{index}
+                """,
+            ).format(
+                index=index,
+            ),
+        )
+
+        source_filenames.append(source_filename)
+
+    return source_filenames
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    app()
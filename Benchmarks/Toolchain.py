@@ -0,0 +1,529 @@
+# ----------------------------------------------------------------------
+# |
+# |  Toolchain.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 14:10:55
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Measures the performance of the installed clang++ and lld with a synthetic C++ corpus and compares the
+results with a baseline, so that toolchain builds that compile or link more slowly are flagged. Run
+this script within an activated environment.
+
+Scenarios:
+    templates_O0:   Template-heavy translation units compiled with -O0 and linked.
+    templates_O2:   Template-heavy translation units compiled with -O2 and linked.
+    thinlto:        Template-heavy translation units compiled with -O2 -flto=thin and linked with ThinLTO.
+    libcxx_headers: A translation unit that includes the most commonly used libc++ headers (-fsyntax-only).
+
+Compilation is measured with 1..N concurrent jobs (parallel scaling); wall time and the peak RSS of the
+compiler and linker processes are recorded.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import typer
+
+from typer.core import TyperGroup
+
+
+# ----------------------------------------------------------------------
+DEFAULT_BASELINE_FILENAME                   = Path(__file__).parent / "Toolchain.baseline.json"
+
+LIBCXX_HEADERS                              = [
+    "algorithm", "any", "array", "atomic", "bitset", "chrono", "complex", "condition_variable",
+    "deque", "filesystem", "fstream", "functional", "future", "iomanip", "iostream", "iterator",
+    "list", "map", "memory", "mutex", "numeric", "optional", "queue", "random", "regex", "set",
+    "sstream", "stack", "string", "string_view", "thread", "tuple", "type_traits", "unordered_map",
+    "unordered_set", "utility", "valarray", "variant", "vector",
+]
+
+
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
+
+
+# ----------------------------------------------------------------------
+app                                         = typer.Typer(
+    cls=NaturalOrderGrouper,
+    help=__doc__,
+    no_args_is_help=False,
+    pretty_exceptions_show_locals=False,
+    pretty_exceptions_enable=False,
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("EntryPoint", help=__doc__, no_args_is_help=False)
+def EntryPoint(
+    compiler: str=typer.Option("clang++", "--compiler", help="C++ compiler to benchmark."),
+    num_translation_units: int=typer.Option(8, "--translation-units", min=1, help="Number of translation units in the synthetic corpus."),
+    max_jobs: int=typer.Option(os.cpu_count() or 1, "--max-jobs", min=1, help="Maximum number of concurrent compilations."),
+    iterations: int=typer.Option(3, "--iterations", min=1, help="Number of times to run each measurement; the fastest is recorded."),
+    baseline_filename: Path=typer.Option(DEFAULT_BASELINE_FILENAME, "--baseline", dir_okay=False, help="Baseline results; the comparison is skipped if the file doesn't exist."),
+    update_baseline: bool=typer.Option(False, "--update-baseline", help="Write the results to the baseline file."),
+    tolerance: float=typer.Option(10.0, "--tolerance", min=0.0, help="Percentage that a measurement may exceed the baseline before it is flagged as a regression."),
+    output_filename: Path=typer.Option(None, "--output", dir_okay=False, help="Write the results as JSON to this file."),
+) -> None:
+    jobs_values = _GetJobsValues(max_jobs)
+
+    results: Dict[str, Any] = {
+        "compiler": compiler,
+        "compiler_version": subprocess.run(
+            [compiler, "--version"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.splitlines()[0],
+        "host": {
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "translation_units": num_translation_units,
+        "scenarios": {},
+    }
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        working_dir = Path(temp_directory)
+
+        source_filenames = _CreateCorpus(working_dir, num_translation_units)
+
+        for scenario, compile_flags, link_flags in [
+            ("templates_O0", ["-O0"], []),
+            ("templates_O2", ["-O2"], []),
+            ("thinlto", ["-O2", "-flto=thin"], ["-flto=thin"]),
+        ]:
+            sys.stdout.write("Running '{}'...\n".format(scenario))
+
+            scenario_results: Dict[str, Any] = {
+                "compile": {},
+            }
+
+            object_filenames: List[Path] = []
+
+            for jobs in jobs_values:
+                measurements = [
+                    _CompileAll(compiler, source_filenames, working_dir / scenario, compile_flags, jobs)
+                    for _ in range(iterations)
+                ]
+
+                object_filenames = measurements[0][1]
+
+                scenario_results["compile"][str(jobs)] = min(
+                    (measurement[0] for measurement in measurements),
+                    key=lambda measurement: measurement.wall_time,
+                ).ToJson()
+
+            link_jobs_values = [1, max_jobs] if link_flags else [1]
+
+            scenario_results["link"] = {}
+
+            for jobs in link_jobs_values:
+                extra_flags = ["-Wl,--thinlto-jobs={}".format(jobs)] if link_flags else []
+
+                scenario_results["link"][str(jobs)] = min(
+                    (
+                        _Run(
+                            [compiler, "-fuse-ld=lld", *link_flags, *extra_flags]
+                            + [str(filename) for filename in object_filenames]
+                            + ["-o", str(working_dir / scenario / "a.out")],
+                        )
+                        for _ in range(iterations)
+                    ),
+                    key=lambda measurement: measurement.wall_time,
+                ).ToJson()
+
+            results["scenarios"][scenario] = scenario_results
+
+        sys.stdout.write("Running 'libcxx_headers'...\n")
+
+        headers_filename = working_dir / "headers.cpp"
+
+        with headers_filename.open("w") as f:
+            f.write("".join("#include <{}>\n".format(header) for header in LIBCXX_HEADERS))
+
+        results["scenarios"]["libcxx_headers"] = {
+            "compile": {
+                "1": min(
+                    (
+                        _Run([compiler, "-std=c++17", "-fsyntax-only", str(headers_filename)])
+                        for _ in range(iterations)
+                    ),
+                    key=lambda measurement: measurement.wall_time,
+                ).ToJson(),
+            },
+        }
+
+    _WriteResults(results, jobs_values)
+
+    regressions: List[str] = []
+
+    if baseline_filename.is_file() and not update_baseline:
+        with baseline_filename.open() as f:
+            regressions = _Compare(json.load(f), results, tolerance)
+
+        results["regressions"] = regressions
+
+        sys.stdout.write(
+            "\nBaseline comparison ({}% tolerance): {}\n".format(
+                tolerance,
+                "no regressions" if not regressions else "{} regression(s)".format(len(regressions)),
+            ),
+        )
+
+        for regression in regressions:
+            sys.stdout.write("    {}\n".format(regression))
+
+    if output_filename is not None:
+        with output_filename.open("w") as f:
+            json.dump(results, f, indent=2)
+
+    if update_baseline:
+        with baseline_filename.open("w") as f:
+            json.dump(results, f, indent=2)
+
+        sys.stdout.write("\nThe baseline has been written to '{}'.\n".format(baseline_filename))
+
+    if regressions:
+        sys.stdout.write("\nFAILED\n")
+        raise typer.Exit(-1)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Measurement(object):
+    wall_time: float
+    peak_rss_kb: Optional[int]              # The maximum of all processes; None if not available on this platform
+
+    # ----------------------------------------------------------------------
+    def ToJson(self) -> Dict[str, Any]:
+        return {
+            "wall_time": self.wall_time,
+            "peak_rss_kb": self.peak_rss_kb,
+        }
+
+
+# ----------------------------------------------------------------------
+def _GetJobsValues(
+    max_jobs: int,
+) -> List[int]:
+    jobs_values: List[int] = []
+
+    jobs = 1
+    while jobs < max_jobs:
+        jobs_values.append(jobs)
+        jobs *= 2
+
+    jobs_values.append(max_jobs)
+
+    return jobs_values
+
+
+# ----------------------------------------------------------------------
+def _Run(
+    command: List[str],
+) -> _Measurement:
+    start_time = time.perf_counter()
+
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+
+    assert process.stdout is not None
+    output = process.stdout.read()
+
+    peak_rss_kb: Optional[int] = None
+
+    if hasattr(os, "wait4"):
+        # wait4 provides the resource usage of this specific process
+        _, status, rusage = os.wait4(process.pid, 0)  # pylint: disable=no-member
+
+        process.returncode = os.waitstatus_to_exitcode(status)
+        peak_rss_kb = rusage.ru_maxrss
+    else:
+        process.wait()
+
+    wall_time = time.perf_counter() - start_time
+
+    if process.returncode != 0:
+        raise Exception("'{}' failed:\n{}".format(" ".join(command), output.decode("utf-8", errors="replace")))
+
+    return _Measurement(wall_time, peak_rss_kb)
+
+
+# ----------------------------------------------------------------------
+def _CompileAll(
+    compiler: str,
+    source_filenames: List[Path],
+    output_dir: Path,
+    flags: List[str],
+    jobs: int,
+) -> Tuple[_Measurement, List[Path]]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    object_filenames = [output_dir / "{}.o".format(source_filename.stem) for source_filename in source_filenames]
+
+    start_time = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        measurements = list(
+            executor.map(
+                lambda args: _Run([compiler, "-std=c++17", *flags, "-c", str(args[0]), "-o", str(args[1])]),
+                zip(source_filenames, object_filenames),
+            ),
+        )
+
+    wall_time = time.perf_counter() - start_time
+
+    peak_rss_values = [measurement.peak_rss_kb for measurement in measurements if measurement.peak_rss_kb is not None]
+
+    return (
+        _Measurement(wall_time, max(peak_rss_values) if peak_rss_values else None),
+        object_filenames,
+    )
+
+
+# ----------------------------------------------------------------------
+def _WriteResults(
+    results: Dict[str, Any],
+    jobs_values: List[int],
+) -> None:
+    sys.stdout.write("\n{}\n\n".format(results["compiler_version"]))
+
+    sys.stdout.write(
+        "{:<16} {:<8} {:>6} {:>14} {:>10} {:>16}\n".format("Scenario", "Step", "Jobs", "Wall Time (s)", "Speedup", "Peak RSS (MB)"),
+    )
+
+    for scenario, scenario_results in results["scenarios"].items():
+        for step in ["compile", "link"]:
+            step_results = scenario_results.get(step, None)
+            if step_results is None:
+                continue
+
+            for jobs in [str(jobs) for jobs in jobs_values]:
+                measurement = step_results.get(jobs, None)
+                if measurement is None:
+                    continue
+
+                sys.stdout.write(
+                    "{:<16} {:<8} {:>6} {:>14.3f} {:>10} {:>16}\n".format(
+                        scenario,
+                        step,
+                        jobs,
+                        measurement["wall_time"],
+                        "{:.2f}x".format(step_results["1"]["wall_time"] / measurement["wall_time"]),
+                        "-" if measurement["peak_rss_kb"] is None else "{:.1f}".format(measurement["peak_rss_kb"] / 1024),
+                    ),
+                )
+
+
+# ----------------------------------------------------------------------
+def _Compare(
+    baseline: Dict[str, Any],
+    results: Dict[str, Any],
+    tolerance: float,
+) -> List[str]:
+    """Returns descriptions of the measurements that exceed the baseline by more than the tolerance"""
+
+    regressions: List[str] = []
+
+    for scenario, scenario_results in results["scenarios"].items():
+        for step, step_results in scenario_results.items():
+            for jobs, measurement in step_results.items():
+                baseline_measurement = baseline.get("scenarios", {}).get(scenario, {}).get(step, {}).get(jobs, None)
+                if baseline_measurement is None:
+                    continue
+
+                for metric in ["wall_time", "peak_rss_kb"]:
+                    value = measurement.get(metric, None)
+                    baseline_value = baseline_measurement.get(metric, None)
+
+                    if value is None or not baseline_value:
+                        continue
+
+                    change = (value - baseline_value) / baseline_value * 100
+
+                    if change > tolerance:
+                        regressions.append(
+                            "{} {} (jobs={}) {}: {:.3f} -> {:.3f} (+{:.1f}%)".format(
+                                scenario,
+                                step,
+                                jobs,
+                                metric,
+                                baseline_value,
+                                value,
+                                change,
+                            ),
+                        )
+
+    return regressions
+
+
+# ----------------------------------------------------------------------
+def _CreateCorpus(
+    output_dir: Path,
+    num_translation_units: int,
+) -> List[Path]:
+    """Creates a deterministic, template-heavy corpus and returns the source filenames"""
+
+    source_filenames: List[Path] = []
+
+    for index in range(num_translation_units):
+        source_filename = output_dir / "tu{}.cpp".format(index)
+
+        with source_filename.open("w") as f:
+            f.write(
+                _TRANSLATION_UNIT_TEMPLATE.format(
+                    index=index,
+                    tuple_size=64 + index % 16,
+                    fib=40 + index % 8,
+                    depth=4 + index % 3,
+                ),
+            )
+
+        source_filenames.append(source_filename)
+
+    main_filename = output_dir / "main.cpp"
+
+    with main_filename.open("w") as f:
+        f.write(
+            textwrap.dedent(
+                """\
+                {declarations}
+
+                int main(int argc, char **) {{
+                    int result = 0;
+
+                {calls}
+
+                    return result == 42 ? 1 : 0;
+                }}
+                """,
+            ).format(
+                declarations="\n".join("int Entry{}(int argc);".format(index) for index in range(num_translation_units)),
+                calls="\n".join("    result += Entry{}(argc);".format(index) for index in range(num_translation_units)),
+            ),
+        )
+
+    source_filenames.append(main_filename)
+
+    return source_filenames
+
+
+# ----------------------------------------------------------------------
+_TRANSLATION_UNIT_TEMPLATE                  = textwrap.dedent(
+    """\
+    #include <algorithm>
+    #include <cstddef>
+    #include <functional>
+    #include <map>
+    #include <memory>
+    #include <string>
+    #include <tuple>
+    #include <utility>
+    #include <variant>
+    #include <vector>
+
+    namespace tu{index} {{
+
+    template <std::size_t N>
+    struct Fib {{ static constexpr std::size_t value = Fib<N - 1>::value + Fib<N - 2>::value; }};
+
+    template <> struct Fib<0> {{ static constexpr std::size_t value = 0; }};
+    template <> struct Fib<1> {{ static constexpr std::size_t value = 1; }};
+
+    template <typename T, std::size_t... Is>
+    auto MakeTuple(std::index_sequence<Is...>) {{ return std::make_tuple(static_cast<T>(Is)...); }}
+
+    template <typename TupleT, std::size_t... Is>
+    auto Sum(TupleT const &t, std::index_sequence<Is...>) {{ return (std::get<Is>(t) + ... + 0); }}
+
+    template <std::size_t N>
+    struct Node {{
+        std::vector<Node<N - 1>> children;
+        std::map<std::string, std::variant<int, double, std::string>> values;
+        std::function<std::size_t(std::size_t)> transform = [](std::size_t value) {{ return value + N; }};
+
+        std::size_t Count() const {{
+            std::size_t result = transform(values.size());
+
+            for(auto const &child : children)
+                result += child.Count();
+
+            return result;
+        }}
+    }};
+
+    template <>
+    struct Node<0> {{
+        std::size_t Count() const {{ return 1; }}
+    }};
+
+    template <std::size_t N>
+    Node<N> Build(std::size_t width) {{
+        Node<N> node;
+
+        if constexpr (N > 0) {{
+            for(std::size_t i = 0; i < width; ++i)
+                node.children.emplace_back(Build<N - 1>(width));
+
+            node.values.emplace("index", static_cast<int>(width));
+            node.values.emplace("name", std::string("tu{index}"));
+        }}
+
+        return node;
+    }}
+
+    }} // namespace tu{index}
+
+    int Entry{index}(int argc) {{
+        auto const tuple = tu{index}::MakeTuple<long>(std::make_index_sequence<{tuple_size}>());
+        long const sum = tu{index}::Sum(tuple, std::make_index_sequence<{tuple_size}>());
+
+        std::vector<std::unique_ptr<std::string>> words;
+
+        for(int i = 0; i < argc + 16; ++i)
+            words.emplace_back(std::make_unique<std::string>(std::to_string(i * {index})));
+
+        std::sort(words.begin(), words.end(), [](auto const &a, auto const &b) {{ return *a < *b; }});
+
+        auto const node = tu{index}::Build<{depth}>(2);
+
+        return static_cast<int>((sum + tu{index}::Fib<{fib}>::value + node.Count() + words.size()) % 7);
+    }}
+    """,
+)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    app()
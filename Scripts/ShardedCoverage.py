@@ -0,0 +1,755 @@
+# ----------------------------------------------------------------------
+# |
+# |  ShardedCoverage.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 16:42:19
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Generates a coverage report for large test suites by processing coverage data in parallel shards. Run
+this script within an activated environment (grcov, llvm-profdata, and llvm-cov must be available).
+
+Phases:
+    discover:   Finds source files below the source directory and coverage data (.profraw, .gcda)
+                below the input directories.
+    merge:      Merges .profraw files with `llvm-profdata merge` in a parallel tree reduction.
+    shards:     Generates lcov data for each shard (a directory of source files at `--shard-depth`)
+                in parallel; .gcda data is processed by grcov and .profdata is exported by `llvm-cov`.
+    report:     Combines the lcov data of all shards and (optionally) converts it with grcov.
+
+Intermediate merge results and shard results are cached in `--cache-dir` by the hash of their inputs,
+so that unchanged work is reused by the next run. The wall time and the peak RSS of the largest
+process are reported for each phase.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import typer
+
+from typer.core import TyperGroup
+
+
+# ----------------------------------------------------------------------
+SOURCE_EXTENSIONS                           = {
+    ".c", ".cc", ".cpp", ".cxx", ".c++", ".m", ".mm",
+}
+
+HEADER_EXTENSIONS                           = {
+    ".h", ".hh", ".hpp", ".hxx", ".h++", ".inc", ".inl", ".ipp", ".tcc",
+}
+
+LCOV_FILENAME                               = "coverage.info"
+
+
+# ----------------------------------------------------------------------
+class NaturalOrderGrouper(TyperGroup):
+    # ----------------------------------------------------------------------
+    def list_commands(self, *args, **kwargs):  # pylint: disable=unused-argument
+        return self.commands.keys()
+
+
+# ----------------------------------------------------------------------
+app                                         = typer.Typer(
+    cls=NaturalOrderGrouper,
+    help=__doc__,
+    no_args_is_help=True,
+    pretty_exceptions_show_locals=False,
+    pretty_exceptions_enable=False,
+)
+
+
+# ----------------------------------------------------------------------
+@app.command("EntryPoint", help=__doc__, no_args_is_help=True)
+def EntryPoint(
+    input_dirs: List[Path]=typer.Argument(..., exists=True, file_okay=False, resolve_path=True, help="Directories searched for coverage data (.profraw, .gcda and .gcno files)."),
+    source_dir: Path=typer.Option(..., "--source-dir", exists=True, file_okay=False, resolve_path=True, help="Root of the source files."),
+    output_dir: Path=typer.Option(..., "--output-dir", file_okay=False, resolve_path=True, help="Directory for the report."),
+    binaries: List[Path]=typer.Option([], "--binary", exists=True, dir_okay=False, resolve_path=True, help="Instrumented binaries that produced the .profraw files."),
+    output_type: str=typer.Option("lcov", "--output-type", help="grcov output type of the report (lcov, html, cobertura, covdir, ...)."),
+    shard_depth: int=typer.Option(1, "--shard-depth", min=0, help="Depth of the source directories that define shards."),
+    fan_in: int=typer.Option(8, "--fan-in", min=2, help="Number of profiles merged by each `llvm-profdata` invocation."),
+    jobs: int=typer.Option(os.cpu_count() or 1, "--jobs", min=1, help="Number of concurrent processes."),
+    cache_dir: Optional[Path]=typer.Option(None, "--cache-dir", file_okay=False, resolve_path=True, help="Directory for cached results; defaults to '<output_dir>/.cache'."),
+    grcov_args: List[str]=typer.Option([], "--grcov-arg", help="Additional argument passed to grcov."),
+    stats_filename: Optional[Path]=typer.Option(None, "--stats", dir_okay=False, help="Write the phase statistics as JSON to this file."),
+) -> None:
+    if cache_dir is None:
+        cache_dir = output_dir / ".cache"
+
+    tools = _Tools.Create()
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        phases: List[_Phase] = []
+
+        # Discover
+        with _Phase.Create("discover", phases) as phase:
+            shards = _CreateShards(source_dir, shard_depth, [output_dir, cache_dir])
+
+            profraw_filenames: List[Path] = []
+            gcda_filenames: List[Tuple[Path, Path]] = []
+
+            for input_dir in input_dirs:
+                for root, directories, filenames in os.walk(input_dir):
+                    root_path = Path(root)
+
+                    directories[:] = sorted(directory for directory in directories if root_path / directory != cache_dir)
+
+                    for filename in sorted(filenames):
+                        if filename.endswith(".profraw"):
+                            profraw_filenames.append(root_path / filename)
+                        elif filename.endswith(".gcda"):
+                            gcda_filenames.append((input_dir, root_path / filename))
+
+            phase.items = len(profraw_filenames) + len(gcda_filenames)
+
+            if not profraw_filenames and not gcda_filenames:
+                raise typer.BadParameter("No coverage data was found.", param_hint="input_dirs")
+
+            if profraw_filenames and not binaries:
+                raise typer.BadParameter("'--binary' is required to process .profraw files.", param_hint="--binary")
+
+        # Merge
+        profdata_filename: Optional[Path] = None
+
+        with _Phase.Create("merge", phases) as phase:
+            if profraw_filenames:
+                profdata_filename = _MergeProfiles(executor, tools, profraw_filenames, fan_in, cache_dir / "merge", phase)
+
+        # Shards
+        with _Phase.Create("shards", phases) as phase:
+            shard_filenames = _ProcessShards(
+                executor,
+                tools,
+                source_dir,
+                shards,
+                profdata_filename,
+                binaries,
+                gcda_filenames,
+                grcov_args,
+                cache_dir / "shards",
+                phase,
+            )
+
+        # Report
+        with _Phase.Create("report", phases) as phase:
+            lcov_filename = output_dir / LCOV_FILENAME
+
+            with lcov_filename.open("wb") as f:
+                for shard_filename in shard_filenames:
+                    with shard_filename.open("rb") as shard_f:
+                        shutil.copyfileobj(shard_f, f)
+
+            phase.items = len(shard_filenames)
+
+            if output_type != "lcov":
+                phase.AddProcess(
+                    _Run(
+                        [
+                            tools.grcov,
+                            str(lcov_filename),
+                            "-s", str(source_dir),
+                            "-t", output_type,
+                            "-o", str(output_dir / output_type),
+                            *grcov_args,
+                        ],
+                    ),
+                )
+
+    sys.stdout.write("\n{:<10} {:>10} {:>8} {:>12} {:>14}\n".format("Phase", "Time (s)", "Items", "Cache Hits", "Peak RSS (MB)"))
+
+    for phase in phases:
+        sys.stdout.write(
+            "{:<10} {:>10.2f} {:>8} {:>12} {:>14}\n".format(
+                phase.name,
+                phase.wall_time,
+                phase.items,
+                phase.cache_hits,
+                "{:.1f}".format(phase.peak_rss_kb / 1024) if phase.peak_rss_kb is not None else "-",
+            ),
+        )
+
+    sys.stdout.write("\nWrote '{}'.\n".format(output_dir / (LCOV_FILENAME if output_type == "lcov" else output_type)))
+
+    if stats_filename is not None:
+        with stats_filename.open("w") as f:
+            json.dump({phase.name: phase.ToJson() for phase in phases}, f, indent=2)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Tools(object):
+    grcov: str
+    llvm_profdata: str
+    llvm_cov: str
+
+    key: str                                # Changes when any of the tools change
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Create(cls) -> "_Tools":
+        paths: List[str] = []
+
+        for name in ["grcov", "llvm-profdata", "llvm-cov"]:
+            path = shutil.which(name)
+            if path is None:
+                raise Exception("'{}' was not found; run this script within an activated environment.".format(name))
+
+            paths.append(path)
+
+        return cls(*paths, _HashFiles(Path(path) for path in paths))
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Shard(object):
+    relative_dir: str                       # "." for the root
+    is_recursive: bool                      # False if the shard only contains the files directly within the dir
+    filenames: List[Path]
+
+    # ----------------------------------------------------------------------
+    @property
+    def has_headers(self) -> bool:
+        return any(filename.suffix in HEADER_EXTENSIONS for filename in self.filenames)
+
+    # ----------------------------------------------------------------------
+    def GetGrcovFilterArgs(self) -> List[str]:
+        # grcov globs match path separators, so "<dir>/*/*" matches everything in subdirectories
+        prefix = "" if self.relative_dir == "." else "{}/".format(self.relative_dir)
+
+        args = ["--keep-only", "{}*".format(prefix)]
+
+        if not self.is_recursive:
+            args += ["--ignore", "{}*/*".format(prefix)]
+
+        return args
+
+
+# ----------------------------------------------------------------------
+@dataclass
+class _Phase(object):
+    name: str
+
+    wall_time: float                        = field(init=False, default=0.0)
+    items: int                              = field(init=False, default=0)
+    cache_hits: int                         = field(init=False, default=0)
+    peak_rss_kb: Optional[int]              = field(init=False, default=None)
+
+    _lock: threading.Lock                   = field(init=False, default_factory=threading.Lock)
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Create(
+        cls,
+        name: str,
+        phases: List["_Phase"],
+    ) -> "_PhaseContext":
+        phase = cls(name)
+        phases.append(phase)
+
+        return _PhaseContext(phase)
+
+    # ----------------------------------------------------------------------
+    def AddProcess(
+        self,
+        peak_rss_kb: Optional[int],
+    ) -> None:
+        with self._lock:
+            if peak_rss_kb is not None and (self.peak_rss_kb is None or peak_rss_kb > self.peak_rss_kb):
+                self.peak_rss_kb = peak_rss_kb
+
+    # ----------------------------------------------------------------------
+    def AddCacheHit(self) -> None:
+        with self._lock:
+            self.cache_hits += 1
+
+    # ----------------------------------------------------------------------
+    def ToJson(self) -> Dict[str, Any]:
+        return {
+            "wall_time": self.wall_time,
+            "items": self.items,
+            "cache_hits": self.cache_hits,
+            "peak_rss_kb": self.peak_rss_kb,
+        }
+
+
+# ----------------------------------------------------------------------
+class _PhaseContext(object):
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        phase: _Phase,
+    ):
+        self._phase = phase
+        self._start_time = 0.0
+
+    # ----------------------------------------------------------------------
+    def __enter__(self) -> _Phase:
+        sys.stdout.write("Running '{}'...\n".format(self._phase.name))
+
+        self._start_time = time.perf_counter()
+        return self._phase
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, *args):
+        self._phase.wall_time = time.perf_counter() - self._start_time
+
+
+# ----------------------------------------------------------------------
+def _Run(
+    command: List[str],
+    *,
+    stdout_filename: Optional[Path]=None,
+) -> Optional[int]:
+    """Runs the command and returns the peak RSS (in KB) of its process (if available)"""
+
+    with (stdout_filename.open("wb") if stdout_filename is not None else open(os.devnull, "wb")) as stdout:
+        process = subprocess.Popen(
+            command,
+            stdout=stdout,
+            stderr=subprocess.PIPE,
+        )
+
+        assert process.stderr is not None
+        errors = process.stderr.read()
+
+        peak_rss_kb: Optional[int] = None
+
+        if hasattr(os, "wait4"):
+            # wait4 provides the resource usage of this specific process
+            _, status, rusage = os.wait4(process.pid, 0)  # pylint: disable=no-member
+
+            process.returncode = os.waitstatus_to_exitcode(status)
+            peak_rss_kb = rusage.ru_maxrss
+        else:
+            process.wait()
+
+    if process.returncode != 0:
+        raise Exception("'{}' failed:\n{}".format(" ".join(command), errors.decode("utf-8", errors="replace")))
+
+    return peak_rss_kb
+
+
+# ----------------------------------------------------------------------
+def _HashFiles(
+    filenames: Iterable[Path],
+) -> str:
+    """Hashes the identity (rather than the content) of the files, which is sufficient to detect changes"""
+
+    hasher = hashlib.sha256()
+
+    for filename in filenames:
+        stat = filename.stat()
+        hasher.update("{}|{}|{}\n".format(filename, stat.st_size, stat.st_mtime_ns).encode("utf-8"))
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def _HashStrings(
+    *values: str,
+) -> str:
+    return hashlib.sha256("\n".join(values).encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------------------
+def _GetCached(
+    cache_dir: Path,
+    key: str,
+    suffix: str,
+    phase: _Phase,
+    used: Set[Path],
+    create_func: Callable[[Path], None],
+) -> Path:
+    """Returns the cached file associated with the key, creating it with `create_func` if necessary"""
+
+    filename = cache_dir / "{}{}".format(key, suffix)
+    used.add(filename)
+
+    if filename.is_file():
+        phase.AddCacheHit()
+        return filename
+
+    # Write to a temporary file so that an interrupted run never leaves a partial result in the cache
+    temp_filename = filename.with_name("{}.{}.tmp".format(filename.name, threading.get_ident()))
+
+    try:
+        create_func(temp_filename)
+        os.replace(temp_filename, filename)
+    finally:
+        if temp_filename.exists():
+            temp_filename.unlink()
+
+    return filename
+
+
+# ----------------------------------------------------------------------
+def _PruneCache(
+    cache_dir: Path,
+    used: Set[Path],
+) -> None:
+    """Removes results that weren't used by this run, so that the cache doesn't grow without bound"""
+
+    for item in cache_dir.iterdir():
+        if item not in used:
+            if item.is_dir():
+                shutil.rmtree(item)
+            else:
+                item.unlink()
+
+
+# ----------------------------------------------------------------------
+def _CreateShards(
+    source_dir: Path,
+    shard_depth: int,
+    excluded_dirs: List[Path],
+) -> List[_Shard]:
+    shards: Dict[Tuple[str, bool], List[Path]] = {}
+
+    for root, directories, filenames in os.walk(source_dir):
+        root_path = Path(root)
+
+        directories[:] = sorted(
+            directory
+            for directory in directories
+            if not directory.startswith(".") and root_path / directory not in excluded_dirs
+        )
+
+        relative_parts = root_path.relative_to(source_dir).parts
+
+        if len(relative_parts) >= shard_depth:
+            shard_key = ("/".join(relative_parts[:shard_depth]) or ".", True)
+        else:
+            shard_key = ("/".join(relative_parts) or ".", False)
+
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1] in SOURCE_EXTENSIONS or os.path.splitext(filename)[1] in HEADER_EXTENSIONS:
+                shards.setdefault(shard_key, []).append(root_path / filename)
+
+    return [
+        _Shard(relative_dir, is_recursive, filenames)
+        for (relative_dir, is_recursive), filenames in sorted(shards.items())
+    ]
+
+
+# ----------------------------------------------------------------------
+def _MergeProfiles(
+    executor: ThreadPoolExecutor,
+    tools: _Tools,
+    profraw_filenames: List[Path],
+    fan_in: int,
+    cache_dir: Path,
+    phase: _Phase,
+) -> Path:
+    """\
+    Merges the profiles in a tree reduction, where each level merges groups of `fan_in` results from the
+    previous level concurrently. Groups are formed within directories so that new profiles only
+    invalidate the cached results of the groups that they are added to.
+    """
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    used: Set[Path] = set()
+
+    # ----------------------------------------------------------------------
+    def Merge(
+        args: Tuple[str, List[Path]],
+    ) -> Path:
+        key, input_filenames = args
+
+        return _GetCached(
+            cache_dir,
+            key,
+            ".profdata",
+            phase,
+            used,
+            lambda output_filename: phase.AddProcess(
+                _Run(
+                    [
+                        tools.llvm_profdata,
+                        "merge",
+                        "-sparse",
+                        "--num-threads=1",
+                        "-o", str(output_filename),
+                        *(str(input_filename) for input_filename in input_filenames),
+                    ],
+                ),
+            ),
+        )
+
+    # ----------------------------------------------------------------------
+
+    groups: Dict[Path, List[Path]] = {}
+
+    for profraw_filename in profraw_filenames:
+        groups.setdefault(profraw_filename.parent, []).append(profraw_filename)
+
+    # Each item is (key, filename)
+    level: List[Tuple[str, Path]] = []
+    work: List[Tuple[str, List[Path]]] = []
+
+    for filenames in groups.values():
+        for index in range(0, len(filenames), fan_in):
+            chunk = filenames[index:index + fan_in]
+            work.append((_HashStrings(tools.key, _HashFiles(chunk)), chunk))
+
+    phase.items = len(profraw_filenames)
+
+    while True:
+        level = list(zip((key for key, _ in work), executor.map(Merge, work)))
+
+        if len(level) == 1:
+            break
+
+        work = []
+
+        for index in range(0, len(level), fan_in):
+            chunk = level[index:index + fan_in]
+            work.append((_HashStrings(tools.key, *(key for key, _ in chunk)), [filename for _, filename in chunk]))
+
+    _PruneCache(cache_dir, used)
+
+    return level[0][1]
+
+
+# ----------------------------------------------------------------------
+def _ProcessShards(
+    executor: ThreadPoolExecutor,
+    tools: _Tools,
+    source_dir: Path,
+    shards: List[_Shard],
+    profdata_filename: Optional[Path],
+    binaries: List[Path],
+    gcda_filenames: List[Tuple[Path, Path]],
+    grcov_args: List[str],
+    cache_dir: Path,
+    phase: _Phase,
+) -> List[Path]:
+    """Returns the lcov filenames of the shards"""
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    used: Set[Path] = set()
+
+    # A translation unit's .gcda file (`foo.cpp.gcda` with CMake, `foo.gcda` with make) only contains
+    # coverage for its source file and the headers that it includes; shards with source files only
+    # need the .gcda files of their translation units, while shards with headers need all of them.
+    gcda_lookup: Dict[str, List[Tuple[Path, Path]]] = {}
+
+    for input_dir, gcda_filename in gcda_filenames:
+        name = gcda_filename.name[:-len(".gcda")]
+        gcda_lookup.setdefault(name, []).append((input_dir, gcda_filename))
+
+    source_names: Set[str] = set()
+
+    for shard in shards:
+        for filename in shard.filenames:
+            source_names.add(filename.name)
+            source_names.add(filename.stem)
+
+    unmatched_gcda_filenames = [
+        item
+        for name, items in gcda_lookup.items()
+        if name not in source_names
+        for item in items
+    ]
+
+    # ----------------------------------------------------------------------
+    def GetGcdaFilenames(
+        shard: _Shard,
+    ) -> List[Tuple[Path, Path]]:
+        if shard.has_headers:
+            return gcda_filenames
+
+        results = list(unmatched_gcda_filenames)
+
+        for filename in shard.filenames:
+            results += gcda_lookup.get(filename.name, [])
+
+            if filename.stem != filename.name:
+                results += gcda_lookup.get(filename.stem, [])
+
+        return sorted(set(results))
+
+    # ----------------------------------------------------------------------
+    def ProcessGcda(
+        shard: _Shard,
+        shard_gcda_filenames: List[Tuple[Path, Path]],
+        output_filename: Path,
+    ) -> None:
+        # grcov processes directories, so link the shard's .gcda and .gcno files into a working
+        # directory (preserving their relative paths, as names are not unique).
+        working_dir = output_filename.with_name(output_filename.name + ".inputs")
+
+        if working_dir.exists():
+            shutil.rmtree(working_dir)
+
+        try:
+            for input_dir, gcda_filename in shard_gcda_filenames:
+                for filename in [gcda_filename, gcda_filename.with_suffix(".gcno")]:
+                    if not filename.is_file():
+                        continue
+
+                    dest_filename = working_dir / str(input_dirs_index[input_dir]) / filename.relative_to(input_dir)
+                    dest_filename.parent.mkdir(parents=True, exist_ok=True)
+
+                    try:
+                        os.link(filename, dest_filename)
+                    except OSError:
+                        shutil.copy2(filename, dest_filename)
+
+            phase.AddProcess(
+                _Run(
+                    [
+                        tools.grcov,
+                        str(working_dir),
+                        "-s", str(source_dir),
+                        "-t", "lcov",
+                        "--llvm",
+                        "--ignore-not-existing",
+                        *shard.GetGrcovFilterArgs(),
+                        "-o", str(output_filename),
+                        *grcov_args,
+                    ],
+                ),
+            )
+
+        finally:
+            shutil.rmtree(working_dir, ignore_errors=True)
+
+    # ----------------------------------------------------------------------
+    def ProcessProfdata(
+        shard: _Shard,
+        output_filename: Path,
+    ) -> None:
+        assert profdata_filename is not None
+
+        if shard.is_recursive:
+            sources = [str(source_dir / shard.relative_dir)]
+        else:
+            sources = [str(filename) for filename in shard.filenames]
+
+        command = [
+            tools.llvm_cov,
+            "export",
+            "-format=lcov",
+            "-instr-profile={}".format(profdata_filename),
+            str(binaries[0]),
+        ]
+
+        for binary in binaries[1:]:
+            command += ["-object", str(binary)]
+
+        phase.AddProcess(_Run(command + sources, stdout_filename=output_filename))
+
+    # ----------------------------------------------------------------------
+    def Process(
+        shard: _Shard,
+    ) -> List[Path]:
+        results: List[Path] = []
+
+        source_key = _HashFiles(shard.filenames)
+
+        if gcda_filenames:
+            shard_gcda_filenames = GetGcdaFilenames(shard)
+
+            if shard_gcda_filenames:
+                key = _HashStrings(
+                    tools.key,
+                    shard.relative_dir,
+                    str(shard.is_recursive),
+                    source_key,
+                    _HashFiles(
+                        filename
+                        for _, gcda_filename in shard_gcda_filenames
+                        for filename in [gcda_filename, gcda_filename.with_suffix(".gcno")]
+                        if filename.is_file()
+                    ),
+                    *grcov_args,
+                )
+
+                results.append(
+                    _GetCached(
+                        cache_dir,
+                        key,
+                        ".gcda.info",
+                        phase,
+                        used,
+                        lambda output_filename: ProcessGcda(shard, shard_gcda_filenames, output_filename),
+                    ),
+                )
+
+        if profdata_filename is not None:
+            key = _HashStrings(
+                tools.key,
+                shard.relative_dir,
+                str(shard.is_recursive),
+                source_key,
+                # The merged profile's name is the hash of its inputs
+                profdata_filename.stem,
+                _HashFiles(binaries),
+            )
+
+            results.append(
+                _GetCached(
+                    cache_dir,
+                    key,
+                    ".profdata.info",
+                    phase,
+                    used,
+                    lambda output_filename: ProcessProfdata(shard, output_filename),
+                ),
+            )
+
+        return results
+
+    # ----------------------------------------------------------------------
+
+    input_dirs_index: Dict[Path, int] = {}
+
+    for input_dir, _ in gcda_filenames:
+        input_dirs_index.setdefault(input_dir, len(input_dirs_index))
+
+    phase.items = len(shards)
+
+    # Largest shards first, so that a single large shard doesn't start last
+    futures = {
+        index: executor.submit(Process, shards[index])
+        for index in sorted(range(len(shards)), key=lambda index: -len(shards[index].filenames))
+    }
+
+    results = [filename for index in range(len(shards)) for filename in futures[index].result()]
+
+    _PruneCache(cache_dir, used)
+
+    return results
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    app()
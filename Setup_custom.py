@@ -16,11 +16,15 @@
 # pylint: disable=missing-module-docstring
 
 import copy
+import io
 import os
+import time
 import uuid
 import sys
 import textwrap
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
@@ -30,24 +34,51 @@ from Common_Foundation.ContextlibEx import ExitStack                        # ty
 from Common_Foundation import PathEx                                        # type: ignore  # pylint: disable=import-error,unused-import
 from Common_Foundation.Shell.All import CurrentShell                        # type: ignore  # pylint: disable=import-error,unused-import
 from Common_Foundation.Shell import Commands                                # type: ignore  # pylint: disable=import-error,unused-import
-from Common_Foundation.Streams.DoneManager import DoneManager               # type: ignore  # pylint: disable=import-error,unused-import
+from Common_Foundation.Streams.DoneManager import DoneManager, DoneManagerFlags             # type: ignore  # pylint: disable=import-error,unused-import
 from Common_Foundation import SubprocessEx                                  # type: ignore  # pylint: disable=import-error,unused-import
 from Common_Foundation import TextwrapEx                                    # type: ignore  # pylint: disable=import-error,unused-import
 from Common_Foundation import Types                                         # type: ignore  # pylint: disable=import-error,unused-import
 
 from RepositoryBootstrap import Configuration                               # type: ignore  # pylint: disable=import-error,unused-import
 from RepositoryBootstrap import Constants                                   # type: ignore  # pylint: disable=import-error,unused-import
-from RepositoryBootstrap.SetupAndActivate.Installers.DownloadNSISInstaller import DownloadNSISInstaller             # type: ignore  # pylint: disable=import-error,unused-import
-from RepositoryBootstrap.SetupAndActivate.Installers.DownloadSevenZipInstaller import DownloadSevenZipInstaller     # type: ignore  # pylint: disable=import-error,unused-import
-from RepositoryBootstrap.SetupAndActivate.Installers.DownloadZipInstaller import DownloadZipInstaller               # type: ignore  # pylint: disable=import-error,unused-import
-from RepositoryBootstrap.SetupAndActivate.Installers.Installer import Installer                                     # type: ignore  # pylint: disable=import-error,unused-import
-from RepositoryBootstrap.SetupAndActivate.Installers.LocalSevenZipInstaller import LocalSevenZipInstaller           # type: ignore  # pylint: disable=import-error,unused-import
 
 
 # ----------------------------------------------------------------------
-from _install_data import GRCOV_VERSIONS, LLVM_VERSIONS
+from _archive_pipeline import RecoverStagingDirectories
+del sys.modules["_archive_pipeline"]
+
+from _dedup_store import DedupStore
+del sys.modules["_dedup_store"]
+
+from _delta_update import FILE_MANIFEST_FILENAME, FileManifest
+del sys.modules["_delta_update"]
+
+from _install_data import DEFERRED_INSTALL_FILENAME, DeferInstall, GetArchiveCache, GRCOV_VERSIONS, InstallData, IsLazyInstallEnabled, LAZY_INSTALL_ENV_VAR, LLVM_VERSIONS
 del sys.modules["_install_data"]
 
+from _install_lock import InstallLock
+del sys.modules["_install_lock"]
+
+from _integrity import CreateManifest, IsVerificationEnabled, Repair, Verify
+del sys.modules["_integrity"]
+
+from _precompiled_headers import GetModuleCacheDir, GetPrecompiledHeaderFilename, IsUpToDate as ArePrecompiledHeadersUpToDate, PRECOMPILED_DIRNAME, PREFIX_HEADER, RecordInputs, VARIANTS
+del sys.modules["_precompiled_headers"]
+
+from _self_test import RunSelfTests, SELF_TEST_CASES
+del sys.modules["_self_test"]
+
+from _toolchain_validation import CalculateFingerprint, GetValidatedCases, IsValidationForced, RecordValidation
+del sys.modules["_toolchain_validation"]
+
+from _trace import Nested as TraceNested, Phase as TracePhase, Session as TraceSession, Subprocess as TraceSubprocess
+del sys.modules["_trace"]
+
+
+# ----------------------------------------------------------------------
+# The number of tools installed concurrently during setup (a value of 1 installs the tools serially)
+INSTALL_WORKERS_ENV_VAR                     = "COMMON_LLVM_INSTALL_WORKERS"
+
 
 # ----------------------------------------------------------------------
 def GetConfigurations() -> Union[
@@ -147,147 +178,671 @@ def GetCustomActions(
         ),
     )
 
-    with dm.Nested("\nProcessing 'Common_LLVM' tools...") as extract_dm:
-        with extract_dm.Nested("Processing 'grcov'...") as grcov_dm:
-            for index, (grcov_version, install_data) in enumerate(GRCOV_VERSIONS.items()):
-                with grcov_dm.Nested("'{}' ({} of {})...".format(grcov_version, index + 1, len(GRCOV_VERSIONS))) as version_dm:
-                    install_data.installer.Install(
-                        version_dm,
-                        force=force,
-                        prompt_for_interactive=install_data.prompt_for_interactive,
-                        interactive=interactive,
+    # Phases are traced when `COMMON_LLVM_TRACE` is set (see `_trace.py`)
+    with TraceSession("setup", dm), TraceNested(dm, "\nProcessing 'Common_LLVM' tools...") as extract_dm:
+        work_items: List[_WorkItem] = []
+
+        # Toolchains that aren't installed are installed during the first activation of a configuration
+        # that uses them; configurations provided on the command line are always installed.
+        defer_installs = IsLazyInstallEnabled() and not explicit_configurations and not force
+
+        for index, (grcov_version, install_data) in enumerate(GRCOV_VERSIONS.items()):
+            work_items.append(
+                _WorkItem(
+                    "'grcov' '{}' ({} of {})...".format(grcov_version, index + 1, len(GRCOV_VERSIONS)),
+                    grcov_version,
+                    install_data,
+                    validate=False,
+                ),
+            )
+
+        for index, (version, install_data_items) in enumerate(LLVM_VERSIONS.items()):
+            if explicit_configurations and not any(explicit_configuration.startswith(version) for explicit_configuration in explicit_configurations):
+                extract_dm.WriteVerbose("'LLVM' '{}' was skipped.\n".format(version))
+                continue
+
+            for install_data_item in install_data_items:
+                if defer_installs and install_data_item.installer.ShouldInstall(None, None):
+                    DeferInstall(install_data_item)
+
+                    extract_dm.WriteInfo(
+                        "'LLVM' '{}' - '{}' will be installed when it is first activated (unset '{}' to install it now).\n".format(
+                            version,
+                            install_data_item.name,
+                            LAZY_INSTALL_ENV_VAR,
+                        ),
                     )
 
-        with extract_dm.Nested("Processing 'LLVM'...") as llvm_dm:
-            for index, (version, install_data_items) in enumerate(LLVM_VERSIONS.items()):
-                with llvm_dm.Nested(
-                    "'{}' ({} of {})...".format(
-                        version,
-                        index + 1,
-                        len(LLVM_VERSIONS),
+                    continue
+
+                work_items.append(
+                    _WorkItem(
+                        "'LLVM' '{}' ({} of {}) - '{}'...".format(
+                            version,
+                            index + 1,
+                            len(LLVM_VERSIONS),
+                            install_data_item.name,
+                        ),
+                        "{}-{}".format(version, install_data_item.name),
+                        install_data_item,
+                        # Create a simple test program to ensure that LLVM was installed correctly
+                        validate=CurrentShell.family_name != "Windows",
                     ),
-                ) as version_dm:
-                    if explicit_configurations and not any(explicit_configuration.startswith(version) for explicit_configuration in explicit_configurations):
-                        version_dm.WriteVerbose("The version was skipped.\n")
-                        continue
+                )
 
-                    for install_data_item in install_data_items:
-                        with version_dm.Nested("'{}'...".format(install_data_item.name)) as this_dm:
-                            install_data_item.installer.Install(
-                                this_dm,
-                                force=force,
-                                prompt_for_interactive=install_data_item.prompt_for_interactive,
-                                interactive=interactive,
-                            )
+        _InstallWorkItems(
+            extract_dm,
+            work_items,
+            force=force,
+            interactive=interactive,
+        )
 
-                        if CurrentShell.family_name != "Windows":
-                            # Create a simple test program to ensure that LLVM was installed correctly
-                            with version_dm.Nested("Validating installation...") as validate_dm:
-                                temp_directory = CurrentShell.CreateTempDirectory()
+        archive_cache = GetArchiveCache()
+        if archive_cache is not None:
+            extract_dm.WriteInfo("Archive cache '{}': {}.\n".format(archive_cache.root, archive_cache.stats))
 
-                                was_successful = False
+        if extract_dm.result != 0:
+            return []
 
-                                # ----------------------------------------------------------------------
-                                def OnExit():
-                                    if was_successful:
-                                        PathEx.RemoveTree(temp_directory)
-                                        return
+    return commands
 
-                                    validate_dm.WriteInfo("The temporary directory '{}' has not been deleted.".format(temp_directory))
 
-                                # ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def InstallDeferred(
+    dm: DoneManager,
+    version: str,
+    install_data: InstallData,
+) -> None:
+    """\
+    Installs a toolchain whose installation was deferred by setup (see `LAZY_INSTALL_ENV_VAR`); invoked
+    by activation. Concurrent activations wait for the process that is installing the toolchain and
+    reuse its work.
+    """
+
+    _ExecuteWorkItem(
+        dm,
+        _WorkItem(
+            "'LLVM' '{}' - '{}'...".format(version, install_data.name),
+            "{}-{}".format(version, install_data.name),
+            install_data,
+            validate=CurrentShell.family_name != "Windows",
+        ),
+        force=False,
+        interactive=None,
+    )
 
-                                with ExitStack(OnExit):
-                                    source_filename = temp_directory / "test.cpp"
+    if dm.result == 0:
+        # Promotion of the installed content has usually removed the file already
+        (install_data.installer.output_dir / DEFERRED_INSTALL_FILENAME).unlink(missing_ok=True)
 
-                                    with validate_dm.Nested("Creating source file..."):
-                                        with source_filename.open("w") as f:
-                                            f.write(
-                                                textwrap.dedent(
-                                                    """\
-                                                    #include <iostream>
 
-                                                    int main() {
-                                                        std::cout << "Hello world!\\n";
-                                                        return 0;
-                                                    }
-                                                    """,
-                                                ),
-                                            )
+# ----------------------------------------------------------------------
+# |
+# |  Private Types
+# |
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _WorkItem(object):
+    heading: str
+    version: str
+    install_data: InstallData
+    validate: bool                          = field(kw_only=True)
 
-                                    with validate_dm.Nested("Compiling...") as compile_dm:
-                                        command_line = 'clang++ "{}"'.format(source_filename.name)
 
-                                        compile_dm.WriteVerbose("Command Line: {}\n\n".format(command_line))
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _WorkItemResult(object):
+    result: int
+    output: Optional[str]                   # None if the output was written directly
+    execution_time: float
 
-                                        modified_env = copy.deepcopy(os.environ)
 
-                                        modified_env["PATH"] = "{}:{}".format(
-                                            modified_env["PATH"],
-                                            install_data_item.installer.output_dir / "bin",
-                                        )
+# ----------------------------------------------------------------------
+# |
+# |  Private Functions
+# |
+# ----------------------------------------------------------------------
+def _GetNumInstallWorkers() -> int:
+    value = os.getenv(INSTALL_WORKERS_ENV_VAR)
+    if value is None:
+        return min(4, os.cpu_count() or 1)
 
-                                        modified_env["LD_LIBRARY_PATH"] = "{}".format(
-                                            install_data_item.installer.output_dir / "lib" / "x86_64-unknown-linux-gnu",
-                                        )
+    try:
+        num_workers = int(value)
+    except ValueError as ex:
+        raise Exception("'{}' is not a valid value for '{}'; an integer was expected.".format(value, INSTALL_WORKERS_ENV_VAR)) from ex
 
-                                        result = SubprocessEx.Run(
-                                            command_line,
-                                            cwd=temp_directory,
-                                            env=modified_env,  # type: ignore
-                                        )
+    return max(1, num_workers)
 
-                                        compile_dm.result = result.returncode
 
-                                        if compile_dm.result != 0:
-                                            compile_dm.WriteError(
-                                                textwrap.dedent(
-                                                    """\
-                                                    Errors here generally indicate that glibc has not been installed (especially if the error is associated with 'features.h').
-                                                    Visit https://www.gnu.org/software/libc/ for more information.
+# ----------------------------------------------------------------------
+def _InstallWorkItems(
+    dm: DoneManager,
+    work_items: List[_WorkItem],
+    *,
+    force: bool,
+    interactive: Optional[bool],
+) -> None:
+    num_workers = _GetNumInstallWorkers()
 
-                                                    Please install glibc using your distro's favorite package manager.
+    # Installers that prompt the user can't share the terminal with other installers, so they are
+    # always invoked serially (and after the concurrent installers have completed).
+    concurrent_items: List[_WorkItem] = []
+    serial_items: List[_WorkItem] = []
 
-                                                    Examples:
-                                                        Ubuntu:     `apt-get install -y libc6-dev`
+    for work_item in work_items:
+        if num_workers > 1 and not work_item.install_data.prompt_for_interactive:
+            concurrent_items.append(work_item)
+        else:
+            serial_items.append(work_item)
 
-                                                    COMPILER ERROR
-                                                    --------------
-                                                    {}
+    results: List[Tuple[_WorkItem, _WorkItemResult]] = []
 
-                                                    """,
-                                                ).format(
-                                                    TextwrapEx.Indent(result.output.strip(), 4),
-                                                ),
-                                            )
+    start_time = time.perf_counter()
 
-                                            return []
+    if concurrent_items:
+        with ThreadPoolExecutor(max_workers=min(num_workers, len(concurrent_items))) as executor:
+            futures = [
+                executor.submit(
+                    _ExecuteCapturedWorkItem,
+                    dm,
+                    work_item,
+                    force=force,
+                    interactive=interactive,
+                )
+                for work_item in concurrent_items
+            ]
+
+            # Write the output in the original order; the output for an item is written as soon as it
+            # and all of the items that precede it have completed. The output is replayed within a
+            # nested block so that it is indented the same way as output written by a serial install
+            # (the block isn't traced, as the work was traced when it was executed).
+            for work_item, future in zip(concurrent_items, futures):
+                work_item_result = future.result()
+
+                assert work_item_result.output is not None
+
+                with dm.Nested(work_item.heading) as item_dm:
+                    if work_item_result.output:
+                        with item_dm.YieldStream() as stream:
+                            stream.write(work_item_result.output)
+
+                    item_dm.result = work_item_result.result
+
+                results.append((work_item, work_item_result))
+
+    for work_item in serial_items:
+        item_start_time = time.perf_counter()
+
+        with TraceNested(dm, work_item.heading) as item_dm:
+            _ExecuteWorkItem(
+                item_dm,
+                work_item,
+                force=force,
+                interactive=interactive,
+            )
+
+        results.append(
+            (
+                work_item,
+                _WorkItemResult(item_dm.result, None, time.perf_counter() - item_start_time),
+            ),
+        )
 
-                                        with compile_dm.YieldVerboseStream() as stream:
-                                            stream.write(result.output)
+    wall_time = time.perf_counter() - start_time
+    serial_time = sum(work_item_result.execution_time for _, work_item_result in results)
+
+    failures = [work_item for work_item, work_item_result in results if work_item_result.result != 0]
+    if failures:
+        dm.WriteError(
+            "{} of {} tool(s) failed to install:\n{}\n".format(
+                len(failures),
+                len(results),
+                "\n".join("    - {}".format(work_item.heading.rstrip(".")) for work_item in failures),
+            ),
+        )
 
-                                    with validate_dm.Nested("Testing...") as testing_dm:
-                                        command_line = "./a.out"
+    dm.WriteInfo(
+        "{} tool(s) processed with {} worker(s) in {:.2f}s (serial time: {:.2f}s).\n".format(
+            len(results),
+            num_workers,
+            wall_time,
+            serial_time,
+        ),
+    )
 
-                                        testing_dm.WriteVerbose("Command Line: {}\n\n".format(command_line))
 
-                                        result = SubprocessEx.Run(
-                                            command_line,
-                                            cwd=temp_directory,
-                                        )
+# ----------------------------------------------------------------------
+def _ExecuteCapturedWorkItem(
+    dm: DoneManager,
+    work_item: _WorkItem,
+    *,
+    force: bool,
+    interactive: Optional[bool],
+) -> _WorkItemResult:
+    sink = io.StringIO()
+    result = 0
 
-                                        testing_dm.result = result.returncode
+    start_time = time.perf_counter()
 
-                                        if testing_dm.result == 0:
-                                            testing_dm.result = 0 if result.output == "Hello world!\n" else -1
+    try:
+        # The heading is written when the captured output is replayed within a nested block, so only
+        # the content is captured here (and the time spent doing the work is traced explicitly).
+        with TracePhase(work_item.heading, captured=True), DoneManager.Create(
+            sink,
+            "",
+            output_flags=DoneManagerFlags.Create(verbose=dm.is_verbose, debug=dm.is_debug),
+        ) as item_dm:
+            _ExecuteWorkItem(
+                item_dm,
+                work_item,
+                force=force,
+                interactive=interactive,
+            )
 
-                                        if testing_dm.result != 0:
-                                            compile_dm.WriteError(result.output)
-                                            return []
+            result = item_dm.result
 
-                                        with testing_dm.YieldVerboseStream() as stream:
-                                            stream.write(result.output)
+    except Exception:                                                       # pylint: disable=broad-except
+        # The DoneManager has already written the exception information to the sink
+        result = -1
 
-                                        was_successful = True
+    return _WorkItemResult(result, sink.getvalue(), time.perf_counter() - start_time)
 
-    return commands
+
+# ----------------------------------------------------------------------
+def _ExecuteWorkItem(
+    dm: DoneManager,
+    work_item: _WorkItem,
+    *,
+    force: bool,
+    interactive: Optional[bool],
+) -> None:
+    output_dir = work_item.install_data.installer.output_dir
+
+    # Other processes (for example, concurrent CI jobs on the same agent) may be installing into the
+    # same directory. The installer determines if installation is necessary after the lock is
+    # acquired, so processes that wait reuse the content installed by the process that held the lock.
+    with InstallLock(
+        output_dir,
+        on_wait=lambda: dm.WriteInfo("Waiting for another process to finish installing '{}'...\n".format(output_dir)),
+    ):
+        RecoverStagingDirectories(output_dir)
+
+        is_installing = force or work_item.install_data.installer.ShouldInstall(None, None)
+        install_start_time = time.time()
+
+        work_item.install_data.installer.Install(
+            dm,
+            force=force,
+            prompt_for_interactive=work_item.install_data.prompt_for_interactive,
+            interactive=interactive,
+        )
+
+        if dm.result != 0:
+            return
+
+        if is_installing:
+            _DeduplicateInstallation(dm, output_dir)
+
+            # Installers may have recorded the manifest published with the archive
+            manifest_filename = output_dir / FILE_MANIFEST_FILENAME
+
+            if not manifest_filename.is_file() or manifest_filename.stat().st_mtime < install_start_time:
+                with TraceNested(dm, "Recording the file manifest..."):
+                    CreateManifest(output_dir, work_item.version)
+
+        elif IsVerificationEnabled():
+            _VerifyInstallation(dm, work_item.version, work_item.install_data)
+
+            if dm.result != 0:
+                return
+
+        if not work_item.validate:
+            return
+
+        _ValidateInstallation(
+            dm,
+            work_item.version,
+            work_item.install_data,
+            force=force or IsValidationForced(),
+        )
+
+        if dm.result != 0:
+            return
+
+        _PrecompileHeaders(
+            dm,
+            work_item.install_data,
+            force=force,
+        )
+
+
+# ----------------------------------------------------------------------
+def _DeduplicateInstallation(
+    dm: DoneManager,
+    output_dir: Path,
+) -> None:
+    # Files that are identical to those in other toolchains on the host are replaced with links to a
+    # single copy of the content.
+    dedup_store = DedupStore.FromEnvironment()
+    if dedup_store is None:
+        return
+
+    dedup_result = None
+
+    with TraceNested(
+        dm,
+        "Deduplicating files with '{}'...".format(dedup_store.root),
+        lambda: None if dedup_result is None else str(dedup_result),
+    ):
+        dedup_result = dedup_store.Deduplicate(output_dir)
+
+
+# ----------------------------------------------------------------------
+def _VerifyInstallation(
+    dm: DoneManager,
+    version: str,
+    install_data: InstallData,
+) -> None:
+    output_dir = install_data.installer.output_dir
+
+    manifest = FileManifest.Load(output_dir)
+
+    if manifest is None:
+        with TraceNested(dm, "Recording the file manifest..."):
+            CreateManifest(output_dir, version)
+
+        dm.WriteVerbose(
+            "'{}' was installed before file manifests were recorded; its current content is the baseline for future verification.\n".format(output_dir),
+        )
+
+        return
+
+    verify_result = None
+
+    with TraceNested(
+        dm,
+        "Verifying '{}'...".format(output_dir),
+        lambda: None if verify_result is None else str(verify_result),
+    ):
+        verify_result = Verify(output_dir, manifest)
+
+    if verify_result.is_valid:
+        return
+
+    for title, relative_paths in [
+        ("Missing", verify_result.missing),
+        ("Modified", verify_result.modified),
+        ("Permissions", verify_result.permissions),
+    ]:
+        for relative_path in relative_paths:
+            dm.WriteVerbose("{}: {}\n".format(title, relative_path))
+
+    extract_files_func = getattr(install_data.installer, "ExtractFiles", None)
+
+    if extract_files_func is None:
+        dm.WriteError(
+            "The installation at '{}' has been modified and its installer can't repair it; run setup with '--force' to reinstall it.\n".format(output_dir),
+        )
+        return
+
+    # Modified files may be hardlinks of entries in the deduplication store, in which case the entries
+    # have been modified as well.
+    dedup_store = DedupStore.FromEnvironment()
+
+    if dedup_store is not None:
+        for relative_path in verify_result.modified:
+            entry = manifest.files[relative_path]
+
+            if entry.sha256 is not None:
+                dedup_store.Discard(entry.sha256, entry.mode)
+
+    num_repaired = 0
+
+    with TraceNested(
+        dm,
+        "Repairing '{}'...".format(output_dir),
+        lambda: "{} file(s) repaired".format(num_repaired),
+    ) as repair_dm:
+        try:
+            num_repaired = Repair(
+                output_dir,
+                manifest,
+                verify_result,
+                lambda staging_dir, relative_paths: extract_files_func(repair_dm, staging_dir, relative_paths),
+            )
+
+        except Exception as ex:                                             # pylint: disable=broad-except
+            repair_dm.WriteError(
+                "The installation at '{}' could not be repaired ({}); run setup with '--force' to reinstall it.\n".format(
+                    output_dir,
+                    ex,
+                ),
+            )
+
+
+# ----------------------------------------------------------------------
+def _ValidateInstallation(
+    dm: DoneManager,
+    version: str,
+    install_data: InstallData,
+    *,
+    force: bool,
+) -> None:
+    output_dir = install_data.installer.output_dir
+
+    # Validation is expensive, so only run the self-tests that haven't passed since the installation
+    # last changed.
+    fingerprint = CalculateFingerprint(output_dir, version)
+
+    validated_case_keys = set() if force else GetValidatedCases(output_dir, fingerprint)
+
+    cases = [case for case in SELF_TEST_CASES if case.key not in validated_case_keys]
+
+    if not cases:
+        dm.WriteVerbose("The installation has not changed since it was last validated.\n")
+        return
+
+    with TraceNested(dm, "Validating installation ({} self-test(s))...".format(len(cases))) as validate_dm:
+        temp_directory = CurrentShell.CreateTempDirectory()
+
+        was_successful = False
+
+        # ----------------------------------------------------------------------
+        def OnExit():
+            if was_successful:
+                PathEx.RemoveTree(temp_directory)
+                return
+
+            validate_dm.WriteInfo("The temporary directory '{}' has not been deleted.".format(temp_directory))
+
+        # ----------------------------------------------------------------------
+
+        with ExitStack(OnExit):
+            start_time = time.perf_counter()
+
+            results = RunSelfTests(
+                output_dir / "bin" / "clang++",
+                temp_directory,
+                cases,
+                env=_CreateToolchainEnvironment(output_dir),  # type: ignore
+            )
+
+            wall_time = time.perf_counter() - start_time
+
+            for result in results:
+                if result.passed:
+                    validate_dm.WriteVerbose("{}\n".format(result))
+                    continue
+
+                if result.case.name == "hello" and result.stage == "compile":
+                    validate_dm.WriteError(
+                        textwrap.dedent(
+                            """\
+                            Errors here generally indicate that glibc has not been installed (especially if the error is associated with 'features.h').
+                            Visit https://www.gnu.org/software/libc/ for more information.
+
+                            Please install glibc using your distro's favorite package manager.
+
+                            Examples:
+                                Ubuntu:     `apt-get install -y libc6-dev`
+
+                            COMPILER ERROR
+                            --------------
+                            {}
+
+                            """,
+                        ).format(
+                            TextwrapEx.Indent(result.output.strip(), 4),
+                        ),
+                    )
+
+                    continue
+
+                validate_dm.WriteError(
+                    "{}:\n{}\n".format(
+                        result,
+                        TextwrapEx.Indent(result.output.strip(), 4),
+                    ),
+                )
+
+            validate_dm.WriteInfo(
+                "{} of {} self-test(s) passed in {:.2f}s (serial time: {:.2f}s).\n".format(
+                    sum(1 for result in results if result.passed),
+                    len(results),
+                    wall_time,
+                    sum(result.execution_time for result in results),
+                ),
+            )
+
+            was_successful = all(result.passed for result in results)
+
+            if not was_successful:
+                validate_dm.result = -1
+
+        # Tests that passed aren't run again until the installation changes
+        RecordValidation(
+            output_dir,
+            fingerprint,
+            validated_case_keys | {result.case.key for result in results if result.passed},
+        )
+
+
+# ----------------------------------------------------------------------
+def _PrecompileHeaders(
+    dm: DoneManager,
+    install_data: InstallData,
+    *,
+    force: bool,
+) -> None:
+    output_dir = install_data.installer.output_dir
+
+    prefix_header = output_dir / PREFIX_HEADER
+
+    if not prefix_header.is_file():
+        dm.WriteVerbose("The toolchain does not include '{}'.\n".format(PREFIX_HEADER.as_posix()))
+        return
+
+    if not force and ArePrecompiledHeadersUpToDate(output_dir):
+        dm.WriteVerbose("The precompiled headers are up-to-date.\n")
+        return
+
+    with TraceNested(dm, "Precompiling libc++ headers...") as precompile_dm:
+        # The precompiled headers and module cache reference the files that they depend on by their
+        # location, so they are created in place.
+        precompiled_dir = output_dir / PRECOMPILED_DIRNAME
+
+        if precompiled_dir.exists():
+            PathEx.RemoveTree(precompiled_dir)
+
+        precompiled_dir.mkdir()
+
+        clang_filename = output_dir / "bin" / "clang++"
+
+        command_lines: List[str] = []
+        dependency_filenames: List[Path] = []
+
+        for standard, optimization in VARIANTS:
+            pch_filename = GetPrecompiledHeaderFilename(precompiled_dir, standard, optimization)
+            dependency_filename = pch_filename.with_suffix(".d")
+
+            command_lines += [
+                '"{}" -x c++-header -std={} -{} "{}" -o "{}" -MD -MF "{}"'.format(
+                    clang_filename,
+                    standard,
+                    optimization,
+                    prefix_header,
+                    pch_filename,
+                    dependency_filename,
+                ),
+                '"{}" -x c++ -std={} -{} -fmodules -fmodules-cache-path="{}" -fsyntax-only "{}"'.format(
+                    clang_filename,
+                    standard,
+                    optimization,
+                    GetModuleCacheDir(precompiled_dir),
+                    prefix_header,
+                ),
+            ]
+
+            dependency_filenames.append(dependency_filename)
+
+        env = _CreateToolchainEnvironment(output_dir)
+
+        with ThreadPoolExecutor(max_workers=min(len(command_lines), os.cpu_count() or 1)) as executor:
+            results = list(
+                executor.map(
+                    lambda command_line: _RunSubprocess(command_line, cwd=precompiled_dir, env=env),  # type: ignore
+                    command_lines,
+                ),
+            )
+
+        errors = [
+            (command_line, result)
+            for command_line, result in zip(command_lines, results)
+            if result.returncode != 0
+        ]
+
+        if errors:
+            # Precompiled headers are an optimization that projects opt into, so failures don't fail
+            # setup; the environment variables aren't set during activation until they are created.
+            for command_line, result in errors:
+                precompile_dm.WriteWarning(
+                    "'{}' failed:\n{}\n".format(
+                        command_line,
+                        TextwrapEx.Indent(result.output.strip(), 4),
+                    ),
+                )
+
+            return
+
+        RecordInputs(precompiled_dir, clang_filename, dependency_filenames)
+
+
+# ----------------------------------------------------------------------
+def _RunSubprocess(
+    command_line: str,
+    **kwargs,
+) -> SubprocessEx.RunResult:
+    with TraceSubprocess(command_line) as trace:
+        # The compiler may run a shim that installs a component
+        kwargs["env"] = trace.CreateEnvironment(kwargs.get("env", None))
+
+        return SubprocessEx.Run(command_line, **kwargs)
+
+
+# ----------------------------------------------------------------------
+def _CreateToolchainEnvironment(
+    output_dir: Path,
+) -> Dict[str, str]:
+    modified_env = copy.deepcopy(os.environ)
+
+    modified_env["PATH"] = "{}:{}".format(
+        modified_env["PATH"],
+        output_dir / "bin",
+    )
+
+    modified_env["LD_LIBRARY_PATH"] = "{}".format(
+        output_dir / "lib" / "x86_64-unknown-linux-gnu",
+    )
+
+    return modified_env  # type: ignore
@@ -0,0 +1,239 @@
+# ----------------------------------------------------------------------
+# |
+# |  CreateComponentArchives.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 10:03:26
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Splits an LLVM installation into component archives (seekable zstd tar archives) and writes a
+`manifest.json` file that describes them.
+
+Configurations install the components that they need and the remaining components are installed on
+demand (see `_components.py` in the repository root).
+
+This script runs within the build container, so it only depends on python 3.6+ and the `zstd`
+executable.
+
+Usage:
+    python3 CreateComponentArchives.py <input_dir> <output_dir> <version> [--frame-size <MB>] [--level <level>] [--jobs <num>]
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from CreateSeekableArchive import CreateArchive, EnumerateMembers           # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+# The component that contains everything that isn't matched by a rule below
+DEFAULT_COMPONENT                           = "clang"
+
+# (component, description, requires, flags)
+#
+# Components without executables are never installed by a shim, so they are either required by the
+# compiler or list the compiler flags (shell patterns) that use them; the compiler installs the
+# component when one of those flags is provided.
+COMPONENTS                                  = [
+    # The compiler is built to use libc++ and libunwind by default (see `build_linux.sh`), so it can't link without them
+    (DEFAULT_COMPONENT, "clang, lld, LLVM tools, clang resource headers, and compiler-rt builtins", ["libcxx"], []),
+    ("libcxx", "libc++, libc++abi, and libunwind headers and libraries", [], []),
+    (
+        "compiler-rt",
+        "Sanitizer, profile, and fuzzer runtimes",
+        [DEFAULT_COMPONENT],
+        [
+            "-fsanitize=*",
+            "-fprofile-generate*",
+            "-fprofile-instr-generate*",
+            "-fcs-profile-generate*",
+            "-fprofile-arcs",
+            "--coverage",
+            "-fxray-instrument",
+        ],
+    ),
+    ("clang-tools-extra", "clang-tidy, clangd, and other clang-based tools", [DEFAULT_COMPONENT], []),
+    ("libc", "LLVM libc", [DEFAULT_COMPONENT], []),
+    ("development", "LLVM and clang headers, static libraries, and CMake packages", [DEFAULT_COMPONENT], []),
+]
+
+# (pattern, component); the first matching pattern determines the component ('*' matches '/')
+RULES                                       = [
+    # The compiler can't link without these
+    ("lib/clang/*/include/*", DEFAULT_COMPONENT),
+    ("lib/clang/*/lib/*/libclang_rt.builtins*", DEFAULT_COMPONENT),
+    ("lib/clang/*/lib/*/clang_rt.crt*", DEFAULT_COMPONENT),
+
+    ("include/c++/*", "libcxx"),
+    ("include/*/c++/*", "libcxx"),
+    ("lib/libc++*", "libcxx"),
+    ("lib/libunwind*", "libcxx"),
+    ("lib/*/libc++*", "libcxx"),
+    ("lib/*/libunwind*", "libcxx"),
+    ("share/Common_LLVM/*", "libcxx"),
+
+    ("lib/clang/*/lib/*", "compiler-rt"),
+    ("lib/clang/*/share/*", "compiler-rt"),
+
+    ("bin/clang-apply-replacements", "clang-tools-extra"),
+    ("bin/clang-change-namespace", "clang-tools-extra"),
+    ("bin/clang-doc", "clang-tools-extra"),
+    ("bin/clang-include-fixer", "clang-tools-extra"),
+    ("bin/clang-move", "clang-tools-extra"),
+    ("bin/clang-pseudo", "clang-tools-extra"),
+    ("bin/clang-query", "clang-tools-extra"),
+    ("bin/clang-reorder-fields", "clang-tools-extra"),
+    ("bin/clang-tidy*", "clang-tools-extra"),
+    ("bin/clangd*", "clang-tools-extra"),
+    ("bin/find-all-symbols", "clang-tools-extra"),
+    ("bin/modularize", "clang-tools-extra"),
+    ("bin/pp-trace", "clang-tools-extra"),
+    ("bin/run-clang-tidy", "clang-tools-extra"),
+    ("share/clang/*", "clang-tools-extra"),
+
+    ("include/llvm-libc*", "libc"),
+    ("lib/libllvmlibc*", "libc"),
+
+    ("include/*", "development"),
+    ("lib/cmake/*", "development"),
+    ("lib/*.a", "development"),
+]
+
+
+# ----------------------------------------------------------------------
+def EntryPoint(args):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument("input_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument("version")
+    parser.add_argument("--frame-size", type=int, default=32, help="Approximate uncompressed size of each frame (in MB).")
+    parser.add_argument("--level", type=int, default=19, help="zstd compression level.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of frames compressed concurrently.")
+
+    args = parser.parse_args(args)
+
+    input_dir = os.path.realpath(args.input_dir)
+
+    if not os.path.isdir(args.output_dir):
+        os.makedirs(args.output_dir)
+
+    members = OrderedDict((component[0], []) for component in COMPONENTS)
+
+    for relative_path, size in EnumerateMembers(input_dir):
+        fullpath = os.path.join(input_dir, relative_path)
+
+        # Directories are created when files are extracted
+        if os.path.isdir(fullpath) and not os.path.islink(fullpath):
+            continue
+
+        members[Classify(relative_path.replace(os.path.sep, "/"))].append((relative_path, size))
+
+    manifest = OrderedDict(
+        [
+            ("version", args.version),
+            ("components", OrderedDict()),
+        ],
+    )
+
+    for name, description, requires, flags in COMPONENTS:
+        if not members[name]:
+            continue
+
+        archive_name = "{}.tar.zst".format(name)
+        archive_filename = os.path.join(args.output_dir, archive_name)
+
+        num_frames, decompressed_size = CreateArchive(
+            input_dir,
+            members[name],
+            archive_filename,
+            frame_size=args.frame_size,
+            level=args.level,
+            jobs=args.jobs,
+        )
+
+        manifest["components"][name] = OrderedDict(
+            [
+                ("description", description),
+                ("archive", archive_name),
+                ("sha256", _CalculateSha256(archive_filename)),
+                ("num_bytes", os.path.getsize(archive_filename)),
+                ("installed_bytes", decompressed_size),
+                ("requires", requires),
+                (
+                    "executables",
+                    [
+                        relative_path.replace(os.path.sep, "/")
+                        for relative_path, _ in members[name]
+                        if relative_path.startswith("bin" + os.path.sep)
+                    ],
+                ),
+                ("flags", flags),
+            ],
+        )
+
+        sys.stdout.write(
+            "Wrote '{}' ({} file(s), {} frame(s), {:,} bytes -> {:,} bytes).\n".format(
+                archive_filename,
+                len(members[name]),
+                num_frames,
+                decompressed_size,
+                os.path.getsize(archive_filename),
+            ),
+        )
+
+    with open(os.path.join(args.output_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return 0
+
+
+# ----------------------------------------------------------------------
+def Classify(relative_path):
+    for pattern, component in RULES:
+        if fnmatch.fnmatchcase(relative_path, pattern):
+            return component
+
+    return DEFAULT_COMPONENT
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CalculateSha256(filename):
+    hasher = hashlib.sha256()
+
+    with open(filename, "rb") as f:
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                break
+
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(EntryPoint(sys.argv[1:]))
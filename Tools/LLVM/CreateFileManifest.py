@@ -0,0 +1,262 @@
+# ----------------------------------------------------------------------
+# |
+# |  CreateFileManifest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 23:02:51
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Writes a per-file manifest (`files.json`) for an LLVM installation, along with the individually
+compressed content of each file and binary deltas from previous installations. Installations created
+from an earlier revision are updated by downloading only the files (or deltas) that changed (see
+`_delta_update.py` in the repository root).
+
+The output directory is shared by all revisions, so content that was published by an earlier revision
+is reused:
+
+    <output_dir>/files.json
+    <output_dir>/files/<sha256[:2]>/<sha256>.zst
+    <output_dir>/deltas/<sha256[:2]>/<previous sha256>-<sha256>.zst
+
+Deltas are created with `zstd --patch-from` for files whose content changed since the installations in
+`--previous-dir` and are only published when they are significantly smaller than the compressed file.
+
+This script runs within the build container, so it only depends on python 3.6+ and the `zstd`
+executable.
+
+Usage:
+    python3 CreateFileManifest.py <input_dir> <output_dir> <version> [--previous-dir <dir>]... [--level <level>] [--jobs <num>]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import stat
+import subprocess
+import sys
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ----------------------------------------------------------------------
+MANIFEST_FILENAME                           = "files.json"
+
+# Deltas are only published when they are smaller than this fraction of the compressed file
+MAX_DELTA_RATIO                             = 0.5
+
+
+# ----------------------------------------------------------------------
+def EntryPoint(args):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument("input_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument("version")
+    parser.add_argument("--previous-dir", action="append", default=[], help="Installation of a previous revision; deltas are created from its files.")
+    parser.add_argument("--level", type=int, default=19, help="zstd compression level.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of files compressed concurrently.")
+
+    args = parser.parse_args(args)
+
+    input_dir = os.path.realpath(args.input_dir)
+
+    files = CreateEntries(input_dir)
+
+    # ----------------------------------------------------------------------
+    def CompressFile(entry):
+        output_filename = GetFilename(args.output_dir, entry["sha256"])
+
+        if not os.path.isfile(output_filename):
+            _Compress(entry["fullpath"], output_filename, args.level)
+
+        return os.path.getsize(output_filename)
+
+    # ----------------------------------------------------------------------
+
+    unique_entries = OrderedDict(
+        (entry["sha256"], entry)
+        for entry in files.values()
+        if "sha256" in entry
+    )
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        compressed_sizes = dict(zip(unique_entries.keys(), executor.map(CompressFile, unique_entries.values())))
+
+    deltas = OrderedDict()
+
+    for previous_dir in args.previous_dir:
+        previous_files = CreateEntries(os.path.realpath(previous_dir))
+
+        candidates = []
+
+        for relative_path, entry in files.items():
+            previous_entry = previous_files.get(relative_path, None)
+
+            if (
+                "sha256" not in entry
+                or previous_entry is None
+                or "sha256" not in previous_entry
+                or previous_entry["sha256"] == entry["sha256"]
+                or previous_entry["sha256"] in deltas.get(entry["sha256"], {})
+            ):
+                continue
+
+            candidates.append((previous_entry, entry))
+
+        # ----------------------------------------------------------------------
+        def CreateDelta(candidate):
+            previous_entry, entry = candidate
+
+            output_filename = GetDeltaFilename(args.output_dir, previous_entry["sha256"], entry["sha256"])
+
+            if not os.path.isfile(output_filename):
+                _Compress(entry["fullpath"], output_filename, args.level, patch_from=previous_entry["fullpath"])
+
+            delta_size = os.path.getsize(output_filename)
+
+            if delta_size > compressed_sizes[entry["sha256"]] * MAX_DELTA_RATIO:
+                os.remove(output_filename)
+                return None
+
+            return delta_size
+
+        # ----------------------------------------------------------------------
+
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            for (previous_entry, entry), delta_size in zip(candidates, executor.map(CreateDelta, candidates)):
+                if delta_size is not None:
+                    deltas.setdefault(entry["sha256"], OrderedDict())[previous_entry["sha256"]] = delta_size
+
+    manifest = OrderedDict(
+        [
+            ("version", args.version),
+            (
+                "files",
+                OrderedDict(
+                    (
+                        relative_path,
+                        OrderedDict((key, value) for key, value in entry.items() if key != "fullpath"),
+                    )
+                    for relative_path, entry in files.items()
+                ),
+            ),
+            ("deltas", deltas),
+        ],
+    )
+
+    manifest_filename = os.path.join(args.output_dir, MANIFEST_FILENAME)
+
+    with open(manifest_filename + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    os.replace(manifest_filename + ".tmp", manifest_filename)
+
+    sys.stdout.write(
+        "Wrote '{}' ({} file(s), {:,} bytes; {:,} compressed bytes; {} delta(s), {:,} bytes).\n".format(
+            manifest_filename,
+            len(files),
+            sum(entry.get("size", 0) for entry in files.values()),
+            sum(compressed_sizes.values()),
+            sum(len(value) for value in deltas.values()),
+            sum(size for value in deltas.values() for size in value.values()),
+        ),
+    )
+
+    return 0
+
+
+# ----------------------------------------------------------------------
+def CreateEntries(input_dir):
+    """Returns information about each file and symbolic link in `input_dir`"""
+
+    entries = OrderedDict()
+
+    for root, directories, filenames in os.walk(input_dir):
+        directories.sort()
+
+        for name in sorted(filenames) + [directory for directory in directories if os.path.islink(os.path.join(root, directory))]:
+            fullpath = os.path.join(root, name)
+            relative_path = os.path.relpath(fullpath, input_dir).replace(os.path.sep, "/")
+
+            file_stat = os.lstat(fullpath)
+
+            if stat.S_ISLNK(file_stat.st_mode):
+                entries[relative_path] = OrderedDict([("link", os.readlink(fullpath))])
+            elif stat.S_ISREG(file_stat.st_mode):
+                entries[relative_path] = OrderedDict(
+                    [
+                        ("sha256", _CalculateSha256(fullpath)),
+                        ("size", file_stat.st_size),
+                        ("mode", stat.S_IMODE(file_stat.st_mode)),
+                        ("fullpath", fullpath),
+                    ],
+                )
+
+    return entries
+
+
+# ----------------------------------------------------------------------
+def GetFilename(output_dir, sha256):
+    return os.path.join(output_dir, "files", sha256[:2], "{}.zst".format(sha256))
+
+
+# ----------------------------------------------------------------------
+def GetDeltaFilename(output_dir, previous_sha256, sha256):
+    return os.path.join(output_dir, "deltas", sha256[:2], "{}-{}.zst".format(previous_sha256, sha256))
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Compress(input_filename, output_filename, level, patch_from=None):
+    output_dir = os.path.dirname(output_filename)
+
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+
+    command_line = ["zstd", "--quiet", "--force", "-{}".format(level)]
+
+    if level > 19:
+        command_line.append("--ultra")
+
+    if patch_from is not None:
+        command_line.append("--patch-from={}".format(patch_from))
+
+    subprocess.run(
+        command_line + [input_filename, "-o", output_filename + ".tmp"],
+        check=True,
+    )
+
+    os.replace(output_filename + ".tmp", output_filename)
+
+
+# ----------------------------------------------------------------------
+def _CalculateSha256(filename):
+    hasher = hashlib.sha256()
+
+    with open(filename, "rb") as f:
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                break
+
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(EntryPoint(sys.argv[1:]))
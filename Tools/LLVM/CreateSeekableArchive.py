@@ -0,0 +1,202 @@
+# ----------------------------------------------------------------------
+# |
+# |  CreateSeekableArchive.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 08:02:11
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Creates a seekable, multi-frame zstd tar archive that can be decompressed across multiple cores.
+
+Files are grouped into frames of approximately `--frame-size` MB; each frame contains complete tar
+members and is compressed independently. The frame sizes are written to a seek table in a skippable
+frame at the end of the file, as described in the zstd seekable format:
+https://github.com/facebook/zstd/blob/dev/contrib/seekable_format/zstd_seekable_compression_format.md
+
+The output is a valid .tar.zst file (`tar --zstd -xf <filename>` extracts it).
+
+This script runs within the build container, so it only depends on python 3.6+ and the `zstd`
+executable.
+
+Usage:
+    python3 CreateSeekableArchive.py <input_dir> <output_filename> [--frame-size <MB>] [--level <level>] [--jobs <num>]
+"""
+
+import argparse
+import io
+import os
+import struct
+import subprocess
+import sys
+import tarfile
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ----------------------------------------------------------------------
+SKIPPABLE_FRAME_MAGIC                       = 0x184D2A5E
+SEEKABLE_MAGIC                              = 0x8F92EAB1
+
+
+# ----------------------------------------------------------------------
+def EntryPoint(args):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument("input_dir")
+    parser.add_argument("output_filename")
+    parser.add_argument("--frame-size", type=int, default=32, help="Approximate uncompressed size of each frame (in MB).")
+    parser.add_argument("--level", type=int, default=19, help="zstd compression level.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of frames compressed concurrently.")
+
+    args = parser.parse_args(args)
+
+    input_dir = os.path.realpath(args.input_dir)
+
+    num_frames, decompressed_size = CreateArchive(
+        input_dir,
+        EnumerateMembers(input_dir),
+        args.output_filename,
+        frame_size=args.frame_size,
+        level=args.level,
+        jobs=args.jobs,
+    )
+
+    sys.stdout.write(
+        "Wrote '{}' ({} frame(s), {:,} bytes -> {:,} bytes).\n".format(
+            args.output_filename,
+            num_frames,
+            decompressed_size,
+            os.path.getsize(args.output_filename),
+        ),
+    )
+
+    return 0
+
+
+# ----------------------------------------------------------------------
+def EnumerateMembers(input_dir):
+    """Yields (relative_path, size) for every item, sorted so that related files are stored together"""
+
+    for root, directories, filenames in os.walk(input_dir):
+        directories.sort()
+
+        relative_root = os.path.relpath(root, input_dir)
+
+        if relative_root != ".":
+            yield relative_root, 0
+
+        # Symlinks to directories aren't walked, so they are stored as members
+        for filename in sorted(filenames + [directory for directory in directories if os.path.islink(os.path.join(root, directory))]):
+            fullpath = os.path.join(root, filename)
+
+            yield (
+                os.path.normpath(os.path.join(relative_root, filename)),
+                0 if os.path.islink(fullpath) else os.path.getsize(fullpath),
+            )
+
+
+# ----------------------------------------------------------------------
+def CreateArchive(input_dir, members, output_filename, frame_size=32, level=19, jobs=None):
+    """\
+    Creates a seekable archive with the (relative_path, size) members and returns the number of frames
+    and the decompressed size.
+    """
+
+    frames = _GroupIntoFrames(members, frame_size * 1024 * 1024)
+
+    # ----------------------------------------------------------------------
+    def CreateFrame(index):
+        content = _CreateTarContent(input_dir, frames[index], is_last=index == len(frames) - 1)
+
+        result = subprocess.run(
+            ["zstd", "-{}".format(level), "--single-thread", "--stdout", "--quiet"],
+            input=content,
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+
+        return result.stdout, len(content)
+
+    # ----------------------------------------------------------------------
+
+    entries = []
+
+    temp_filename = output_filename + ".tmp"
+
+    with open(temp_filename, "wb") as f:
+        with ThreadPoolExecutor(max_workers=max(1, jobs or os.cpu_count() or 1)) as executor:
+            for compressed, decompressed_size in executor.map(CreateFrame, range(len(frames))):
+                f.write(compressed)
+                entries.append((len(compressed), decompressed_size))
+
+        table = b"".join(struct.pack("<II", *entry) for entry in entries)
+        footer = struct.pack("<IBI", len(entries), 0, SEEKABLE_MAGIC)
+
+        f.write(struct.pack("<II", SKIPPABLE_FRAME_MAGIC, len(table) + len(footer)))
+        f.write(table)
+        f.write(footer)
+
+    os.replace(temp_filename, output_filename)
+
+    return len(entries), sum(entry[1] for entry in entries)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _GroupIntoFrames(members, frame_size):
+    frames = []
+
+    current_frame = []
+    current_size = 0
+
+    for relative_path, size in members:
+        # Include the tar header and padding
+        size = 512 + (size + 511) // 512 * 512
+
+        if current_frame and current_size + size > frame_size:
+            frames.append(current_frame)
+
+            current_frame = []
+            current_size = 0
+
+        current_frame.append(relative_path)
+        current_size += size
+
+    if current_frame or not frames:
+        frames.append(current_frame)
+
+    return frames
+
+
+# ----------------------------------------------------------------------
+def _CreateTarContent(input_dir, relative_paths, is_last):
+    buffer = io.BytesIO()
+
+    # Hard links are only preserved within a frame, as each frame must be extractable on its own
+    tar = tarfile.open(fileobj=buffer, mode="w", format=tarfile.PAX_FORMAT)
+
+    for relative_path in relative_paths:
+        tar.add(os.path.join(input_dir, relative_path), arcname=relative_path.replace(os.path.sep, "/"), recursive=False)
+
+    # The end-of-archive marker is only written at the end of the last frame, so that the
+    # concatenation of all frames is a single valid tar stream.
+    if is_last:
+        tar.close()
+
+    return buffer.getvalue()
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(EntryPoint(sys.argv[1:]))
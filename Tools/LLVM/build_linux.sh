@@ -15,6 +15,7 @@
 # |
 # ----------------------------------------------------------------------
 set -e                                      # Exit on error
+set -o pipefail                             # Exit on errors within pipelines (for example, failed downloads)
 set -x                                      # Statements
 
 # Builds LLVM code using docker
@@ -26,6 +27,9 @@ set -x                                      # Statements
 #       [Linux Host]     docker run -it --rm -v `pwd`/..:/local centos:8 bash /local/LLVM/build_linux.sh <3.10.6>
 #       [Windows Host]   docker run -it --rm -v %cd%\..:/local  centos:8 bash /local/LLVM/build_linux.sh <3.10.6>
 #
+#       Add `-v llvm_src:/src -v llvm_ccache:/ccache` to reuse unchanged stages and the compiler cache
+#       across builds.
+#
 #   Holy Build Box Image
 #   --------------------
 #   NOTE THAT THIS DOESN'T WORK RIGHT NOW with optimizations, errors during build
@@ -33,6 +37,21 @@ set -x                                      # Statements
 #       [Linux Host]     docker run -it --rm -v `pwd`/..:/local phusion/holy-build-box-64 bash /local/LLVM/build_linux.sh <3.10.6>
 #       [Windows Host]   docker run -it --rm -v %cd%\..:/local  phusion/holy-build-box-64 bash /local/LLVM/build_linux.sh <3.10.6>
 #
+# Optimization (environment variables):
+#
+#   PGO=1 [default]         Build an instrumented clang/lld, collect profiles by building TRAINING_TARGETS,
+#                           and build the final stage with -DLLVM_PROFDATA_FILE.
+#   THINLTO=1 [default]     Build the final stage with -DLLVM_ENABLE_LTO=Thin.
+#   BOLT=0 [default]        Optimize the final clang binary with BOLT (using BOLT's instrumentation, as perf
+#                           is generally not available within containers).
+#
+# Offline builds:
+#
+#   The LLVM source, CMake, and Ninja are extracted from PREFETCH_DIR (default: /local/prefetched) when
+#   the files exist there; run `bash prefetch_linux.sh <version>` on a connected machine to populate it.
+#   OFFLINE=1 fails rather than downloading content and skips the package manager, which requires an
+#   image with the packages in UpdateEnvironment already installed.
+#
 
 if [[ "$1" == "15.0.2" ]]
 then
@@ -56,8 +75,204 @@ then
     is_centos_8=1
 fi
 
+# Stages are only configured and built again when their keys (a hash of the CMake arguments, the
+# identity of the compilers, and the source version) change; set no_clean=1 to reuse the source and
+# stage directories even when their keys have changed.
+#
 # no_clean=1
 
+# Build directories (mount a volume here to reuse stages across containers)
+SRC_DIR=${SRC_DIR:-/src}
+
+# ccache directory (mount a volume here to reuse the cache across containers)
+export CCACHE_DIR=${CCACHE_DIR:-/ccache}
+export CCACHE_MAXSIZE=${CCACHE_MAXSIZE:-20G}
+
+# Hash the compiler's content rather than its mtime, as compilers are rebuilt by earlier stages
+export CCACHE_COMPILERCHECK=content
+
+# Stage 1 is skipped when a clang of at least this version (that wasn't built by stage 1) is found;
+# set HOST_CLANG to the path of a specific clang or to "none" to always build stage 1.
+HOST_CLANG=${HOST_CLANG:-auto}
+MIN_HOST_CLANG_VERSION=${MIN_HOST_CLANG_VERSION:-12}
+
+# Space-delimited list of archive formats to create:
+#     7z:  install.7z
+#     zst: install.tar.zst (seekable zstd tar archive that is extracted across multiple cores)
+#     components: components/manifest.json and components/<component>.tar.zst (see CreateComponentArchives.py)
+#     files: files/files.json and the individually compressed files and deltas used to update existing
+#            installations (see CreateFileManifest.py)
+ARCHIVE_FORMATS=${ARCHIVE_FORMATS:-"7z zst components files"}
+
+# Space-delimited list of directories that contain installations of previous revisions; the "files"
+# format includes deltas from these installations. Mount /local/files from the previous revision to
+# reuse the content that it published.
+PREVIOUS_INSTALL_DIRS=${PREVIOUS_INSTALL_DIRS:-}
+
+PGO=${PGO:-1}
+THINLTO=${THINLTO:-1}
+BOLT=${BOLT:-0}
+
+# libc++ headers included by share/Common_LLVM/libcxx_common.h, which setup precompiles
+LIBCXX_PCH_HEADERS=${LIBCXX_PCH_HEADERS:-"algorithm any array atomic bitset chrono functional iostream iterator map memory mutex numeric optional set sstream string string_view thread tuple type_traits unordered_map unordered_set utility variant vector"}
+
+# Targets built with the instrumented compilers to generate profile data
+TRAINING_TARGETS=${TRAINING_TARGETS:-"LLVMSupport LLVMCore LLVMAnalysis LLVMTransformUtils clangBasic clangLex clangAST clangSema llvm-tblgen FileCheck"}
+
+PREFETCH_DIR=${PREFETCH_DIR:-/local/prefetched}
+OFFLINE=${OFFLINE:-0}
+
+LLVM_SOURCE_TARBALL=${LLVM_SOURCE_TARBALL:-${PREFETCH_DIR}/llvmorg-${LLVM_VERSION}.tar.gz}
+CMAKE_TARBALL=${CMAKE_TARBALL:-${PREFETCH_DIR}/cmake-3.24.2-linux-x86_64.tar.gz}
+NINJA_ZIP=${NINJA_ZIP:-${PREFETCH_DIR}/ninja-linux.zip}
+
+# Writes the content of a prefetched file (if it exists) or a url to stdout
+Fetch()
+{
+    local prefetched_filename=$1
+    local url=$2
+
+    if [[ -e ${prefetched_filename} ]]; then
+        cat ${prefetched_filename}
+    elif [[ ${OFFLINE} == 1 ]]; then
+        echo "'${prefetched_filename}' does not exist and downloads are disabled (OFFLINE=1)" >&2
+        exit 1
+    else
+        curl -L ${url}
+    fi
+}
+
+StageBanner()
+{
+    set +x
+    local line=$(echo "$1" | sed 's/./-/g')
+
+    echo ""
+    echo "[36m[1m----${line}[0m"
+    echo "[36m[1m| $1 |[0m"
+    echo "[36m[1m----${line}[0m"
+    echo ""
+    set -x
+}
+
+# Configures LLVM in the current directory with the provided compilers and builds TRAINING_TARGETS
+RunTrainingWorkload()
+{
+    local c_compiler=$1
+    local cxx_compiler=$2
+
+    cmake -G Ninja -S ${llvm_source_dir} \
+        ${cmake_standard_args} \
+        -DCMAKE_C_COMPILER=${c_compiler} \
+        -DCMAKE_CXX_COMPILER=${cxx_compiler} \
+        -DCMAKE_CXX_FLAGS="-stdlib=libc++" \
+        -DCMAKE_EXE_LINKER_FLAGS="${LDFLAGS}" \
+        -DCMAKE_SHARED_LINKER_FLAGS="${LDFLAGS}" \
+        -DLLVM_CCACHE_BUILD=OFF \
+        -DLLVM_ENABLE_PROJECTS="clang;" \
+        -DLLVM_TARGETS_TO_BUILD="X86;" \
+        -DLLVM_USE_LINKER=lld
+
+    ninja ${TRAINING_TARGETS}
+}
+
+# Writes the path of a suitable host clang (or nothing) to stdout
+FindHostClang()
+{
+    local candidates
+
+    if [[ ${HOST_CLANG} == none ]]; then
+        return
+    elif [[ ${HOST_CLANG} != auto ]]; then
+        candidates=${HOST_CLANG}
+    else
+        candidates=$(which -a clang 2> /dev/null || true)
+    fi
+
+    for candidate in ${candidates}; do
+        # Don't use the clang installed by a previous stage 1 or stage 2
+        [[ ${candidate} != /usr/local/* ]] || continue
+        [[ -x ${candidate}++ ]] || continue
+
+        local major_version=$(${candidate} --version | sed -n 's/.*clang version \([0-9]*\).*/\1/p' | head -n 1)
+
+        if [[ -n ${major_version} && ${major_version} -ge ${MIN_HOST_CLANG_VERSION} ]]; then
+            echo ${candidate}
+            return
+        fi
+    done
+}
+
+# Configures, builds, and installs a stage in the current directory:
+#
+#   BuildStage <stage_dir> <ninja targets (empty for all)> <ninja install target (empty for none)> <cmake args>...
+#
+# The stage is skipped (but still installed) when its key hasn't changed since it was last built
+# successfully and resumed when its key hasn't changed since it was last configured. The key is
+# available in STAGE_KEY after this function returns.
+BuildStage()
+{
+    local stage_dir=$1
+    local targets=$2
+    local install_target=$3
+    shift 3
+
+    STAGE_KEY=$(
+        {
+            echo ${source_key}
+            printf '%s\n' "$@"
+
+            for arg in "$@"; do
+                case ${arg} in
+                    -DCMAKE_C_COMPILER=*|-DCMAKE_CXX_COMPILER=*)
+                        ${arg#*=} --version
+                        sha256sum < $(readlink -f $(which ${arg#*=}))
+                        ;;
+                    -DLLVM_PROFDATA_FILE=*)
+                        sha256sum < ${arg#*=}
+                        ;;
+                esac
+            done
+        } | sha256sum | cut -d' ' -f1
+    )
+
+    if [[ `cat ${stage_dir}/.stage_key 2> /dev/null` == ${STAGE_KEY} ]]; then
+        echo "'${stage_dir}' is up-to-date."
+        pushd ${stage_dir} > /dev/null
+    else
+        if [[ -e ${stage_dir} && no_clean -ne 1 && `cat ${stage_dir}/.configure_key 2> /dev/null` != ${STAGE_KEY} ]]; then
+            rm -rfd ${stage_dir}
+        fi
+
+        [[ -e ${stage_dir} ]] || mkdir ${stage_dir}
+        pushd ${stage_dir} > /dev/null
+
+        rm -f .stage_key
+
+        if [[ `cat .configure_key 2> /dev/null` != ${STAGE_KEY} ]]; then
+            cmake -G Ninja -S ${llvm_source_dir} "$@"
+            echo ${STAGE_KEY} > .configure_key
+        fi
+
+        ccache --zero-stats > /dev/null
+
+        ninja ${targets}
+
+        set +x
+        echo ""
+        echo "ccache statistics for '${stage_dir}':"
+        ccache --show-stats | tee ccache_stats.txt
+        echo ""
+        set -x
+
+        echo ${STAGE_KEY} > .stage_key
+    fi
+
+    [[ -z ${install_target} ]] || ninja ${install_target}
+
+    popd > /dev/null
+}
+
 UpdateEnvironment()
 {
     set +x
@@ -68,6 +283,12 @@ UpdateEnvironment()
     echo "# ----------------------------------------------------------------------"
     set -x
 
+    if [[ ${OFFLINE} == 1 ]];
+    then
+        echo "Skipping the package manager (OFFLINE=1)"
+        return
+    fi
+
     if [[ ${is_hbb} == 1 ]];
     then
         /hbb_exe/activate-exec
@@ -87,8 +308,10 @@ UpdateEnvironment()
         binutils-devel \
         bzip2-devel \
         ccache \
+        which \
         p7zip \
-        python3
+        python3 \
+        zstd
 }
 
 InstallCMake()
@@ -101,8 +324,8 @@ InstallCMake()
     echo "# ----------------------------------------------------------------------"
     set -x
 
-    [[ -e /src/cmake-3.24.2-linux-x86_64/bin ]] || curl -L https://github.com/Kitware/CMake/releases/download/v3.24.2/cmake-3.24.2-linux-x86_64.tar.gz  | gunzip -c | tar xf -
-    export PATH=/src/cmake-3.24.2-linux-x86_64/bin:${PATH}
+    [[ -e ${SRC_DIR}/cmake-3.24.2-linux-x86_64/bin ]] || Fetch ${CMAKE_TARBALL} https://github.com/Kitware/CMake/releases/download/v3.24.2/cmake-3.24.2-linux-x86_64.tar.gz  | gunzip -c | tar xf -
+    export PATH=${SRC_DIR}/cmake-3.24.2-linux-x86_64/bin:${PATH}
 }
 
 InstallNinja()
@@ -115,12 +338,12 @@ InstallNinja()
     echo "# ----------------------------------------------------------------------"
     set -x
 
-    if [[ ! -e /src/ninja ]]; then
-        curl -L https://github.com/ninja-build/ninja/releases/download/v1.11.1/ninja-linux.zip --output ninja.zip
+    if [[ ! -e ${SRC_DIR}/ninja ]]; then
+        Fetch ${NINJA_ZIP} https://github.com/ninja-build/ninja/releases/download/v1.11.1/ninja-linux.zip > ninja.zip
         unzip -q ninja.zip
     fi
 
-    export PATH=/src:${PATH}
+    export PATH=${SRC_DIR}:${PATH}
 }
 
 BuildLLVM()
@@ -135,22 +358,30 @@ BuildLLVM()
 
     [[ ! -e /opt/Common_LLVM/llvm/${LLVM_VERSION} ]] || rm -rfd /opt/Common_LLVM/llvm/${LLVM_VERSION}
 
-    if [[ -e llvm-project-llvmorg-${LLVM_VERSION} && no_clean -ne 1 ]]; then
+    # The source is only extracted again when the version (or the prefetched tarball) changes
+    source_key=$( { echo ${LLVM_VERSION}; [[ ! -e ${LLVM_SOURCE_TARBALL} ]] || sha256sum < ${LLVM_SOURCE_TARBALL}; } | sha256sum | cut -d' ' -f1)
+
+    if [[ -e llvm-project-llvmorg-${LLVM_VERSION} && ( no_clean -ne 1 && `cat llvm-project-llvmorg-${LLVM_VERSION}/.source_key 2> /dev/null` != ${source_key} ) ]]; then
         rm -rfd llvm-project-llvmorg-${LLVM_VERSION}
     fi
 
     if [[ ! -e llvm-project-llvmorg-${LLVM_VERSION} ]]; then
-        curl -L https://github.com/llvm/llvm-project/archive/refs/tags/llvmorg-${LLVM_VERSION}.tar.gz | gunzip -c | tar xf -
+        Fetch ${LLVM_SOURCE_TARBALL} https://github.com/llvm/llvm-project/archive/refs/tags/llvmorg-${LLVM_VERSION}.tar.gz | gunzip -c | tar xf -
+        echo ${source_key} > llvm-project-llvmorg-${LLVM_VERSION}/.source_key
     fi
 
     pushd llvm-project-llvmorg-${LLVM_VERSION} > /dev/null
 
+    llvm_source_dir=`pwd`/llvm
+
     [[ -e build ]] || mkdir build
     pushd build > /dev/null
 
     cmake_standard_args="-Wno-dev
         -DCMAKE_BUILD_TYPE=Release
         -DLLVM_CCACHE_BUILD=ON
+        -DLLVM_CCACHE_DIR=${CCACHE_DIR}
+        -DLLVM_CCACHE_MAXSIZE=${CCACHE_MAXSIZE}
         -DLLVM_ENABLE_BINDINGS=OFF
         -DLLVM_ENABLE_OCAMLDOC=OFF
         -DLLVM_ENABLE_PLUGINS=OFF
@@ -160,63 +391,46 @@ BuildLLVM()
         -DLLVM_INCLUDE_TESTS=OFF
         "
 
-    set +x
-    echo ""
-    echo "[36m[1m-------------------------[0m"
-    echo "[36m[1m| Building Stage 1 of 3 |[0m"
-    echo "[36m[1m-------------------------[0m"
-    echo ""
-    set -x
-
-    # This step builds LLVM and clang via gcc/ld/libstdc++
+    host_clang=$(FindHostClang)
 
-    if [[ -e stage1 && no_clean -ne 1 ]]; then
-        rm -rfd stage1
-    fi
-
-    [[ -e stage1 ]] || mkdir stage1
-
-    pushd stage1 > /dev/null
-
-    cmake -G Ninja -S ../../llvm \
-        ${cmake_standard_args} \
-        -DCMAKE_C_COMPILER=/usr/bin/gcc \
-        -DCMAKE_CXX_COMPILER=/usr/bin/g++ \
-        -DCMAKE_INSTALL_PREFIX=/usr/local \
-        -DLLVM_ENABLE_PROJECTS="clang;lld;" \
-        -DLLVM_INSTALL_TOOLCHAIN_ONLY=ON \
-        -DLLVM_TARGETS_TO_BUILD="Native" \
-        -DLLVM_USE_LINKER=gold
+    if [[ -n ${host_clang} ]]; then
+        StageBanner "Skipping Stage 1 (using '${host_clang}')"
 
+        stage2_c_compiler=${host_clang}
+        stage2_cxx_compiler=${host_clang}++
+    else
+        StageBanner "Building Stage 1 (gcc)"
 
-    ninja
-    ninja install
-    ldconfig
-
-    popd > /dev/null
+        # This step builds LLVM and clang via gcc/ld/libstdc++
 
-    set +x
-    echo ""
-    echo "[36m[1m-------------------------[0m"
-    echo "[36m[1m| Building Stage 2 of 3 |[0m"
-    echo "[36m[1m-------------------------[0m"
-    echo ""
-    set -x
+        BuildStage stage1 "" install \
+            ${cmake_standard_args} \
+            -DCMAKE_C_COMPILER=/usr/bin/gcc \
+            -DCMAKE_CXX_COMPILER=/usr/bin/g++ \
+            -DCMAKE_INSTALL_PREFIX=/usr/local \
+            -DLLVM_ENABLE_PROJECTS="clang;lld;" \
+            -DLLVM_INSTALL_TOOLCHAIN_ONLY=ON \
+            -DLLVM_TARGETS_TO_BUILD="Native" \
+            -DLLVM_USE_LINKER=gold
 
-    # This step builds LLVM, clang, and runtimes using the clang compiler created in step 1
+        ldconfig
 
-    if [[ -e stage2 && no_clean -ne 1 ]]; then
-        rm -rfd stage2
+        stage2_c_compiler=/usr/local/bin/clang
+        stage2_cxx_compiler=/usr/local/bin/clang++
     fi
 
-    [[ -e stage2 ]] || mkdir stage2
+    StageBanner "Building Stage 2 (clang)"
+
+    # This step builds LLVM, clang, and runtimes using the clang compiler created in step 1 (or the host's clang)
 
-    pushd stage2 > /dev/null
+    # BOLT is built (but not installed) so that it can optimize the final clang binary
+    stage2_extra_projects=""
+    [[ ${BOLT} != 1 ]] || stage2_extra_projects="bolt;"
 
-    cmake -G Ninja -S ../../llvm \
+    BuildStage stage2 "" install \
         ${cmake_standard_args} \
-        -DCMAKE_C_COMPILER=clang \
-        -DCMAKE_CXX_COMPILER=clang++ \
+        -DCMAKE_C_COMPILER=${stage2_c_compiler} \
+        -DCMAKE_CXX_COMPILER=${stage2_cxx_compiler} \
         -DCMAKE_SHARED_LINKER_FLAGS="${LDFLAGS}" \
         -DCMAKE_MODULE_LINKER_FLAGS="${LDFLAGS}" \
         -DCMAKE_EXE_LINKER_FLAGS="${LDFLAGS}" \
@@ -226,7 +440,7 @@ BuildLLVM()
         -DCLANG_DEFAULT_RTLIB=compiler-rt \
         -DCLANG_DEFAULT_CXX_STDLIB=libc++ \
         -DCLANG_DEFAULT_LINKER=lld \
-        -DLLVM_ENABLE_PROJECTS="clang;clang-tools-extra;libc;lld;" \
+        -DLLVM_ENABLE_PROJECTS="clang;clang-tools-extra;libc;lld;${stage2_extra_projects}" \
         -DLLVM_ENABLE_RUNTIMES="compiler-rt;libcxx;libcxxabi;libunwind;" \
         -DLLVM_INSTALL_TOOLCHAIN_ONLY=ON \
         -DLLVM_TARGETS_TO_BUILD="Native" \
@@ -238,40 +452,88 @@ BuildLLVM()
         -DLIBCXXABI_USE_LLVM_UNWINDER=ON \
         -DLIBUNWIND_USE_COMPILER_RT=ON
 
-    ninja
-    ninja install
     ldconfig
 
-    popd > /dev/null
+    export LDFLAGS="-rtlib=compiler-rt -unwindlib=libunwind -stdlib=libc++ -L/usr/local/lib"
+    export LD_LIBRARY_PATH=${LD_LIBRARY_PATH}:/usr/local/lib
 
-    set +x
-    echo ""
-    echo "[36m[1m-------------------------[0m"
-    echo "[36m[1m| Building Stage 3 of 3 |[0m"
-    echo "[36m[1m-------------------------[0m"
-    echo ""
-    set -x
+    stage3_optimization_args=""
 
-    # This step builds LLVM, clang, and runtimes using the clang compiler and libraries built in step 2; there should not be any traces of GCC when this is done
+    if [[ ${PGO} == 1 ]]; then
+        StageBanner "Building Stage 3 (instrumented)"
+
+        # This step builds clang and lld instrumented to collect profile data
+
+        BuildStage stage3-instrumented "clang lld" "" \
+            ${cmake_standard_args} \
+            -DCMAKE_C_COMPILER=/usr/local/bin/clang \
+            -DCMAKE_CXX_COMPILER=/usr/local/bin/clang++ \
+            -DCMAKE_SHARED_LINKER_FLAGS="${LDFLAGS}" \
+            -DCMAKE_MODULE_LINKER_FLAGS="${LDFLAGS}" \
+            -DCMAKE_EXE_LINKER_FLAGS="${LDFLAGS}" \
+            -DLLVM_BUILD_INSTRUMENTED=IR \
+            -DLLVM_BUILD_RUNTIME=OFF \
+            -DLLVM_ENABLE_PROJECTS="clang;lld;" \
+            -DLLVM_TARGETS_TO_BUILD="X86;" \
+            -DLLVM_USE_LINKER=lld
+
+        # The profile data is only collected again when the instrumented compilers or the workload change
+        profile_key=$(echo "${STAGE_KEY} ${TRAINING_TARGETS}" | sha256sum | cut -d' ' -f1)
+
+        if [[ -e clang.profdata && `cat clang.profdata.key 2> /dev/null` == ${profile_key} ]]; then
+            StageBanner "Reusing Profile Data"
+        else
+            StageBanner "Collecting Profile Data"
+
+            # This step builds the training workload with the instrumented compiler and linker (lld is
+            # found via the path); profile data is written to stage3-instrumented/profiles.
+
+            rm -rfd stage3-instrumented/profiles stage3-training clang.profdata.key
+            mkdir stage3-training
+
+            pushd stage3-training > /dev/null
+
+            original_path=${PATH}
+            export PATH=`pwd`/../stage3-instrumented/bin:${PATH}
+
+            RunTrainingWorkload `pwd`/../stage3-instrumented/bin/clang `pwd`/../stage3-instrumented/bin/clang++
+
+            export PATH=${original_path}
+
+            popd > /dev/null
+
+            llvm-profdata merge -output=`pwd`/clang.profdata stage3-instrumented/profiles/*.profraw
+            rm -rfd stage3-training
+
+            echo ${profile_key} > clang.profdata.key
+        fi
 
-    if [[ -e stage3 && no_clean -ne 1 ]]; then
-        rm -rfd stage3
+        stage3_optimization_args="${stage3_optimization_args} -DLLVM_PROFDATA_FILE=`pwd`/clang.profdata"
     fi
 
-    [[ -e stage3 ]] || mkdir stage3
+    if [[ ${THINLTO} == 1 ]]; then
+        stage3_optimization_args="${stage3_optimization_args} -DLLVM_ENABLE_LTO=Thin -DCMAKE_AR=`which llvm-ar` -DCMAKE_RANLIB=`which llvm-ranlib`"
+    fi
 
-    pushd stage3 > /dev/null
+    stage3_linker_flags="${LDFLAGS}"
 
-    export LDFLAGS="-rtlib=compiler-rt -unwindlib=libunwind -stdlib=libc++ -L/usr/local/lib"
-    export LD_LIBRARY_PATH=${LD_LIBRARY_PATH}:/usr/local/lib
+    if [[ ${BOLT} == 1 ]]; then
+        # BOLT requires relocations
+        stage3_linker_flags="${stage3_linker_flags} -Wl,--emit-relocs"
+    fi
 
-    cmake -G Ninja -S ../../llvm \
+    StageBanner "Building Stage 3 (final)"
+
+    # This step builds LLVM, clang, and runtimes using the clang compiler and libraries built in step 2; there should not be any traces of GCC when this is done
+
+    BuildStage stage3 "" install \
         ${cmake_standard_args} \
-        -DCMAKE_C_COMPILER=clang \
-        -DCMAKE_CXX_COMPILER=clang++ \
+        ${stage3_optimization_args} \
+        -DCMAKE_C_COMPILER=/usr/local/bin/clang \
+        -DCMAKE_CXX_COMPILER=/usr/local/bin/clang++ \
         -DCMAKE_SHARED_LINKER_FLAGS="${LDFLAGS}" \
         -DCMAKE_MODULE_LINKER_FLAGS="${LDFLAGS}" \
-        -DCMAKE_EXE_LINKER_FLAGS="${LDFLAGS}" \
+        -DCMAKE_EXE_LINKER_FLAGS="${stage3_linker_flags}" \
         -DCMAKE_INSTALL_PREFIX=/opt/Common_LLVM/llvm/${LLVM_VERSION} \
         -DCLANG_DEFAULT_LINKER=lld \
         -DCLANG_DEFAULT_RTLIB=compiler-rt \
@@ -291,10 +553,82 @@ BuildLLVM()
         -DLLVM_INSTALL_TOOLCHAIN_ONLY=OFF \
         -DLLVM_TARGETS_TO_BUILD="X86;" \
         -DLLVM_USE_LINKER=lld \
-        -DSANITIZER_CXX_ABI=libc++ \
+        -DSANITIZER_CXX_ABI=libc++
+
+    if [[ ${BOLT} == 1 ]]; then
+        StageBanner "Optimizing clang with BOLT"
+
+        # This step instruments the final clang binary with BOLT, builds the training workload with
+        # it, and uses the resulting profile to optimize the binary's layout.
+
+        clang_binary=/opt/Common_LLVM/llvm/${LLVM_VERSION}/bin/clang-${LLVM_VERSION_SHORTER}
+
+        rm -rfd stage3-bolt
+        mkdir -p stage3-bolt/bin stage3-bolt/profiles stage3-bolt/training
+
+        stage2/bin/llvm-bolt ${clang_binary} \
+            -instrument \
+            -instrumentation-file=`pwd`/stage3-bolt/profiles/clang.fdata \
+            -instrumentation-file-append-pid \
+            -o stage3-bolt/bin/clang-${LLVM_VERSION_SHORTER}
+
+        # The driver mode is determined by the name of the executable
+        ln -s clang-${LLVM_VERSION_SHORTER} stage3-bolt/bin/clang
+        ln -s clang-${LLVM_VERSION_SHORTER} stage3-bolt/bin/clang++
+
+        pushd stage3-bolt/training > /dev/null
+        RunTrainingWorkload `pwd`/../bin/clang `pwd`/../bin/clang++
+        popd > /dev/null
+
+        stage2/bin/merge-fdata stage3-bolt/profiles/*.fdata > stage3-bolt/clang.fdata
+
+        stage2/bin/llvm-bolt ${clang_binary} \
+            -data=stage3-bolt/clang.fdata \
+            -reorder-blocks=ext-tsp \
+            -reorder-functions=hfsort \
+            -split-functions \
+            -split-all-cold \
+            -split-eh \
+            -dyno-stats \
+            -icf=1 \
+            -use-gnu-stack \
+            -o ${clang_binary}.bolt
+
+        mv --force ${clang_binary}.bolt ${clang_binary}
+        rm -rfd stage3-bolt
+    fi
 
-    ninja
-    ninja install
+    StageBanner "Creating the libc++ Prefix Header"
+
+    # This step creates a header that includes the most commonly used libc++ headers. Precompiled
+    # headers embed the paths and timestamps of the host's libc headers, so setup precompiles this
+    # header on the machine that uses it; this step ensures that it can be precompiled.
+
+    prefix_header=/opt/Common_LLVM/llvm/${LLVM_VERSION}/share/Common_LLVM/libcxx_common.h
+
+    mkdir -p `dirname ${prefix_header}`
+
+    {
+        echo "// Includes the most commonly used libc++ headers (generated by build_linux.sh)"
+        echo "#ifndef COMMON_LLVM_LIBCXX_COMMON_H"
+        echo "#define COMMON_LLVM_LIBCXX_COMMON_H"
+        echo ""
+
+        for header in ${LIBCXX_PCH_HEADERS}; do
+            echo "#include <${header}>"
+        done
+
+        echo ""
+        echo "#endif"
+    } > ${prefix_header}
+
+    rm -rfd stage3-pch
+    mkdir stage3-pch
+
+    /opt/Common_LLVM/llvm/${LLVM_VERSION}/bin/clang++ -x c++-header -std=c++17 ${prefix_header} -o stage3-pch/libcxx_common.pch
+    /opt/Common_LLVM/llvm/${LLVM_VERSION}/bin/clang++ -x c++ -std=c++17 -fmodules -fmodules-cache-path=`pwd`/stage3-pch/modules -fsyntax-only ${prefix_header}
+
+    rm -rfd stage3-pch
 
     popd > /dev/null                        # build
     popd > /dev/null                        # llvm-project-llvmorg-${LLVM_VERSION}
@@ -302,13 +636,41 @@ BuildLLVM()
     # Zip the output
     pushd /opt/Common_LLVM/llvm/${LLVM_VERSION} > /dev/null                 # install dir
 
-    7za a install.7z *
-    cp --force install.7z /local
-    rm --force install.7z
+    if [[ " ${ARCHIVE_FORMATS} " == *" 7z "* ]]; then
+        7za a /tmp/install.7z *
+        cp --force /tmp/install.7z /local
+        rm --force /tmp/install.7z
+    fi
+
+    if [[ " ${ARCHIVE_FORMATS} " == *" zst "* ]]; then
+        python3 /local/LLVM/CreateSeekableArchive.py . /tmp/install.tar.zst
+        cp --force /tmp/install.tar.zst /local
+        rm --force /tmp/install.tar.zst
+    fi
+
+    if [[ " ${ARCHIVE_FORMATS} " == *" components "* ]]; then
+        python3 /local/LLVM/CreateComponentArchives.py . /tmp/components ${LLVM_VERSION}
+        [[ -e /local/components ]] || mkdir /local/components
+        cp --force /tmp/components/* /local/components
+        rm -rfd /tmp/components
+    fi
+
+    if [[ " ${ARCHIVE_FORMATS} " == *" files "* ]]; then
+        local previous_dir_args=""
+
+        for previous_dir in ${PREVIOUS_INSTALL_DIRS}; do
+            previous_dir_args="${previous_dir_args} --previous-dir ${previous_dir}"
+        done
+
+        [[ -e /local/files ]] || mkdir /local/files
+        python3 /local/LLVM/CreateFileManifest.py . /local/files ${LLVM_VERSION} ${previous_dir_args}
+    fi
+
+    popd > /dev/null                        # install dir
 }
 
-[[ -d /src ]] || mkdir /src
-pushd /src > /dev/null
+[[ -d ${SRC_DIR} ]] || mkdir ${SRC_DIR}
+pushd ${SRC_DIR} > /dev/null
 
 UpdateEnvironment
 InstallCMake
@@ -0,0 +1,46 @@
+#!/bin/bash
+# ----------------------------------------------------------------------
+# |
+# |  prefetch_linux.sh
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 15:22:09
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+set -e                                      # Exit on error
+set -x                                      # Statements
+
+# Downloads the content required by build_linux.sh so that the build can run offline.
+#
+#   [Linux Host]     bash prefetch_linux.sh 15.0.2 [<output_dir>]
+#
+# The content is written to ../prefetched (/local/prefetched within the build container) by default.
+
+if [[ "$1" == "15.0.2" ]]
+then
+    LLVM_VERSION=15.0.2
+else
+    echo "Invalid LLVM version; expected 15.0.2"
+    exit 1
+fi
+
+PREFETCH_DIR=${2:-$(dirname "$0")/../prefetched}
+
+[[ -d ${PREFETCH_DIR} ]] || mkdir -p ${PREFETCH_DIR}
+pushd ${PREFETCH_DIR} > /dev/null
+
+[[ -e llvmorg-${LLVM_VERSION}.tar.gz ]] || curl -L --fail https://github.com/llvm/llvm-project/archive/refs/tags/llvmorg-${LLVM_VERSION}.tar.gz --output llvmorg-${LLVM_VERSION}.tar.gz
+[[ -e cmake-3.24.2-linux-x86_64.tar.gz ]] || curl -L --fail https://github.com/Kitware/CMake/releases/download/v3.24.2/cmake-3.24.2-linux-x86_64.tar.gz --output cmake-3.24.2-linux-x86_64.tar.gz
+[[ -e ninja-linux.zip ]] || curl -L --fail https://github.com/ninja-build/ninja/releases/download/v1.11.1/ninja-linux.zip --output ninja-linux.zip
+
+popd > /dev/null
+
+set +x
+echo "DONE!"
@@ -0,0 +1,191 @@
+# ----------------------------------------------------------------------
+# |
+# |  ActivationCache_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-20 16:18:52
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _activation_cache.py"""
+
+import json
+import shutil
+import sys
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _activation_cache import ActivationCacheEntry, CreateActivationCacheKey, LoadActivationCacheEntry, SaveActivationCacheEntry  # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _VersionInfo(object):
+    """Has the same representation as the version specs provided by the activation framework"""
+
+    name: str
+    version: str
+
+
+# ----------------------------------------------------------------------
+_tools                                      = [_VersionInfo("LLVM", "v17.0.6"), _VersionInfo("grcov", "v0.8.12")]
+
+
+# ----------------------------------------------------------------------
+def test_KeyStable():
+    assert CreateActivationCacheKey("17.0.6-clang", list(_tools), False) == CreateActivationCacheKey("17.0.6-clang", list(_tools), False)
+
+
+# ----------------------------------------------------------------------
+def test_KeyChanges():
+    keys = [
+        CreateActivationCacheKey("17.0.6-clang", _tools, False),
+
+        # Configuration
+        CreateActivationCacheKey("16.0.6-clang", _tools, False),
+
+        # Tool version specs
+        CreateActivationCacheKey("17.0.6-clang", [_VersionInfo("LLVM", "v16.0.6"), _tools[1]], False),
+        CreateActivationCacheKey("17.0.6-clang", _tools[:1], False),
+        CreateActivationCacheKey("17.0.6-clang", [], False),
+
+        # Compile cache
+        CreateActivationCacheKey("17.0.6-clang", _tools, True),
+    ]
+
+    assert len(set(keys)) == len(keys)
+
+
+# ----------------------------------------------------------------------
+def test_SaveAndLoad(tmp_path):
+    cache_filename, entry = _Save(tmp_path, "key")
+
+    assert LoadActivationCacheEntry(cache_filename, "key") == entry
+    assert LoadActivationCacheEntry(cache_filename, "other key") is None
+
+    # Entries for other keys are preserved
+    other_entry = ActivationCacheEntry(entry.tool_dirs, ["other"], {}, {})
+    SaveActivationCacheEntry(cache_filename, "other key", other_entry)
+
+    assert LoadActivationCacheEntry(cache_filename, "key") == entry
+    assert LoadActivationCacheEntry(cache_filename, "other key") == other_entry
+
+
+# ----------------------------------------------------------------------
+def test_ToolsChanged(tmp_path):
+    cache_filename, entry = _Save(tmp_path, "key")
+
+    # An installation changes the top-level items of a tool directory
+    (entry.tool_dirs[0] / "bin" / "clang").unlink()
+    (entry.tool_dirs[0] / "install.json").write_text("{}")
+
+    assert LoadActivationCacheEntry(cache_filename, "key") is None
+
+
+# ----------------------------------------------------------------------
+def test_ToolDirRemoved(tmp_path):
+    cache_filename, entry = _Save(tmp_path, "key")
+
+    shutil.rmtree(entry.tool_dirs[1])
+
+    assert LoadActivationCacheEntry(cache_filename, "key") is None
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"{ not json",
+        b"\xff\xfe",
+        b"[]",
+        b'{"key": "entry"}',
+        b'{"key": {}}',
+        b'{"key": {"tool_dirs": 5, "stamp": "", "path_dirs": [], "augmented_vars": {}, "set_vars": {}}}',
+    ],
+)
+def test_CorruptFile(tmp_path, content):
+    cache_filename, entry = _Save(tmp_path, "key")
+
+    cache_filename.write_bytes(content)
+
+    # Activation falls back to a full activation, which saves the entry again
+    assert LoadActivationCacheEntry(cache_filename, "key") is None
+
+    SaveActivationCacheEntry(cache_filename, "key", entry)
+
+    assert LoadActivationCacheEntry(cache_filename, "key") == entry
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "name, value",
+    [
+        ("tool_dirs", [5]),
+        ("path_dirs", "bin"),
+        ("path_dirs", [None]),
+        ("augmented_vars", ["LD_LIBRARY_PATH"]),
+        ("augmented_vars", {"LD_LIBRARY_PATH": 5}),
+        ("set_vars", None),
+        ("stamp", "0" * 64),
+    ],
+)
+def test_CorruptEntry(tmp_path, name, value):
+    cache_filename, _ = _Save(tmp_path, "key")
+
+    with cache_filename.open() as f:
+        content = json.load(f)
+
+    content["key"][name] = value
+
+    with cache_filename.open("w") as f:
+        json.dump(content, f)
+
+    assert LoadActivationCacheEntry(cache_filename, "key") is None
+
+
+# ----------------------------------------------------------------------
+def test_MissingFile(tmp_path):
+    assert LoadActivationCacheEntry(tmp_path / "missing.json", "key") is None
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Save(
+    root: Path,
+    key: str,
+):
+    tool_dirs = [root / "Tools" / "LLVM", root / "Tools" / "grcov"]
+
+    for tool_dir in tool_dirs:
+        (tool_dir / "bin").mkdir(parents=True)
+        (tool_dir / "bin" / "clang").write_text("clang")
+
+    entry = ActivationCacheEntry(
+        tool_dirs,
+        [str(tool_dirs[0] / "bin")],
+        {"LD_LIBRARY_PATH": str(tool_dirs[0] / "lib")},
+        {"COMMON_LLVM_VALUE": "value"},
+    )
+
+    cache_filename = root / "Generated" / "Common_LLVM.activation.json"
+
+    SaveActivationCacheEntry(cache_filename, key, entry)
+
+    return cache_filename, entry
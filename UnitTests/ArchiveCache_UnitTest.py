@@ -0,0 +1,200 @@
+# ----------------------------------------------------------------------
+# |
+# |  ArchiveCache_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 08:55:37
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _archive_cache.py"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+
+from pathlib import Path
+
+import pytest
+
+from _http_server import Serve, Server
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _archive_cache import ArchiveCache, ParseSize                          # pylint: disable=wrong-import-position
+from _install_lock import InstallLock                                       # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+_content                                    = os.urandom(100 * 1024)
+_sha256                                     = hashlib.sha256(_content).hexdigest()
+
+
+# ----------------------------------------------------------------------
+def test_FetchMissThenHit(tmp_path):
+    cache = ArchiveCache(tmp_path / "cache", 1024 * 1024)
+
+    with Serve(Server({"archive.7z": _content})) as server:
+        archive_filename, was_cached = cache.Fetch(server.GetUrl("archive.7z"), _sha256)
+
+        assert was_cached is False
+        assert archive_filename == cache.GetArchiveFilename(_sha256, "archive.7z")
+        assert archive_filename.read_bytes() == _content
+
+        archive_filename, was_cached = cache.Fetch(server.GetUrl("archive.7z"), _sha256)
+
+        assert was_cached is True
+        assert archive_filename.read_bytes() == _content
+
+        # The second fetch is served from the cache
+        assert len([request for request in server.requests if request.endswith("archive.7z")]) == 2  # Probe and download
+
+    stats = cache.stats
+
+    assert stats.hits == 1
+    assert stats.misses == 1
+
+    # Only the archive remains in the entry's directory
+    assert [child.name for child in archive_filename.parent.iterdir()] == ["archive.7z"]
+
+
+# ----------------------------------------------------------------------
+def test_FetchWithOnChunk(tmp_path):
+    cache = ArchiveCache(tmp_path / "cache", 1024 * 1024)
+    chunks = []
+
+    with Serve(Server({"archive.tar.gz": _content})) as server:
+        archive_filename, was_cached = cache.Fetch(server.GetUrl("archive.tar.gz"), _sha256, on_chunk=chunks.append)
+
+    assert was_cached is False
+    assert b"".join(chunks) == _content
+    assert archive_filename.read_bytes() == _content
+
+
+# ----------------------------------------------------------------------
+def test_FetchInvalidHash(tmp_path):
+    cache = ArchiveCache(tmp_path / "cache", 1024 * 1024)
+    sha256 = "0" * 64
+
+    with Serve(Server({"archive.7z": _content})) as server:
+        with pytest.raises(Exception, match="does not match the expected sha256"):
+            cache.Fetch(server.GetUrl("archive.7z"), sha256)
+
+    # Nothing is left behind
+    assert not cache.GetArchiveFilename(sha256, "archive.7z").parent.exists()
+    assert cache.Lookup(sha256, "archive.7z") is None
+
+
+# ----------------------------------------------------------------------
+def test_Evict(tmp_path):
+    contents = [os.urandom(40 * 1024) for _ in range(3)]
+    sha256s = [hashlib.sha256(content).hexdigest() for content in contents]
+
+    cache = ArchiveCache(tmp_path / "cache", 100 * 1024)
+
+    with Serve(Server({"archive{}.7z".format(index): content for index, content in enumerate(contents)})) as server:
+        for index, sha256 in enumerate(sha256s[:2]):
+            cache.Fetch(server.GetUrl("archive{}.7z".format(index)), sha256)
+
+        # Make the first archive the least recently used one
+        os.utime(cache.GetArchiveFilename(sha256s[0], "archive0.7z"), (0, 0))
+
+        archive_filename, _ = cache.Fetch(server.GetUrl("archive2.7z"), sha256s[2])
+
+    assert archive_filename.is_file()
+    assert cache.Lookup(sha256s[0], "archive0.7z") is None
+    assert cache.Lookup(sha256s[1], "archive1.7z") is not None
+
+    stats = cache.stats
+
+    assert stats.evictions == 1
+    assert stats.evicted_bytes == len(contents[0])
+
+
+# ----------------------------------------------------------------------
+def test_EvictSkipsLockedEntries(tmp_path):
+    contents = [os.urandom(40 * 1024) for _ in range(3)]
+    sha256s = [hashlib.sha256(content).hexdigest() for content in contents]
+
+    cache = ArchiveCache(tmp_path / "cache", 100 * 1024)
+
+    with Serve(Server({"archive{}.7z".format(index): content for index, content in enumerate(contents)})) as server:
+        for index, sha256 in enumerate(sha256s[:2]):
+            cache.Fetch(server.GetUrl("archive{}.7z".format(index)), sha256)
+
+        os.utime(cache.GetArchiveFilename(sha256s[0], "archive0.7z"), (0, 0))
+        os.utime(cache.GetArchiveFilename(sha256s[1], "archive1.7z"), (1, 1))
+
+        # The least recently used archive is locked by another process that is using it
+        with InstallLock(cache.GetArchiveFilename(sha256s[0], "archive0.7z").parent):
+            cache.Fetch(server.GetUrl("archive2.7z"), sha256s[2])
+
+    assert cache.GetArchiveFilename(sha256s[0], "archive0.7z").read_bytes() == contents[0]
+    assert not cache.GetArchiveFilename(sha256s[1], "archive1.7z").exists()
+    assert cache.GetArchiveFilename(sha256s[2], "archive2.7z").is_file()
+
+    assert cache.stats.evictions == 1
+
+
+# ----------------------------------------------------------------------
+def test_FetchAfterWaiting(tmp_path):
+    cache = ArchiveCache(tmp_path / "cache", 1024 * 1024)
+
+    archive_filename = cache.GetArchiveFilename(_sha256, "archive.7z")
+    results = []
+
+    with Serve(Server({"archive.7z": _content})) as server:
+        # Another process is downloading the archive
+        with InstallLock(archive_filename.parent):
+            thread = threading.Thread(target=lambda: results.append(cache.Fetch(server.GetUrl("archive.7z"), _sha256)))
+            thread.start()
+
+            time.sleep(0.5)
+            assert not results
+
+            archive_filename.parent.mkdir()
+            archive_filename.write_bytes(_content)
+
+        thread.join()
+
+        # The archive downloaded by the other process was used
+        assert server.requests == []
+
+    assert results == [(archive_filename, True)]
+
+    stats = cache.stats
+
+    assert stats.hits == 1
+    assert stats.misses == 0
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("1024", 1024),
+        ("512M", 512 * 1024 ** 2),
+        ("20G", 20 * 1024 ** 3),
+        ("1.5kb", 1536),
+    ],
+)
+def test_ParseSize(value, expected):
+    assert ParseSize(value) == expected
+
+
+# ----------------------------------------------------------------------
+def test_ParseSizeInvalid():
+    with pytest.raises(Exception, match="is not a valid size"):
+        ParseSize("twenty gigabytes")
@@ -0,0 +1,189 @@
+# ----------------------------------------------------------------------
+# |
+# |  ArchivePipeline_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-20 09:12:41
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _archive_pipeline.py"""
+
+import io
+import sys
+import tarfile
+
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _archive_pipeline import ExtractTar, StreamingExtractor                 # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+# (type, name, content or link target); "{outside}" is replaced with the directory outside of the
+# output directory.
+_MALICIOUS_MEMBERS: List[Tuple[str, List[Tuple[str, str, str]]]] = [
+    ("Parent", [("file", "../outside/evil.txt", "evil")]),
+    ("NestedParent", [("file", "bin/../../outside/evil.txt", "evil")]),
+    ("Absolute", [("file", "{outside}/evil.txt", "evil")]),
+    ("SymlinkToParent", [("symlink", "link", "../outside"), ("file", "link/evil.txt", "evil")]),
+    ("SymlinkToAbsolute", [("symlink", "link", "{outside}"), ("file", "link/evil.txt", "evil")]),
+    ("Hardlink", [("hardlink", "evil.txt", "../outside/target.txt")]),
+]
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture(params=[True, False], ids=["data_filter", "validation"])
+def has_data_filter(request, monkeypatch):
+    if request.param:
+        if not hasattr(tarfile, "data_filter"):
+            pytest.skip("'tarfile.data_filter' is not available")
+    else:
+        # Simulate versions of python that don't provide the filter
+        monkeypatch.delattr(tarfile, "data_filter", raising=False)
+
+    return request.param
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("members", [members for _, members in _MALICIOUS_MEMBERS], ids=[name for name, _ in _MALICIOUS_MEMBERS])
+def test_MaliciousMember(tmp_path, has_data_filter, members):
+    output_dir, outside_dir = _CreateDirectories(tmp_path)
+
+    with tarfile.open(fileobj=io.BytesIO(_CreateTar(members, outside_dir))) as tar:
+        try:
+            ExtractTar(tar, output_dir)
+            raised = False
+        except Exception:                                                   # pylint: disable=broad-except
+            raised = True
+
+    # The data filter strips the leading slash from absolute names rather than raising
+    assert raised or has_data_filter
+
+    _VerifyOutsideDir(outside_dir)
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("members", [members for _, members in _MALICIOUS_MEMBERS], ids=[name for name, _ in _MALICIOUS_MEMBERS])
+def test_MaliciousMemberStreamed(tmp_path, has_data_filter, members):      # pylint: disable=unused-argument
+    output_dir, outside_dir = _CreateDirectories(tmp_path)
+
+    content = _CreateTar(members, outside_dir)
+
+    extractor = StreamingExtractor(output_dir)
+
+    try:
+        for offset in range(0, len(content), 512):
+            extractor.Write(content[offset:offset + 512])
+
+        extractor.Close()
+
+    except Exception:                                                       # pylint: disable=broad-except
+        pass
+
+    _VerifyOutsideDir(outside_dir)
+
+
+# ----------------------------------------------------------------------
+def test_Links(tmp_path, has_data_filter):                                  # pylint: disable=unused-argument
+    output_dir, _ = _CreateDirectories(tmp_path)
+
+    members = [
+        ("file", "bin/clang", "clang"),
+        ("symlink", "bin/clang++", "clang"),
+        ("symlink", "lib/clang/current", "../../bin"),
+        ("hardlink", "bin/clang-cpp", "bin/clang"),
+    ]
+
+    with tarfile.open(fileobj=io.BytesIO(_CreateTar(members, tmp_path))) as tar:
+        ExtractTar(tar, output_dir)
+
+    assert (output_dir / "bin" / "clang++").read_text() == "clang"
+    assert (output_dir / "bin" / "clang-cpp").read_text() == "clang"
+    assert (output_dir / "lib" / "clang" / "current" / "clang").read_text() == "clang"
+
+
+# ----------------------------------------------------------------------
+def test_SelectedMembers(tmp_path, has_data_filter):                        # pylint: disable=unused-argument
+    output_dir, outside_dir = _CreateDirectories(tmp_path)
+
+    members = [
+        ("file", "bin/clang", "clang"),
+        ("file", "../outside/evil.txt", "evil"),
+    ]
+
+    with tarfile.open(fileobj=io.BytesIO(_CreateTar(members, outside_dir))) as tar:
+        ExtractTar(tar, output_dir, members=[member for member in tar if member.name == "bin/clang"])
+
+    assert (output_dir / "bin" / "clang").read_text() == "clang"
+
+    _VerifyOutsideDir(outside_dir)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CreateDirectories(
+    root: Path,
+) -> Tuple[Path, Path]:
+    output_dir = root / "output"
+    output_dir.mkdir()
+
+    outside_dir = root / "outside"
+    outside_dir.mkdir()
+
+    (outside_dir / "target.txt").write_text("target")
+
+    return output_dir, outside_dir
+
+
+# ----------------------------------------------------------------------
+def _CreateTar(
+    members: List[Tuple[str, str, str]],
+    outside_dir: Path,
+) -> bytes:
+    sink = io.BytesIO()
+
+    with tarfile.open(fileobj=sink, mode="w") as tar:
+        for member_type, name, value in members:
+            info = tarfile.TarInfo(name.format(outside=outside_dir))
+
+            if member_type == "file":
+                content = value.encode("utf-8")
+
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+
+            else:
+                info.type = tarfile.SYMTYPE if member_type == "symlink" else tarfile.LNKTYPE
+                info.linkname = value.format(outside=outside_dir)
+
+                tar.addfile(info)
+
+    return sink.getvalue()
+
+
+# ----------------------------------------------------------------------
+def _VerifyOutsideDir(
+    outside_dir: Path,
+) -> None:
+    assert [child.name for child in outside_dir.iterdir()] == ["target.txt"]
+
+    target = outside_dir / "target.txt"
+
+    assert target.read_text() == "target"
+    assert target.stat().st_nlink == 1
@@ -0,0 +1,404 @@
+# ----------------------------------------------------------------------
+# |
+# |  CompileCache_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-20 11:21:05
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _compile_cache.py"""
+
+import os
+import sys
+import textwrap
+
+from pathlib import Path
+
+import pytest
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _compile_cache import CompileCache, _Invocation                        # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+def test_Invocation():
+    invocation = _Invocation.Create(["-O2", "-c", "src/main.cpp", "-o", "obj/main.o"])
+    assert invocation is not None
+
+    assert invocation.output_filename == Path("obj/main.o")
+    assert invocation.dependency_filename is None
+    assert invocation.preprocess_args == ["-O2", "src/main.cpp", "-E"]
+
+    # The output filename isn't part of the key
+    assert invocation.key_args == ["-O2", "src/main.cpp"]
+
+
+# ----------------------------------------------------------------------
+def test_InvocationDefaultOutput():
+    invocation = _Invocation.Create(["-c", "src/main.cpp"])
+    assert invocation is not None
+
+    assert invocation.output_filename == Path("main.o")
+
+
+# ----------------------------------------------------------------------
+def test_InvocationJoinedOutput():
+    invocation = _Invocation.Create(["-c", "main.c", "-oobj/main.o"])
+    assert invocation is not None
+
+    assert invocation.output_filename == Path("obj/main.o")
+    assert invocation.key_args == ["main.c"]
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "option, value",
+    [
+        ("-target", "x86_64-pc-linux-gnu"),
+        ("-arch", "arm64"),
+        ("-mllvm", "-inline-threshold=100"),
+        ("-Xlinker", "libfoo.a"),
+        ("-Xpreprocessor", "-DVALUE"),
+        ("-Xanalyzer", "config.txt"),
+        ("-isystem", "third_party/include"),
+        ("-include", "config.h"),
+        ("-gcc-toolchain", "/opt/gcc"),
+        ("--sysroot", "/opt/sysroot"),
+    ],
+)
+def test_InvocationOptionsWithValues(option, value):
+    invocation = _Invocation.Create(["-c", "main.cpp", option, value, "-o", "main.o"])
+
+    # The value isn't treated as an input
+    assert invocation is not None
+
+    assert invocation.key_args == ["main.cpp", option, value]
+    assert invocation.preprocess_args == ["main.cpp", option, value, "-E"]
+
+
+# ----------------------------------------------------------------------
+def test_InvocationDependencies():
+    invocation = _Invocation.Create(["-c", "main.cpp", "-o", "obj/main.o", "-MD"])
+    assert invocation is not None
+
+    assert invocation.dependency_filename == Path("obj/main.d")
+    assert invocation.dependency_target == "obj/main.o"
+    assert invocation.key_args == ["main.cpp", "-MD", ""]
+
+    invocation = _Invocation.Create(["-c", "main.cpp", "-o", "obj/main.o", "-MMD", "-MF", "deps/main.d"])
+    assert invocation is not None
+
+    assert invocation.dependency_filename == Path("deps/main.d")
+    assert invocation.dependency_target == "obj/main.o"
+
+    # The dependency filename isn't part of the key
+    assert invocation.key_args == ["main.cpp", "-MMD", ""]
+
+    # Explicit targets are part of the key and aren't replaced
+    invocation = _Invocation.Create(["-c", "main.cpp", "-o", "obj/main.o", "-MD", "-MT", "main"])
+    assert invocation is not None
+
+    assert invocation.dependency_target is None
+    assert "main" in invocation.key_args
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["main.cpp", "-o", "main"],                                         # Linking
+        ["-c", "main.cpp", "other.cpp"],                                    # Multiple sources
+        ["-c", "main.o", "-o", "other.o"],                                  # Not a source
+        ["-c"],                                                             # No source
+        ["-c", "main.cpp", "-o"],                                           # Missing value
+        ["-c", "main.cpp", "-E"],
+        ["-c", "main.cpp", "-S"],
+        ["-c", "main.cpp", "-M"],
+        ["-c", "main.cpp", "@args.rsp"],
+        ["-c", "main.cpp", "-save-temps"],
+        ["-c", "main.cpp", "-Xclang", "-ast-dump"],
+        ["-c", "main.cpp", "-include-pch", "main.pch"],
+        ["-c", "main.cpp", "-fprofile-use=main.profdata"],
+        ["-c", "main.cpp", "--coverage"],
+        ["-c", "main.cpp", "-MJ", "main.json"],
+        ["-c", "main.cpp", "-serialize-diagnostics", "main.dia"],
+        ["-c", "main.cpp", "-working-directory", "src"],
+    ],
+)
+def test_InvocationUncacheable(args):
+    assert _Invocation.Create(args) is None
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(os.name == "nt", reason="The compilation cache is only used on POSIX systems")
+def test_KeyStability(tmp_path, monkeypatch):
+    compiler = _CreateCompiler(tmp_path)
+    source = _CreateSource(tmp_path)
+
+    monkeypatch.chdir(tmp_path)
+
+    cache = CompileCache(tmp_path / "cache", 1024 * 1024)
+
+    key = _CalculateKey(cache, compiler, ["-O2", "-c", source.name, "-o", "main.o"])
+
+    assert key is not None
+    assert _CalculateKey(cache, compiler, ["-O2", "-c", source.name, "-o", "main.o"]) == key
+
+    # The output filename isn't part of the key
+    assert _CalculateKey(cache, compiler, ["-O2", "-c", source.name, "-o", "other.o"]) == key
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(os.name == "nt", reason="The compilation cache is only used on POSIX systems")
+def test_KeySensitivity(tmp_path, monkeypatch):
+    compiler = _CreateCompiler(tmp_path)
+    source = _CreateSource(tmp_path)
+
+    (tmp_path / "other").mkdir()
+
+    monkeypatch.chdir(tmp_path)
+
+    cache = CompileCache(tmp_path / "cache", 1024 * 1024)
+
+    args = ["-O2", "-c", str(source), "-o", "main.o"]
+
+    keys = [_CalculateKey(cache, compiler, args)]
+
+    # Arguments
+    keys.append(_CalculateKey(cache, compiler, ["-O0"] + args[1:]))
+
+    # Working directory
+    monkeypatch.chdir(tmp_path / "other")
+    keys.append(_CalculateKey(cache, compiler, args))
+    monkeypatch.chdir(tmp_path)
+
+    # Preprocessed source
+    source.write_text("int main() { return 1; }\n")
+    keys.append(_CalculateKey(cache, compiler, args))
+
+    # Compiler content
+    compiler.write_text(compiler.read_text() + "# A different compiler\n")
+    keys.append(_CalculateKey(cache, compiler, args))
+
+    assert None not in keys
+    assert len(set(keys)) == len(keys)
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(os.name == "nt", reason="The compilation cache is only used on POSIX systems")
+def test_KeyPreprocessorFailure(tmp_path, monkeypatch):
+    compiler = _CreateCompiler(tmp_path)
+
+    monkeypatch.chdir(tmp_path)
+
+    cache = CompileCache(tmp_path / "cache", 1024 * 1024)
+
+    # The compiler reports the error when the source can't be preprocessed
+    assert _CalculateKey(cache, compiler, ["-c", "missing.c", "-o", "missing.o"]) is None
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(os.name == "nt", reason="The compilation cache is only used on POSIX systems")
+def test_HitAndMiss(tmp_path, monkeypatch):
+    compiler = _CreateCompiler(tmp_path)
+    source = _CreateSource(tmp_path)
+
+    monkeypatch.chdir(tmp_path)
+
+    cache = CompileCache(tmp_path / "cache", 1024 * 1024)
+
+    args = ["-c", source.name, "-o", "main.o", "-MD"]
+
+    assert cache.Compile(str(compiler), args) == 0
+
+    stats = cache.GetStats()
+    assert (stats.hits, stats.misses, stats.uncacheable) == (0, 1, 0)
+    assert stats.size > 0
+
+    assert _ReadCompilations(tmp_path) == 1
+
+    (tmp_path / "main.o").unlink()
+    (tmp_path / "main.d").unlink()
+
+    assert cache.Compile(str(compiler), args) == 0
+
+    stats = cache.GetStats()
+    assert (stats.hits, stats.misses, stats.uncacheable) == (1, 1, 0)
+
+    # The results were restored without compiling
+    assert _ReadCompilations(tmp_path) == 1
+    assert (tmp_path / "main.o").read_text() == source.read_text()
+    assert (tmp_path / "main.d").read_text() == "main.o: {}\n".format(source.name)
+
+    # Another output filename shares the entry, and the dependency target is updated
+    assert cache.Compile(str(compiler), ["-c", source.name, "-o", "other.o", "-MD"]) == 0
+
+    assert _ReadCompilations(tmp_path) == 1
+    assert (tmp_path / "other.d").read_text() == "other.o: {}\n".format(source.name)
+
+    # Uncacheable invocations are passed to the compiler
+    assert cache.Compile(str(compiler), [source.name, "-o", "main"]) == 0
+
+    stats = cache.GetStats()
+    assert (stats.hits, stats.misses, stats.uncacheable) == (2, 1, 1)
+
+    assert _ReadCompilations(tmp_path) == 2
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(os.name == "nt", reason="The compilation cache is only used on POSIX systems")
+def test_CompilationFailure(tmp_path, monkeypatch):
+    compiler = _CreateCompiler(tmp_path)
+    source = _CreateSource(tmp_path)
+
+    monkeypatch.chdir(tmp_path)
+
+    cache = CompileCache(tmp_path / "cache", 1024 * 1024)
+
+    monkeypatch.setenv("FAKE_COMPILER_FAIL", "1")
+
+    assert cache.Compile(str(compiler), ["-c", source.name, "-o", "main.o"]) == 1
+
+    # Failures aren't cached
+    assert cache.GetStats().size == 0
+    assert [item for item in (tmp_path / "cache").iterdir() if item.is_dir()] == []
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(os.name == "nt", reason="The compilation cache is only used on POSIX systems")
+def test_EvictSkipsEntriesBeingStored(tmp_path):
+    cache = CompileCache(tmp_path / "cache", 1000)
+
+    for index in range(4):
+        entry_dir = cache.root / "ab" / "ab{:062x}".format(index)
+        entry_dir.mkdir(parents=True)
+
+        (entry_dir / "object").write_bytes(b"x" * 400)
+        os.utime(entry_dir / "object", (index, index))
+
+    # An entry that another process is storing (see `CompileCache._Store`)
+    temp_dir = cache.root / "ab" / "ab{:062x}.1234.tmp".format(99)
+    temp_dir.mkdir()
+
+    (temp_dir / "object").write_bytes(b"x" * 400)
+    os.utime(temp_dir / "object", (0, 0))
+
+    cache._UpdateStats(size=2000)                                           # pylint: disable=protected-access
+    cache.Evict()
+
+    assert (temp_dir / "object").is_file()
+
+    # The least recently used entries are evicted until the cache is below 90% of its maximum size
+    assert sorted(item.name for item in (cache.root / "ab").iterdir() if not item.name.endswith(".tmp")) == [
+        "ab{:062x}".format(index) for index in [2, 3]
+    ]
+
+    stats = cache.GetStats()
+
+    assert stats.evictions == 2
+    assert stats.size == 800
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CreateCompiler(
+    root: Path,
+) -> Path:
+    """\
+    Creates a compiler that "compiles" a source by copying it to the output file, writes a
+    dependency file for -MD, and counts its compilations in `compilations.txt`.
+    """
+
+    compiler = root / "fake_clang"
+
+    compiler.write_text(
+        textwrap.dedent(
+            """\
+            #!{python}
+            import os
+            import sys
+
+            args = sys.argv[1:]
+            sources = [arg for arg in args if arg.endswith((".c", ".cpp"))]
+
+            if os.getenv("FAKE_COMPILER_FAIL"):
+                sys.stderr.write("error: compilation failed\\n")
+                sys.exit(1)
+
+            if "-E" in args:
+                with open(sources[0]) as f:
+                    sys.stdout.write(f.read())
+
+                sys.exit(0)
+
+            with open("{compilations}", "a") as f:
+                f.write("compiled\\n")
+
+            output = args[args.index("-o") + 1]
+
+            with open(output, "w") as f:
+                with open(sources[0]) as source:
+                    f.write(source.read())
+
+            if "-MD" in args:
+                with open(os.path.splitext(output)[0] + ".d", "w") as f:
+                    f.write("{{}}: {{}}\\n".format(output, sources[0]))
+
+            sys.stderr.write("warning: fake\\n")
+            """,
+        ).format(
+            python=sys.executable,
+            compilations=root / "compilations.txt",
+        ),
+    )
+
+    compiler.chmod(0o755)
+
+    return compiler
+
+
+# ----------------------------------------------------------------------
+def _CreateSource(
+    root: Path,
+) -> Path:
+    source = root / "main.c"
+    source.write_text("int main() { return 0; }\n")
+
+    return source
+
+
+# ----------------------------------------------------------------------
+def _CalculateKey(
+    cache: CompileCache,
+    compiler: Path,
+    args,
+):
+    invocation = _Invocation.Create(args)
+    assert invocation is not None
+
+    return cache._CalculateKey(str(compiler), args, invocation)             # pylint: disable=protected-access
+
+
+# ----------------------------------------------------------------------
+def _ReadCompilations(
+    root: Path,
+) -> int:
+    compilations_filename = root / "compilations.txt"
+
+    if not compilations_filename.is_file():
+        return 0
+
+    return len(compilations_filename.read_text().splitlines())
@@ -0,0 +1,189 @@
+# ----------------------------------------------------------------------
+# |
+# |  Components_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 17:48:30
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _components.py using component archives served by a local HTTP server"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from pathlib import Path
+
+import pytest
+
+from _http_server import Serve, Server
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _components import ComponentManifest, ComponentsInfo, CreateShims, ExtractComponent, InstallComponents     # pylint: disable=wrong-import-position
+from _integrity import CreateManifest, Verify                               # pylint: disable=wrong-import-position
+from _delta_update import FileManifest                                      # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+pytestmark                                  = [
+    pytest.mark.skipif(os.name == "nt", reason="Shims are only created on POSIX systems"),
+    pytest.mark.skipif(shutil.which("zstd") is None, reason="The 'zstd' executable is required"),
+]
+
+_create_component_archives_script           = Path(__file__).parent.parent / "Tools" / "LLVM" / "CreateComponentArchives.py"
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture(name="server")
+def fixture_server(tmp_path):
+    input_dir = tmp_path / "toolchain"
+
+    for relative_path, content in [
+        ("bin/clang-17", "#!/bin/sh\necho \"clang $*\"\n"),
+        ("bin/clang-tidy", "#!/bin/sh\necho \"clang-tidy $*\"\n"),
+        ("include/c++/v1/vector", "// vector\n"),
+        ("lib/clang/17/lib/linux/libclang_rt.asan.a", "asan\n"),
+    ]:
+        filename = input_dir / relative_path
+
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        filename.write_text(content)
+        filename.chmod(0o755)
+
+    os.symlink("clang-17", input_dir / "bin" / "clang")
+    os.symlink("clang", input_dir / "bin" / "clang++")
+
+    # Symlinks to directories
+    os.symlink("linux", input_dir / "lib" / "clang" / "17" / "lib" / "x86_64-unknown-linux-gnu")
+    os.symlink("17", input_dir / "lib" / "clang" / "17.0")
+
+    publish_dir = tmp_path / "publish"
+
+    subprocess.run(
+        [sys.executable, str(_create_component_archives_script), str(input_dir), str(publish_dir), "17.0.0", "--level", "3"],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+    with Serve(Server({filename.name: filename.read_bytes() for filename in publish_dir.iterdir()})) as server:
+        yield server
+
+
+# ----------------------------------------------------------------------
+def test_ClangRequiresLibcxx(tmp_path, server):
+    output_dir, info = _Install(tmp_path, server, ["clang"])
+
+    assert sorted(info.installed) == ["clang", "libcxx"]
+    assert (output_dir / "include" / "c++" / "v1" / "vector").is_file()
+
+    assert os.readlink(output_dir / "lib" / "clang" / "17.0") == "17"
+
+
+# ----------------------------------------------------------------------
+def test_CompilerInstallsRuntimes(tmp_path, server):
+    output_dir, _ = _Install(tmp_path, server, ["clang"])
+
+    runtime_filename = output_dir / "lib" / "clang" / "17" / "lib" / "linux" / "libclang_rt.asan.a"
+
+    # Compilations that don't use the runtimes don't install them
+    assert _Invoke(output_dir / "bin" / "clang++", "-c", "file.cpp") == "clang --driver-mode=g++ -c file.cpp"
+    assert not runtime_filename.exists()
+
+    assert _Invoke(output_dir / "bin" / "clang++", "-fsanitize=address", "file.cpp") == "clang --driver-mode=g++ -fsanitize=address file.cpp"
+    assert runtime_filename.is_file()
+
+    # Symlinks to directories are installed with the component
+    triple_dir = output_dir / "lib" / "clang" / "17" / "lib" / "x86_64-unknown-linux-gnu"
+
+    assert os.readlink(triple_dir) == "linux"
+    assert (triple_dir / "libclang_rt.asan.a").is_file()
+
+    # The original compilers are restored
+    assert os.readlink(output_dir / "bin" / "clang") == "clang-17"
+    assert os.readlink(output_dir / "bin" / "clang++") == "clang"
+
+    info = ComponentsInfo.Load(output_dir)
+    assert info is not None
+
+    assert "compiler-rt" in info.installed
+    assert info.compilers == {}
+
+    # The manifest describes the files that were added and replaced
+    assert Verify(output_dir, FileManifest.Load(output_dir)).is_valid
+
+
+# ----------------------------------------------------------------------
+def test_ExecutableShim(tmp_path, server):
+    output_dir, _ = _Install(tmp_path, server, ["clang"])
+
+    assert _Invoke(output_dir / "bin" / "clang-tidy", "--version") == "clang-tidy --version"
+    assert Verify(output_dir, FileManifest.Load(output_dir)).is_valid
+
+
+# ----------------------------------------------------------------------
+def test_ShimReentry(tmp_path, server):
+    output_dir, _ = _Install(tmp_path, server, ["clang"])
+
+    # Simulate a manifest that lists an executable that isn't in the component's archive
+    missing_filename = output_dir / "bin" / "clang-missing"
+    missing_filename.write_text((output_dir / "bin" / "clang-tidy").read_text().replace("bin/clang-tidy", "bin/clang-missing"))
+    missing_filename.chmod(0o755)
+
+    result = subprocess.run([str(missing_filename)], capture_output=True, text=True, timeout=60, check=False)
+
+    assert result.returncode != 0
+    assert "does not provide" in result.stderr
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Install(
+    tmp_path: Path,
+    server: Server,
+    names: list,
+):
+    """Installs components as `ComponentArchiveInstaller` does"""
+
+    output_dir = tmp_path / "install"
+
+    info = ComponentsInfo(
+        server.GetUrl("manifest.json"),
+        ComponentManifest.FromJson(json.loads(server.content["manifest.json"])),
+        {},
+    )
+
+    for component in info.manifest.Resolve(names):
+        ExtractComponent(info.GetArchiveUrl(component), component, output_dir, archive_cache=None)
+        info.installed[component.name] = component.sha256
+
+    CreateShims(output_dir, info)
+    info.Save(output_dir)
+
+    CreateManifest(output_dir, info.manifest.version)
+
+    return output_dir, info
+
+
+# ----------------------------------------------------------------------
+def _Invoke(
+    executable: Path,
+    *args: str,
+) -> str:
+    result = subprocess.run([str(executable), *args], capture_output=True, text=True, timeout=60, check=True)
+
+    return result.stdout.strip()
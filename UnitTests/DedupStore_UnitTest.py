@@ -0,0 +1,360 @@
+# ----------------------------------------------------------------------
+# |
+# |  DedupStore_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-20 10:03:27
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _dedup_store.py"""
+
+import errno
+import os
+import stat
+import sys
+
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import _dedup_store                                                         # pylint: disable=wrong-import-position
+
+from _dedup_store import DedupStore                                         # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+_clang_content                              = b"clang" * 1024
+_header_content                             = b"#pragma once\n" * 100
+
+
+# ----------------------------------------------------------------------
+def test_IdenticalFiles(tmp_path):
+    store = DedupStore(tmp_path / "store", "hardlink")
+
+    first_dir = _CreateToolchain(tmp_path / "first")
+    second_dir = _CreateToolchain(tmp_path / "second")
+
+    first_result = store.Deduplicate(first_dir)
+
+    assert first_result.num_files == 2
+    assert first_result.num_added == 2
+    assert first_result.num_linked == 0
+
+    second_result = store.Deduplicate(second_dir)
+
+    assert second_result.num_files == 2
+    assert second_result.num_added == 0
+    assert second_result.num_linked == 2
+    assert second_result.bytes_saved == len(_clang_content) + len(_header_content)
+
+    for relative_path in ["bin/clang", "include/header.h"]:
+        first_stat = (first_dir / relative_path).stat()
+        second_stat = (second_dir / relative_path).stat()
+
+        assert first_stat.st_ino == second_stat.st_ino
+        assert first_stat.st_nlink == 3                                     # Both toolchains and the store entry
+
+    assert (second_dir / "bin" / "clang").read_bytes() == _clang_content
+
+    report = store.GetReport()
+
+    assert report.num_entries == 2
+    assert report.num_references == 4
+    assert report.num_unreferenced == 0
+
+
+# ----------------------------------------------------------------------
+def test_IdenticalFilesWithinDirectory(tmp_path):
+    store = DedupStore(tmp_path / "store", "hardlink")
+
+    directory = _CreateToolchain(tmp_path / "toolchain")
+    (directory / "bin" / "clang++").write_bytes(_clang_content)
+    os.chmod(directory / "bin" / "clang++", 0o755)
+
+    result = store.Deduplicate(directory)
+
+    assert result.num_files == 3
+    assert result.num_linked + result.num_added == 3
+
+    assert (directory / "bin" / "clang").stat().st_ino == (directory / "bin" / "clang++").stat().st_ino
+
+
+# ----------------------------------------------------------------------
+def test_DifferentPermissions(tmp_path):
+    store = DedupStore(tmp_path / "store", "hardlink")
+
+    first_dir = _CreateToolchain(tmp_path / "first")
+    second_dir = _CreateToolchain(tmp_path / "second", clang_mode=0o700)
+
+    store.Deduplicate(first_dir)
+    result = store.Deduplicate(second_dir)
+
+    # Permissions belong to the inode, so files with different permissions can't share one
+    assert result.num_linked == 1
+    assert result.num_added == 1
+
+    first_stat = (first_dir / "bin" / "clang").stat()
+    second_stat = (second_dir / "bin" / "clang").stat()
+
+    assert first_stat.st_ino != second_stat.st_ino
+    assert stat.S_IMODE(first_stat.st_mode) == 0o755
+    assert stat.S_IMODE(second_stat.st_mode) == 0o700
+
+    assert sorted(
+        entry_filename.name.rsplit("-", 1)[1]
+        for entry_filename in (store.root / "hardlink").glob("*/*")
+        if entry_filename.read_bytes() == _clang_content
+    ) == ["700", "755"]
+
+
+# ----------------------------------------------------------------------
+def test_Idempotent(tmp_path):
+    store = DedupStore(tmp_path / "store", "hardlink")
+
+    first_dir = _CreateToolchain(tmp_path / "first")
+    second_dir = _CreateToolchain(tmp_path / "second")
+
+    store.Deduplicate(first_dir)
+    store.Deduplicate(second_dir)
+
+    inodes = _GetInodes(tmp_path)
+
+    for directory in [first_dir, second_dir]:
+        result = store.Deduplicate(directory)
+
+        assert result.num_files == 2
+        assert result.num_linked == 0
+        assert result.num_added == 0
+        assert result.num_skipped == 0
+        assert result.bytes_saved == 0
+
+    assert _GetInodes(tmp_path) == inodes
+    assert store.GetReport().num_entries == 2
+
+
+# ----------------------------------------------------------------------
+def test_SkippedFiles(tmp_path):
+    store = DedupStore(tmp_path / "store", "hardlink")
+
+    directories = [_CreateToolchain(tmp_path / "first"), _CreateToolchain(tmp_path / "second")]
+
+    for directory in directories:
+        # Root-level files include installation metadata that is rewritten in place
+        (directory / "install.json").write_bytes(_clang_content)
+
+        (directory / "bin" / "small.txt").write_bytes(b"x" * 511)
+
+        result = store.Deduplicate(directory)
+
+        assert result.num_files == 2
+
+    for relative_path in ["install.json", "bin/small.txt"]:
+        assert directories[0].joinpath(relative_path).stat().st_ino != directories[1].joinpath(relative_path).stat().st_ino
+        assert directories[0].joinpath(relative_path).stat().st_nlink == 1
+
+    assert store.GetReport().num_entries == 2
+
+
+# ----------------------------------------------------------------------
+def test_Symlinks(tmp_path):
+    store = DedupStore(tmp_path / "store", "hardlink")
+
+    directory = _CreateToolchain(tmp_path / "toolchain")
+    (directory / "bin" / "clang++").symlink_to("clang")
+
+    result = store.Deduplicate(directory)
+
+    assert result.num_files == 2
+    assert (directory / "bin" / "clang++").is_symlink()
+
+
+# ----------------------------------------------------------------------
+def test_DiscardAfterPrune(tmp_path):
+    store = DedupStore(tmp_path / "store", "hardlink")
+
+    first_dir = _CreateToolchain(tmp_path / "first")
+    second_dir = _CreateToolchain(tmp_path / "second")
+
+    store.Deduplicate(first_dir)
+    store.Deduplicate(second_dir)
+
+    # Every entry is referenced
+    assert store.Prune() == (0, 0)
+
+    sha256 = _GetEntrySha256(store, _clang_content)
+
+    store.Discard(sha256, 0o755)
+    assert store.Prune() == (0, 0)
+
+    # Content that is linked from the toolchains survives the removal of its entry
+    for directory in [first_dir, second_dir]:
+        assert (directory / "bin" / "clang").read_bytes() == _clang_content
+        assert (directory / "include" / "header.h").read_bytes() == _header_content
+
+    assert (first_dir / "bin" / "clang").stat().st_ino == (second_dir / "bin" / "clang").stat().st_ino
+    assert (first_dir / "bin" / "clang").stat().st_nlink == 2
+
+    # Discarding an entry that doesn't exist is not an error
+    store.Discard(sha256, 0o755)
+
+    # The content is added to the store again
+    third_dir = _CreateToolchain(tmp_path / "third")
+
+    result = store.Deduplicate(third_dir)
+
+    assert result.num_added == 1
+    assert result.num_linked == 1
+
+
+# ----------------------------------------------------------------------
+def test_PruneUnreferenced(tmp_path):
+    store = DedupStore(tmp_path / "store", "hardlink")
+
+    first_dir = _CreateToolchain(tmp_path / "first")
+    second_dir = _CreateToolchain(tmp_path / "second")
+
+    store.Deduplicate(first_dir)
+    store.Deduplicate(second_dir)
+
+    (first_dir / "bin" / "clang").unlink()
+    assert store.Prune() == (0, 0)
+
+    (second_dir / "bin" / "clang").unlink()
+    assert store.Prune() == (1, len(_clang_content))
+
+    assert (first_dir / "include" / "header.h").read_bytes() == _header_content
+    assert store.GetReport().num_entries == 1
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("mode", ["hardlink", "reflink"])
+def test_LinksNotSupported(tmp_path, monkeypatch, mode):
+    if mode == "reflink" and not sys.platform.startswith("linux"):
+        pytest.skip("Reflinks are only supported on Linux")
+
+    # ----------------------------------------------------------------------
+    def Unsupported(*args, **kwargs):                                      # pylint: disable=unused-argument
+        raise OSError(errno.EXDEV if mode == "hardlink" else errno.EOPNOTSUPP, "Not supported")
+
+    # ----------------------------------------------------------------------
+
+    if mode == "hardlink":
+        monkeypatch.setattr(os, "link", Unsupported)
+    else:
+        monkeypatch.setattr(_dedup_store, "_Clone", Unsupported)
+
+    store = DedupStore(tmp_path / "store", mode)
+
+    first_dir = _CreateToolchain(tmp_path / "first")
+    second_dir = _CreateToolchain(tmp_path / "second")
+
+    for directory in [first_dir, second_dir]:
+        result = store.Deduplicate(directory)
+
+        assert result.num_files == 2
+        assert result.num_skipped == 2
+        assert result.num_linked == 0
+        assert result.bytes_saved == 0
+
+    # Each toolchain keeps its own copy of the content
+    for relative_path, content in [("bin/clang", _clang_content), ("include/header.h", _header_content)]:
+        first_stat = (first_dir / relative_path).stat()
+        second_stat = (second_dir / relative_path).stat()
+
+        assert first_stat.st_ino != second_stat.st_ino
+        assert first_stat.st_nlink == 1
+
+        assert (first_dir / relative_path).read_bytes() == content
+        assert (second_dir / relative_path).read_bytes() == content
+
+    assert stat.S_IMODE((first_dir / "bin" / "clang").stat().st_mode) == 0o755
+
+    # Nothing is left behind
+    assert [path for path in tmp_path.rglob("*") if path.name.endswith(".tmp")] == []
+    assert store.GetReport().num_entries == 0
+
+
+# ----------------------------------------------------------------------
+def test_Reflink(tmp_path):
+    if not sys.platform.startswith("linux"):
+        pytest.skip("Reflinks are only supported on Linux")
+
+    source = tmp_path / "source"
+    source.write_bytes(_clang_content)
+
+    try:
+        _dedup_store._Clone(source, tmp_path / "clone")                     # pylint: disable=protected-access
+    except OSError:
+        pytest.skip("The filesystem doesn't support reflinks")
+
+    store = DedupStore(tmp_path / "store", "reflink")
+
+    first_dir = _CreateToolchain(tmp_path / "first")
+    second_dir = _CreateToolchain(tmp_path / "second")
+
+    store.Deduplicate(first_dir)
+    result = store.Deduplicate(second_dir)
+
+    assert result.num_linked == 2
+
+    # Clones are independent files
+    (first_dir / "bin" / "clang").write_bytes(b"modified")
+
+    assert (second_dir / "bin" / "clang").read_bytes() == _clang_content
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CreateToolchain(
+    directory: Path,
+    *,
+    clang_mode: int=0o755,
+) -> Path:
+    (directory / "bin").mkdir(parents=True)
+    (directory / "include").mkdir()
+
+    (directory / "bin" / "clang").write_bytes(_clang_content)
+    os.chmod(directory / "bin" / "clang", clang_mode)
+
+    (directory / "include" / "header.h").write_bytes(_header_content)
+    os.chmod(directory / "include" / "header.h", 0o644)
+
+    return directory
+
+
+# ----------------------------------------------------------------------
+def _GetInodes(
+    root: Path,
+) -> Dict[str, int]:
+    return {
+        str(path.relative_to(root)): path.stat().st_ino
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+
+
+# ----------------------------------------------------------------------
+def _GetEntrySha256(
+    store: DedupStore,
+    content: bytes,
+) -> str:
+    for entry_filename in (store.root / store.mode).glob("*/*"):
+        if entry_filename.read_bytes() == content:
+            return entry_filename.name.rsplit("-", 1)[0]
+
+    assert False, content  # pragma: no cover
@@ -0,0 +1,270 @@
+# ----------------------------------------------------------------------
+# |
+# |  DeferredInstall_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-20 16:41:07
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for toolchains whose installation is deferred by setup until they are first activated"""
+
+import io
+import sys
+import tarfile
+
+from pathlib import Path
+
+import pytest
+
+
+# ----------------------------------------------------------------------
+pytest.importorskip("Common_Foundation")
+pytest.importorskip("RepositoryBootstrap")
+pytest.importorskip("semantic_version")
+
+from Common_Foundation.Streams.DoneManager import DoneManager, DoneManagerFlags  # type: ignore  # pylint: disable=import-error,wrong-import-position
+
+from RepositoryBootstrap import Constants                                   # type: ignore  # pylint: disable=import-error,wrong-import-position
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import Activate_custom                                                      # pylint: disable=wrong-import-position
+del sys.modules["Activate_custom"]
+
+import Setup_custom                                                         # pylint: disable=wrong-import-position
+del sys.modules["Setup_custom"]
+
+from _activation_cache import ACTIVATION_CACHE_FILENAME                     # pylint: disable=wrong-import-position
+from _install_data import DEFERRED_INSTALL_FILENAME, DeferInstall, InstallData, IsInstallDeferred, IsLazyInstallEnabled, LAZY_INSTALL_ENV_VAR  # pylint: disable=wrong-import-position
+from _installers import LocalArchiveInstaller                               # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+class _FailingInstaller(LocalArchiveInstaller):
+    # Extracts the content and then reports an error, as 7zip does when extraction fails partway
+    def _Populate(self, dm, staging_dir):
+        install_info = super(_FailingInstaller, self)._Populate(dm, staging_dir)
+
+        dm.result = -1
+
+        return install_info
+
+
+# ----------------------------------------------------------------------
+def test_IsLazyInstallEnabled(monkeypatch):
+    monkeypatch.delenv(LAZY_INSTALL_ENV_VAR, raising=False)
+    assert IsLazyInstallEnabled() is False
+
+    monkeypatch.setenv(LAZY_INSTALL_ENV_VAR, "0")
+    assert IsLazyInstallEnabled() is False
+
+    monkeypatch.setenv(LAZY_INSTALL_ENV_VAR, "1")
+    assert IsLazyInstallEnabled() is True
+
+
+# ----------------------------------------------------------------------
+def test_SetupDefersInstall(tmp_path, monkeypatch):
+    monkeypatch.setenv(LAZY_INSTALL_ENV_VAR, "1")
+    _PrepareSetup(tmp_path, monkeypatch)
+
+    install_data = _CreateInstallData(tmp_path, LocalArchiveInstaller)
+
+    assert not IsInstallDeferred(install_data)
+
+    monkeypatch.setattr(Setup_custom, "GRCOV_VERSIONS", {})
+    monkeypatch.setattr(Setup_custom, "LLVM_VERSIONS", {"1.0.0": [install_data]})
+
+    with _CreateDoneManager() as dm:
+        Setup_custom.GetCustomActions(dm, None, force=False, interactive=None)
+
+    assert dm.result == 0
+
+    # The marker is the only content until the toolchain is activated
+    assert IsInstallDeferred(install_data)
+    assert [child.name for child in install_data.installer.output_dir.iterdir()] == [DEFERRED_INSTALL_FILENAME]
+    assert install_data.installer.ShouldInstall(None, None)
+
+
+# ----------------------------------------------------------------------
+def test_SetupDoesNotDeferExplicitConfigurations(tmp_path, monkeypatch):
+    monkeypatch.setenv(LAZY_INSTALL_ENV_VAR, "1")
+    _PrepareSetup(tmp_path, monkeypatch)
+
+    install_data = _CreateInstallData(tmp_path, LocalArchiveInstaller)
+
+    monkeypatch.setattr(Setup_custom, "GRCOV_VERSIONS", {})
+    monkeypatch.setattr(Setup_custom, "LLVM_VERSIONS", {"1.0.0": [install_data]})
+    _DisableValidation(monkeypatch)
+
+    with _CreateDoneManager() as dm:
+        Setup_custom.GetCustomActions(dm, ["1.0.0-test"], force=False, interactive=None)
+
+    assert dm.result == 0
+
+    assert not IsInstallDeferred(install_data)
+    assert not install_data.installer.ShouldInstall(None, None)
+
+
+# ----------------------------------------------------------------------
+def test_ActivationInstalls(tmp_path, monkeypatch):
+    install_data = _CreateInstallData(tmp_path, LocalArchiveInstaller)
+
+    DeferInstall(install_data)
+
+    generated_dir = _PrepareActivation(tmp_path, monkeypatch, install_data)
+
+    with _CreateDoneManager() as dm:
+        Activate_custom._GetCustomActions(dm, generated_dir, "1.0.0-test", _VersionSpecs(), force=False)  # pylint: disable=protected-access
+
+    assert dm.result == 0
+
+    assert not IsInstallDeferred(install_data)
+    assert not install_data.installer.ShouldInstall(None, None)
+    assert (install_data.installer.output_dir / "bin" / "clang").is_file()
+
+    assert (generated_dir / ACTIVATION_CACHE_FILENAME).is_file()
+
+
+# ----------------------------------------------------------------------
+def test_ActivationInstallFails(tmp_path, monkeypatch):
+    install_data = _CreateInstallData(tmp_path, _FailingInstaller)
+
+    DeferInstall(install_data)
+
+    generated_dir = _PrepareActivation(tmp_path, monkeypatch, install_data)
+
+    with _CreateDoneManager() as dm:
+        commands = Activate_custom._GetCustomActions(dm, generated_dir, "1.0.0-test", _VersionSpecs(), force=False)  # pylint: disable=protected-access
+
+    assert dm.result != 0
+    assert commands == []
+
+    # The next activation tries again
+    assert IsInstallDeferred(install_data)
+    assert install_data.installer.ShouldInstall(None, None)
+
+    assert not (generated_dir / ACTIVATION_CACHE_FILENAME).exists()
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+class _VersionSpecs(object):
+    """Implements the parts of `Configuration.VersionSpecs` used during activation"""
+
+    tools: list                             = []
+
+
+# ----------------------------------------------------------------------
+class _GrcovInstaller(object):
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        output_dir: Path,
+    ):
+        self.output_dir                     = output_dir
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def ShouldInstall(*args, **kwargs) -> bool:                             # pylint: disable=unused-argument
+        return False
+
+
+# ----------------------------------------------------------------------
+def _CreateDoneManager():
+    return DoneManager.Create(io.StringIO(), "", output_flags=DoneManagerFlags.Create())
+
+
+# ----------------------------------------------------------------------
+def _CreateInstallData(
+    root: Path,
+    installer_type: type,
+) -> InstallData:
+    archive_filename = root / "install.tar.gz"
+
+    with tarfile.open(archive_filename, "w:gz") as tar:
+        for name, content in [
+            ("bin/clang", b"#!/bin/sh\necho clang\n"),
+            ("lib/x86_64-unknown-linux-gnu/libc++.so", b"library"),
+        ]:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mode = 0o755
+
+            tar.addfile(info, io.BytesIO(content))
+
+    output_dir = root / "Tools" / "LLVM" / "v1.0.0" / "test"
+
+    return InstallData(
+        "test",
+        lambda: installer_type(archive_filename, output_dir, "1.0.0"),
+        prompt_for_interactive=False,
+    )
+
+
+# ----------------------------------------------------------------------
+def _PrepareSetup(
+    root: Path,
+    monkeypatch,
+) -> None:
+    # Setup creates a link to the foundation's .pylintrc file
+    foundation_dir = root / "Common_Foundation"
+    foundation_dir.mkdir()
+
+    (foundation_dir / ".pylintrc").touch()
+
+    monkeypatch.setenv(Constants.DE_FOUNDATION_ROOT_NAME, str(foundation_dir))
+
+
+# ----------------------------------------------------------------------
+def _DisableValidation(
+    monkeypatch,
+) -> None:
+    # The content of the test archive can't compile anything
+    monkeypatch.setattr(Setup_custom, "_ValidateInstallation", lambda *args, **kwargs: None)
+    monkeypatch.setattr(Setup_custom, "_PrecompileHeaders", lambda *args, **kwargs: None)
+
+
+# ----------------------------------------------------------------------
+def _PrepareActivation(
+    root: Path,
+    monkeypatch,
+    install_data: InstallData,
+) -> Path:
+    _DisableValidation(monkeypatch)
+
+    grcov_dir = root / "Tools" / "grcov"
+    grcov_dir.mkdir(parents=True)
+
+    llvm_dir = install_data.installer.output_dir
+
+    # ----------------------------------------------------------------------
+    class ActivateActivity(object):
+        @staticmethod
+        def GetVersionedDirectoryEx(tool_dir, *args, **kwargs):             # pylint: disable=unused-argument
+            if tool_dir.name == "grcov":
+                return grcov_dir, "0.1.0"
+
+            return llvm_dir, "1.0.0"
+
+    # ----------------------------------------------------------------------
+
+    monkeypatch.setattr(Activate_custom, "ActivateActivity", ActivateActivity)
+    monkeypatch.setattr(Activate_custom, "GRCOV_VERSIONS", {"0.1.0": InstallData("grcov", lambda: _GrcovInstaller(grcov_dir), prompt_for_interactive=False)})
+    monkeypatch.setattr(Activate_custom, "LLVM_VERSIONS", {"1.0.0": [install_data]})
+    monkeypatch.setattr(Activate_custom, "InstallDeferred", lambda dm, version, install_data: Setup_custom.InstallDeferred(dm, version, install_data))
+    monkeypatch.setattr(Activate_custom, "IsCompileCacheEnabled", lambda: False)
+
+    generated_dir = root / "Generated"
+    generated_dir.mkdir()
+
+    return generated_dir
@@ -0,0 +1,226 @@
+# ----------------------------------------------------------------------
+# |
+# |  DeltaUpdate_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 15:26:08
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _delta_update.py using two revisions served by a local HTTP server"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pytest
+
+from _http_server import Serve, Server
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _delta_update import ApplyUpdate, DownloadManifest, FileManifest       # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+pytestmark                                  = pytest.mark.skipif(shutil.which("zstd") is None, reason="The 'zstd' executable is required")
+
+_create_file_manifest_script                = Path(__file__).parent.parent / "Tools" / "LLVM" / "CreateFileManifest.py"
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture(name="revisions")
+def fixture_revisions(tmp_path) -> Tuple[Path, Path, Dict[str, bytes]]:
+    tool_content = os.urandom(256 * 1024)
+
+    revision1 = _CreateTree(
+        tmp_path / "revision1",
+        {
+            "bin/tool": (tool_content, 0o755),
+            "lib/data.txt": (b"unchanged\n" * 1000, 0o644),
+            "share/mode.txt": (b"The mode of this file changes\n", 0o644),
+            "share/removed.txt": (b"This file is removed\n", 0o644),
+        },
+        {
+            "bin/tool-link": "tool",
+        },
+    )
+
+    revision2 = _CreateTree(
+        tmp_path / "revision2",
+        {
+            "bin/tool": (tool_content[:1000] + b"patched" + tool_content[1000:], 0o755),
+            "lib/data.txt": (b"unchanged\n" * 1000, 0o644),
+            "share/mode.txt": (b"The mode of this file changes\n", 0o755),
+            "share/added.txt": (b"This file is added\n", 0o644),
+        },
+        {
+            "bin/tool-link": "../share/added.txt",
+        },
+    )
+
+    publish_dir = tmp_path / "publish"
+
+    _Publish(revision1, publish_dir, "1.0.0")
+    shutil.copyfile(publish_dir / "files.json", publish_dir / "files-1.0.0.json")
+
+    _Publish(revision2, publish_dir, "2.0.0", revision1)
+    shutil.copyfile(publish_dir / "files.json", publish_dir / "files-2.0.0.json")
+
+    content = {
+        filename.relative_to(publish_dir).as_posix(): filename.read_bytes()
+        for filename in publish_dir.rglob("*")
+        if filename.is_file()
+    }
+
+    return revision1, revision2, content
+
+
+# ----------------------------------------------------------------------
+def test_Update(tmp_path, revisions):
+    revision1, revision2, content = revisions
+    output_dir = tmp_path / "install"
+
+    with Serve(Server(content)) as server:
+        manifest1 = _DownloadManifest(server, content, "files-1.0.0.json")
+        manifest2 = _DownloadManifest(server, content, "files-2.0.0.json")
+
+        result = ApplyUpdate(output_dir, FileManifest("0.0.0", {}, {}), manifest1, server.GetUrl("files-1.0.0.json"))
+
+        assert result.num_downloaded == 4
+        _VerifyTree(output_dir, revision1)
+
+        # Simulate the dedup store, which shares the content of installed files via hard links
+        store_filename = tmp_path / "store_entry"
+        os.link(output_dir / "share" / "mode.txt", store_filename)
+
+        num_bytes_sent = server.num_bytes_sent
+
+        result = ApplyUpdate(output_dir, FileManifest.Load(output_dir), manifest2, server.GetUrl("files-2.0.0.json"))
+
+        downloaded_bytes = server.num_bytes_sent - num_bytes_sent
+
+    assert result.num_patched == 1
+    assert result.num_downloaded == 1
+    assert result.num_removed == 1
+    assert result.num_unchanged == 2
+
+    # The delta is much smaller than the file
+    assert downloaded_bytes < 64 * 1024
+
+    _VerifyTree(output_dir, revision2)
+
+    assert FileManifest.Load(output_dir) == manifest2
+
+    # The mode change didn't modify the content shared with the store
+    assert store_filename.stat().st_mode & 0o777 == 0o644
+    assert not os.path.samefile(store_filename, output_dir / "share" / "mode.txt")
+
+
+# ----------------------------------------------------------------------
+def test_UpdateInterrupted(tmp_path, revisions):
+    revision1, revision2, content = revisions
+    output_dir = tmp_path / "install"
+
+    with Serve(Server(content)) as server:
+        manifest1 = _DownloadManifest(server, content, "files-1.0.0.json")
+        manifest2 = _DownloadManifest(server, content, "files-2.0.0.json")
+
+        ApplyUpdate(output_dir, FileManifest("0.0.0", {}, {}), manifest1, server.GetUrl("files-1.0.0.json"))
+
+        # The delta for the tool isn't available, so the update fails before anything is replaced
+        for name in list(server.content):
+            if name.startswith("deltas/"):
+                del server.content[name]
+
+        with pytest.raises(Exception):
+            ApplyUpdate(output_dir, manifest1, manifest2, server.GetUrl("files-2.0.0.json"))
+
+        _VerifyTree(output_dir, revision1)
+        assert FileManifest.Load(output_dir) == manifest1
+
+        # The files are downloaded in their entirety when the deltas aren't published
+        ApplyUpdate(output_dir, manifest1, FileManifest(manifest2.version, manifest2.files, {}), server.GetUrl("files-2.0.0.json"))
+
+    _VerifyTree(output_dir, revision2)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CreateTree(
+    root: Path,
+    files: Dict[str, Tuple[bytes, int]],
+    links: Dict[str, str],
+) -> Path:
+    for relative_path, (content, mode) in files.items():
+        filename = root / relative_path
+
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        filename.write_bytes(content)
+        os.chmod(filename, mode)
+
+    for relative_path, target in links.items():
+        os.symlink(target, root / relative_path)
+
+    return root
+
+
+# ----------------------------------------------------------------------
+def _Publish(
+    input_dir: Path,
+    output_dir: Path,
+    version: str,
+    previous_dir: Path=None,
+) -> None:
+    command_line = [sys.executable, str(_create_file_manifest_script), str(input_dir), str(output_dir), version, "--level", "3"]
+
+    if previous_dir is not None:
+        command_line += ["--previous-dir", str(previous_dir)]
+
+    subprocess.run(command_line, check=True, stdout=subprocess.DEVNULL)
+
+
+# ----------------------------------------------------------------------
+def _DownloadManifest(
+    server: Server,
+    content: Dict[str, bytes],
+    name: str,
+) -> FileManifest:
+    return DownloadManifest(server.GetUrl(name), hashlib.sha256(content[name]).hexdigest())
+
+
+# ----------------------------------------------------------------------
+def _VerifyTree(
+    output_dir: Path,
+    expected_dir: Path,
+) -> None:
+    for expected_filename in expected_dir.rglob("*"):
+        filename = output_dir / expected_filename.relative_to(expected_dir)
+
+        if expected_filename.is_symlink():
+            assert os.readlink(filename) == os.readlink(expected_filename), filename
+        elif expected_filename.is_file():
+            assert filename.read_bytes() == expected_filename.read_bytes(), filename
+            assert filename.stat().st_mode & 0o7777 == expected_filename.stat().st_mode & 0o7777, filename
+
+    for filename in output_dir.rglob("*"):
+        if filename.name.startswith(".Common_LLVM."):
+            continue
+
+        assert os.path.lexists(expected_dir / filename.relative_to(output_dir)), filename
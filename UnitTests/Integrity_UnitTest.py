@@ -0,0 +1,144 @@
+# ----------------------------------------------------------------------
+# |
+# |  Integrity_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 18:21:44
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _integrity.py"""
+
+import os
+import shutil
+import sys
+
+from pathlib import Path
+
+import pytest
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _integrity import CreateManifest, Repair, UpdateManifest, Verify       # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture(name="installation")
+def fixture_installation(tmp_path):
+    original_dir = tmp_path / "original"
+
+    for relative_path, content, mode in [
+        ("bin/tool", b"#!/bin/sh\n", 0o755),
+        ("lib/data.txt", b"data\n", 0o644),
+    ]:
+        filename = original_dir / relative_path
+
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        filename.write_bytes(content)
+        filename.chmod(mode)
+
+    os.symlink("tool", original_dir / "bin" / "tool-link")
+
+    output_dir = tmp_path / "install"
+    shutil.copytree(original_dir, output_dir, symlinks=True)
+
+    manifest = CreateManifest(output_dir, "1.0.0")
+
+    return original_dir, output_dir, manifest
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.skipif(os.name == "nt", reason="Windows doesn't preserve POSIX permissions")
+def test_RepairPermissions(tmp_path, installation):
+    _, output_dir, manifest = installation
+
+    # Simulate the dedup store, which shares the content of installed files via hard links
+    store_filename = tmp_path / "store_entry"
+    os.link(output_dir / "bin" / "tool", store_filename)
+
+    store_filename.chmod(0o700)
+
+    verify_result = Verify(output_dir, manifest)
+    assert verify_result.permissions == ["bin/tool"]
+
+    assert Repair(output_dir, manifest, verify_result, _NoExtraction) == 1
+
+    assert Verify(output_dir, manifest).is_valid
+
+    # The store entry wasn't changed
+    assert store_filename.stat().st_mode & 0o777 == 0o700
+    assert not os.path.samefile(store_filename, output_dir / "bin" / "tool")
+
+
+# ----------------------------------------------------------------------
+def test_RepairModified(installation):
+    original_dir, output_dir, manifest = installation
+
+    (output_dir / "lib" / "data.txt").write_bytes(b"modified\n")
+    (output_dir / "bin" / "tool-link").unlink()
+
+    verify_result = Verify(output_dir, manifest)
+
+    assert verify_result.modified == ["lib/data.txt"]
+    assert verify_result.missing == ["bin/tool-link"]
+
+    # ----------------------------------------------------------------------
+    def Extract(staging_dir, relative_paths):
+        for relative_path in relative_paths:
+            (staging_dir / relative_path).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(original_dir / relative_path, staging_dir / relative_path)
+
+    # ----------------------------------------------------------------------
+
+    assert Repair(output_dir, manifest, verify_result, Extract) == 2
+    assert Verify(output_dir, manifest).is_valid
+
+
+# ----------------------------------------------------------------------
+def test_RepairInvalidExtraction(installation):
+    _, output_dir, manifest = installation
+
+    (output_dir / "lib" / "data.txt").write_bytes(b"modified\n")
+
+    with pytest.raises(Exception, match="was not extracted"):
+        Repair(output_dir, manifest, Verify(output_dir, manifest), _NoExtraction)
+
+    # Nothing was replaced
+    assert (output_dir / "lib" / "data.txt").read_bytes() == b"modified\n"
+
+
+# ----------------------------------------------------------------------
+def test_UpdateManifest(installation):
+    _, output_dir, _ = installation
+
+    (output_dir / "bin" / "tool").write_bytes(b"#!/bin/sh\necho replaced\n")
+    (output_dir / "bin" / "added").write_bytes(b"added\n")
+    (output_dir / "lib" / "data.txt").unlink()
+
+    manifest = UpdateManifest(output_dir, ["bin/tool", "bin/added", "lib/data.txt"])
+
+    assert manifest is not None
+    assert sorted(manifest.files) == ["bin/added", "bin/tool", "bin/tool-link"]
+    assert Verify(output_dir, manifest).is_valid
+
+
+# ----------------------------------------------------------------------
+def test_UpdateManifestWithoutManifest(tmp_path):
+    assert UpdateManifest(tmp_path, ["file"]) is None
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _NoExtraction(staging_dir, relative_paths):  # pylint: disable=unused-argument
+    pass
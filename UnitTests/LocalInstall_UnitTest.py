@@ -0,0 +1,308 @@
+# ----------------------------------------------------------------------
+# |
+# |  LocalInstall_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 13:17:52
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for concurrent installations of archives stored within the repository"""
+
+import io
+import multiprocessing
+import sys
+import tarfile
+
+from pathlib import Path
+
+import pytest
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _archive_pipeline import CreateStagingDirectory, PromoteStagingDirectory, RecoverStagingDirectories  # pylint: disable=wrong-import-position
+from _install_lock import InstallLock                                       # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+_num_processes                              = 4
+
+
+# ----------------------------------------------------------------------
+def test_ConcurrentInstalls(tmp_path):
+    archive_filename = _CreateArchive(tmp_path / "install.tar.gz")
+    output_dir = tmp_path / "install"
+
+    results = _Run(_InstallWithPipeline, archive_filename, output_dir)
+
+    # One process installs the content and the others reuse it
+    assert sorted(results) == [False] * (_num_processes - 1) + [True]
+
+    _VerifyInstallation(tmp_path, archive_filename, output_dir)
+
+
+# ----------------------------------------------------------------------
+def test_ConcurrentInstallerInstalls(tmp_path):
+    pytest.importorskip("Common_Foundation")
+
+    archive_filename = _CreateArchive(tmp_path / "install.tar.gz")
+    output_dir = tmp_path / "install"
+
+    results = _Run(_InstallWithInstaller, archive_filename, output_dir)
+
+    assert sorted(results) == [False] * (_num_processes - 1) + [True]
+
+    _VerifyInstallation(tmp_path, archive_filename, output_dir)
+
+
+# ----------------------------------------------------------------------
+def test_ArchiveWithinOutputDir(tmp_path):
+    pytest.importorskip("Common_Foundation")
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    try:
+        from _installers import LocalArchiveInstaller                       # pylint: disable=import-outside-toplevel
+    finally:
+        del sys.path[0]
+
+    # The archive would be deleted when the installation is promoted
+    with pytest.raises(Exception, match="can't be stored within the output directory"):
+        LocalArchiveInstaller(tmp_path / "install" / "install.7z", tmp_path / "install", "1.0.0")
+
+
+# ----------------------------------------------------------------------
+def test_FailedExtraction(tmp_path):
+    pytest.importorskip("Common_Foundation")
+
+    from Common_Foundation.Streams.DoneManager import DoneManager, DoneManagerFlags  # type: ignore  # pylint: disable=import-error,import-outside-toplevel
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    try:
+        from _installers import LocalArchiveInstaller                       # pylint: disable=import-outside-toplevel
+    finally:
+        del sys.path[0]
+
+    # ----------------------------------------------------------------------
+    class FailingInstaller(LocalArchiveInstaller):
+        # Extracts the content and then reports an error, as 7zip does when extraction fails partway
+        def _Populate(self, dm, staging_dir):
+            install_info = super(FailingInstaller, self)._Populate(dm, staging_dir)
+
+            (staging_dir / "bin" / "tool").unlink()
+            dm.result = -1
+
+            return install_info
+
+    # ----------------------------------------------------------------------
+
+    archive_filename = _CreateArchive(tmp_path / "install.tar.gz")
+    output_dir = tmp_path / "install"
+
+    output_dir.mkdir()
+    (output_dir / "working").write_text("The working installation")
+
+    installer = FailingInstaller(archive_filename, output_dir, "1.0.0")
+
+    with DoneManager.Create(io.StringIO(), "", output_flags=DoneManagerFlags.Create()) as dm:
+        installer.Install(
+            dm,
+            force=False,
+            prompt_for_interactive=False,
+            interactive=None,
+        )
+
+    assert dm.result != 0
+
+    # The working installation is left unchanged and is still out of date
+    assert [child.name for child in output_dir.iterdir()] == ["working"]
+    assert (output_dir / "working").read_text() == "The working installation"
+
+    assert installer.ShouldInstall(None, None)
+
+    assert [child.name for child in tmp_path.iterdir() if ".staging-" in child.name] == []
+
+
+# ----------------------------------------------------------------------
+def test_LegacyInstallation(tmp_path):
+    pytest.importorskip("Common_Foundation")
+
+    from Common_Foundation.Streams.DoneManager import DoneManager, DoneManagerFlags  # type: ignore  # pylint: disable=import-error,import-outside-toplevel
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    try:
+        from _installers import LocalArchiveInstaller                       # pylint: disable=import-outside-toplevel
+    finally:
+        del sys.path[0]
+
+    # Content was previously extracted into the directory that contains the archive
+    legacy_dir = tmp_path / "Linux"
+    legacy_dir.mkdir()
+
+    archive_filename = _CreateArchive(legacy_dir / "install.tar.gz")
+    output_dir = legacy_dir / "install"
+
+    (legacy_dir / "bin").mkdir()
+    (legacy_dir / "bin" / "tool").write_text("The previous installation")
+    (legacy_dir / "bin.lnk").symlink_to("bin")
+    (legacy_dir / "__installed_version__").write_text("1.0.0")
+
+    installer = LocalArchiveInstaller(archive_filename, output_dir, "1.0.0", legacy_output_dir=legacy_dir)
+
+    # ----------------------------------------------------------------------
+    def Install() -> None:
+        with InstallLock(output_dir):
+            with DoneManager.Create(io.StringIO(), "", output_flags=DoneManagerFlags.Create()) as dm:
+                installer.Install(
+                    dm,
+                    force=False,
+                    prompt_for_interactive=False,
+                    interactive=None,
+                )
+
+            assert dm.result == 0
+
+    # ----------------------------------------------------------------------
+
+    Install()
+
+    assert sorted(child.name for child in legacy_dir.iterdir()) == [".install.lock", "install", "install.tar.gz"]
+    assert (output_dir / "bin" / "tool").is_file()
+
+    # The content is only removed when an installation is promoted
+    (legacy_dir / "README.txt").write_text("Added after the installation")
+
+    Install()
+
+    assert (legacy_dir / "README.txt").is_file()
+
+
+# ----------------------------------------------------------------------
+def test_GrcovArchive():
+    pytest.importorskip("Common_Foundation")
+    pytest.importorskip("RepositoryBootstrap")
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    try:
+        from _install_data import GRCOV_VERSIONS                            # pylint: disable=import-outside-toplevel
+    finally:
+        del sys.path[0]
+
+    for install_data in GRCOV_VERSIONS.values():
+        installer = install_data.installer
+
+        assert installer.archive_filename.is_file()
+        assert installer.output_dir.resolve() not in installer.archive_filename.resolve().parents
+        assert installer.legacy_output_dir == installer.archive_filename.parent
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CreateArchive(
+    archive_filename: Path,
+) -> Path:
+    with tarfile.open(archive_filename, "w:gz") as tar:
+        for name, content in [
+            ("bin/tool", b"#!/bin/sh\necho tool\n"),
+            ("share/README.txt", b"The content of the archive\n" * 1000),
+        ]:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mode = 0o755
+
+            tar.addfile(info, io.BytesIO(content))
+
+    return archive_filename
+
+
+# ----------------------------------------------------------------------
+def _Run(
+    func,
+    archive_filename: Path,
+    output_dir: Path,
+) -> list:
+    context = multiprocessing.get_context("spawn")
+
+    with context.Pool(_num_processes) as pool:
+        return pool.starmap(func, [(archive_filename, output_dir)] * _num_processes)
+
+
+# ----------------------------------------------------------------------
+def _VerifyInstallation(
+    root: Path,
+    archive_filename: Path,
+    output_dir: Path,
+) -> None:
+    # The archive survives the installation
+    assert archive_filename.is_file()
+
+    assert (output_dir / "bin" / "tool").is_file()
+    assert (output_dir / "share" / "README.txt").is_file()
+
+    # Nothing is left behind
+    assert [child.name for child in root.iterdir() if ".staging-" in child.name or ".previous-" in child.name] == []
+
+
+# ----------------------------------------------------------------------
+def _InstallWithPipeline(
+    archive_filename: Path,
+    output_dir: Path,
+) -> bool:
+    with InstallLock(output_dir):
+        RecoverStagingDirectories(output_dir)
+
+        if (output_dir / "installed").is_file():
+            return False
+
+        staging_dir = CreateStagingDirectory(output_dir)
+
+        with tarfile.open(archive_filename) as tar:
+            tar.extractall(staging_dir)
+
+        (staging_dir / "installed").touch()
+
+        PromoteStagingDirectory(staging_dir, output_dir)
+
+        return True
+
+
+# ----------------------------------------------------------------------
+def _InstallWithInstaller(
+    archive_filename: Path,
+    output_dir: Path,
+) -> bool:
+    from Common_Foundation.Streams.DoneManager import DoneManager, DoneManagerFlags  # type: ignore  # pylint: disable=import-error,import-outside-toplevel
+
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    try:
+        from _installers import LocalArchiveInstaller                       # pylint: disable=import-outside-toplevel
+    finally:
+        del sys.path[0]
+
+    installer = LocalArchiveInstaller(archive_filename, output_dir, "1.0.0")
+
+    with DoneManager.Create(io.StringIO(), "", output_flags=DoneManagerFlags.Create()) as dm:
+        with InstallLock(output_dir):
+            RecoverStagingDirectories(output_dir)
+
+            should_install = installer.ShouldInstall(None, None)
+
+            installer.Install(
+                dm,
+                force=False,
+                prompt_for_interactive=False,
+                interactive=None,
+            )
+
+    assert dm.result == 0
+    return should_install
@@ -0,0 +1,150 @@
+# ----------------------------------------------------------------------
+# |
+# |  RangedDownload_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 10:03:26
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _ranged_download.py and resumable downloads into the archive cache"""
+
+import hashlib
+import os
+import sys
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from _http_server import Serve, Server
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _archive_cache import ArchiveCache                                     # pylint: disable=wrong-import-position
+from _ranged_download import DownloadFileRanged                             # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+_segment_size                               = 64 * 1024
+_content                                    = os.urandom(4 * _segment_size + 1234)
+_sha256                                     = hashlib.sha256(_content).hexdigest()
+
+
+# ----------------------------------------------------------------------
+def test_Download(tmp_path):
+    destination = tmp_path / "archive.7z"
+
+    with Serve(Server({"archive.7z": _content}, supports_ranges=True)) as server:
+        result = DownloadFileRanged(server.GetUrl("archive.7z"), destination, num_connections=3, segment_size=_segment_size)
+
+    assert result.sha256 == _sha256
+    assert result.num_bytes == len(_content)
+    assert destination.read_bytes() == _content
+
+    assert not destination.with_name("archive.7z.partial").exists()
+    assert not destination.with_name("archive.7z.partial.json").exists()
+
+
+# ----------------------------------------------------------------------
+def test_RangesNotSupported(tmp_path):
+    destination = tmp_path / "archive.7z"
+
+    with Serve(Server({"archive.7z": _content})) as server:
+        result = DownloadFileRanged(server.GetUrl("archive.7z"), destination, num_connections=3, segment_size=_segment_size)
+
+    assert result.sha256 == _sha256
+    assert destination.read_bytes() == _content
+
+
+# ----------------------------------------------------------------------
+def test_DroppedConnections(tmp_path):
+    destination = tmp_path / "archive.7z"
+
+    with Serve(
+        Server(
+            {"archive.7z": _content},
+            supports_ranges=True,
+            drop_after=10000,
+            num_drops=3,
+        ),
+    ) as server:
+        result = DownloadFileRanged(server.GetUrl("archive.7z"), destination, num_connections=2, segment_size=_segment_size)
+
+        # Dropped connections are resumed from the last byte received rather than restarted
+        assert server.num_bytes_sent < len(_content) + 2 * 10000
+
+    assert result.sha256 == _sha256
+    assert destination.read_bytes() == _content
+
+
+# ----------------------------------------------------------------------
+def test_Resume(tmp_path):
+    destination = tmp_path / "archive.7z"
+
+    with Serve(
+        Server(
+            {"archive.7z": _content},
+            supports_ranges=True,
+            unavailable_offsets={_segment_size},
+        ),
+    ) as server:
+        # The second segment can't be downloaded, but the other segments are completed
+        with pytest.raises(Exception):
+            DownloadFileRanged(server.GetUrl("archive.7z"), destination, num_connections=2, segment_size=_segment_size, max_retries=1)
+
+        assert not destination.exists()
+        assert destination.with_name("archive.7z.partial.json").is_file()
+
+        server.unavailable_offsets.clear()
+        num_bytes_sent = server.num_bytes_sent
+
+        result = DownloadFileRanged(server.GetUrl("archive.7z"), destination, num_connections=2, segment_size=_segment_size)
+
+        # Only the incomplete segment is downloaded (plus the 1-byte probe)
+        assert server.num_bytes_sent - num_bytes_sent == _segment_size + 1
+
+    assert result.sha256 == _sha256
+    assert destination.read_bytes() == _content
+
+
+# ----------------------------------------------------------------------
+def test_ConcurrentCacheFetches(tmp_path):
+    cache = ArchiveCache(tmp_path / "cache", 1024 * 1024 * 1024)
+
+    with Serve(
+        Server(
+            {"archive.7z": _content},
+            supports_ranges=True,
+            bytes_per_second=2 * len(_content),
+        ),
+    ) as server:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(cache.Fetch, server.GetUrl("archive.7z"), _sha256)
+                for _ in range(4)
+            ]
+
+            results = [future.result() for future in futures]
+
+        # The archive is downloaded once; the other fetches wait for it and use the cached archive
+        assert server.num_bytes_sent == len(_content) + 1
+
+    assert len({archive_filename for archive_filename, _ in results}) == 1
+    assert sorted(was_cached for _, was_cached in results) == [False, True, True, True]
+
+    archive_filename = results[0][0]
+
+    assert archive_filename.read_bytes() == _content
+    assert [child.name for child in archive_filename.parent.iterdir()] == ["archive.7z"]
@@ -0,0 +1,250 @@
+# ----------------------------------------------------------------------
+# |
+# |  SelfTest_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-20 17:02:44
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _self_test.py"""
+
+import os
+import sys
+import textwrap
+import time
+
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _self_test import RunSelfTests, SELF_TEST_CASES, SelfTestCase          # pylint: disable=wrong-import-position
+from _toolchain_validation import CalculateFingerprint, GetValidatedCases, RecordValidation  # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="The tests use POSIX shell scripts")
+
+
+# ----------------------------------------------------------------------
+# The test programs are shell scripts that the fake compiler copies to the output
+_case                                       = SelfTestCase(
+    "test",
+    """\
+    #!/bin/sh
+    echo "Hello world!"
+    """,
+    [],
+    "Hello world!\n",
+)
+
+
+# ----------------------------------------------------------------------
+def test_KeysAreUnique():
+    assert len({case.key for case in SELF_TEST_CASES}) == len(SELF_TEST_CASES)
+
+
+# ----------------------------------------------------------------------
+def test_KeyStable():
+    assert replace(_case).key == _case.key
+    assert replace(_case, env={"A": "1", "B": "2"}).key == replace(_case, env={"B": "2", "A": "1"}).key
+
+
+# ----------------------------------------------------------------------
+def test_KeyChanges():
+    keys = [
+        _case.key,
+
+        # Env
+        replace(_case, env={"ASAN_OPTIONS": "detect_leaks=0"}).key,
+        replace(_case, env={"ASAN_OPTIONS": "detect_leaks=1"}).key,
+        replace(_case, env={"UBSAN_OPTIONS": "detect_leaks=0"}).key,
+
+        # Timeout
+        replace(_case, timeout=61.0).key,
+        replace(_case, timeout=60.5).key,
+
+        # Other content
+        replace(_case, compile_args=["-O2"]).key,
+        replace(_case, expect_failure=True).key,
+    ]
+
+    assert len(set(keys)) == len(keys)
+
+
+# ----------------------------------------------------------------------
+def test_ToolchainFingerprintChanges(tmp_path):
+    output_dir = tmp_path / "install"
+
+    (output_dir / "bin").mkdir(parents=True)
+    (output_dir / "bin" / "clang").write_bytes(b"clang")
+
+    fingerprint = CalculateFingerprint(output_dir, "17.0.0")
+
+    RecordValidation(output_dir, fingerprint, [_case.key])
+
+    assert _case.key in GetValidatedCases(output_dir, fingerprint)
+
+    # Tests that passed with a different toolchain are run again
+    (output_dir / "bin" / "clang").write_bytes(b"CLANG")
+
+    new_fingerprint = CalculateFingerprint(output_dir, "17.0.0")
+
+    assert new_fingerprint != fingerprint
+    assert GetValidatedCases(output_dir, new_fingerprint) == set()
+
+    # As are tests run for a different version
+    assert GetValidatedCases(output_dir, CalculateFingerprint(output_dir, "17.0.1")) == set()
+
+
+# ----------------------------------------------------------------------
+def test_Passed(tmp_path):
+    compiler = _CreateCompiler(tmp_path)
+
+    results = RunSelfTests(
+        compiler,
+        tmp_path / "working",
+        [
+            _case,
+            replace(_case, name="failed", expected_output="Goodbye"),
+            replace(
+                _case,
+                name="expect_failure",
+                source="#!/bin/sh\necho \"Error: $TEST_VALUE\"\nexit 1\n",
+                expected_output="Error: value",
+                expect_failure=True,
+                env={"TEST_VALUE": "value"},
+            ),
+        ],
+    )
+
+    assert [(result.case.name, result.passed, result.stage) for result in results] == [
+        ("test", True, "run"),
+        ("failed", False, "run"),
+        ("expect_failure", True, "run"),
+    ]
+
+
+# ----------------------------------------------------------------------
+def test_HangingRun(tmp_path):
+    compiler = _CreateCompiler(tmp_path)
+
+    # The test program starts a child process that inherits its output; the child must be terminated
+    # along with the program or reading the output would wait for the child.
+    hanging_case = replace(
+        _case,
+        name="hanging",
+        source="#!/bin/sh\nsleep 30 &\necho \"$!\" > child.pid\nsleep 30\n",
+        timeout=1.0,
+    )
+
+    start_time = time.perf_counter()
+
+    results = RunSelfTests(compiler, tmp_path / "working", [hanging_case, _case])
+
+    assert time.perf_counter() - start_time < 15
+
+    assert [(result.case.name, result.passed, result.stage) for result in results] == [
+        ("hanging", False, "run"),
+        ("test", True, "run"),
+    ]
+
+    assert "did not complete before its timeout" in results[0].output
+
+    # The child process was killed
+    _WaitForExit(int((tmp_path / "working" / "hanging" / "child.pid").read_text()))
+
+
+# ----------------------------------------------------------------------
+def test_HangingCompile(tmp_path):
+    compiler = _CreateCompiler(tmp_path)
+
+    hanging_case = replace(_case, name="hanging", compile_args=["--hang"], timeout=1.0)
+
+    start_time = time.perf_counter()
+
+    results = RunSelfTests(compiler, tmp_path / "working", [hanging_case])
+
+    assert time.perf_counter() - start_time < 15
+
+    assert [(result.case.name, result.passed, result.stage) for result in results] == [
+        ("hanging", False, "compile"),
+    ]
+
+    assert "did not complete before its timeout" in results[0].output
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CreateCompiler(
+    root: Path,
+) -> Path:
+    compiler = root / "clang++"
+
+    compiler.write_text(
+        textwrap.dedent(
+            """\
+            #!/bin/sh
+            while [ $# -gt 0 ]; do
+                case "$1" in
+                    --hang) sleep 30 & sleep 30 ;;
+                    -o) shift; output="$1" ;;
+                    *.cpp) source="$1" ;;
+                esac
+                shift
+            done
+
+            cp "$source" "$output" && chmod +x "$output"
+            """,
+        ),
+    )
+
+    compiler.chmod(0o755)
+
+    return compiler
+
+
+# ----------------------------------------------------------------------
+def _WaitForExit(
+    pid: int,
+) -> None:
+    # The killed process may briefly remain until it is reaped by init
+    deadline = time.perf_counter() + 10
+
+    while time.perf_counter() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return
+
+        if _IsZombie(pid):
+            return
+
+        time.sleep(0.1)
+
+    assert False, pid
+
+
+# ----------------------------------------------------------------------
+def _IsZombie(
+    pid: int,
+) -> bool:
+    try:
+        with open("/proc/{}/stat".format(pid)) as f:
+            return f.read().rsplit(")", 1)[1].split()[0] == "Z"
+    except (FileNotFoundError, IndexError):
+        return False
@@ -0,0 +1,213 @@
+# ----------------------------------------------------------------------
+# |
+# |  ToolchainValidation_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-20 15:32:08
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _toolchain_validation.py"""
+
+import json
+import os
+import sys
+
+from pathlib import Path
+
+import pytest
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _precompiled_headers import PRECOMPILED_DIRNAME                        # pylint: disable=wrong-import-position
+from _toolchain_validation import CalculateFingerprint, GetValidatedCases, RecordValidation, VALIDATION_STAMP_FILENAME  # pylint: disable=wrong-import-position
+
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+def test_Stable(tmp_path):
+    output_dir = _CreateToolchain(tmp_path)
+
+    assert CalculateFingerprint(output_dir, "17.0.0") == CalculateFingerprint(output_dir, "17.0.0")
+    assert CalculateFingerprint(output_dir, "17.0.0") != CalculateFingerprint(output_dir, "18.0.0")
+
+
+# ----------------------------------------------------------------------
+def test_ClangChanged(tmp_path):
+    output_dir = _CreateToolchain(tmp_path)
+
+    fingerprint = CalculateFingerprint(output_dir, "17.0.0")
+
+    # The binary is modified without changing its size or modification time, or the top-level items
+    clang_filename = output_dir / "bin" / "clang-17"
+    clang_stat = clang_filename.stat()
+
+    _WriteInPlace(clang_filename, b"C" * clang_stat.st_size)
+
+    assert CalculateFingerprint(output_dir, "17.0.0") != fingerprint
+
+
+# ----------------------------------------------------------------------
+def test_SmallTopLevelFileChanged(tmp_path):
+    output_dir = _CreateToolchain(tmp_path)
+
+    fingerprint = CalculateFingerprint(output_dir, "17.0.0")
+
+    # Installer version stamps are rewritten with the same size
+    _WriteInPlace(output_dir / ".Common_LLVM.install.json", b'{"version": "17.0.1"}')
+
+    assert CalculateFingerprint(output_dir, "17.0.0") != fingerprint
+
+
+# ----------------------------------------------------------------------
+def test_TopLevelItemAdded(tmp_path):
+    output_dir = _CreateToolchain(tmp_path)
+
+    fingerprint = CalculateFingerprint(output_dir, "17.0.0")
+
+    (output_dir / "share").mkdir()
+
+    assert CalculateFingerprint(output_dir, "17.0.0") != fingerprint
+
+
+# ----------------------------------------------------------------------
+def test_ExcludedItems(tmp_path):
+    output_dir = _CreateToolchain(tmp_path)
+
+    fingerprint = CalculateFingerprint(output_dir, "17.0.0")
+
+    # Content created after validation doesn't change the fingerprint
+    RecordValidation(output_dir, fingerprint, ["case"])
+
+    (output_dir / PRECOMPILED_DIRNAME).mkdir()
+    (output_dir / PRECOMPILED_DIRNAME / "vector.pch").write_bytes(b"pch")
+
+    assert CalculateFingerprint(output_dir, "17.0.0") == fingerprint
+
+    RecordValidation(output_dir, fingerprint, ["case", "other case"])
+    (output_dir / PRECOMPILED_DIRNAME / "vector.pch").write_bytes(b"rebuilt pch")
+
+    assert CalculateFingerprint(output_dir, "17.0.0") == fingerprint
+
+
+# ----------------------------------------------------------------------
+def test_NotInstalled(tmp_path):
+    # Nothing to fingerprint beyond the version
+    assert CalculateFingerprint(tmp_path / "missing", "17.0.0") == CalculateFingerprint(tmp_path / "missing", "17.0.0")
+    assert GetValidatedCases(tmp_path / "missing", "fingerprint") == set()
+
+
+# ----------------------------------------------------------------------
+def test_RecordAndGet(tmp_path):
+    output_dir = _CreateToolchain(tmp_path)
+
+    fingerprint = CalculateFingerprint(output_dir, "17.0.0")
+
+    assert GetValidatedCases(output_dir, fingerprint) == set()
+
+    RecordValidation(output_dir, fingerprint, ["b", "a"])
+
+    assert GetValidatedCases(output_dir, fingerprint) == {"a", "b"}
+    assert [child.name for child in output_dir.iterdir() if child.name.endswith(".tmp")] == []
+
+
+# ----------------------------------------------------------------------
+def test_StaleStamp(tmp_path):
+    output_dir = _CreateToolchain(tmp_path)
+
+    RecordValidation(output_dir, CalculateFingerprint(output_dir, "17.0.0"), ["a"])
+
+    _WriteInPlace(output_dir / "bin" / "clang-17", b"D" * (output_dir / "bin" / "clang-17").stat().st_size)
+
+    # Every case runs again
+    assert GetValidatedCases(output_dir, CalculateFingerprint(output_dir, "17.0.0")) == set()
+
+
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"{ not json",
+        b"\xff\xfe",
+        b"[]",
+        b"null",
+        b'{"cases": ["a"]}',
+        b'{"fingerprint": "@fingerprint@"}',
+        b'{"fingerprint": "@fingerprint@", "cases": 5}',
+        b'{"fingerprint": "@fingerprint@", "cases": "a"}',
+        b'{"fingerprint": "@fingerprint@", "cases": [1, 2]}',
+        b'{"fingerprint": "@fingerprint@", "cases": [["a"]]}',
+    ],
+)
+def test_CorruptStamp(tmp_path, content):
+    output_dir = _CreateToolchain(tmp_path)
+
+    fingerprint = CalculateFingerprint(output_dir, "17.0.0")
+
+    (output_dir / VALIDATION_STAMP_FILENAME).write_bytes(content.replace(b"@fingerprint@", fingerprint.encode("utf-8")))
+
+    assert GetValidatedCases(output_dir, fingerprint) == set()
+
+    # The stamp is replaced once validation completes
+    RecordValidation(output_dir, fingerprint, ["a"])
+
+    assert GetValidatedCases(output_dir, fingerprint) == {"a"}
+
+
+# ----------------------------------------------------------------------
+def test_StampIsDirectory(tmp_path):
+    output_dir = _CreateToolchain(tmp_path)
+
+    (output_dir / VALIDATION_STAMP_FILENAME).mkdir()
+
+    assert GetValidatedCases(output_dir, CalculateFingerprint(output_dir, "17.0.0")) == set()
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _CreateToolchain(
+    root: Path,
+) -> Path:
+    output_dir = root / "install"
+
+    (output_dir / "bin").mkdir(parents=True)
+    (output_dir / "lib").mkdir()
+
+    (output_dir / "bin" / "clang-17").write_bytes(b"clang" * 10000)
+    (output_dir / "bin" / "clang").symlink_to("clang-17")
+
+    (output_dir / ".Common_LLVM.install.json").write_text(json.dumps({"version": "17.0.0"}))
+
+    return output_dir
+
+
+# ----------------------------------------------------------------------
+def _WriteInPlace(
+    filename: Path,
+    content: bytes,
+) -> None:
+    """Writes `content` without changing the file's size, modification time, or inode"""
+
+    file_stat = filename.stat()
+
+    assert len(content) == file_stat.st_size
+
+    with filename.open("r+b") as f:
+        f.write(content)
+
+    os.utime(filename, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+
+    new_stat = filename.stat()
+
+    assert (new_stat.st_size, new_stat.st_mtime_ns, new_stat.st_ino) == (file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino)
@@ -0,0 +1,249 @@
+# ----------------------------------------------------------------------
+# |
+# |  Trace_UnitTest.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-20 13:46:19
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Unit tests for _trace.py"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+
+# ----------------------------------------------------------------------
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _trace import DOWNLOADED_COUNTER, Nested, RecordBytes, Session, Subprocess, TRACE_ENV_VAR  # pylint: disable=wrong-import-position
+
+# Each module in the repository imports its own copy of this module
+del sys.modules["_trace"]
+
+import _trace as other_trace_copy                                           # pylint: disable=wrong-import-position
+
+del sys.modules["_trace"]
+del sys.path[0]
+
+
+# ----------------------------------------------------------------------
+class _DoneManager(object):
+    """Implements the parts of `DoneManager` used by `_trace.py`"""
+
+    # ----------------------------------------------------------------------
+    def __init__(self):
+        self.result                         = 0
+        self.sink                           = io.StringIO()
+
+    # ----------------------------------------------------------------------
+    @contextmanager
+    def Nested(self, heading, *args, **kwargs):                             # pylint: disable=unused-argument
+        nested_dm = _DoneManager()
+
+        yield nested_dm
+
+        self.sink.write(heading)
+
+    # ----------------------------------------------------------------------
+    @contextmanager
+    def YieldStream(self):
+        yield self.sink
+
+
+# ----------------------------------------------------------------------
+_original_nested                            = _DoneManager.__dict__["Nested"]
+
+
+# ----------------------------------------------------------------------
+def test_Disabled(tmp_path, monkeypatch):
+    monkeypatch.delenv(TRACE_ENV_VAR, raising=False)
+
+    dm = _DoneManager()
+
+    with Session("setup", dm):
+        with Nested(dm, "Phase..."):
+            pass
+
+    assert dm.sink.getvalue() == "Phase..."
+    assert list(tmp_path.iterdir()) == []
+
+
+# ----------------------------------------------------------------------
+def test_Session(tmp_path, monkeypatch):
+    monkeypatch.setenv(TRACE_ENV_VAR, str(tmp_path))
+
+    environ = dict(os.environ)
+
+    dm = _DoneManager()
+
+    with Session("setup", dm):
+        # The environment of subprocesses isn't modified
+        assert dict(os.environ) == environ
+
+        # DoneManager isn't modified
+        assert _DoneManager.__dict__["Nested"] is _original_nested
+
+        with Nested(dm, "\nOuter...") as outer_dm:
+            # Blocks that aren't created with `Nested` aren't recorded
+            with outer_dm.Nested("Not traced..."):
+                pass
+
+            with Nested(outer_dm, "Inner...", lambda: "suffix") as inner_dm:
+                # Events recorded by other copies of the module are part of the session
+                other_trace_copy.RecordBytes(DOWNLOADED_COUNTER, 1024)
+
+                inner_dm.result = -1
+
+    assert dict(os.environ) == environ
+
+    events = _ReadTrace(tmp_path)
+
+    assert sorted(event["name"] for event in events if event["cat"] == "phase") == ["Inner...", "Outer...", "setup"]
+    assert [event["args"]["result"] for event in events if event["name"] == "Inner..."] == [-1]
+
+    assert "Inner..." in dm.sink.getvalue()
+    assert "Downloaded" in dm.sink.getvalue()
+
+    # Events aren't recorded once the session ends
+    RecordBytes(DOWNLOADED_COUNTER, 1024)
+
+    with Nested(dm, "After..."):
+        pass
+
+    assert len(_ReadTrace(tmp_path)) == len(events)
+
+
+# ----------------------------------------------------------------------
+def test_NestedSessions(tmp_path, monkeypatch):
+    monkeypatch.setenv(TRACE_ENV_VAR, str(tmp_path))
+
+    dm = _DoneManager()
+
+    with Session("setup", dm):
+        with other_trace_copy.Session("activate", dm):
+            with Nested(dm, "Activating..."):
+                pass
+
+        # The outer session is still active
+        with Nested(dm, "After activation..."):
+            pass
+
+    assert [child.name for child in tmp_path.iterdir() if child.suffix == ".json"] == [
+        next(child.name for child in tmp_path.iterdir() if child.name.startswith("setup-")),
+    ]
+
+    assert sorted(event["name"] for event in _ReadTrace(tmp_path) if event["cat"] == "phase") == [
+        "Activating...",
+        "After activation...",
+        "setup",
+    ]
+
+
+# ----------------------------------------------------------------------
+def test_ConcurrentThreads(tmp_path, monkeypatch):
+    monkeypatch.setenv(TRACE_ENV_VAR, str(tmp_path))
+
+    dm = _DoneManager()
+
+    # ----------------------------------------------------------------------
+    def Work(
+        index: int,
+    ) -> None:
+        thread_dm = _DoneManager()
+
+        with Nested(thread_dm, "Thread {}...".format(index)):
+            pass
+
+    # ----------------------------------------------------------------------
+
+    with Session("setup", dm):
+        threads = [threading.Thread(target=Work, args=(index, )) for index in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+    assert sorted(event["name"] for event in _ReadTrace(tmp_path) if event["name"].startswith("Thread ")) == [
+        "Thread {}...".format(index) for index in range(4)
+    ]
+
+
+# ----------------------------------------------------------------------
+def test_SubprocessEnvironment(tmp_path, monkeypatch):
+    monkeypatch.setenv(TRACE_ENV_VAR, str(tmp_path))
+
+    # Records bytes in a subprocess and reports whether its own subprocesses would be part of the session
+    script = tmp_path / "script.py"
+    script.write_text(
+        "\n".join(
+            [
+                "import os, sys",
+                "sys.path.insert(0, {!r})".format(str(Path(__file__).parent.parent)),
+                "import _trace",
+                "_trace.RecordBytes(_trace.DOWNLOADED_COUNTER, 2048)",
+                "sys.stdout.write(str(any(name.startswith('_COMMON_LLVM_TRACE') for name in os.environ)))",
+            ],
+        ),
+    )
+
+    dm = _DoneManager()
+
+    with Session("setup", dm):
+        # Subprocesses aren't part of the session by default
+        result = subprocess.run([sys.executable, str(script)], stdout=subprocess.PIPE, check=True)
+        assert result.stdout == b"False"
+
+        with Subprocess("script") as trace:
+            env = trace.CreateEnvironment()
+            assert env is not None
+
+            result = subprocess.run([sys.executable, str(script)], stdout=subprocess.PIPE, env=env, check=True)
+
+        # The subprocess doesn't pass the session to its own subprocesses
+        assert result.stdout == b"False"
+
+    assert Subprocess.CreateEnvironment({"NAME": "value"}) == {"NAME": "value"}
+
+    downloaded = [event for event in _ReadTrace(tmp_path) if event["name"] == DOWNLOADED_COUNTER]
+
+    assert [event["args"]["bytes"] for event in downloaded] == [2048]
+    assert downloaded[0]["pid"] != os.getpid()
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _ReadTrace(
+    trace_dir: Path,
+) -> list:
+    trace_filenames = [child for child in trace_dir.iterdir() if child.suffix == ".json"]
+    assert len(trace_filenames) == 1, trace_filenames
+
+    with trace_filenames[0].open() as f:
+        return json.load(f)["traceEvents"]
+
+
+# ----------------------------------------------------------------------
+@pytest.fixture(autouse=True)
+def _VerifyDoneManager():
+    yield
+
+    assert _DoneManager.__dict__["Nested"] is _original_nested
@@ -0,0 +1,171 @@
+# ----------------------------------------------------------------------
+# |
+# |  _http_server.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 08:41:12
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Local HTTP server used by the tests to serve archives"""
+
+import re
+import threading
+import time
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Set
+
+
+# ----------------------------------------------------------------------
+@dataclass
+class Server(object):
+    """\
+    Serves in-memory content. Range requests are only honored when `supports_ranges` is set;
+    `bytes_per_second` throttles responses, `drop_after` closes the first `num_drops` responses
+    after that many bytes have been written, and Range requests that start at an offset in
+    `unavailable_offsets` fail.
+    """
+
+    content: Dict[str, bytes]
+    supports_ranges: bool                   = False
+    bytes_per_second: Optional[int]         = None
+    drop_after: Optional[int]               = None
+    num_drops: int                          = 0
+    unavailable_offsets: Set[int]           = field(default_factory=set)
+
+    url: str                                = field(init=False, default="")
+    requests: List[str]                     = field(init=False, default_factory=list)
+    num_bytes_sent: int                     = field(init=False, default=0)
+
+    _lock: threading.Lock                   = field(init=False, default_factory=threading.Lock)
+
+    # ----------------------------------------------------------------------
+    def GetUrl(
+        self,
+        name: str,
+    ) -> str:
+        return "{}/{}".format(self.url, name)
+
+    # ----------------------------------------------------------------------
+    def _ShouldDrop(self) -> bool:
+        with self._lock:
+            if self.drop_after is None or self.num_drops <= 0:
+                return False
+
+            self.num_drops -= 1
+            return True
+
+    # ----------------------------------------------------------------------
+    def _OnSent(
+        self,
+        num_bytes: int,
+    ) -> None:
+        with self._lock:
+            self.num_bytes_sent += num_bytes
+
+
+# ----------------------------------------------------------------------
+@contextmanager
+def Serve(
+    server: Server,
+) -> Iterator[Server]:
+    # ----------------------------------------------------------------------
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        # ----------------------------------------------------------------------
+        def do_GET(self):  # pylint: disable=invalid-name
+            name = self.path.lstrip("/")
+
+            with server._lock:  # pylint: disable=protected-access
+                server.requests.append("{} {}".format(self.headers.get("Range", "-"), name))
+
+            content = server.content.get(name)
+            if content is None:
+                self.send_error(404)
+                return
+
+            start = 0
+            end = len(content) - 1
+
+            range_header = self.headers.get("Range")
+            match = _range_regex.match(range_header) if range_header and server.supports_ranges else None
+
+            if match:
+                start = int(match.group("start"))
+
+                if start in server.unavailable_offsets:
+                    self.send_error(503)
+                    return
+
+                if match.group("end"):
+                    end = min(int(match.group("end")), end)
+
+                self.send_response(206)
+                self.send_header("Content-Range", "bytes {}-{}/{}".format(start, end, len(content)))
+                self.send_header("ETag", '"{}"'.format(hash(content)))
+            else:
+                self.send_response(200)
+
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+
+            body = content[start:end + 1]
+            drop_after = server.drop_after if len(body) > 1 and server._ShouldDrop() else None  # pylint: disable=protected-access
+
+            offset = 0
+            while offset < len(body):
+                chunk = body[offset:offset + 8192]
+
+                if drop_after is not None and offset + len(chunk) > drop_after:
+                    chunk = chunk[:max(0, drop_after - offset)]
+
+                    self.wfile.write(chunk)
+                    server._OnSent(len(chunk))  # pylint: disable=protected-access
+
+                    self.close_connection = True
+                    return
+
+                self.wfile.write(chunk)
+                server._OnSent(len(chunk))  # pylint: disable=protected-access
+
+                offset += len(chunk)
+
+                if server.bytes_per_second:
+                    time.sleep(len(chunk) / server.bytes_per_second)
+
+        # ----------------------------------------------------------------------
+        def log_message(self, *args, **kwargs):  # pylint: disable=arguments-differ
+            pass
+
+    # ----------------------------------------------------------------------
+
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    http_server.daemon_threads = True
+
+    server.url = "http://127.0.0.1:{}".format(http_server.server_address[1])
+
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield server
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
+        thread.join()
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_range_regex                                = re.compile(r"^bytes=(?P<start>\d+)-(?P<end>\d*)$")
@@ -0,0 +1,161 @@
+# ----------------------------------------------------------------------
+# |
+# |  _activation_cache.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-17 15:37:02
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Persisted results of activation, which allow activation to skip directory scanning and installation checks"""
+
+import hashlib
+import json
+import os
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# ----------------------------------------------------------------------
+ACTIVATION_CACHE_FILENAME                   = "Common_LLVM.activation.json"
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class ActivationCacheEntry(object):
+    tool_dirs: List[Path]                   # Directories whose content was validated during activation
+    path_dirs: List[str]                    # Directories added to the path
+    augmented_vars: Dict[str, str]          # Environment variables augmented with the values
+    set_vars: Dict[str, str]                # Environment variables set to the values
+
+
+# ----------------------------------------------------------------------
+def CreateActivationCacheKey(
+    configuration: str,
+    version_specs: Any,
+    *options: Any,
+) -> str:
+    """`options` are values (for example, those read from environment variables) that change the results of activation"""
+
+    return hashlib.sha256("|".join(str(value) for value in (configuration, version_specs) + options).encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------------------
+def LoadActivationCacheEntry(
+    cache_filename: Path,
+    key: str,
+) -> Optional[ActivationCacheEntry]:
+    """Returns the entry associated with the key if it exists and the tool directories haven't changed since it was saved"""
+
+    try:
+        with cache_filename.open() as f:
+            content = json.load(f)[key]
+
+        # Entries that are corrupt are created again by a full activation
+        if (
+            not _IsStringList(content["tool_dirs"])
+            or not _IsStringList(content["path_dirs"])
+            or not _IsStringDict(content["augmented_vars"])
+            or not _IsStringDict(content["set_vars"])
+        ):
+            return None
+
+        tool_dirs = [Path(tool_dir) for tool_dir in content["tool_dirs"]]
+
+        if content["stamp"] != _CalculateStamp(tool_dirs):
+            return None
+
+        return ActivationCacheEntry(
+            tool_dirs,
+            content["path_dirs"],
+            content["augmented_vars"],
+            content["set_vars"],
+        )
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+# ----------------------------------------------------------------------
+def SaveActivationCacheEntry(
+    cache_filename: Path,
+    key: str,
+    entry: ActivationCacheEntry,
+) -> None:
+    try:
+        with cache_filename.open() as f:
+            content = json.load(f)
+
+        if not isinstance(content, dict):
+            content = {}
+
+    except (OSError, ValueError):
+        content = {}
+
+    content[key] = {
+        "tool_dirs": [str(tool_dir) for tool_dir in entry.tool_dirs],
+        "stamp": _CalculateStamp(entry.tool_dirs),
+        "path_dirs": entry.path_dirs,
+        "augmented_vars": entry.augmented_vars,
+        "set_vars": entry.set_vars,
+    }
+
+    cache_filename.parent.mkdir(parents=True, exist_ok=True)
+
+    temp_filename = cache_filename.with_name(cache_filename.name + ".tmp")
+
+    with temp_filename.open("w") as f:
+        json.dump(content, f)
+
+    os.replace(temp_filename, cache_filename)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _IsStringList(
+    value: Any,
+) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+# ----------------------------------------------------------------------
+def _IsStringDict(
+    value: Any,
+) -> bool:
+    return isinstance(value, dict) and all(isinstance(item, str) for item in value.values())
+
+
+# ----------------------------------------------------------------------
+def _CalculateStamp(
+    tool_dirs: List[Path],
+) -> str:
+    """\
+    Calculates a stamp based on the identity of each tool directory and its top-level items; any
+    installation (which adds, removes, renames, or rewrites top-level items) changes the stamp.
+    """
+
+    hasher = hashlib.sha256()
+
+    for tool_dir in tool_dirs:
+        stat = tool_dir.stat()
+
+        hasher.update("{}|{}|{}\n".format(tool_dir, stat.st_ino, stat.st_mtime_ns).encode("utf-8"))
+
+        with os.scandir(tool_dir) as it:
+            for item in sorted(it, key=lambda item: item.name):
+                stat = item.stat(follow_symlinks=False)
+
+                hasher.update(
+                    "{}|{}|{}|{}\n".format(item.name, stat.st_ino, stat.st_size, stat.st_mtime_ns).encode("utf-8"),
+                )
+
+    return hasher.hexdigest()
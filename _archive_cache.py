@@ -0,0 +1,308 @@
+# ----------------------------------------------------------------------
+# |
+# |  _archive_cache.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-17 09:12:41
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Host-wide, content-addressed cache for downloaded archives"""
+
+import os
+import re
+import shutil
+import sys
+import threading
+import uuid
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+
+# ----------------------------------------------------------------------
+from _archive_pipeline import DownloadFile
+del sys.modules["_archive_pipeline"]
+
+from _install_lock import InstallLock
+del sys.modules["_install_lock"]
+
+from _ranged_download import DownloadFileRanged
+del sys.modules["_ranged_download"]
+
+
+# ----------------------------------------------------------------------
+# Directory used to store archives shared by all enlistments on the host; the cache is disabled if this
+# value isn't defined.
+ARCHIVE_CACHE_ENV_VAR                       = "COMMON_LLVM_ARCHIVE_CACHE"
+
+# Maximum size of the cache (e.g. "20G", "512M", "1073741824"); the least recently used archives are
+# evicted when the cache grows beyond this size.
+ARCHIVE_CACHE_MAX_SIZE_ENV_VAR              = "COMMON_LLVM_ARCHIVE_CACHE_MAX_SIZE"
+
+DEFAULT_MAX_SIZE                            = 20 * 1024 * 1024 * 1024
+
+
+# ----------------------------------------------------------------------
+@dataclass
+class ArchiveCacheStats(object):
+    hits: int                               = 0
+    misses: int                             = 0
+    evictions: int                          = 0
+    evicted_bytes: int                      = 0
+
+    # ----------------------------------------------------------------------
+    def __str__(self) -> str:
+        return "{} hit(s), {} miss(es), {} eviction(s) ({} bytes)".format(
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.evicted_bytes,
+        )
+
+
+# ----------------------------------------------------------------------
+class ArchiveCache(object):
+    """\
+    Archives are stored by sha256 at `<root>/<sha256[:2]>/<sha256>/<filename>`. The modification
+    time of an archive is updated each time that it is used, and that time is used to determine which
+    archives are evicted when the cache exceeds its maximum size.
+    """
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def FromEnvironment(cls) -> Optional["ArchiveCache"]:
+        root = os.getenv(ARCHIVE_CACHE_ENV_VAR)
+        if not root:
+            return None
+
+        max_size = os.getenv(ARCHIVE_CACHE_MAX_SIZE_ENV_VAR)
+
+        return cls(
+            Path(root),
+            DEFAULT_MAX_SIZE if max_size is None else ParseSize(max_size),
+        )
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        root: Path,
+        max_size: int,
+    ):
+        self.root                           = root
+        self.max_size                       = max_size
+
+        self._stats                         = ArchiveCacheStats()
+        self._stats_lock                    = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    @property
+    def stats(self) -> ArchiveCacheStats:
+        with self._stats_lock:
+            return ArchiveCacheStats(**self._stats.__dict__)
+
+    # ----------------------------------------------------------------------
+    def GetArchiveFilename(
+        self,
+        sha256: str,
+        filename: str,
+    ) -> Path:
+        sha256 = sha256.lower()
+        return self.root / sha256[:2] / sha256 / filename
+
+    # ----------------------------------------------------------------------
+    def Lookup(
+        self,
+        sha256: str,
+        filename: str,
+    ) -> Optional[Path]:
+        """Returns the cached archive (updating its use time) or None if it doesn't exist in the cache"""
+
+        archive_filename = self.GetArchiveFilename(sha256, filename)
+
+        is_cached = self._Touch(archive_filename)
+
+        self._RecordLookup(is_cached)
+
+        return archive_filename if is_cached else None
+
+    # ----------------------------------------------------------------------
+    def Fetch(
+        self,
+        url: str,
+        sha256: str,
+        *,
+        on_chunk: Optional[Callable[[bytes], None]]=None,
+    ) -> Tuple[Path, bool]:
+        """\
+        Returns the cached archive and a flag indicating if it was found in the cache, downloading it
+        if necessary. `on_chunk` is only invoked when the archive is downloaded.
+        """
+
+        filename = url.rsplit("/", 1)[-1] or "archive"
+
+        archive_filename = self.GetArchiveFilename(sha256, filename)
+
+        if self._Touch(archive_filename):
+            self._RecordLookup(True)
+            return archive_filename, True
+
+        # Processes fetching the same archive are serialized so that they don't write to the same
+        # resumable download; processes that wait use the archive downloaded by the lock holder (which
+        # is counted as a hit).
+        with InstallLock(archive_filename.parent):
+            is_cached = self._Touch(archive_filename)
+
+            self._RecordLookup(is_cached)
+
+            if is_cached:
+                return archive_filename, True
+
+            self._Download(url, sha256, archive_filename, on_chunk)
+
+        self.Evict(archive_filename)
+
+        return archive_filename, False
+
+    # ----------------------------------------------------------------------
+    def Evict(
+        self,
+        keep: Optional[Path]=None,
+    ) -> None:
+        """Removes the least recently used archives until the cache is within its maximum size"""
+
+        entries: List[Tuple[float, int, Path]] = []
+        total_size = 0
+
+        for archive_filename in self.root.glob("*/*/*"):
+            # Skip in-progress downloads
+            if ".tmp" in archive_filename.suffixes or not archive_filename.is_file():
+                continue
+
+            try:
+                stat = archive_filename.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, archive_filename))
+            total_size += stat.st_size
+
+        entries.sort()
+
+        for _, size, archive_filename in entries:
+            if total_size <= self.max_size:
+                break
+
+            if archive_filename == keep:
+                continue
+
+            # Entries that are locked are being downloaded or validated by another process
+            try:
+                with InstallLock(archive_filename.parent, timeout=0):
+                    shutil.rmtree(archive_filename.parent, ignore_errors=True)
+            except Exception:                                               # pylint: disable=broad-except
+                continue
+
+            total_size -= size
+
+            with self._stats_lock:
+                self._stats.evictions += 1
+                self._stats.evicted_bytes += size
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _Touch(
+        archive_filename: Path,
+    ) -> bool:
+        """Updates the use time of an archive; returns False if it doesn't exist in the cache"""
+
+        try:
+            os.utime(archive_filename)
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    # ----------------------------------------------------------------------
+    def _RecordLookup(
+        self,
+        is_cached: bool,
+    ) -> None:
+        with self._stats_lock:
+            if is_cached:
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _Download(
+        url: str,
+        sha256: str,
+        archive_filename: Path,
+        on_chunk: Optional[Callable[[bytes], None]],
+    ) -> None:
+        filename = archive_filename.name
+
+        archive_filename.parent.mkdir(parents=True, exist_ok=True)
+
+        if on_chunk is None:
+            # Ranged downloads use a well-known name so that an interrupted download can be resumed
+            temp_filename = archive_filename.parent / "{}.download.tmp".format(filename)
+        else:
+            # Download to a unique name so that concurrent processes don't step on each other
+            temp_filename = archive_filename.parent / "{}.{}.tmp".format(filename, uuid.uuid4().hex)
+
+        try:
+            if on_chunk is None:
+                result = DownloadFileRanged(url, temp_filename)
+            else:
+                result = DownloadFile(url, temp_filename, on_chunk=on_chunk)
+
+            if result.sha256 != sha256.lower():
+                raise Exception(
+                    "The content downloaded from '{}' does not match the expected sha256 ('{}' != '{}').".format(
+                        url,
+                        result.sha256,
+                        sha256.lower(),
+                    ),
+                )
+
+            os.replace(temp_filename, archive_filename)
+
+        finally:
+            temp_filename.unlink(missing_ok=True)
+
+            if not archive_filename.is_file():
+                try:
+                    archive_filename.parent.rmdir()
+                except OSError:
+                    pass
+
+
+# ----------------------------------------------------------------------
+def ParseSize(
+    value: str,
+) -> int:
+    """Converts strings like "20G" or "512M" into a number of bytes"""
+
+    match = _size_regex.match(value.strip())
+    if not match:
+        raise Exception("'{}' is not a valid size.".format(value))
+
+    return int(float(match.group("value")) * 1024 ** "BKMGT".index((match.group("units") or "B").upper()))
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_size_regex                                 = re.compile(r"^(?P<value>\d+(?:\.\d+)?)\s*(?P<units>[BKMGTbkmgt])?[Bb]?$")
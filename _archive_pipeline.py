@@ -0,0 +1,365 @@
+# ----------------------------------------------------------------------
+# |
+# |  _archive_pipeline.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-17 11:02:55
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Single-pass download, hash, and extraction of archives"""
+
+import hashlib
+import os
+import queue
+import shutil
+import sys
+import tarfile
+import threading
+import urllib.request
+import uuid
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+
+# ----------------------------------------------------------------------
+from _trace import DOWNLOADED_COUNTER, EXTRACTED_COUNTER, RecordBytes
+del sys.modules["_trace"]
+
+
+# ----------------------------------------------------------------------
+CHUNK_SIZE                                  = 1024 * 1024
+
+# Files committed to the repository within an output directory (for example, a README that explains
+# that the directory is populated during setup); these files survive promotion of a staging directory.
+PRESERVED_FILENAMES: Tuple[str, ...]        = ("README.md", )
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class DownloadResult(object):
+    sha256: str
+    num_bytes: int
+
+
+# ----------------------------------------------------------------------
+def IsStreamable(
+    filename: str,
+) -> bool:
+    """Returns True if the archive can be extracted while it is being downloaded"""
+
+    return filename.endswith(_STREAMABLE_SUFFIXES)
+
+
+# ----------------------------------------------------------------------
+def DownloadFile(
+    url: str,
+    destination: Optional[Path],
+    *,
+    on_chunk: Optional[Callable[[bytes], None]]=None,
+) -> DownloadResult:
+    """\
+    Downloads the content at `url`, calculating its sha256 as the bytes arrive. The content is
+    written to `destination` (if provided) and sent to `on_chunk` (if provided) in the same pass.
+    """
+
+    hasher = hashlib.sha256()
+    num_bytes = 0
+
+    with urllib.request.urlopen(url) as response:
+        with (destination.open("wb") if destination is not None else _NullFile()) as f:
+            while True:
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                hasher.update(chunk)
+                num_bytes += len(chunk)
+
+                f.write(chunk)
+
+                if on_chunk is not None:
+                    on_chunk(chunk)
+
+    RecordBytes(DOWNLOADED_COUNTER, num_bytes)
+
+    return DownloadResult(hasher.hexdigest(), num_bytes)
+
+
+# ----------------------------------------------------------------------
+class StreamingExtractor(object):
+    """\
+    Extracts a tar stream (optionally compressed with gzip, bzip2, or xz) on a background thread as
+    chunks are written to it. Memory usage is bounded by the number of chunks that can be queued,
+    regardless of the size of the archive.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        output_dir: Path,
+        max_queued_chunks: int=16,
+    ):
+        self.output_dir                     = output_dir
+        self.num_bytes                      = 0         # Size of the files extracted (available after `Close`)
+
+        self._queue: queue.Queue[Optional[bytes]]           = queue.Queue(maxsize=max_queued_chunks)
+        self._aborted                       = threading.Event()
+        self._exception: Optional[BaseException]            = None
+
+        self._thread                        = threading.Thread(target=self._Extract, daemon=True)
+        self._thread.start()
+
+    # ----------------------------------------------------------------------
+    def Write(
+        self,
+        chunk: bytes,
+    ) -> None:
+        while True:
+            if self._exception is not None:
+                raise Exception("Extraction into '{}' failed.".format(self.output_dir)) from self._exception
+
+            try:
+                self._queue.put(chunk, timeout=0.1)
+                break
+            except queue.Full:
+                if not self._thread.is_alive():
+                    raise Exception("Extraction into '{}' terminated unexpectedly.".format(self.output_dir))
+
+    # ----------------------------------------------------------------------
+    def Close(self) -> None:
+        """Waits for extraction to complete, raising any exception encountered during extraction"""
+
+        self.Write(b"")
+        self._thread.join()
+
+        if self._exception is not None:
+            raise Exception("Extraction into '{}' failed.".format(self.output_dir)) from self._exception
+
+        RecordBytes(EXTRACTED_COUNTER, self.num_bytes)
+
+    # ----------------------------------------------------------------------
+    def Abort(self) -> None:
+        self._aborted.set()
+
+        # Unblock the reader (if it is waiting)
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+        self._thread.join()
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Extract(self) -> None:
+        try:
+            with tarfile.open(fileobj=_QueueReader(self._queue, self._aborted), mode="r|*") as tar:  # type: ignore
+                ExtractTar(tar, self.output_dir)
+
+                self.num_bytes = sum(member.size for member in tar.getmembers() if member.isfile())
+
+        except BaseException as ex:                                         # pylint: disable=broad-except
+            # Writers check for this value while waiting for space in the queue
+            self._exception = ex
+
+
+# ----------------------------------------------------------------------
+def ExtractTar(
+    tar: tarfile.TarFile,
+    output_dir: Path,
+    *,
+    members: Optional[Iterable[tarfile.TarInfo]]=None,     # All members are extracted if None
+) -> None:
+    """\
+    Extracts the members of a tar archive (which may be a stream) into `output_dir`, raising an
+    exception for members that would be written outside of it.
+
+    Archives are extracted before their digests are verified when they are streamed, so the members
+    must be validated on versions of python that don't provide `tarfile.data_filter`.
+    """
+
+    if hasattr(tarfile, "data_filter"):
+        tar.extractall(output_dir, members=members, filter="data")  # type: ignore  # pylint: disable=unexpected-keyword-arg
+        return
+
+    tar.extractall(output_dir, members=_ValidateTarMembers(tar if members is None else members, output_dir))
+
+
+# ----------------------------------------------------------------------
+def CreateStagingDirectory(
+    output_dir: Path,
+) -> Path:
+    """Creates a directory that is a sibling of `output_dir`, which ensures that promotion is a rename on the same volume"""
+
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+
+    staging_dir = output_dir.parent / ".{}.staging-{}".format(output_dir.name, uuid.uuid4().hex)
+    staging_dir.mkdir()
+
+    return staging_dir
+
+
+# ----------------------------------------------------------------------
+def PromoteStagingDirectory(
+    staging_dir: Path,
+    output_dir: Path,
+) -> None:
+    """Replaces `output_dir` with the content of `staging_dir`"""
+
+    if output_dir.exists():
+        for preserved_filename in PRESERVED_FILENAMES:
+            source = output_dir / preserved_filename
+            dest = staging_dir / preserved_filename
+
+            if source.is_file() and not dest.exists():
+                shutil.copy2(source, dest)
+
+        previous_dir = output_dir.parent / ".{}.previous-{}".format(output_dir.name, uuid.uuid4().hex)
+
+        os.replace(output_dir, previous_dir)
+        os.replace(staging_dir, output_dir)
+
+        shutil.rmtree(previous_dir, ignore_errors=True)
+
+    else:
+        os.replace(staging_dir, output_dir)
+
+
+# ----------------------------------------------------------------------
+def RecoverStagingDirectories(
+    output_dir: Path,
+) -> None:
+    """\
+    Removes staging directories left behind by interrupted installations and restores the previous
+    output directory if a process was interrupted during promotion. Only invoke this function while
+    holding the install lock for `output_dir`.
+    """
+
+    if not output_dir.parent.is_dir():
+        return
+
+    staging_prefix = ".{}.staging-".format(output_dir.name)
+    previous_prefix = ".{}.previous-".format(output_dir.name)
+
+    for item in output_dir.parent.iterdir():
+        if item.name.startswith(previous_prefix) and not output_dir.exists():
+            os.replace(item, output_dir)
+        elif item.name.startswith(staging_prefix) or item.name.startswith(previous_prefix):
+            shutil.rmtree(item, ignore_errors=True)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_STREAMABLE_SUFFIXES                        = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+
+# ----------------------------------------------------------------------
+def _ValidateTarMembers(
+    members: Iterable[tarfile.TarInfo],
+    output_dir: Path,
+) -> Iterator[tarfile.TarInfo]:
+    """\
+    Yields members that can be extracted within `output_dir`. Each member is validated immediately
+    before it is extracted, so links created by previous members are taken into account.
+    """
+
+    root = os.path.realpath(output_dir)
+
+    # ----------------------------------------------------------------------
+    def IsWithinRoot(
+        path: str,
+    ) -> bool:
+        return os.path.commonpath([root, os.path.realpath(path)]) == root
+
+    # ----------------------------------------------------------------------
+
+    for member in members:
+        if os.path.isabs(member.name) or member.name.startswith(("/", "\\")):
+            raise Exception("The tar member '{}' has an absolute path.".format(member.name))
+
+        dest = os.path.join(root, member.name)
+
+        if not IsWithinRoot(dest):
+            raise Exception("The tar member '{}' would be extracted outside of '{}'.".format(member.name, output_dir))
+
+        if member.issym():
+            if os.path.isabs(member.linkname) or not IsWithinRoot(os.path.join(os.path.dirname(dest), member.linkname)):
+                raise Exception("The tar member '{}' links outside of '{}' ('{}').".format(member.name, output_dir, member.linkname))
+
+        elif member.islnk():
+            if os.path.isabs(member.linkname) or not IsWithinRoot(os.path.join(root, member.linkname)):
+                raise Exception("The tar member '{}' links outside of '{}' ('{}').".format(member.name, output_dir, member.linkname))
+
+        elif not (member.isfile() or member.isdir()):
+            raise Exception("The tar member '{}' is not a file, directory, or link.".format(member.name))
+
+        yield member
+
+
+# ----------------------------------------------------------------------
+class _NullFile(object):
+    # ----------------------------------------------------------------------
+    def __enter__(self):
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, *args):
+        pass
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def write(data: bytes) -> int:
+        return len(data)
+
+
+# ----------------------------------------------------------------------
+class _QueueReader(object):
+    """File-like object that reads chunks from a queue; an empty chunk indicates the end of the stream"""
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        source: "queue.Queue[Optional[bytes]]",
+        aborted: threading.Event,
+    ):
+        self._source                        = source
+        self._aborted                       = aborted
+
+        self._buffer                        = memoryview(b"")
+        self._is_complete                   = False
+
+    # ----------------------------------------------------------------------
+    def read(
+        self,
+        size: int=-1,
+    ) -> bytes:
+        if not self._buffer and not self._is_complete:
+            chunk = self._source.get()
+
+            if chunk is None or self._aborted.is_set():
+                raise Exception("Extraction was aborted.")
+
+            if not chunk:
+                self._is_complete = True
+            else:
+                self._buffer = memoryview(chunk)
+
+        if size < 0 or size >= len(self._buffer):
+            result = self._buffer
+            self._buffer = memoryview(b"")
+        else:
+            result = self._buffer[:size]
+            self._buffer = self._buffer[size:]
+
+        return result.tobytes()
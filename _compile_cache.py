@@ -0,0 +1,693 @@
+# ----------------------------------------------------------------------
+# |
+# |  _compile_cache.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 20:11:58
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Compilation cache for clang and clang++.
+
+When `COMMON_LLVM_COMPILE_CACHE` is "1", activation puts wrappers for `clang` and `clang++` in front of
+the toolchain's compilers. Each compilation of a single source file to an object file is keyed by the
+content of the compiler, the command line, the working directory, and the preprocessed source; the
+object file (along with its dependency file and diagnostics) is restored from the cache when the key
+has been seen before. All other invocations (for example, linking) are passed to the compiler.
+
+Entries are stored at `<cache_dir>/<key[:2]>/<key>/`, and the least recently used entries are evicted
+when the cache exceeds its maximum size.
+
+This module only depends on the python standard library, as it is invoked for every compilation.
+
+Usage:
+    python _compile_cache.py <compiler> <arg> [<arg> ...]
+    python _compile_cache.py --show-stats | --zero-stats | --clear
+"""
+
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# The wrappers are shell scripts, so the cache is only used on POSIX systems (although this module is
+# imported during activation on all systems).
+if os.name != "nt":
+    import fcntl
+
+
+# ----------------------------------------------------------------------
+# Set this environment variable to "1" before activation to put the compilation cache in front of the
+# compilers.
+COMPILE_CACHE_ENV_VAR                       = "COMMON_LLVM_COMPILE_CACHE"
+
+# Directory used to store cached objects (defaults to `$XDG_CACHE_HOME/Common_LLVM/compile_cache`)
+COMPILE_CACHE_DIR_ENV_VAR                   = "COMMON_LLVM_COMPILE_CACHE_DIR"
+
+# Maximum size of the cache (e.g. "5G", "512M", "1073741824")
+COMPILE_CACHE_MAX_SIZE_ENV_VAR              = "COMMON_LLVM_COMPILE_CACHE_MAX_SIZE"
+
+DEFAULT_MAX_SIZE                            = 5 * 1024 * 1024 * 1024
+
+WRAPPED_COMPILERS                           = ["clang", "clang++"]
+
+# Name of the wrapper that manages the cache (for example, `compile_cache --show-stats`)
+COMMAND_NAME                                = "compile_cache"
+
+
+# ----------------------------------------------------------------------
+@dataclass
+class CompileCacheStats(object):
+    hits: int                               = 0
+    misses: int                             = 0
+    uncacheable: int                        = 0
+    evictions: int                          = 0
+    evicted_bytes: int                      = 0
+    size: int                               = 0
+
+    # ----------------------------------------------------------------------
+    def __str__(self) -> str:
+        num_cacheable = self.hits + self.misses
+
+        return "{} hit(s), {} miss(es) ({:.1f}% hit rate), {} uncacheable, {} eviction(s) ({} bytes)".format(
+            self.hits,
+            self.misses,
+            self.hits / num_cacheable * 100 if num_cacheable else 0.0,
+            self.uncacheable,
+            self.evictions,
+            self.evicted_bytes,
+        )
+
+
+# ----------------------------------------------------------------------
+def IsEnabled() -> bool:
+    return os.getenv(COMPILE_CACHE_ENV_VAR) == "1"
+
+
+# ----------------------------------------------------------------------
+def CreateWrappers(
+    wrapper_dir: Path,
+    compiler_dir: Path,
+) -> None:
+    """Creates wrappers for the compilers in `compiler_dir` (and a command to manage the cache)"""
+
+    wrapper_dir.mkdir(parents=True, exist_ok=True)
+
+    for name, args in [
+        *((compiler, shlex.quote(str(compiler_dir / compiler))) for compiler in WRAPPED_COMPILERS),
+        (COMMAND_NAME, ""),
+    ]:
+        wrapper_filename = wrapper_dir / name
+
+        with wrapper_filename.open("w") as f:
+            f.write(
+                _WRAPPER_TEMPLATE.format(
+                    python=shlex.quote(sys.executable),
+                    script=shlex.quote(str(Path(__file__).resolve())),
+                    args=args,
+                ),
+            )
+
+        wrapper_filename.chmod(0o755)
+
+
+# ----------------------------------------------------------------------
+class CompileCache(object):
+    # ----------------------------------------------------------------------
+    @classmethod
+    def FromEnvironment(cls) -> "CompileCache":
+        root = os.getenv(COMPILE_CACHE_DIR_ENV_VAR)
+
+        if root:
+            root_dir = Path(root)
+        else:
+            root_dir = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "Common_LLVM" / "compile_cache"
+
+        max_size = os.getenv(COMPILE_CACHE_MAX_SIZE_ENV_VAR)
+
+        if max_size is None:
+            return cls(root_dir, DEFAULT_MAX_SIZE)
+
+        # `_archive_cache` is only imported when necessary, as its dependencies are expensive to import
+        # relative to the cost of a cache hit.
+        sys.path.insert(0, str(Path(__file__).parent))
+
+        try:
+            from _archive_cache import ParseSize                            # pylint: disable=import-outside-toplevel
+            del sys.modules["_archive_cache"]
+        finally:
+            del sys.path[0]
+
+        return cls(root_dir, ParseSize(max_size))
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        root: Path,
+        max_size: int,
+    ):
+        self.root                           = root
+        self.max_size                       = max_size
+
+    # ----------------------------------------------------------------------
+    def Compile(
+        self,
+        compiler: str,
+        args: List[str],
+    ) -> int:
+        """Compiles, restoring the results from the cache when possible; returns the compiler's exit code"""
+
+        invocation = _Invocation.Create(args)
+
+        key: Optional[str] = None
+
+        if invocation is not None:
+            key = self._CalculateKey(compiler, args, invocation)
+
+        if key is None:
+            self._UpdateStats(uncacheable=1)
+            return subprocess.run([compiler] + args, check=False).returncode
+
+        assert invocation is not None
+
+        entry_dir = self.root / key[:2] / key
+
+        if self._Restore(entry_dir, invocation):
+            self._UpdateStats(hits=1)
+            return 0
+
+        result = subprocess.run([compiler] + args, stderr=subprocess.PIPE, check=False)
+
+        sys.stderr.buffer.write(result.stderr)
+        sys.stderr.buffer.flush()
+
+        if result.returncode != 0:
+            return result.returncode
+
+        try:
+            size = self._Store(entry_dir, invocation, result.stderr)
+        except OSError:
+            # The cache is an optimization; failing to store an entry (for example, because the disk is
+            # full) shouldn't fail the compilation.
+            size = 0
+
+        self._UpdateStats(misses=1, size=size)
+
+        if size:
+            self.Evict()
+
+        return 0
+
+    # ----------------------------------------------------------------------
+    def Evict(self) -> None:
+        """Removes the least recently used entries if the cache exceeds its maximum size"""
+
+        with self._Lock():
+            stats = self._ReadStats()
+
+            if stats.size <= self.max_size:
+                return
+
+            entries: List[Tuple[float, int, Path]] = []
+            total_size = 0
+
+            for object_filename in self.root.glob("*/*/{}".format(_OBJECT_FILENAME)):
+                # Entries that are being stored by other processes (see `_Store`)
+                if object_filename.parent.name.endswith(".tmp"):
+                    continue
+
+                try:
+                    stat = object_filename.stat()
+                except FileNotFoundError:
+                    continue
+
+                size = _GetEntrySize(object_filename.parent)
+
+                entries.append((stat.st_mtime, size, object_filename.parent))
+                total_size += size
+
+            entries.sort()
+
+            # Evict below the maximum size so that eviction doesn't happen on every store
+            target_size = self.max_size * 9 // 10
+
+            for _, size, entry_dir in entries:
+                if total_size <= target_size:
+                    break
+
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total_size -= size
+
+                stats.evictions += 1
+                stats.evicted_bytes += size
+
+            stats.size = total_size
+
+            self._WriteStats(stats)
+
+    # ----------------------------------------------------------------------
+    def GetStats(self) -> CompileCacheStats:
+        with self._Lock():
+            return self._ReadStats()
+
+    # ----------------------------------------------------------------------
+    def ZeroStats(self) -> None:
+        with self._Lock():
+            stats = self._ReadStats()
+            self._WriteStats(CompileCacheStats(size=stats.size))
+
+    # ----------------------------------------------------------------------
+    def Clear(self) -> None:
+        with self._Lock():
+            for item in self.root.iterdir():
+                if item.is_dir():
+                    shutil.rmtree(item, ignore_errors=True)
+
+            self._WriteStats(CompileCacheStats())
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _CalculateKey(
+        self,
+        compiler: str,
+        args: List[str],
+        invocation: "_Invocation",
+    ) -> Optional[str]:
+        result = subprocess.run(
+            [compiler] + invocation.preprocess_args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+
+        # Let the compiler report the errors
+        if result.returncode != 0:
+            return None
+
+        hasher = hashlib.sha256()
+
+        hasher.update(
+            json.dumps([_CACHE_VERSION, self._GetCompilerHash(compiler), os.getcwd(), invocation.key_args]).encode("utf-8"),
+        )
+        hasher.update(result.stdout)
+
+        return hasher.hexdigest()
+
+    # ----------------------------------------------------------------------
+    def _GetCompilerHash(
+        self,
+        compiler: str,
+    ) -> str:
+        """Returns the hash of the compiler's content, which is cached by the compiler's identity"""
+
+        compiler_filename = Path(shutil.which(compiler) or compiler).resolve()
+        stat = compiler_filename.stat()
+
+        identity = hashlib.sha256(
+            "{}|{}|{}".format(compiler_filename, stat.st_size, stat.st_mtime_ns).encode("utf-8"),
+        ).hexdigest()
+
+        hash_filename = self.root / "compilers" / identity
+
+        try:
+            return hash_filename.read_text()
+        except FileNotFoundError:
+            pass
+
+        hasher = hashlib.sha256()
+
+        with compiler_filename.open("rb") as f:
+            while True:
+                chunk = f.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                hasher.update(chunk)
+
+        _WriteFile(hash_filename, hasher.hexdigest().encode("utf-8"))
+
+        return hasher.hexdigest()
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _Restore(
+        entry_dir: Path,
+        invocation: "_Invocation",
+    ) -> bool:
+        object_filename = entry_dir / _OBJECT_FILENAME
+
+        try:
+            # Update the use time of the entry
+            os.utime(object_filename)
+
+            _CopyFile(object_filename, invocation.output_filename)
+
+            if invocation.dependency_filename is not None:
+                content = (entry_dir / _DEPENDENCY_FILENAME).read_bytes()
+
+                if invocation.dependency_target is not None:
+                    content = content.replace(_DEPENDENCY_TARGET_PLACEHOLDER, invocation.dependency_target.encode("utf-8"), 1)
+
+                _WriteFile(invocation.dependency_filename, content)
+
+            stderr = (entry_dir / _STDERR_FILENAME).read_bytes()
+
+        except FileNotFoundError:
+            return False
+
+        sys.stderr.buffer.write(stderr)
+        sys.stderr.buffer.flush()
+
+        return True
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _Store(
+        entry_dir: Path,
+        invocation: "_Invocation",
+        stderr: bytes,
+    ) -> int:
+        """Stores the results of a compilation and returns the size of the entry"""
+
+        temp_dir = entry_dir.with_name("{}.{}.tmp".format(entry_dir.name, os.getpid()))
+        temp_dir.mkdir(parents=True)
+
+        try:
+            shutil.copyfile(invocation.output_filename, temp_dir / _OBJECT_FILENAME)
+
+            if invocation.dependency_filename is not None:
+                content = invocation.dependency_filename.read_bytes()
+
+                # The target is the output filename, which isn't part of the key
+                if invocation.dependency_target is not None:
+                    # Compilers may normalize the target (for example, by removing a leading './')
+                    target = content.split(b":", 1)[0]
+
+                    if Path(target.decode("utf-8")) != Path(invocation.dependency_target):
+                        raise OSError("The dependency target is not the output filename.")
+
+                    content = _DEPENDENCY_TARGET_PLACEHOLDER + content[len(target):]
+
+                (temp_dir / _DEPENDENCY_FILENAME).write_bytes(content)
+
+            (temp_dir / _STDERR_FILENAME).write_bytes(stderr)
+
+            size = _GetEntrySize(temp_dir)
+
+            try:
+                os.rename(temp_dir, entry_dir)
+            except OSError:
+                # Another process stored the same entry
+                return 0
+
+            return size
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # ----------------------------------------------------------------------
+    @contextmanager
+    def _Lock(self) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        fd = os.open(self.root / _LOCK_FILENAME, os.O_RDWR | os.O_CREAT, 0o666)
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+
+        finally:
+            os.close(fd)
+
+    # ----------------------------------------------------------------------
+    def _UpdateStats(
+        self,
+        **deltas: int,
+    ) -> None:
+        try:
+            with self._Lock():
+                stats = self._ReadStats()
+
+                for name, delta in deltas.items():
+                    setattr(stats, name, getattr(stats, name) + delta)
+
+                self._WriteStats(stats)
+
+        except OSError:
+            pass
+
+    # ----------------------------------------------------------------------
+    def _ReadStats(self) -> CompileCacheStats:
+        try:
+            with (self.root / _STATS_FILENAME).open() as f:
+                return CompileCacheStats(**json.load(f))
+
+        except (OSError, ValueError, TypeError):
+            return CompileCacheStats()
+
+    # ----------------------------------------------------------------------
+    def _WriteStats(
+        self,
+        stats: CompileCacheStats,
+    ) -> None:
+        _WriteFile(self.root / _STATS_FILENAME, json.dumps(stats.__dict__).encode("utf-8"))
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_CACHE_VERSION                              = 1
+_CHUNK_SIZE                                 = 1024 * 1024
+
+_LOCK_FILENAME                              = "lock"
+_STATS_FILENAME                             = "stats.json"
+
+_OBJECT_FILENAME                            = "object"
+_DEPENDENCY_FILENAME                        = "dependencies"
+_STDERR_FILENAME                            = "stderr"
+
+_DEPENDENCY_TARGET_PLACEHOLDER              = b"@@COMMON_LLVM_COMPILE_CACHE_TARGET@@"
+
+_WRAPPER_TEMPLATE                           = """\
+#!/bin/sh
+# This file was generated by Common_LLVM during activation.
+exec {python} {script} {args} "$@"
+"""
+
+_SOURCE_EXTENSIONS                          = {
+    ".c", ".cc", ".cpp", ".cxx", ".c++", ".C", ".m", ".mm", ".i", ".ii",
+}
+
+# Options whose value is the next argument
+_OPTIONS_WITH_VALUES                        = {
+    "-o", "-MF", "-MT", "-MQ", "-MJ", "-I", "-D", "-U", "-F", "-include", "-include-pch", "-imacros",
+    "-isystem", "-isystem-after", "-iquote", "-idirafter", "-iframework", "-isysroot", "-iprefix",
+    "-iwithprefix", "-iwithprefixbefore", "-imultilib", "-ivfsoverlay", "-cxx-isystem", "--sysroot",
+    "-gcc-toolchain", "-resource-dir", "-working-directory", "-x", "-target", "-arch", "-mllvm",
+    "-Xclang", "-Xlinker", "-Xassembler", "-Xpreprocessor", "-Xanalyzer", "-Xopenmp-target",
+    "-Xarch_host", "-Xarch_device", "-serialize-diagnostics", "--param", "-z", "-L", "-l",
+}
+
+# Options that produce additional outputs or depend on content that isn't part of the preprocessed
+# source, so invocations that include them are passed to the compiler.
+_UNCACHEABLE_OPTION_PREFIXES                = (
+    "@", "-E", "-S", "-M", "-save-temps", "-gsplit-dwarf", "-ftime-trace", "-fmodules", "-include-pch",
+    "-Xclang", "-fprofile-use", "-fprofile-instr-use", "-fprofile-sample-use", "-fsanitize-blacklist",
+    "-fsanitize-ignorelist", "--coverage", "-ftest-coverage", "-MJ", "-serialize-diagnostics",
+    "-working-directory", "-ivfsoverlay",
+)
+
+# Dependency options that are supported (and that aren't matched by the prefixes above)
+_DEPENDENCY_OPTIONS                         = {"-MD", "-MMD", "-MP", "-MF", "-MT", "-MQ"}
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Invocation(object):
+    output_filename: Path
+    dependency_filename: Optional[Path]
+    dependency_target: Optional[str]
+    preprocess_args: List[str]
+    key_args: List[str]
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Create(
+        cls,
+        args: List[str],
+    ) -> Optional["_Invocation"]:
+        """Returns information about a cacheable invocation, or None if the invocation is not cacheable"""
+
+        if "-c" not in args:
+            return None
+
+        source_filenames: List[str] = []
+        options: Dict[str, Optional[str]] = {}
+        preprocess_args: List[str] = []
+
+        # The arguments without the output filenames, so that the same source compiled to different
+        # locations shares an entry.
+        key_args: List[str] = []
+
+        index = 0
+
+        while index < len(args):
+            arg = args[index]
+            index += 1
+
+            if arg in _OPTIONS_WITH_VALUES:
+                if index == len(args):
+                    return None
+
+                value: Optional[str] = args[index]
+                index += 1
+            else:
+                value = None
+
+            dependency_option = next(
+                (option for option in _DEPENDENCY_OPTIONS if arg == option or (option in ["-MF", "-MT", "-MQ"] and arg.startswith(option))),
+                None,
+            )
+
+            if dependency_option is not None:
+                options[dependency_option] = value if value is not None else arg[len(dependency_option):]
+
+                if dependency_option != "-MF":
+                    key_args += [dependency_option, options[dependency_option] or ""]
+
+                continue
+
+            if arg.startswith(_UNCACHEABLE_OPTION_PREFIXES):
+                return None
+
+            if arg == "-o" or (arg.startswith("-o") and value is None):
+                options["-o"] = value if value is not None else arg[2:]
+                continue
+
+            if arg == "-c":
+                continue
+
+            key_args.append(arg)
+
+            if value is not None:
+                key_args.append(value)
+
+            if not arg.startswith("-"):
+                if os.path.splitext(arg)[1] not in _SOURCE_EXTENSIONS:
+                    return None
+
+                source_filenames.append(arg)
+
+            preprocess_args.append(arg)
+
+            if value is not None:
+                preprocess_args.append(value)
+
+        if len(source_filenames) != 1:
+            return None
+
+        output_filename = Path(options.get("-o") or Path(source_filenames[0]).with_suffix(".o").name)
+
+        dependency_filename: Optional[Path] = None
+        dependency_target: Optional[str] = None
+
+        if "-MD" in options or "-MMD" in options:
+            dependency_filename = Path(options.get("-MF") or output_filename.with_suffix(".d"))
+
+            if "-MT" not in options and "-MQ" not in options:
+                dependency_target = options.get("-o") or str(output_filename)
+
+        return cls(output_filename, dependency_filename, dependency_target, preprocess_args + ["-E"], key_args)
+
+
+# ----------------------------------------------------------------------
+def _GetEntrySize(
+    entry_dir: Path,
+) -> int:
+    return sum(item.stat().st_size for item in entry_dir.iterdir())
+
+
+# ----------------------------------------------------------------------
+def _CopyFile(
+    source: Path,
+    dest: Path,
+) -> None:
+    # Copy to a temporary file first, so that an interrupted copy never leaves a partial object file
+    temp_filename = dest.with_name("{}.{}.tmp".format(dest.name, os.getpid()))
+
+    try:
+        shutil.copyfile(source, temp_filename)
+        os.replace(temp_filename, dest)
+    finally:
+        temp_filename.unlink(missing_ok=True)
+
+
+# ----------------------------------------------------------------------
+def _WriteFile(
+    filename: Path,
+    content: bytes,
+) -> None:
+    filename.parent.mkdir(parents=True, exist_ok=True)
+
+    temp_filename = filename.with_name("{}.{}.tmp".format(filename.name, os.getpid()))
+
+    temp_filename.write_bytes(content)
+    os.replace(temp_filename, filename)
+
+
+# ----------------------------------------------------------------------
+def _EntryPoint(
+    args: List[str],
+) -> int:
+    if not args:
+        sys.stderr.write("Usage: python {} <compiler> <arg> [<arg> ...] | --show-stats | --zero-stats | --clear\n".format(Path(__file__).name))
+        return -1
+
+    cache = CompileCache.FromEnvironment()
+
+    if args[0] == "--show-stats":
+        stats = cache.GetStats()
+
+        sys.stdout.write(
+            "Cache directory: {}\nSize: {:,} bytes (maximum: {:,} bytes)\n{}\n".format(
+                cache.root,
+                stats.size,
+                cache.max_size,
+                stats,
+            ),
+        )
+
+        return 0
+
+    if args[0] == "--zero-stats":
+        cache.ZeroStats()
+        return 0
+
+    if args[0] == "--clear":
+        cache.Clear()
+        return 0
+
+    return cache.Compile(args[0], args[1:])
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(_EntryPoint(sys.argv[1:]))
@@ -0,0 +1,559 @@
+# ----------------------------------------------------------------------
+# |
+# |  _components.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 10:41:09
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Toolchains that are split into component archives (as created by `Tools/LLVM/CreateComponentArchives.py`).
+
+Setup installs the components required by a configuration. The executables of the remaining components
+are replaced with shims that install the component the first time that they are invoked:
+
+    python _components.py <output_dir> <component> [<component> ...]
+
+Components without executables (for example, the sanitizer runtimes) list the compiler flags that use
+them. While such a component is missing, the compilers are replaced with shims that install it when one
+of those flags is provided.
+
+This module only depends on the python standard library, as it is invoked by the shims outside of an
+activated environment.
+"""
+
+import json
+import os
+import re
+import shlex
+import shutil
+import sys
+import tempfile
+import urllib.parse
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+
+# ----------------------------------------------------------------------
+from _archive_cache import ArchiveCache
+del sys.modules["_archive_cache"]
+
+from _archive_pipeline import CreateStagingDirectory, RecoverStagingDirectories
+del sys.modules["_archive_pipeline"]
+
+from _install_lock import InstallLock
+del sys.modules["_install_lock"]
+
+from _integrity import UpdateManifest
+del sys.modules["_integrity"]
+
+from _ranged_download import DownloadFileRanged
+del sys.modules["_ranged_download"]
+
+from _zstd_archive import ExtractSeekableArchive
+del sys.modules["_zstd_archive"]
+
+
+# ----------------------------------------------------------------------
+# Information about the components available to (and installed within) an output directory
+COMPONENTS_INFO_FILENAME                    = ".Common_LLVM.components.json"
+
+# Compilers (relative to the output directory) that are replaced with shims while components used via
+# compiler flags are missing, and the driver mode associated with each one (clang determines the mode
+# from its name, which is lost when the shim invokes the compiler).
+COMPILER_DRIVER_MODES                       = {
+    "bin/clang": "gcc",
+    "bin/clang++": "g++",
+    "bin/clang-cpp": "cpp",
+}
+
+# Set by shims before they install their component; a shim that finds its own executable in this
+# variable has been invoked again by the executable that it installed, which means that the component
+# doesn't provide the executable.
+SHIM_EXECUTABLE_ENV_VAR                     = "COMMON_LLVM_SHIM_EXECUTABLE"
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class Component(object):
+    name: str
+    description: str
+    archive: str                            # Relative to the manifest url
+    sha256: str
+    num_bytes: int
+    installed_bytes: int
+    requires: List[str]
+    executables: List[str]                  # Relative to the output directory
+    flags: List[str]                        # Compiler flags (shell patterns) that use the component
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class ComponentManifest(object):
+    version: str
+    components: Dict[str, Component]
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def FromJson(
+        cls,
+        content: Dict,
+    ) -> "ComponentManifest":
+        return cls(
+            content["version"],
+            {
+                name: Component(
+                    name,
+                    value.get("description", ""),
+                    value["archive"],
+                    value["sha256"].lower(),
+                    value["num_bytes"],
+                    value["installed_bytes"],
+                    value.get("requires", []),
+                    value.get("executables", []),
+                    value.get("flags", []),
+                )
+                for name, value in content["components"].items()
+            },
+        )
+
+    # ----------------------------------------------------------------------
+    def ToJson(self) -> Dict:
+        return {
+            "version": self.version,
+            "components": {
+                component.name: {
+                    "description": component.description,
+                    "archive": component.archive,
+                    "sha256": component.sha256,
+                    "num_bytes": component.num_bytes,
+                    "installed_bytes": component.installed_bytes,
+                    "requires": component.requires,
+                    "executables": component.executables,
+                    "flags": component.flags,
+                }
+                for component in self.components.values()
+            },
+        }
+
+    # ----------------------------------------------------------------------
+    def Resolve(
+        self,
+        names: List[str],
+    ) -> List[Component]:
+        """Returns the components (and the components that they require) in manifest order"""
+
+        resolved: Dict[str, None] = {}
+
+        # ----------------------------------------------------------------------
+        def Impl(
+            name: str,
+        ) -> None:
+            if name in resolved:
+                return
+
+            component = self.components.get(name, None)
+            if component is None:
+                raise Exception(
+                    "'{}' is not a valid component; valid values are {}.".format(
+                        name,
+                        ", ".join("'{}'".format(name) for name in self.components),
+                    ),
+                )
+
+            resolved[name] = None
+
+            for required_name in component.requires:
+                Impl(required_name)
+
+        # ----------------------------------------------------------------------
+
+        for name in names:
+            Impl(name)
+
+        return [component for component in self.components.values() if component.name in resolved]
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class ComponentsInfo(object):
+    manifest_url: str
+    manifest: ComponentManifest
+    installed: Dict[str, str]               # component name -> sha256 of the installed archive
+    compilers: Dict[str, str]               = field(default_factory=dict)   # compiler replaced by a shim -> original symlink target
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Load(
+        cls,
+        output_dir: Path,
+    ) -> Optional["ComponentsInfo"]:
+        try:
+            with (output_dir / COMPONENTS_INFO_FILENAME).open() as f:
+                content = json.load(f)
+
+            return cls(
+                content["manifest_url"],
+                ComponentManifest.FromJson(content["manifest"]),
+                content["installed"],
+                content.get("compilers", {}),
+            )
+
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    # ----------------------------------------------------------------------
+    def Save(
+        self,
+        output_dir: Path,
+    ) -> None:
+        filename = output_dir / COMPONENTS_INFO_FILENAME
+        temp_filename = filename.with_name(filename.name + ".tmp")
+
+        with temp_filename.open("w") as f:
+            json.dump(
+                {
+                    "manifest_url": self.manifest_url,
+                    "manifest": self.manifest.ToJson(),
+                    "installed": self.installed,
+                    "compilers": self.compilers,
+                },
+                f,
+            )
+
+        os.replace(temp_filename, filename)
+
+    # ----------------------------------------------------------------------
+    def GetArchiveUrl(
+        self,
+        component: Component,
+    ) -> str:
+        return urllib.parse.urljoin(self.manifest_url, component.archive)
+
+
+# ----------------------------------------------------------------------
+def ExtractComponent(
+    component_url: str,
+    component: Component,
+    output_dir: Path,
+    *,
+    archive_cache: Optional[ArchiveCache],
+    members: Optional[Set[str]]=None,       # Relative paths of the files to extract; all files are extracted if None
+) -> None:
+    """Downloads (or retrieves from the cache) and extracts the component into `output_dir`"""
+
+    if archive_cache is not None:
+        archive_filename, _ = archive_cache.Fetch(component_url, component.sha256)
+
+        ExtractSeekableArchive(archive_filename, output_dir, members=members)
+        return
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        archive_filename = Path(temp_directory) / component.archive
+
+        result = DownloadFileRanged(component_url, archive_filename)
+
+        if result.sha256 != component.sha256:
+            raise Exception(
+                "The content downloaded from '{}' does not match the expected sha256 ('{}' != '{}').".format(
+                    component_url,
+                    result.sha256,
+                    component.sha256,
+                ),
+            )
+
+        ExtractSeekableArchive(archive_filename, output_dir, members=members)
+
+
+# ----------------------------------------------------------------------
+def CreateShims(
+    output_dir: Path,
+    info: ComponentsInfo,
+    *,
+    staging_dir: Optional[Path]=None,
+) -> List[Path]:
+    """\
+    Creates shims for the executables of components that haven't been installed (and for the compilers,
+    if any of those components are used via compiler flags). The shims are written to `staging_dir` (if
+    provided), but always refer to `output_dir`. The compilers that are replaced are recorded in `info`.
+    """
+
+    if os.name == "nt":
+        return []
+
+    shims: List[Path] = []
+
+    for component in info.manifest.components.values():
+        if component.name in info.installed:
+            continue
+
+        for executable in component.executables:
+            shim_filename = (staging_dir or output_dir) / executable
+
+            shim_filename.parent.mkdir(parents=True, exist_ok=True)
+
+            with shim_filename.open("w") as f:
+                f.write(
+                    _SHIM_TEMPLATE.format(
+                        component=component.name,
+                        env_var=SHIM_EXECUTABLE_ENV_VAR,
+                        python=shlex.quote(sys.executable),
+                        script=shlex.quote(str(Path(__file__).resolve())),
+                        output_dir=shlex.quote(str(output_dir)),
+                        executable=shlex.quote(str(output_dir / executable)),
+                    ),
+                )
+
+            shim_filename.chmod(0o755)
+            shims.append(shim_filename)
+
+    shims += _CreateCompilerShims(output_dir, info, staging_dir or output_dir)
+
+    return shims
+
+
+# ----------------------------------------------------------------------
+def InstallComponents(
+    output_dir: Path,
+    names: List[str],
+    *,
+    archive_cache: Optional[ArchiveCache]=None,
+    on_status: Optional[Callable[[str], None]]=None,
+) -> List[str]:
+    """\
+    Installs components (and the components that they require) into an existing installation, returning
+    the names of the components that were installed. The file manifest of the installation (if one has
+    been recorded) is updated with the files that were added or replaced. The caller must hold the
+    install lock for `output_dir`.
+    """
+
+    info = ComponentsInfo.Load(output_dir)
+    if info is None:
+        raise Exception("'{}' does not contain a component-based installation.".format(output_dir))
+
+    components = [
+        component
+        for component in info.manifest.Resolve(names)
+        if info.installed.get(component.name, None) != component.sha256
+    ]
+
+    changed: List[str] = []
+
+    for component in components:
+        if on_status is not None:
+            on_status(
+                "Installing the '{}' component ({:,} bytes)...".format(component.name, component.num_bytes),
+            )
+
+        staging_dir = CreateStagingDirectory(output_dir)
+
+        try:
+            ExtractComponent(
+                info.GetArchiveUrl(component),
+                component,
+                staging_dir,
+                archive_cache=archive_cache,
+            )
+
+            # Components don't share files, so the files (which replace any shims) can be moved into
+            # the installation individually. Symlinks to directories (for example, versioned
+            # `lib/clang/<N>` links) are moved as entries rather than walked.
+            for root, directories, filenames in os.walk(staging_dir, followlinks=False):
+                root_path = Path(root)
+
+                dest_dir = output_dir / root_path.relative_to(staging_dir)
+                dest_dir.mkdir(parents=True, exist_ok=True)
+
+                for name in filenames + [directory for directory in directories if (root_path / directory).is_symlink()]:
+                    os.replace(root_path / name, dest_dir / name)
+                    changed.append((dest_dir / name).relative_to(output_dir).as_posix())
+
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        info.installed[component.name] = component.sha256
+        info.Save(output_dir)
+
+    if components and info.compilers:
+        changed += info.compilers.keys()
+
+        # The compiler shims are recreated for the components that remain
+        _RestoreCompilers(output_dir, info)
+        _CreateCompilerShims(output_dir, info, output_dir)
+
+        info.Save(output_dir)
+
+    if changed:
+        UpdateManifest(output_dir, changed)
+
+    return [component.name for component in components]
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_SHIM_TEMPLATE                              = """\
+#!/bin/sh
+# This file was generated by Common_LLVM and is replaced when the '{component}' component is installed.
+if [ "${{{env_var}:-}}" = {executable} ]; then
+    echo "ERROR: The '{component}' component does not provide {executable}." >&2
+    exit 1
+fi
+{env_var}={executable}
+export {env_var}
+{python} {script} {output_dir} {component} || exit $?
+exec {executable} "$@"
+"""
+
+_COMPILER_SHIM_TEMPLATE                     = """\
+#!/bin/sh
+# This file was generated by Common_LLVM and is replaced when the {components} component(s) are installed.
+for arg in "$@"; do
+    case "$arg" in
+{cases}
+    esac
+done
+exec {compiler} --driver-mode={driver_mode} "$@"
+"""
+
+_COMPILER_SHIM_CASE_TEMPLATE                = """\
+        {patterns})
+            {python} {script} {output_dir} {component} || exit $?
+            ;;"""
+
+_flag_pattern_regex                         = re.compile(r"^[-+=.,_A-Za-z0-9*]+$")
+
+
+# ----------------------------------------------------------------------
+def _CreateCompilerShims(
+    output_dir: Path,
+    info: ComponentsInfo,
+    shim_dir: Path,
+) -> List[Path]:
+    components = [
+        component
+        for component in info.manifest.components.values()
+        if component.flags and component.name not in info.installed
+    ]
+
+    if not components:
+        return []
+
+    cases: List[str] = []
+
+    for component in components:
+        for pattern in component.flags:
+            if not _flag_pattern_regex.match(pattern):
+                raise Exception("'{}' is not a valid flag pattern for the '{}' component.".format(pattern, component.name))
+
+        cases.append(
+            _COMPILER_SHIM_CASE_TEMPLATE.format(
+                patterns="|".join(component.flags),
+                python=shlex.quote(sys.executable),
+                script=shlex.quote(str(Path(__file__).resolve())),
+                output_dir=shlex.quote(str(output_dir)),
+                component=component.name,
+            ),
+        )
+
+    # Compilers may be links to each other, so the executables are resolved before any are replaced
+    executables: Dict[str, Path] = {}
+
+    for compiler in COMPILER_DRIVER_MODES:
+        shim_filename = shim_dir / compiler
+
+        # Only compilers that are links to the compiler executable can be replaced
+        if shim_filename.is_symlink() and shim_filename.exists():
+            executables[compiler] = Path(os.path.realpath(shim_filename)).relative_to(os.path.realpath(shim_dir))
+
+    shims: List[Path] = []
+
+    for compiler, executable in executables.items():
+        driver_mode = COMPILER_DRIVER_MODES[compiler]
+        shim_filename = shim_dir / compiler
+
+        temp_filename = shim_filename.with_name(shim_filename.name + ".tmp")
+
+        with temp_filename.open("w") as f:
+            f.write(
+                _COMPILER_SHIM_TEMPLATE.format(
+                    components=", ".join("'{}'".format(component.name) for component in components),
+                    cases="\n".join(cases),
+                    compiler=shlex.quote(str(output_dir / executable)),
+                    driver_mode=driver_mode,
+                ),
+            )
+
+        temp_filename.chmod(0o755)
+
+        info.compilers[compiler] = os.readlink(shim_filename)
+        os.replace(temp_filename, shim_filename)
+
+        shims.append(shim_filename)
+
+    return shims
+
+
+# ----------------------------------------------------------------------
+def _RestoreCompilers(
+    output_dir: Path,
+    info: ComponentsInfo,
+) -> None:
+    for compiler, target in info.compilers.items():
+        compiler_filename = output_dir / compiler
+        temp_filename = compiler_filename.with_name(compiler_filename.name + ".tmp")
+
+        temp_filename.unlink(missing_ok=True)
+        os.symlink(target, temp_filename)
+        os.replace(temp_filename, compiler_filename)
+
+    info.compilers.clear()
+
+
+# ----------------------------------------------------------------------
+def _EntryPoint(
+    args: List[str],
+) -> int:
+    if len(args) < 2:
+        sys.stderr.write("Usage: python {} <output_dir> <component> [<component> ...]\n".format(Path(__file__).name))
+        return -1
+
+    output_dir = Path(args[0])
+
+    try:
+        # Shims for the same component may be invoked concurrently (for example, by parallel builds);
+        # the first process installs the component and the others find it installed.
+        with InstallLock(
+            output_dir,
+            on_wait=lambda: sys.stderr.write("Waiting for another process to finish installing components in '{}'...\n".format(output_dir)),
+        ):
+            RecoverStagingDirectories(output_dir)
+
+            InstallComponents(
+                output_dir,
+                args[1:],
+                archive_cache=ArchiveCache.FromEnvironment(),
+                on_status=lambda message: sys.stderr.write("{}\n".format(message)),
+            )
+
+    except Exception as ex:  # pylint: disable=broad-except
+        sys.stderr.write("ERROR: {}\n".format(ex))
+        return -1
+
+    return 0
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(_EntryPoint(sys.argv[1:]))
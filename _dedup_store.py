@@ -0,0 +1,461 @@
+# ----------------------------------------------------------------------
+# |
+# |  _dedup_store.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 22:14:09
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Host-wide, content-addressed store of the files within installed toolchains.
+
+Many files are byte-identical across toolchains installed on the same host (for example, the headers,
+compiler-rt libraries, and tools of the `mingw` and `msvc` flavors on Windows, or of successive builds
+of the same LLVM version on Linux). Once a toolchain has been installed, each of its files is hashed and
+replaced with a link to the store's copy of that content, so the content is only stored once:
+
+    hardlink:   Files are hardlinks of the store's entry (the default). Installed toolchains must be
+                treated as read-only, as modifying a file in place modifies it in every toolchain.
+    reflink:    Files are copy-on-write clones of the store's entry (Linux filesystems that support
+                FICLONE, such as btrfs and xfs); files remain independent of each other.
+
+The store must be on the same volume as the toolchains. It can also be managed directly:
+
+    python _dedup_store.py dedupe <dir> [<dir> ...]
+    python _dedup_store.py report
+    python _dedup_store.py prune
+
+This module only depends on the python standard library.
+"""
+
+import hashlib
+import os
+import shutil
+import stat
+import sys
+import threading
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import auto, Enum
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+if sys.platform.startswith("linux"):
+    import fcntl
+
+
+# ----------------------------------------------------------------------
+# Directory of the store shared by all toolchains on the host; files aren't deduplicated if this value
+# isn't defined.
+DEDUP_STORE_ENV_VAR                         = "COMMON_LLVM_DEDUP_STORE"
+
+# "hardlink" (the default) or "reflink"
+DEDUP_STORE_MODE_ENV_VAR                    = "COMMON_LLVM_DEDUP_STORE_MODE"
+
+MODES                                       = ["hardlink", "reflink"]
+
+
+# ----------------------------------------------------------------------
+@dataclass
+class DedupResult(object):
+    num_files: int                          = 0
+    num_bytes: int                          = 0
+
+    num_linked: int                         = 0         # Files replaced with a link to an existing entry
+    num_added: int                          = 0         # Files whose content was added to the store
+    num_skipped: int                        = 0         # Files that couldn't be linked (for example, the store is on a different volume)
+
+    bytes_saved: int                        = 0
+
+    # ----------------------------------------------------------------------
+    def __str__(self) -> str:
+        return "{} of {} file(s) linked to existing content, {:,} of {:,} bytes saved ({:.1f}%), {} file(s) added to the store{}".format(
+            self.num_linked,
+            self.num_files,
+            self.bytes_saved,
+            self.num_bytes,
+            100.0 * self.bytes_saved / self.num_bytes if self.num_bytes else 0.0,
+            self.num_added,
+            "" if not self.num_skipped else ", {} file(s) skipped".format(self.num_skipped),
+        )
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class StoreReport(object):
+    num_entries: int
+    num_bytes: int                          # Bytes stored once
+    num_references: int                     # Hardlinks to the entries from installed toolchains
+    bytes_saved: int                        # Bytes that would be written again without the store
+    num_unreferenced: int                   # Entries that are no longer referenced (see `Prune`)
+
+    # ----------------------------------------------------------------------
+    def __str__(self) -> str:
+        return "{} entries ({:,} bytes) referenced {} time(s), {:,} bytes saved, {} unreferenced entries".format(
+            self.num_entries,
+            self.num_bytes,
+            self.num_references,
+            self.bytes_saved,
+            self.num_unreferenced,
+        )
+
+
+# ----------------------------------------------------------------------
+class DedupStore(object):
+    """\
+    Entries are stored by the sha256 of their content and their permissions (which hardlinks share) at
+    `<root>/<mode>/<sha256[:2]>/<sha256>-<permissions>`.
+    """
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def FromEnvironment(cls) -> Optional["DedupStore"]:
+        root = os.getenv(DEDUP_STORE_ENV_VAR)
+        if not root:
+            return None
+
+        mode = os.getenv(DEDUP_STORE_MODE_ENV_VAR) or MODES[0]
+
+        if mode not in MODES:
+            raise Exception(
+                "'{}' is not a valid value for '{}'; expected one of {}.".format(
+                    mode,
+                    DEDUP_STORE_MODE_ENV_VAR,
+                    ", ".join("'{}'".format(value) for value in MODES),
+                ),
+            )
+
+        return cls(Path(root), mode)
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        root: Path,
+        mode: str,
+    ):
+        assert mode in MODES, mode
+
+        if mode == "reflink" and not sys.platform.startswith("linux"):
+            raise Exception("Reflinks are only supported on Linux.")
+
+        self.root                           = root
+        self.mode                           = mode
+
+    # ----------------------------------------------------------------------
+    def Deduplicate(
+        self,
+        directory: Path,
+        *,
+        max_workers: Optional[int]=None,
+    ) -> DedupResult:
+        """\
+        Replaces the files in `directory` with links to the store's entries, adding the content that
+        isn't in the store yet. Files at the root of `directory` (which include installation metadata
+        that may be rewritten) and small files are left as-is. The caller must hold the install lock for
+        `directory`.
+        """
+
+        filenames: List[Path] = []
+
+        for root, _, names in os.walk(directory):
+            if root == str(directory):
+                continue
+
+            for name in names:
+                filenames.append(Path(root) / name)
+
+        result = DedupResult()
+        result_lock = threading.Lock()
+
+        # ----------------------------------------------------------------------
+        def Process(
+            filename: Path,
+        ) -> None:
+            file_stat = filename.lstat()
+
+            if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size < _MIN_FILE_SIZE:
+                return
+
+            outcome = self._Process(filename, file_stat)
+
+            with result_lock:
+                result.num_files += 1
+                result.num_bytes += file_stat.st_size
+
+                if outcome == _Outcome.Linked:
+                    result.num_linked += 1
+                    result.bytes_saved += file_stat.st_size
+                elif outcome == _Outcome.Added:
+                    result.num_added += 1
+                elif outcome == _Outcome.Skipped:
+                    result.num_skipped += 1
+
+        # ----------------------------------------------------------------------
+
+        # Hashing dominates, and hashlib releases the GIL while hashing
+        with ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 1)) as executor:
+            for _ in executor.map(Process, filenames):
+                pass
+
+        return result
+
+    # ----------------------------------------------------------------------
+    def GetReport(self) -> StoreReport:
+        num_entries = 0
+        num_bytes = 0
+        num_references = 0
+        bytes_saved = 0
+        num_unreferenced = 0
+
+        for entry_filename in self._EnumEntries():
+            entry_stat = entry_filename.stat()
+
+            num_entries += 1
+            num_bytes += entry_stat.st_size
+
+            if self.mode != "hardlink":
+                continue
+
+            # One of the links is the entry itself
+            references = entry_stat.st_nlink - 1
+
+            num_references += references
+
+            if references == 0:
+                num_unreferenced += 1
+            else:
+                bytes_saved += (references - 1) * entry_stat.st_size
+
+        return StoreReport(num_entries, num_bytes, num_references, bytes_saved, num_unreferenced)
+
+    # ----------------------------------------------------------------------
+    def Prune(self) -> Tuple[int, int]:
+        """Removes hardlink entries that are no longer referenced by a toolchain; returns the number of entries and bytes removed"""
+
+        if self.mode != "hardlink":
+            return 0, 0
+
+        num_entries = 0
+        num_bytes = 0
+
+        for entry_filename in self._EnumEntries():
+            entry_stat = entry_filename.stat()
+
+            if entry_stat.st_nlink != 1:
+                continue
+
+            entry_filename.unlink(missing_ok=True)
+
+            num_entries += 1
+            num_bytes += entry_stat.st_size
+
+        return num_entries, num_bytes
+
+    # ----------------------------------------------------------------------
+    def Discard(
+        self,
+        sha256: str,
+        mode: int,
+    ) -> None:
+        """\
+        Removes the entry for content that is known to be corrupt (for example, because a hardlink of
+        the entry was modified in place); toolchains that link to the entry are unaffected.
+        """
+
+        self._GetEntryFilename(sha256, mode).unlink(missing_ok=True)
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _GetEntryFilename(
+        self,
+        sha256: str,
+        mode: int,
+    ) -> Path:
+        return self.root / self.mode / sha256[:2] / "{}-{:o}".format(sha256, mode)
+
+    # ----------------------------------------------------------------------
+    def _Process(
+        self,
+        filename: Path,
+        file_stat: os.stat_result,
+    ) -> "_Outcome":
+        hasher = hashlib.sha256()
+
+        with filename.open("rb") as f:
+            while True:
+                chunk = f.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                hasher.update(chunk)
+
+        sha256 = hasher.hexdigest()
+
+        entry_filename = self._GetEntryFilename(sha256, stat.S_IMODE(file_stat.st_mode))
+
+        try:
+            entry_stat = entry_filename.stat()
+        except FileNotFoundError:
+            entry_stat = None
+
+        if entry_stat is not None:
+            if entry_stat.st_ino == file_stat.st_ino and entry_stat.st_dev == file_stat.st_dev:
+                return _Outcome.Unchanged
+
+            # The size is a cheap check that the entry hasn't been modified in place
+            if entry_stat.st_size != file_stat.st_size:
+                return _Outcome.Skipped
+
+            try:
+                self._Replace(entry_filename, filename)
+            except OSError:
+                return _Outcome.Skipped
+
+            return _Outcome.Linked
+
+        entry_filename.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            if self.mode == "hardlink":
+                os.link(filename, entry_filename)
+            else:
+                temp_filename = entry_filename.with_name("{}.{}.tmp".format(entry_filename.name, uuid.uuid4().hex))
+
+                try:
+                    _Clone(filename, temp_filename)
+                    os.rename(temp_filename, entry_filename)
+                finally:
+                    temp_filename.unlink(missing_ok=True)
+
+        except FileExistsError:
+            # Another process added the same content
+            try:
+                self._Replace(entry_filename, filename)
+            except OSError:
+                return _Outcome.Skipped
+
+            return _Outcome.Linked
+
+        except OSError:
+            return _Outcome.Skipped
+
+        return _Outcome.Added
+
+    # ----------------------------------------------------------------------
+    def _Replace(
+        self,
+        entry_filename: Path,
+        filename: Path,
+    ) -> None:
+        """Replaces `filename` with a link to `entry_filename`"""
+
+        temp_filename = filename.with_name(".{}.{}.tmp".format(filename.name, uuid.uuid4().hex))
+
+        try:
+            if self.mode == "hardlink":
+                os.link(entry_filename, temp_filename)
+            else:
+                _Clone(entry_filename, temp_filename)
+                shutil.copystat(filename, temp_filename)
+
+            os.replace(temp_filename, filename)
+
+        finally:
+            temp_filename.unlink(missing_ok=True)
+
+    # ----------------------------------------------------------------------
+    def _EnumEntries(self) -> List[Path]:
+        mode_dir = self.root / self.mode
+
+        if not mode_dir.is_dir():
+            return []
+
+        return [
+            entry_filename
+            for entry_filename in mode_dir.glob("*/*")
+            if not entry_filename.name.endswith(".tmp")
+        ]
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_CHUNK_SIZE                                 = 1024 * 1024
+
+# Linking tiny files saves little space (they occupy a single block) relative to the cost of hashing
+# and linking them.
+_MIN_FILE_SIZE                              = 512
+
+# From <linux/fs.h>
+_FICLONE                                    = 0x40049409
+
+
+# ----------------------------------------------------------------------
+class _Outcome(Enum):
+    Unchanged                               = auto()
+    Linked                                  = auto()
+    Added                                   = auto()
+    Skipped                                 = auto()
+
+
+# ----------------------------------------------------------------------
+def _Clone(
+    source: Path,
+    dest: Path,
+) -> None:
+    with source.open("rb") as source_file:
+        with dest.open("xb") as dest_file:
+            fcntl.ioctl(dest_file.fileno(), _FICLONE, source_file.fileno())
+
+    shutil.copymode(source, dest)
+
+
+# ----------------------------------------------------------------------
+def _EntryPoint(
+    args: List[str],
+) -> int:
+    if not args or args[0] not in ["dedupe", "report", "prune"] or (args[0] == "dedupe") != (len(args) > 1):
+        sys.stderr.write("Usage: python {} dedupe <dir> [<dir> ...] | report | prune\n".format(Path(__file__).name))
+        return -1
+
+    try:
+        store = DedupStore.FromEnvironment()
+        if store is None:
+            raise Exception("'{}' is not defined.".format(DEDUP_STORE_ENV_VAR))
+
+        if args[0] == "dedupe":
+            for directory in args[1:]:
+                sys.stdout.write("{}: {}\n".format(directory, store.Deduplicate(Path(directory))))
+
+        elif args[0] == "report":
+            sys.stdout.write("{} ({}): {}\n".format(store.root, store.mode, store.GetReport()))
+
+        elif args[0] == "prune":
+            num_entries, num_bytes = store.Prune()
+            sys.stdout.write("{} entries ({:,} bytes) removed.\n".format(num_entries, num_bytes))
+
+        else:
+            assert False, args[0]  # pragma: no cover
+
+    except Exception as ex:  # pylint: disable=broad-except
+        sys.stderr.write("ERROR: {}\n".format(ex))
+        return -1
+
+    return 0
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(_EntryPoint(sys.argv[1:]))
@@ -0,0 +1,435 @@
+# ----------------------------------------------------------------------
+# |
+# |  _delta_update.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 23:31:14
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Updates an installed toolchain to a new revision by downloading only the files that changed.
+
+Revisions publish a per-file manifest (`files.json`, created by `Tools/LLVM/CreateFileManifest.py`)
+along with the individually compressed content of each file and binary deltas between revisions. The
+manifest of the installed revision is stored within the installation; an update compares it to the
+manifest of the new revision and, for each file that changed, applies a delta to the installed file
+(when one is available for the installed content) or downloads the file. Files are written to a
+staging directory and verified before they replace the installed files, so an interrupted update is
+completed by the next update.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import urllib.parse
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import zstandard                                                        # type: ignore  # pylint: disable=import-error
+except ImportError:
+    zstandard = None  # pylint: disable=invalid-name
+
+
+# ----------------------------------------------------------------------
+from _archive_pipeline import CreateStagingDirectory, DownloadFile
+del sys.modules["_archive_pipeline"]
+
+from _trace import Subprocess as TraceSubprocess
+del sys.modules["_trace"]
+
+
+# ----------------------------------------------------------------------
+# Set this environment variable to "0" to install new revisions from the complete archive
+DELTA_UPDATES_ENV_VAR                       = "COMMON_LLVM_DELTA_UPDATES"
+
+# The manifest of the installed revision
+FILE_MANIFEST_FILENAME                      = ".Common_LLVM.files.json"
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class FileEntry(object):
+    sha256: Optional[str]                   # None for symbolic links
+    size: int                               = field(default=0)
+    mode: int                               = field(default=0o644)
+    link: Optional[str]                     = field(default=None)
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class FileManifest(object):
+    version: str
+    files: Dict[str, FileEntry]                                 # relative path (with '/' separators) -> entry
+    deltas: Dict[str, Dict[str, int]]                           # sha256 -> {previous sha256: delta size}
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def FromJson(
+        cls,
+        content: Dict,
+    ) -> "FileManifest":
+        return cls(
+            content["version"],
+            {
+                relative_path: FileEntry(
+                    entry.get("sha256", None),
+                    entry.get("size", 0),
+                    entry.get("mode", 0o644),
+                    entry.get("link", None),
+                )
+                for relative_path, entry in content["files"].items()
+            },
+            content.get("deltas", {}),
+        )
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Load(
+        cls,
+        output_dir: Path,
+    ) -> Optional["FileManifest"]:
+        try:
+            with (output_dir / FILE_MANIFEST_FILENAME).open() as f:
+                return cls.FromJson(json.load(f))
+
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    # ----------------------------------------------------------------------
+    def ToJson(self) -> Dict:
+        return {
+            "version": self.version,
+            "files": {
+                relative_path: (
+                    {"link": entry.link}
+                    if entry.link is not None
+                    else {"sha256": entry.sha256, "size": entry.size, "mode": entry.mode}
+                )
+                for relative_path, entry in self.files.items()
+            },
+            "deltas": self.deltas,
+        }
+
+    # ----------------------------------------------------------------------
+    def Save(
+        self,
+        output_dir: Path,
+    ) -> None:
+        filename = output_dir / FILE_MANIFEST_FILENAME
+        temp_filename = filename.with_name(filename.name + ".tmp")
+
+        with temp_filename.open("w") as f:
+            json.dump(self.ToJson(), f)
+
+        os.replace(temp_filename, filename)
+
+
+# ----------------------------------------------------------------------
+@dataclass
+class UpdateResult(object):
+    num_unchanged: int                      = 0
+    num_patched: int                        = 0         # Files updated with a delta
+    num_downloaded: int                     = 0         # Files downloaded in their entirety
+    num_removed: int                        = 0
+
+    downloaded_bytes: int                   = 0
+    updated_bytes: int                      = 0         # The size of the files that were patched or downloaded
+
+    # ----------------------------------------------------------------------
+    def __str__(self) -> str:
+        return "{} file(s) patched, {} downloaded, {} removed, {} unchanged; {:,} bytes downloaded for {:,} bytes of changed content".format(
+            self.num_patched,
+            self.num_downloaded,
+            self.num_removed,
+            self.num_unchanged,
+            self.downloaded_bytes,
+            self.updated_bytes,
+        )
+
+
+# ----------------------------------------------------------------------
+def IsEnabled() -> bool:
+    return os.getenv(DELTA_UPDATES_ENV_VAR) != "0"
+
+
+# ----------------------------------------------------------------------
+def DownloadManifest(
+    manifest_url: str,
+    manifest_sha256: str,
+) -> FileManifest:
+    chunks: List[bytes] = []
+
+    result = DownloadFile(manifest_url, None, on_chunk=chunks.append)
+
+    if result.sha256 != manifest_sha256.lower():
+        raise Exception(
+            "The content downloaded from '{}' does not match the expected sha256 ('{}' != '{}').".format(
+                manifest_url,
+                result.sha256,
+                manifest_sha256,
+            ),
+        )
+
+    return FileManifest.FromJson(json.loads(b"".join(chunks)))
+
+
+# ----------------------------------------------------------------------
+def ApplyUpdate(
+    output_dir: Path,
+    installed: FileManifest,
+    target: FileManifest,
+    manifest_url: str,
+    *,
+    max_workers: Optional[int]=None,
+    on_status: Optional[Callable[[str], None]]=None,
+) -> UpdateResult:
+    """\
+    Updates the files in `output_dir` described by `installed` to those described by `target`. Files in
+    `output_dir` that aren't in either manifest (for example, installation metadata) are preserved. The
+    caller must hold the install lock for `output_dir`.
+    """
+
+    result = UpdateResult()
+    result_lock = threading.Lock()
+
+    staging_dir = CreateStagingDirectory(output_dir)
+
+    try:
+        # ----------------------------------------------------------------------
+        def Prepare(
+            item: Tuple[str, FileEntry],
+        ) -> Optional[str]:
+            """Writes the content of a file that changed to the staging directory; returns the relative path if the file changed"""
+
+            relative_path, entry = item
+
+            installed_filename = output_dir / relative_path
+            staged_filename = staging_dir / relative_path
+
+            if entry.link is not None:
+                if installed_filename.is_symlink() and os.readlink(installed_filename) == entry.link:
+                    with result_lock:
+                        result.num_unchanged += 1
+
+                    return None
+
+                staged_filename.parent.mkdir(parents=True, exist_ok=True)
+                os.symlink(entry.link, staged_filename)
+
+                return relative_path
+
+            assert entry.sha256 is not None
+
+            installed_sha256: Optional[str] = None
+
+            if installed_filename.is_file() and not installed_filename.is_symlink():
+                if installed.files.get(relative_path, None) == entry and installed_filename.stat().st_size == entry.size:
+                    installed_sha256 = entry.sha256
+                else:
+                    installed_sha256 = _CalculateSha256(installed_filename)
+
+            if installed_sha256 == entry.sha256:
+                with result_lock:
+                    result.num_unchanged += 1
+
+                if installed_filename.stat().st_mode & 0o7777 == entry.mode:
+                    return None
+
+                # The installed file may share its content (and therefore its mode) with other links
+                # (for example, entries in the dedup store), so the new mode is applied to a copy that
+                # replaces the file along with the other changes.
+                staged_filename.parent.mkdir(parents=True, exist_ok=True)
+
+                shutil.copy2(installed_filename, staged_filename)
+                os.chmod(staged_filename, entry.mode)
+
+                return relative_path
+
+            staged_filename.parent.mkdir(parents=True, exist_ok=True)
+
+            download_filename = staged_filename.with_name(staged_filename.name + ".zst")
+
+            delta_size = None if installed_sha256 is None else target.deltas.get(entry.sha256, {}).get(installed_sha256, None)
+
+            if delta_size is not None:
+                assert installed_sha256 is not None
+
+                download_result = DownloadFile(
+                    urllib.parse.urljoin(
+                        manifest_url,
+                        "deltas/{}/{}-{}.zst".format(entry.sha256[:2], installed_sha256, entry.sha256),
+                    ),
+                    download_filename,
+                )
+
+                _Decompress(download_filename, staged_filename, patch_from=installed_filename)
+
+            else:
+                download_result = DownloadFile(
+                    urllib.parse.urljoin(manifest_url, "files/{}/{}.zst".format(entry.sha256[:2], entry.sha256)),
+                    download_filename,
+                )
+
+                _Decompress(download_filename, staged_filename)
+
+            download_filename.unlink()
+
+            # The manifest's sha256 is verified by the caller, so verifying the content verifies the download
+            staged_sha256 = _CalculateSha256(staged_filename)
+
+            if staged_sha256 != entry.sha256:
+                raise Exception(
+                    "The content of '{}' does not match the expected sha256 ('{}' != '{}').".format(
+                        relative_path,
+                        staged_sha256,
+                        entry.sha256,
+                    ),
+                )
+
+            os.chmod(staged_filename, entry.mode)
+
+            with result_lock:
+                if delta_size is not None:
+                    result.num_patched += 1
+                else:
+                    result.num_downloaded += 1
+
+                result.downloaded_bytes += download_result.num_bytes
+                result.updated_bytes += entry.size
+
+            return relative_path
+
+        # ----------------------------------------------------------------------
+
+        with ThreadPoolExecutor(max_workers=max_workers or min(8, (os.cpu_count() or 1) * 2)) as executor:
+            changed = [
+                relative_path
+                for relative_path in executor.map(Prepare, target.files.items())
+                if relative_path is not None
+            ]
+
+        if on_status is not None:
+            on_status(
+                "{} of {} file(s) changed ({:,} bytes downloaded).".format(len(changed), len(target.files), result.downloaded_bytes),
+            )
+
+        # Everything has been downloaded and verified; replace the installed files
+        for relative_path in changed:
+            installed_filename = output_dir / relative_path
+
+            installed_filename.parent.mkdir(parents=True, exist_ok=True)
+
+            if installed_filename.is_dir() and not installed_filename.is_symlink():
+                shutil.rmtree(installed_filename)
+
+            os.replace(staging_dir / relative_path, installed_filename)
+
+        for relative_path in installed.files.keys():
+            if relative_path in target.files:
+                continue
+
+            installed_filename = output_dir / relative_path
+
+            if installed_filename.is_symlink() or installed_filename.is_file():
+                installed_filename.unlink()
+                result.num_removed += 1
+
+                _RemoveEmptyParents(installed_filename.parent, output_dir)
+
+        target.Save(output_dir)
+
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    return result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_CHUNK_SIZE                                 = 1024 * 1024
+
+
+# ----------------------------------------------------------------------
+def _CalculateSha256(
+    filename: Path,
+) -> str:
+    hasher = hashlib.sha256()
+
+    with filename.open("rb") as f:
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def _Decompress(
+    source: Path,
+    dest: Path,
+    *,
+    patch_from: Optional[Path]=None,
+) -> None:
+    # Deltas are created with `zstd --patch-from`, so prefer the executable to decompress them
+    if shutil.which("zstd") is not None and (patch_from is not None or zstandard is None):
+        command_line = ["zstd", "--decompress", "--quiet", "--force"]
+
+        if patch_from is not None:
+            command_line.append("--patch-from={}".format(patch_from))
+
+        with TraceSubprocess(" ".join(command_line[:2])):
+            result = subprocess.run(
+                command_line + [str(source), "-o", str(dest)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                check=False,
+            )
+
+        if result.returncode != 0:
+            raise Exception("Decompressing '{}' failed: {}".format(source.name, result.stderr.decode("utf-8", errors="replace")))
+
+        return
+
+    if zstandard is None:
+        raise Exception("The 'zstandard' python package or the 'zstd' executable is required to decompress '{}'.".format(source.name))
+
+    dict_data = None
+
+    if patch_from is not None:
+        # `--patch-from` uses the previous content as a raw content dictionary
+        dict_data = zstandard.ZstdCompressionDict(patch_from.read_bytes(), dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+
+    decompressor = zstandard.ZstdDecompressor(dict_data=dict_data, max_window_size=2 ** 31)
+
+    with source.open("rb") as source_file:
+        with dest.open("wb") as dest_file:
+            decompressor.copy_stream(source_file, dest_file)
+
+
+# ----------------------------------------------------------------------
+def _RemoveEmptyParents(
+    directory: Path,
+    root: Path,
+) -> None:
+    while directory != root and directory.is_dir() and not any(directory.iterdir()):
+        directory.rmdir()
+        directory = directory.parent
@@ -15,41 +15,278 @@
 # ----------------------------------------------------------------------
 """Contains data used during setup and activation"""
 
+import importlib
+import os
+import sys
+
 from dataclasses import dataclass, field
+from functools import cache, cached_property
 from pathlib import Path
-from typing import Dict, List
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING, Union
 
+from Common_Foundation.ContextlibEx import ExitStack                        # type: ignore  # pylint: disable=import-error,unused-import
 from Common_Foundation.Shell.All import CurrentShell                        # type: ignore  # pylint: disable=import-error,unused-import
 
 from RepositoryBootstrap import Constants                                   # type: ignore  # pylint: disable=import-error,unused-import
 
-from RepositoryBootstrap.SetupAndActivate.Installers.DownloadNSISInstaller import DownloadNSISInstaller             # type: ignore  # pylint: disable=import-error,unused-import
-from RepositoryBootstrap.SetupAndActivate.Installers.DownloadSevenZipInstaller import DownloadSevenZipInstaller     # type: ignore  # pylint: disable=import-error,unused-import
-from RepositoryBootstrap.SetupAndActivate.Installers.DownloadZipInstaller import DownloadZipInstaller               # type: ignore  # pylint: disable=import-error,unused-import
-from RepositoryBootstrap.SetupAndActivate.Installers.Installer import Installer                                     # type: ignore  # pylint: disable=import-error,unused-import
-from RepositoryBootstrap.SetupAndActivate.Installers.LocalSevenZipInstaller import LocalSevenZipInstaller           # type: ignore  # pylint: disable=import-error,unused-import
+if TYPE_CHECKING:
+    from Common_Foundation.Streams.DoneManager import DoneManager                                                   # type: ignore  # pylint: disable=import-error,unused-import
+
+    from RepositoryBootstrap.SetupAndActivate.Installers.Installer import Installer                                 # type: ignore  # pylint: disable=import-error,unused-import
+
+    from _archive_cache import ArchiveCache
+    from _installers import CachedArchiveInstaller, ComponentArchiveInstaller, DeltaUpdateInstaller, LocalArchiveInstaller, StreamingArchiveInstaller
+
+
+# ----------------------------------------------------------------------
+InstallerType                               = Union["Installer", "CachedArchiveInstaller", "ComponentArchiveInstaller", "DeltaUpdateInstaller", "LocalArchiveInstaller", "StreamingArchiveInstaller"]
+
+# Installers (and the modules that implement them) are created on demand, as activation rarely needs
+# them and each platform only needs a subset of them.
+InstallerFactory                            = Callable[[], InstallerType]
 
 
 # ----------------------------------------------------------------------
 @dataclass(frozen=True)
 class InstallData(object):
     name: str
-    installer: Installer
+    installer_factory: InstallerFactory
     prompt_for_interactive: bool            = field(kw_only=True)
 
+    # Components installed by setup when the installer is a `ComponentArchiveInstaller`; the remaining
+    # components are installed on demand the first time that they are used. All components are
+    # installed if None.
+    components: Optional[List[str]]         = field(kw_only=True, default=None)
+
+    # ----------------------------------------------------------------------
+    @cached_property
+    def installer(self) -> InstallerType:
+        installer = self.installer_factory()
+
+        if self.components is not None:
+            assert hasattr(installer, "components"), self.name
+            installer.components = self.components  # type: ignore
+
+        return installer
+
 
 # ----------------------------------------------------------------------
 _root_dir                                   = Path(__file__).parent
 
 
+# ----------------------------------------------------------------------
+# Set this environment variable to "1" to install downloaded archives with `StreamingArchiveInstaller`
+STREAMING_INSTALLER_ENV_VAR                 = "COMMON_LLVM_STREAMING_INSTALLER"
+
+# Archives with this suffix are seekable, multi-frame zstd tar archives (created by
+# `Tools/LLVM/CreateSeekableArchive.py`) that are extracted across multiple cores. A version opts in
+# to the format by referencing an archive with this suffix.
+ZSTD_ARCHIVE_SUFFIX                         = ".tar.zst"
+
+# Set this environment variable to "1" during setup to defer the installation of LLVM toolchains until
+# the first activation of a configuration that uses them.
+LAZY_INSTALL_ENV_VAR                        = "COMMON_LLVM_LAZY_INSTALL"
+
+# Written to the output directory of a toolchain whose installation was deferred by setup; the file is
+# removed when the toolchain is installed.
+DEFERRED_INSTALL_FILENAME                   = ".Common_LLVM.deferred"
+
+
+# ----------------------------------------------------------------------
+@cache
+def GetArchiveCache() -> Optional["ArchiveCache"]:
+    """Returns the host-wide archive cache or None if it has not been configured"""
+
+    return _ImportLocalModule("_archive_cache").ArchiveCache.FromEnvironment()
+
+
+# ----------------------------------------------------------------------
+def IsLazyInstallEnabled() -> bool:
+    return os.getenv(LAZY_INSTALL_ENV_VAR) == "1"
+
+
+# ----------------------------------------------------------------------
+def DeferInstall(
+    install_data: InstallData,
+) -> None:
+    output_dir = install_data.installer.output_dir
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / DEFERRED_INSTALL_FILENAME).touch()
+
+
+# ----------------------------------------------------------------------
+def IsInstallDeferred(
+    install_data: InstallData,
+) -> bool:
+    return (install_data.installer.output_dir / DEFERRED_INSTALL_FILENAME).is_file()
+
+
+# ----------------------------------------------------------------------
+def InstallDeferred(
+    dm: "DoneManager",
+    version: str,
+    install_data: InstallData,
+) -> None:
+    """\
+    Installs a toolchain whose installation was deferred by setup; invoked during the first activation
+    of a configuration that uses it. Setup implements the installation, so it is imported on demand.
+    """
+
+    _ImportLocalModule("Setup_custom").InstallDeferred(dm, version, install_data)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _ImportLocalModule(
+    module_name: str,
+) -> ModuleType:
+    # The repository root isn't guaranteed to be in sys.path when installers are created. Remove the
+    # module from sys.modules after it is imported, as other repositories may have modules with the
+    # same name.
+    sys.modules.pop(module_name, None)
+
+    sys.path.insert(0, str(_root_dir))
+    with ExitStack(lambda: sys.path.pop(0)):
+        module = importlib.import_module(module_name)
+
+    del sys.modules[module_name]
+
+    return module
+
+
+# ----------------------------------------------------------------------
+def _ImportRepositoryBootstrapInstaller(
+    class_name: str,
+) -> Any:
+    return getattr(
+        importlib.import_module("RepositoryBootstrap.SetupAndActivate.Installers.{}".format(class_name)),
+        class_name,
+    )
+
+
+# ----------------------------------------------------------------------
+def _Installer(
+    class_name: str,
+    *args,
+) -> InstallerFactory:
+    return lambda: _ImportRepositoryBootstrapInstaller(class_name)(*args)
+
+
+# ----------------------------------------------------------------------
+def _LocalArchiveInstaller(
+    archive_filename: Path,
+    output_dir: Path,
+    required_version: str,
+    *,
+    legacy_output_dir: Optional[Path]=None,
+) -> InstallerFactory:
+    # `LocalArchiveInstaller` extracts into a staging directory that is atomically promoted to the
+    # output directory, so an interrupted installation never leaves partial content behind.
+    return lambda: _ImportLocalModule("_installers").LocalArchiveInstaller(
+        archive_filename,
+        output_dir,
+        required_version,
+        legacy_output_dir=legacy_output_dir,
+    )
+
+
+# ----------------------------------------------------------------------
+def _ArchiveDownloadInstaller(
+    class_name: str,
+    url: str,
+    sha256: str,
+    output_dir: Path,
+    required_version: str,
+    *,
+    manifest_url: Optional[str]=None,
+    manifest_sha256: Optional[str]=None,
+) -> InstallerFactory:
+    # Revisions published with a per-file manifest (`files.json`, created by
+    # `Tools/LLVM/CreateFileManifest.py`) opt in to delta updates by providing its url and sha256;
+    # installations of a previous revision are updated by downloading only the files that changed.
+    assert (manifest_url is None) == (manifest_sha256 is None)
+
+    # ----------------------------------------------------------------------
+    def Create() -> InstallerType:
+        if manifest_url is not None:
+            assert manifest_sha256 is not None
+
+            return _ImportLocalModule("_installers").DeltaUpdateInstaller(
+                url,
+                sha256,
+                manifest_url,
+                manifest_sha256,
+                output_dir,
+                required_version,
+                archive_cache=GetArchiveCache(),
+            )
+
+        if (
+            os.getenv(STREAMING_INSTALLER_ENV_VAR) == "1"
+            # The RepositoryBootstrap installers can't extract seekable zstd archives
+            or url.endswith(ZSTD_ARCHIVE_SUFFIX)
+        ):
+            return _ImportLocalModule("_installers").StreamingArchiveInstaller(
+                url,
+                sha256,
+                output_dir,
+                required_version,
+                archive_cache=GetArchiveCache(),
+            )
+
+        installer = _ImportRepositoryBootstrapInstaller(class_name)(url, sha256, output_dir, required_version)
+
+        archive_cache = GetArchiveCache()
+        if archive_cache is None:
+            return installer
+
+        return _ImportLocalModule("_installers").CachedArchiveInstaller(
+            installer,
+            archive_cache,
+            url,
+            sha256,
+            required_version,
+        )
+
+    # ----------------------------------------------------------------------
+
+    return Create
+
+
+# ----------------------------------------------------------------------
+def _ComponentArchiveInstaller(
+    manifest_url: str,
+    manifest_sha256: str,
+    output_dir: Path,
+    required_version: str,
+) -> InstallerFactory:
+    """Installer for toolchains that are split into component archives (see `Tools/LLVM/CreateComponentArchives.py`)"""
+
+    return lambda: _ImportLocalModule("_installers").ComponentArchiveInstaller(
+        manifest_url,
+        manifest_sha256,
+        output_dir,
+        required_version,
+        archive_cache=GetArchiveCache(),
+    )
+
+
 # ----------------------------------------------------------------------
 GRCOV_VERSIONS: Dict[str, InstallData]      = {
     "0.8.12": InstallData(
         "standard",
-        LocalSevenZipInstaller(
+        # The archive is tracked by the repository, so the content is installed into a subdirectory
+        # that can be replaced without deleting the archive.
+        _LocalArchiveInstaller(
             _root_dir / Constants.TOOLS_SUBDIR / "grcov" / "v0.8.12" / CurrentShell.family_name / "install.7z",
-            _root_dir / Constants.TOOLS_SUBDIR / "grcov" / "v0.8.12" / CurrentShell.family_name,
+            _root_dir / Constants.TOOLS_SUBDIR / "grcov" / "v0.8.12" / CurrentShell.family_name / "install",
             "0.8.12",
+            # Previous versions extracted the archive into the directory that contains it
+            legacy_output_dir=_root_dir / Constants.TOOLS_SUBDIR / "grcov" / "v0.8.12" / CurrentShell.family_name,
         ),
         prompt_for_interactive=False,
     ),
@@ -62,11 +299,18 @@ LLVM_VERSIONS: Dict[str, List[InstallData]] = {}
 if CurrentShell.family_name == "Windows":
     # ----------------------------------------------------------------------
     def AugmentInstaller(
-        installer: Installer,
+        installer_factory: InstallerFactory,
         output_dir_suffix: str,
-    ) -> Installer:
-        installer.output_dir /= output_dir_suffix
-        return installer
+    ) -> InstallerFactory:
+        # ----------------------------------------------------------------------
+        def Create() -> InstallerType:
+            installer = installer_factory()
+            installer.output_dir /= output_dir_suffix
+            return installer
+
+        # ----------------------------------------------------------------------
+
+        return Create
 
     # ----------------------------------------------------------------------
 
@@ -74,7 +318,8 @@ if CurrentShell.family_name == "Windows":
         InstallData(
             "mingw",
             AugmentInstaller(
-                DownloadZipInstaller(
+                _ArchiveDownloadInstaller(
+                    "DownloadZipInstaller",
                     "https://github.com/mstorsjo/llvm-mingw/releases/download/20220906/llvm-mingw-20220906-ucrt-x86_64.zip",
                     "06c8523447a369303f7a67dda1d2b66a6b2e460640126458f69f1d98afd3fdf1",
                     _root_dir / Constants.TOOLS_SUBDIR / "LLVM" / "v15.0.2" / CurrentShell.family_name / "x64",
@@ -87,7 +332,8 @@ if CurrentShell.family_name == "Windows":
         InstallData(
             "msvc",
             AugmentInstaller(
-                DownloadNSISInstaller(
+                _Installer(
+                    "DownloadNSISInstaller",
                     "https://github.com/llvm/llvm-project/releases/download/llvmorg-15.0.2/LLVM-15.0.2-win64.exe",
                     "50d24a9e8cb6767ad5c3eb21422a3ffa8f4a2d797120e8d5be41dd0c88c0d63a",
                     _root_dir / Constants.TOOLS_SUBDIR / "LLVM" / "v15.0.2" / CurrentShell.family_name / "x64",
@@ -105,7 +351,8 @@ else:
     LLVM_VERSIONS["15.0.2"] = [
         InstallData(
             "standard",
-            DownloadSevenZipInstaller(
+            _ArchiveDownloadInstaller(
+                "DownloadSevenZipInstaller",
                 "https://github.com/davidbrownell/v4-Common_LLVM/releases/download/v15.0.2-alpha.4/install.7z",
                 "f4728ace762ff628df9baa9d67dbf256f3331059f15eea05385b556ac9da6cc7",
                 _root_dir / Constants.TOOLS_SUBDIR / "LLVM" / "v15.0.2" / CurrentShell.family_name / "x64",
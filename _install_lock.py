@@ -0,0 +1,141 @@
+# ----------------------------------------------------------------------
+# |
+# |  _install_lock.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 12:26:40
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Inter-process lock that serializes installations into an output directory.
+
+The lock is an OS file lock on a sibling of the output directory, so it is released by the OS when the
+process holding it exits (or crashes); a stale lock file never blocks subsequent installations.
+"""
+
+import os
+import time
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+# ----------------------------------------------------------------------
+# The number of seconds to wait for another process to complete its installation
+LOCK_TIMEOUT_ENV_VAR                        = "COMMON_LLVM_INSTALL_LOCK_TIMEOUT"
+
+DEFAULT_LOCK_TIMEOUT                        = 60 * 60
+
+
+# ----------------------------------------------------------------------
+def GetLockFilename(
+    output_dir: Path,
+) -> Path:
+    # The lock file can't be within the output directory, as the directory is replaced during promotion
+    return output_dir.parent / ".{}.lock".format(output_dir.name)
+
+
+# ----------------------------------------------------------------------
+@contextmanager
+def InstallLock(
+    output_dir: Path,
+    *,
+    timeout: Optional[float]=None,
+    on_wait: Optional[Callable[[], None]]=None,
+) -> Iterator[None]:
+    """\
+    Acquires the lock for `output_dir`, waiting for other processes that hold it. `on_wait` is invoked
+    once if the lock is held by another process.
+    """
+
+    if timeout is None:
+        timeout = _GetTimeout()
+
+    lock_filename = GetLockFilename(output_dir)
+    lock_filename.parent.mkdir(parents=True, exist_ok=True)
+
+    fd = os.open(lock_filename, os.O_RDWR | os.O_CREAT, 0o666)
+
+    try:
+        start_time = time.monotonic()
+        delay = 0.05
+
+        while not _TryLock(fd):
+            if on_wait is not None:
+                on_wait()
+                on_wait = None
+
+            if time.monotonic() - start_time > timeout:
+                raise Exception(
+                    "Another process has been installing '{}' for more than {} seconds (lock: '{}').".format(
+                        output_dir,
+                        timeout,
+                        lock_filename,
+                    ),
+                )
+
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+        try:
+            yield
+        finally:
+            _Unlock(fd)
+
+    finally:
+        os.close(fd)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _GetTimeout() -> float:
+    value = os.getenv(LOCK_TIMEOUT_ENV_VAR)
+    if value is None:
+        return DEFAULT_LOCK_TIMEOUT
+
+    try:
+        return float(value)
+    except ValueError as ex:
+        raise Exception("'{}' is not a valid value for '{}'; a number was expected.".format(value, LOCK_TIMEOUT_ENV_VAR)) from ex
+
+
+# ----------------------------------------------------------------------
+def _TryLock(
+    fd: int,
+) -> bool:
+    try:
+        if os.name == "nt":
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)  # type: ignore  # pylint: disable=used-before-assignment
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)  # type: ignore  # pylint: disable=used-before-assignment
+
+    except OSError:
+        return False
+
+    return True
+
+
+# ----------------------------------------------------------------------
+def _Unlock(
+    fd: int,
+) -> None:
+    if os.name == "nt":
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)  # type: ignore  # pylint: disable=used-before-assignment
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)  # type: ignore  # pylint: disable=used-before-assignment
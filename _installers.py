@@ -0,0 +1,988 @@
+# ----------------------------------------------------------------------
+# |
+# |  _installers.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-17 09:40:18
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Installers that augment the functionality provided by RepositoryBootstrap"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import uuid
+import zipfile
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from Common_Foundation.Streams.DoneManager import DoneManager               # type: ignore  # pylint: disable=import-error,unused-import
+
+from RepositoryBootstrap.SetupAndActivate.Installers.LocalSevenZipInstaller import LocalSevenZipInstaller           # type: ignore  # pylint: disable=import-error,unused-import
+
+if TYPE_CHECKING:
+    from RepositoryBootstrap.SetupAndActivate.Installers.Installer import Installer                                 # type: ignore  # pylint: disable=import-error,unused-import
+
+
+# ----------------------------------------------------------------------
+from _archive_cache import ArchiveCache
+del sys.modules["_archive_cache"]
+
+from _components import ComponentManifest, ComponentsInfo, CreateShims, ExtractComponent, InstallComponents
+del sys.modules["_components"]
+
+from _delta_update import ApplyUpdate, DownloadManifest, FileManifest, IsEnabled as IsDeltaUpdateEnabled
+del sys.modules["_delta_update"]
+
+from _archive_pipeline import CreateStagingDirectory, DownloadFile, ExtractTar, IsStreamable, PromoteStagingDirectory, StreamingExtractor
+del sys.modules["_archive_pipeline"]
+
+from _ranged_download import DownloadFileRanged
+del sys.modules["_ranged_download"]
+
+from _zstd_archive import ARCHIVE_SUFFIX as ZSTD_ARCHIVE_SUFFIX, ExtractSeekableArchive, SelectMembers
+del sys.modules["_zstd_archive"]
+
+from _trace import EXTRACTED_COUNTER, Nested as TraceNested, RecordBytes, Subprocess as TraceSubprocess
+del sys.modules["_trace"]
+
+
+# ----------------------------------------------------------------------
+class CachedArchiveInstaller(object):
+    """\
+    Installs an archive that is retrieved from a host-wide `ArchiveCache` (the archive is downloaded
+    into the cache on a miss).
+
+    The original download installer continues to be used to determine if installation is necessary,
+    so the installed content is indistinguishable from content installed by the original installer.
+    Archives are extracted with 7zip, which handles both .7z and .zip archives, into a staging
+    directory that is promoted to the output directory once extraction is complete.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        download_installer: "Installer",
+        archive_cache: ArchiveCache,
+        url: str,
+        sha256: str,
+        required_version: str,
+    ):
+        self._download_installer            = download_installer
+        self._archive_cache                 = archive_cache
+        self._url                           = url
+        self._sha256                        = sha256
+        self._required_version              = required_version
+
+    # ----------------------------------------------------------------------
+    @property
+    def output_dir(self) -> Path:
+        return self._download_installer.output_dir
+
+    @output_dir.setter
+    def output_dir(self, value: Path) -> None:
+        self._download_installer.output_dir = value
+
+    # ----------------------------------------------------------------------
+    def ShouldInstall(self, *args, **kwargs) -> Any:
+        return self._download_installer.ShouldInstall(*args, **kwargs)
+
+    # ----------------------------------------------------------------------
+    def Install(
+        self,
+        dm: DoneManager,
+        *,
+        force: bool,
+        prompt_for_interactive: bool,
+        interactive: Optional[bool],
+    ) -> None:
+        reasons: List[str] = []
+
+        if not force and not self.ShouldInstall(None, reasons.append):
+            dm.WriteVerbose("The content at '{}' is up-to-date.\n".format(self.output_dir))
+            return
+
+        with TraceNested(
+            dm,
+            "Retrieving '{}'...".format(self._url),
+            lambda: "cache {}".format("hit" if was_cached else "miss"),
+        ):
+            was_cached = False
+
+            archive_filename, was_cached = self._archive_cache.Fetch(self._url, self._sha256)
+
+        staging_dir = CreateStagingDirectory(self.output_dir)
+
+        try:
+            LocalSevenZipInstaller(
+                archive_filename,
+                staging_dir,
+                self._required_version,
+            ).Install(
+                dm,
+                force=True,
+                prompt_for_interactive=prompt_for_interactive,
+                interactive=interactive,
+            )
+
+            if dm.result != 0:
+                return
+
+            with TraceNested(dm, "Promoting '{}'...".format(self.output_dir)):
+                PromoteStagingDirectory(staging_dir, self.output_dir)
+
+        finally:
+            if staging_dir.exists():
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+    # ----------------------------------------------------------------------
+    def ExtractFiles(
+        self,
+        dm: DoneManager,
+        output_dir: Path,
+        relative_paths: List[str],
+    ) -> None:
+        """Extracts the original content of the specified files into `output_dir` (used to repair installations)"""
+
+        archive_filename, _ = self._archive_cache.Fetch(self._url, self._sha256)
+
+        ExtractArchive(dm, archive_filename, output_dir, self._required_version, members=set(relative_paths))
+
+
+# ----------------------------------------------------------------------
+class ArchiveInstaller(ABC):
+    """\
+    Base class for installers that populate a staging directory, record the installed version within
+    it, and then promote it to the output directory.
+    """
+
+    INSTALL_INFO_FILENAME                   = ".Common_LLVM.install.json"
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        output_dir: Path,
+        required_version: str,
+    ):
+        self.output_dir                     = output_dir
+        self.required_version               = required_version
+
+    # ----------------------------------------------------------------------
+    def ShouldInstall(
+        self,
+        explicit_installed_version: Optional[str],
+        on_reason_func: Optional[Callable[[str], None]],
+    ) -> bool:
+        installed_version = explicit_installed_version
+
+        if installed_version is None:
+            install_info_filename = self.output_dir / self.INSTALL_INFO_FILENAME
+
+            if install_info_filename.is_file():
+                with install_info_filename.open() as f:
+                    installed_version = json.load(f).get("version", None)
+
+        if installed_version is None:
+            reason = "The content at '{}' has not been installed.".format(self.output_dir)
+        elif installed_version != self.required_version:
+            reason = "The installed version '{}' does not match the required version '{}'.".format(
+                installed_version,
+                self.required_version,
+            )
+        else:
+            return False
+
+        if on_reason_func is not None:
+            on_reason_func(reason)
+
+        return True
+
+    # ----------------------------------------------------------------------
+    def Install(
+        self,
+        dm: DoneManager,
+        *,
+        force: bool,
+        prompt_for_interactive: bool,                                       # pylint: disable=unused-argument
+        interactive: Optional[bool],                                        # pylint: disable=unused-argument
+    ) -> None:
+        if not force and not self.ShouldInstall(None, None):
+            dm.WriteVerbose("The content at '{}' is up-to-date.\n".format(self.output_dir))
+            return
+
+        staging_dir = CreateStagingDirectory(self.output_dir)
+
+        try:
+            install_info = self._Populate(dm, staging_dir)
+
+            # Errors encountered while populating the staging directory (for example, by 7zip) are
+            # reported through the DoneManager rather than raised; the partial content must not be
+            # promoted.
+            if dm.result != 0:
+                return
+
+            install_info["version"] = self.required_version
+
+            self._WriteInstallInfo(staging_dir, install_info)
+
+            with TraceNested(dm, "Promoting '{}'...".format(self.output_dir)):
+                PromoteStagingDirectory(staging_dir, self.output_dir)
+
+            self._OnPromoted(dm)
+
+        finally:
+            if staging_dir.exists():
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    @abstractmethod
+    def _Populate(
+        self,
+        dm: DoneManager,
+        staging_dir: Path,
+    ) -> Dict[str, Any]:
+        """Populates the staging directory and returns information that is persisted with the installation"""
+        raise Exception("Abstract method")  # pragma: no cover
+
+    # ----------------------------------------------------------------------
+    def _OnPromoted(
+        self,
+        dm: DoneManager,                                                    # pylint: disable=unused-argument
+    ) -> None:
+        """Invoked after new content has been promoted to the output directory (setup holds the install lock)"""
+        pass
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def _WriteInstallInfo(
+        cls,
+        directory: Path,
+        install_info: Dict[str, Any],
+    ) -> None:
+        filename = directory / cls.INSTALL_INFO_FILENAME
+        temp_filename = filename.with_name(filename.name + ".tmp")
+
+        with temp_filename.open("w") as f:
+            json.dump(install_info, f)
+
+        os.replace(temp_filename, filename)
+
+
+# ----------------------------------------------------------------------
+class LocalArchiveInstaller(ArchiveInstaller):
+    """Installs an archive that is stored within the repository"""
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        archive_filename: Path,
+        output_dir: Path,
+        required_version: str,
+        *,
+        legacy_output_dir: Optional[Path]=None,
+    ):
+        # The output directory is replaced when the installation is promoted, which would delete an
+        # archive stored within it.
+        if output_dir.resolve() in archive_filename.resolve().parents:
+            raise Exception(
+                "The archive '{}' can't be stored within the output directory '{}'.".format(
+                    archive_filename,
+                    output_dir,
+                ),
+            )
+
+        # Content that was extracted directly into the directory that contains the archive (before
+        # installations were promoted into their own directory) is removed when the content is
+        # installed.
+        if legacy_output_dir is not None:
+            assert archive_filename.parent == legacy_output_dir, (archive_filename, legacy_output_dir)
+            assert output_dir.parent == legacy_output_dir, (output_dir, legacy_output_dir)
+
+        super(LocalArchiveInstaller, self).__init__(output_dir, required_version)
+
+        self.archive_filename               = archive_filename
+        self.legacy_output_dir              = legacy_output_dir
+
+    # ----------------------------------------------------------------------
+    def Install(
+        self,
+        dm: DoneManager,
+        *,
+        force: bool,
+        prompt_for_interactive: bool,
+        interactive: Optional[bool],
+    ) -> None:
+        super(LocalArchiveInstaller, self).Install(
+            dm,
+            force=force,
+            prompt_for_interactive=prompt_for_interactive,
+            interactive=interactive,
+        )
+
+        # The archive is tracked by the repository and is needed to repair the installation
+        if not self.archive_filename.is_file():
+            raise Exception("The archive '{}' no longer exists after installation.".format(self.archive_filename))
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Populate(
+        self,
+        dm: DoneManager,
+        staging_dir: Path,
+    ) -> Dict[str, Any]:
+        if not self.archive_filename.is_file():
+            raise Exception(
+                "The archive '{}' does not exist; restore it with 'git checkout -- \"{}\"'.".format(
+                    self.archive_filename,
+                    self.archive_filename,
+                ),
+            )
+
+        with TraceNested(dm, "Extracting '{}'...".format(self.archive_filename.name)) as extract_dm:
+            ExtractArchive(extract_dm, self.archive_filename, staging_dir, self.required_version)
+
+        return {
+            "archive": str(self.archive_filename),
+        }
+
+    # ----------------------------------------------------------------------
+    def _OnPromoted(
+        self,
+        dm: DoneManager,
+    ) -> None:
+        if self.legacy_output_dir is None:
+            return
+
+        # The archive, the installation, and the installation's lock and staging directories are preserved
+        installation_prefix = ".{}.".format(self.output_dir.name)
+
+        legacy_items = [
+            item
+            for item in self.legacy_output_dir.iterdir()
+            if item.name not in [self.archive_filename.name, self.output_dir.name]
+            and not item.name.startswith(installation_prefix)
+        ]
+
+        if not legacy_items:
+            return
+
+        with TraceNested(dm, "Removing the previous installation in '{}'...".format(self.legacy_output_dir)) as remove_dm:
+            for item in legacy_items:
+                remove_dm.WriteVerbose("Removing '{}'.\n".format(item))
+
+                if item.is_dir() and not item.is_symlink():
+                    shutil.rmtree(item)
+                else:
+                    item.unlink()
+
+    # ----------------------------------------------------------------------
+    def ExtractFiles(
+        self,
+        dm: DoneManager,
+        output_dir: Path,
+        relative_paths: List[str],
+    ) -> None:
+        """Extracts the original content of the specified files into `output_dir` (used to repair installations)"""
+
+        ExtractArchive(dm, self.archive_filename, output_dir, self.required_version, members=set(relative_paths))
+
+
+# ----------------------------------------------------------------------
+class StreamingArchiveInstaller(ArchiveInstaller):
+    """\
+    Installs an archive in as few passes over its bytes as possible.
+
+    Tar-based archives are hashed while they are downloaded, written to disk, and extracted into a
+    staging directory, all in the same pass. Other archives (.7z, .zip, .tar.zst) store their indexes
+    at the end of the file, so they are downloaded with concurrent, resumable Range requests and
+    extracted into the staging directory once the download completes. The staging directory is only
+    promoted to the output directory if the final digest matches the expected sha256.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        url: str,
+        sha256: str,
+        output_dir: Path,
+        required_version: str,
+        *,
+        archive_cache: Optional[ArchiveCache]=None,
+    ):
+        super(StreamingArchiveInstaller, self).__init__(output_dir, required_version)
+
+        self.url                            = url
+        self.sha256                         = sha256.lower()
+        self.archive_cache                  = archive_cache
+
+    # ----------------------------------------------------------------------
+    @property
+    def archive_name(self) -> str:
+        return self.url.rsplit("/", 1)[-1] or "archive"
+
+    # ----------------------------------------------------------------------
+    def ExtractFiles(
+        self,
+        dm: DoneManager,
+        output_dir: Path,
+        relative_paths: List[str],
+    ) -> None:
+        """Extracts the original content of the specified files into `output_dir` (used to repair installations)"""
+
+        if self.archive_cache is not None:
+            archive_filename, _ = self.archive_cache.Fetch(self.url, self.sha256)
+
+            ExtractArchive(dm, archive_filename, output_dir, self.required_version, members=set(relative_paths))
+            return
+
+        with tempfile.TemporaryDirectory() as temp_directory:
+            archive_filename = Path(temp_directory) / self.archive_name
+
+            result = DownloadFileRanged(self.url, archive_filename)
+
+            if result.sha256 != self.sha256:
+                raise Exception(
+                    "The content downloaded from '{}' does not match the expected sha256 ('{}' != '{}').".format(
+                        self.url,
+                        result.sha256,
+                        self.sha256,
+                    ),
+                )
+
+            ExtractArchive(dm, archive_filename, output_dir, self.required_version, members=set(relative_paths))
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Populate(
+        self,
+        dm: DoneManager,
+        staging_dir: Path,
+    ) -> Dict[str, Any]:
+        archive_filename, is_extracted = self._Retrieve(dm, staging_dir)
+
+        try:
+            if not is_extracted:
+                with TraceNested(dm, "Extracting '{}'...".format(archive_filename.name)) as extract_dm:
+                    ExtractArchive(extract_dm, archive_filename, staging_dir, self.required_version)
+
+        finally:
+            # Downloads that aren't stored in the archive cache are temporary
+            if self.archive_cache is None:
+                shutil.rmtree(archive_filename.parent, ignore_errors=True)
+
+        return {
+            "url": self.url,
+            "sha256": self.sha256,
+        }
+
+    # ----------------------------------------------------------------------
+    def _Retrieve(
+        self,
+        dm: DoneManager,
+        staging_dir: Path,
+    ) -> Tuple[Path, bool]:
+        """Returns the archive filename and a flag indicating if the content has already been extracted into the staging directory"""
+
+        extractor: Optional[StreamingExtractor] = None
+
+        with TraceNested(
+            dm,
+            "Retrieving '{}'...".format(self.url),
+            lambda: "extracted while downloading" if extractor is not None else None,
+        ):
+            if IsStreamable(self.archive_name):
+                extractor = StreamingExtractor(staging_dir)
+
+            try:
+                if self.archive_cache is not None:
+                    # `Fetch` performs the lookup so that each retrieval is counted once in the cache
+                    # statistics.
+                    archive_filename, was_cached = self.archive_cache.Fetch(
+                        self.url,
+                        self.sha256,
+                        on_chunk=None if extractor is None else extractor.Write,
+                    )
+
+                    if was_cached and extractor is not None:
+                        # Nothing was written to the extractor; the cached archive is extracted
+                        # by the caller.
+                        extractor.Abort()
+                        extractor = None
+
+                else:
+                    if extractor is None:
+                        # Ranged downloads use a well-known directory so that an interrupted download
+                        # can be resumed by a later invocation.
+                        download_dir = staging_dir.parent / ".{}.download".format(self.output_dir.name)
+                        download_dir.mkdir(exist_ok=True)
+                    else:
+                        download_dir = staging_dir.parent / ".{}.download-{}".format(self.output_dir.name, uuid.uuid4().hex)
+                        download_dir.mkdir()
+
+                    archive_filename = download_dir / self.archive_name
+
+                    try:
+                        if extractor is None:
+                            result = DownloadFileRanged(self.url, archive_filename)
+                        else:
+                            result = DownloadFile(self.url, archive_filename, on_chunk=extractor.Write)
+
+                        if result.sha256 != self.sha256:
+                            shutil.rmtree(download_dir, ignore_errors=True)
+
+                            raise Exception(
+                                "The content downloaded from '{}' does not match the expected sha256 ('{}' != '{}').".format(
+                                    self.url,
+                                    result.sha256,
+                                    self.sha256,
+                                ),
+                            )
+
+                    except:
+                        # Keep the partial content of ranged downloads so that they can be resumed
+                        if extractor is not None:
+                            shutil.rmtree(download_dir, ignore_errors=True)
+
+                        raise
+
+                if extractor is not None:
+                    extractor.Close()
+
+            except:
+                if extractor is not None:
+                    extractor.Abort()
+
+                raise
+
+            return archive_filename, extractor is not None
+
+
+# ----------------------------------------------------------------------
+class DeltaUpdateInstaller(StreamingArchiveInstaller):
+    """\
+    Installs an archive that is published with a per-file manifest (see `_delta_update.py`).
+
+    The first installation extracts the complete archive (as `StreamingArchiveInstaller` does) and
+    stores the manifest within the installation. Installations of a previous revision are updated by
+    downloading only the files (or binary deltas) that changed; the complete archive is used if the
+    update fails.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        url: str,
+        sha256: str,
+        manifest_url: str,
+        manifest_sha256: str,
+        output_dir: Path,
+        required_version: str,
+        *,
+        archive_cache: Optional[ArchiveCache]=None,
+    ):
+        super(DeltaUpdateInstaller, self).__init__(
+            url,
+            sha256,
+            output_dir,
+            required_version,
+            archive_cache=archive_cache,
+        )
+
+        self.manifest_url                   = manifest_url
+        self.manifest_sha256                = manifest_sha256.lower()
+
+    # ----------------------------------------------------------------------
+    def Install(
+        self,
+        dm: DoneManager,
+        *,
+        force: bool,
+        prompt_for_interactive: bool,
+        interactive: Optional[bool],
+    ) -> None:
+        if not force and IsDeltaUpdateEnabled() and self.ShouldInstall(None, None):
+            installed = FileManifest.Load(self.output_dir)
+
+            if installed is not None and (self.output_dir / self.INSTALL_INFO_FILENAME).is_file():
+                update_result = None
+
+                with TraceNested(
+                    dm,
+                    "Updating '{}' to '{}'...".format(self.output_dir, self.required_version),
+                    lambda: None if update_result is None else str(update_result),
+                ) as update_dm:
+                    try:
+                        target = DownloadManifest(self.manifest_url, self.manifest_sha256)
+
+                        update_result = ApplyUpdate(
+                            self.output_dir,
+                            installed,
+                            target,
+                            self.manifest_url,
+                            on_status=lambda message: update_dm.WriteVerbose("{}\n".format(message)),
+                        )
+
+                    except Exception as ex:                                 # pylint: disable=broad-except
+                        update_dm.WriteWarning(
+                            "The update failed and the complete archive will be installed ({}).\n".format(ex),
+                        )
+
+                if update_result is not None:
+                    self._WriteInstallInfo(
+                        self.output_dir,
+                        {
+                            "url": self.url,
+                            "sha256": self.sha256,
+                            "manifest_url": self.manifest_url,
+                            "version": self.required_version,
+                        },
+                    )
+
+                    return
+
+        super(DeltaUpdateInstaller, self).Install(
+            dm,
+            force=force,
+            prompt_for_interactive=prompt_for_interactive,
+            interactive=interactive,
+        )
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Populate(
+        self,
+        dm: DoneManager,
+        staging_dir: Path,
+    ) -> Dict[str, Any]:
+        install_info = super(DeltaUpdateInstaller, self)._Populate(dm, staging_dir)
+
+        # The manifest is only needed by the next update, so failing to retrieve it doesn't fail the installation
+        try:
+            DownloadManifest(self.manifest_url, self.manifest_sha256).Save(staging_dir)
+        except Exception as ex:                                             # pylint: disable=broad-except
+            dm.WriteWarning("The file manifest could not be retrieved; the next revision will be installed from the complete archive ({}).\n".format(ex))
+
+        install_info["manifest_url"] = self.manifest_url
+
+        return install_info
+
+
+# ----------------------------------------------------------------------
+class ComponentArchiveInstaller(ArchiveInstaller):
+    """\
+    Installs a toolchain that has been split into component archives described by a manifest (see
+    `_components.py`).
+
+    Only the components in `components` (and the components that they require) are installed; the
+    executables of the remaining components are replaced with shims that install the component the
+    first time that they are invoked.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        manifest_url: str,
+        manifest_sha256: str,
+        output_dir: Path,
+        required_version: str,
+        *,
+        archive_cache: Optional[ArchiveCache]=None,
+        components: Optional[List[str]]=None,           # None to install all components
+    ):
+        super(ComponentArchiveInstaller, self).__init__(output_dir, required_version)
+
+        self.manifest_url                   = manifest_url
+        self.manifest_sha256                = manifest_sha256.lower()
+        self.archive_cache                  = archive_cache
+        self.components                     = components
+
+    # ----------------------------------------------------------------------
+    def ShouldInstall(
+        self,
+        explicit_installed_version: Optional[str],
+        on_reason_func: Optional[Callable[[str], None]],
+    ) -> bool:
+        if super(ComponentArchiveInstaller, self).ShouldInstall(explicit_installed_version, on_reason_func):
+            return True
+
+        info = ComponentsInfo.Load(self.output_dir)
+
+        if info is None:
+            reason = "The component information at '{}' does not exist.".format(self.output_dir)
+        else:
+            missing = self._GetMissingComponents(info)
+            if not missing:
+                return False
+
+            reason = "The component(s) {} have not been installed.".format(
+                ", ".join("'{}'".format(name) for name in missing),
+            )
+
+        if on_reason_func is not None:
+            on_reason_func(reason)
+
+        return True
+
+    # ----------------------------------------------------------------------
+    def Install(
+        self,
+        dm: DoneManager,
+        *,
+        force: bool,
+        prompt_for_interactive: bool,
+        interactive: Optional[bool],
+    ) -> None:
+        if not force and not super(ComponentArchiveInstaller, self).ShouldInstall(None, None):
+            info = ComponentsInfo.Load(self.output_dir)
+
+            if info is not None:
+                # The installation is current, but components may have been added to the configuration
+                missing = self._GetMissingComponents(info)
+
+                if missing:
+                    with TraceNested(dm, "Installing component(s) in '{}'...".format(self.output_dir)) as install_dm:
+                        InstallComponents(
+                            self.output_dir,
+                            missing,
+                            archive_cache=self.archive_cache,
+                            on_status=lambda message: install_dm.WriteVerbose("{}\n".format(message)),
+                        )
+                else:
+                    dm.WriteVerbose("The content at '{}' is up-to-date.\n".format(self.output_dir))
+
+                return
+
+        super(ComponentArchiveInstaller, self).Install(
+            dm,
+            force=True,
+            prompt_for_interactive=prompt_for_interactive,
+            interactive=interactive,
+        )
+
+    # ----------------------------------------------------------------------
+    def ExtractFiles(
+        self,
+        dm: DoneManager,                                                    # pylint: disable=unused-argument
+        output_dir: Path,
+        relative_paths: List[str],
+    ) -> None:
+        """Extracts the original content of the specified files into `output_dir` (used to repair installations)"""
+
+        info = ComponentsInfo.Load(self.output_dir)
+        if info is None:
+            raise Exception("The component information at '{}' does not exist.".format(self.output_dir))
+
+        members = set(relative_paths)
+
+        for name in info.installed.keys():
+            component = info.manifest.components[name]
+
+            ExtractComponent(
+                info.GetArchiveUrl(component),
+                component,
+                output_dir,
+                archive_cache=self.archive_cache,
+                members=members,
+            )
+
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    # ----------------------------------------------------------------------
+    def _Populate(
+        self,
+        dm: DoneManager,
+        staging_dir: Path,
+    ) -> Dict[str, Any]:
+        manifest_chunks: List[bytes] = []
+
+        result = DownloadFile(self.manifest_url, None, on_chunk=manifest_chunks.append)
+
+        if result.sha256 != self.manifest_sha256:
+            raise Exception(
+                "The content downloaded from '{}' does not match the expected sha256 ('{}' != '{}').".format(
+                    self.manifest_url,
+                    result.sha256,
+                    self.manifest_sha256,
+                ),
+            )
+
+        info = ComponentsInfo(
+            self.manifest_url,
+            ComponentManifest.FromJson(json.loads(b"".join(manifest_chunks))),
+            {},
+        )
+
+        components = info.manifest.Resolve(self._GetComponentNames(info.manifest))
+
+        with TraceNested(
+            dm,
+            "Installing {} of {} component(s)...".format(len(components), len(info.manifest.components)),
+        ) as components_dm:
+            for component in components:
+                with TraceNested(components_dm, "'{}' ({:,} bytes)...".format(component.name, component.num_bytes)):
+                    ExtractComponent(
+                        info.GetArchiveUrl(component),
+                        component,
+                        staging_dir,
+                        archive_cache=self.archive_cache,
+                    )
+
+                info.installed[component.name] = component.sha256
+
+        shims = CreateShims(self.output_dir, info, staging_dir=staging_dir)
+
+        if shims:
+            dm.WriteVerbose(
+                "{} shim(s) created for components that are installed on demand ({:,} bytes not installed).\n".format(
+                    len(shims),
+                    sum(
+                        component.installed_bytes
+                        for component in info.manifest.components.values()
+                        if component.name not in info.installed
+                    ),
+                ),
+            )
+
+        info.Save(staging_dir)
+
+        return {
+            "manifest_url": self.manifest_url,
+            "components": list(info.installed.keys()),
+        }
+
+    # ----------------------------------------------------------------------
+    def _GetComponentNames(
+        self,
+        manifest: ComponentManifest,
+    ) -> List[str]:
+        if self.components is None:
+            return list(manifest.components.keys())
+
+        return self.components
+
+    # ----------------------------------------------------------------------
+    def _GetMissingComponents(
+        self,
+        info: ComponentsInfo,
+    ) -> List[str]:
+        return [
+            component.name
+            for component in info.manifest.Resolve(self._GetComponentNames(info.manifest))
+            if component.name not in info.installed
+        ]
+
+
+# ----------------------------------------------------------------------
+def ExtractArchive(
+    dm: DoneManager,
+    archive_filename: Path,
+    output_dir: Path,
+    required_version: str,
+    *,
+    members: Optional[Set[str]]=None,       # Relative paths of the files to extract; all files are extracted if None
+) -> None:
+    if archive_filename.name.endswith(ZSTD_ARCHIVE_SUFFIX):
+        extraction_info = ExtractSeekableArchive(archive_filename, output_dir, members=members)
+
+        dm.WriteVerbose(
+            "{} frame(s) extracted with {} worker(s) ({} bytes).\n".format(
+                extraction_info.num_frames,
+                extraction_info.num_workers,
+                extraction_info.decompressed_bytes,
+            ),
+        )
+
+        return
+
+    if IsStreamable(archive_filename.name):
+        with tarfile.open(archive_filename) as tar:
+            selected = None if members is None else SelectMembers(tar, members)
+
+            ExtractTar(tar, output_dir, members=selected)
+
+            RecordBytes(
+                EXTRACTED_COUNTER,
+                sum(
+                    member.size
+                    for member in tar.getmembers()
+                    if member.isfile() and (members is None or member.name.removeprefix("./") in members)
+                ),
+            )
+
+        return
+
+    if members is not None:
+        _ExtractSevenZipMembers(archive_filename, output_dir, members)
+        return
+
+    LocalSevenZipInstaller(
+        archive_filename,
+        output_dir,
+        required_version,
+    ).Install(
+        dm,
+        force=True,
+        prompt_for_interactive=False,
+        interactive=None,
+    )
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _ExtractSevenZipMembers(
+    archive_filename: Path,
+    output_dir: Path,
+    members: Set[str],
+) -> None:
+    """Extracts specific files from a .zip or .7z archive"""
+
+    if archive_filename.suffix == ".zip":
+        with zipfile.ZipFile(archive_filename) as zip_file:
+            for info in zip_file.infolist():
+                if info.filename in members:
+                    zip_file.extract(info, output_dir)
+
+        return
+
+    seven_zip = next((shutil.which(name) for name in ["7z", "7za", "7zz"] if shutil.which(name)), None)
+    if seven_zip is None:
+        raise Exception("A 7zip executable is required to extract files from '{}'.".format(archive_filename))
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        list_filename = Path(temp_directory) / "files.txt"
+        list_filename.write_text("\n".join(sorted(members)) + "\n", encoding="utf-8")
+
+        with TraceSubprocess("{} x".format(Path(seven_zip).name)):
+            result = subprocess.run(
+                [seven_zip, "x", "-y", "-o{}".format(output_dir), str(archive_filename), "@{}".format(list_filename)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                check=False,
+            )
+
+        if result.returncode != 0:
+            raise Exception(
+                "Extracting files from '{}' failed:\n{}".format(
+                    archive_filename,
+                    result.stdout.decode("utf-8", errors="replace"),
+                ),
+            )
@@ -0,0 +1,407 @@
+# ----------------------------------------------------------------------
+# |
+# |  _integrity.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 08:40:12
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Verifies the content of installed toolchains against the per-file manifest recorded when they were
+installed (the same manifest used for delta updates, see `_delta_update.py`), and repairs the files
+that are missing or modified without reinstalling the toolchain.
+
+Files are hashed concurrently through memory maps (hashing releases the GIL and memory maps avoid
+copying the content into python buffers), so a toolchain of several GB is verified in seconds when
+its content is in the page cache:
+
+    python _integrity.py verify <output_dir> [<output_dir> ...]
+"""
+
+import hashlib
+import mmap
+import os
+import shutil
+import stat
+import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# ----------------------------------------------------------------------
+from _archive_pipeline import CreateStagingDirectory, PRESERVED_FILENAMES
+del sys.modules["_archive_pipeline"]
+
+from _delta_update import FileEntry, FileManifest
+del sys.modules["_delta_update"]
+
+
+# ----------------------------------------------------------------------
+# Set this environment variable to "1" to verify (and repair) installed tools during setup
+VERIFY_ENV_VAR                              = "COMMON_LLVM_VERIFY"
+
+
+# ----------------------------------------------------------------------
+@dataclass
+class VerifyResult(object):
+    num_files: int                          = 0
+    num_bytes: int                          = 0
+    execution_time: float                   = 0.0
+
+    missing: List[str]                      = field(default_factory=list)
+    modified: List[str]                     = field(default_factory=list)           # Content or symbolic link target differs
+    permissions: List[str]                  = field(default_factory=list)           # Only the permissions differ
+
+    # ----------------------------------------------------------------------
+    @property
+    def is_valid(self) -> bool:
+        return not self.missing and not self.modified and not self.permissions
+
+    # ----------------------------------------------------------------------
+    def __str__(self) -> str:
+        return "{} file(s) ({:,} bytes) verified in {:.2f}s ({:,.0f} MB/s): {}".format(
+            self.num_files,
+            self.num_bytes,
+            self.execution_time,
+            self.num_bytes / (1024 * 1024) / self.execution_time if self.execution_time else 0.0,
+            "valid" if self.is_valid else "{} missing, {} modified, {} with different permissions".format(
+                len(self.missing),
+                len(self.modified),
+                len(self.permissions),
+            ),
+        )
+
+
+# ----------------------------------------------------------------------
+def IsVerificationEnabled() -> bool:
+    return os.getenv(VERIFY_ENV_VAR) == "1"
+
+
+# ----------------------------------------------------------------------
+def CreateManifest(
+    output_dir: Path,
+    version: str,
+    *,
+    max_workers: Optional[int]=None,
+) -> FileManifest:
+    """\
+    Creates and saves the manifest of the files in `output_dir`. Installation metadata at the root of
+    `output_dir` (files that start with '.' and files that are committed to the repository) isn't
+    included.
+    """
+
+    relative_paths: List[str] = []
+
+    for root, directories, filenames in os.walk(output_dir):
+        root_path = Path(root)
+
+        if root_path == output_dir:
+            directories[:] = [directory for directory in directories if not _IsMetadata(directory)]
+            filenames = [filename for filename in filenames if not _IsMetadata(filename)]
+
+        for name in filenames + [directory for directory in directories if (root_path / directory).is_symlink()]:
+            relative_paths.append((root_path / name).relative_to(output_dir).as_posix())
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        entries = list(executor.map(lambda relative_path: _CreateEntry(output_dir, relative_path), relative_paths))
+
+    manifest = FileManifest(version, dict(zip(relative_paths, entries)), {})
+
+    manifest.Save(output_dir)
+
+    return manifest
+
+
+# ----------------------------------------------------------------------
+def UpdateManifest(
+    output_dir: Path,
+    relative_paths: List[str],
+) -> Optional[FileManifest]:
+    """\
+    Updates the entries of files in the manifest of `output_dir` after they have been added, replaced,
+    or removed outside of an installation (for example, when a component is installed on demand).
+    Nothing is updated if the manifest hasn't been recorded. The caller must hold the install lock for
+    `output_dir`.
+    """
+
+    manifest = FileManifest.Load(output_dir)
+    if manifest is None:
+        return None
+
+    files = dict(manifest.files)
+
+    for relative_path in relative_paths:
+        if os.path.lexists(output_dir / relative_path):
+            files[relative_path] = _CreateEntry(output_dir, relative_path)
+        else:
+            files.pop(relative_path, None)
+
+    manifest = FileManifest(manifest.version, files, manifest.deltas)
+
+    manifest.Save(output_dir)
+
+    return manifest
+
+
+# ----------------------------------------------------------------------
+def Verify(
+    output_dir: Path,
+    manifest: FileManifest,
+    *,
+    max_workers: Optional[int]=None,
+) -> VerifyResult:
+    result = VerifyResult()
+
+    start_time = time.perf_counter()
+
+    # ----------------------------------------------------------------------
+    def VerifyEntry(
+        item: Tuple[str, FileEntry],
+    ) -> Optional[List[str]]:
+        """Returns the list that the file belongs to if it isn't valid"""
+
+        relative_path, entry = item
+        filename = output_dir / relative_path
+
+        try:
+            file_stat = filename.lstat()
+        except FileNotFoundError:
+            return result.missing
+
+        if entry.link is not None:
+            if not stat.S_ISLNK(file_stat.st_mode) or os.readlink(filename) != entry.link:
+                return result.modified
+
+            return None
+
+        if (
+            not stat.S_ISREG(file_stat.st_mode)
+            or file_stat.st_size != entry.size
+            or _CalculateSha256(filename) != entry.sha256
+        ):
+            return result.modified
+
+        # Windows doesn't preserve POSIX permissions
+        if os.name != "nt" and stat.S_IMODE(file_stat.st_mode) != entry.mode:
+            return result.permissions
+
+        return None
+
+    # ----------------------------------------------------------------------
+
+    # Largest files first, so that a single large file doesn't start last
+    items = sorted(manifest.files.items(), key=lambda item: -item[1].size)
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        for (relative_path, _), invalid_list in zip(items, executor.map(VerifyEntry, items)):
+            if invalid_list is not None:
+                invalid_list.append(relative_path)
+
+    result.num_files = len(items)
+    result.num_bytes = sum(entry.size for _, entry in items)
+    result.execution_time = time.perf_counter() - start_time
+
+    for invalid_list in [result.missing, result.modified, result.permissions]:
+        invalid_list.sort()
+
+    return result
+
+
+# ----------------------------------------------------------------------
+def Repair(
+    output_dir: Path,
+    manifest: FileManifest,
+    verify_result: VerifyResult,
+    extract_func: Callable[[Path, List[str]], None],    # (staging_dir, relative_paths)
+) -> int:
+    """\
+    Repairs the files identified by `verify_result`; `extract_func` extracts the original content of
+    files into a staging directory. Returns the number of files repaired. The caller must hold the
+    install lock for `output_dir`.
+    """
+
+    relative_paths = verify_result.missing + verify_result.modified
+
+    if not relative_paths and not verify_result.permissions:
+        return 0
+
+    staging_dir = CreateStagingDirectory(output_dir)
+
+    try:
+        # The content of these files is valid, but it may be shared with other links (for example,
+        # entries in the dedup store) that have the expected permissions; changing the permissions of
+        # the installed file in place would change them for every link, so a copy replaces it.
+        for relative_path in verify_result.permissions:
+            staged_filename = staging_dir / relative_path
+
+            staged_filename.parent.mkdir(parents=True, exist_ok=True)
+
+            shutil.copy2(output_dir / relative_path, staged_filename)
+            os.chmod(staged_filename, manifest.files[relative_path].mode)
+
+        links: Dict[str, str] = {}
+        files: List[str] = []
+
+        for relative_path in relative_paths:
+            entry = manifest.files[relative_path]
+
+            if entry.link is not None:
+                links[relative_path] = entry.link
+            else:
+                files.append(relative_path)
+
+        if files:
+            extract_func(staging_dir, files)
+
+        for relative_path, link in links.items():
+            staged_filename = staging_dir / relative_path
+
+            staged_filename.parent.mkdir(parents=True, exist_ok=True)
+            os.symlink(link, staged_filename)
+
+        # Verify everything before replacing anything
+        for relative_path in files:
+            staged_filename = staging_dir / relative_path
+
+            if not staged_filename.is_file():
+                raise Exception("'{}' was not extracted.".format(relative_path))
+
+            sha256 = _CalculateSha256(staged_filename)
+
+            if sha256 != manifest.files[relative_path].sha256:
+                raise Exception(
+                    "The extracted content of '{}' does not match the expected sha256 ('{}' != '{}').".format(
+                        relative_path,
+                        sha256,
+                        manifest.files[relative_path].sha256,
+                    ),
+                )
+
+            os.chmod(staged_filename, manifest.files[relative_path].mode)
+
+        for relative_path in relative_paths + verify_result.permissions:
+            filename = output_dir / relative_path
+
+            filename.parent.mkdir(parents=True, exist_ok=True)
+
+            if filename.is_dir() and not filename.is_symlink():
+                shutil.rmtree(filename)
+
+            os.replace(staging_dir / relative_path, filename)
+
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    return len(relative_paths) + len(verify_result.permissions)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# Memory maps are hashed in windows of this size so that very large files don't have to be mapped
+# into the address space of 32-bit processes in their entirety.
+_MAP_SIZE                                   = 256 * 1024 * 1024
+
+
+# ----------------------------------------------------------------------
+def _CreateEntry(
+    output_dir: Path,
+    relative_path: str,
+) -> FileEntry:
+    filename = output_dir / relative_path
+
+    if filename.is_symlink():
+        return FileEntry(None, link=os.readlink(filename))
+
+    file_stat = filename.stat()
+
+    return FileEntry(_CalculateSha256(filename), file_stat.st_size, stat.S_IMODE(file_stat.st_mode))
+
+
+# ----------------------------------------------------------------------
+def _IsMetadata(
+    name: str,
+) -> bool:
+    return name.startswith(".") or name in PRESERVED_FILENAMES
+
+
+# ----------------------------------------------------------------------
+def _CalculateSha256(
+    filename: Path,
+) -> str:
+    hasher = hashlib.sha256()
+
+    with filename.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+
+        # Empty files can't be mapped (and aren't)
+        offset = 0
+
+        while offset < size:
+            length = min(_MAP_SIZE, size - offset)
+
+            with mmap.mmap(f.fileno(), length, offset=offset, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, "madvise"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)  # type: ignore  # pylint: disable=no-member
+
+                with memoryview(mapped) as view:  # type: ignore
+                    hasher.update(view)
+
+            offset += length
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def _EntryPoint(
+    args: List[str],
+) -> int:
+    if len(args) < 2 or args[0] != "verify":
+        sys.stderr.write("Usage: python {} verify <output_dir> [<output_dir> ...]\n".format(Path(__file__).name))
+        return -1
+
+    result = 0
+
+    for output_dir in args[1:]:
+        manifest = FileManifest.Load(Path(output_dir))
+
+        if manifest is None:
+            sys.stdout.write("{}: the file manifest does not exist; run setup to create it.\n".format(output_dir))
+            result = -1
+
+            continue
+
+        verify_result = Verify(Path(output_dir), manifest)
+
+        sys.stdout.write("{}: {}\n".format(output_dir, verify_result))
+
+        for title, relative_paths in [
+            ("Missing", verify_result.missing),
+            ("Modified", verify_result.modified),
+            ("Permissions", verify_result.permissions),
+        ]:
+            for relative_path in relative_paths:
+                sys.stdout.write("    {}: {}\n".format(title, relative_path))
+
+        if not verify_result.is_valid:
+            result = -1
+
+    return result
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(_EntryPoint(sys.argv[1:]))
@@ -0,0 +1,172 @@
+# ----------------------------------------------------------------------
+# |
+# |  _precompiled_headers.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 18:20:47
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Precompiled headers and a clang module cache for the most commonly used libc++ headers.
+
+The toolchain ships a prefix header (`share/Common_LLVM/libcxx_common.h`) that includes the common
+libc++ headers. Precompiled headers embed the paths and timestamps of every header that they include
+(including the host's libc headers), so they are created during setup on the machine that uses them
+rather than when the toolchain is built. Activation exposes them through environment variables that
+projects opt into:
+
+    COMMON_LLVM_LIBCXX_PCH_DIR:     Contains `libcxx_common.<standard>.<optimization>.pch` files, for
+                                    example `clang++ -std=c++17 -O2 -include-pch $COMMON_LLVM_LIBCXX_PCH_DIR/libcxx_common.c++17.O2.pch`.
+    COMMON_LLVM_MODULE_CACHE_DIR:   A module cache populated with the libc++ modules, for example
+                                    `clang++ -std=c++17 -fmodules -fmodules-cache-path=$COMMON_LLVM_MODULE_CACHE_DIR`.
+"""
+
+import json
+import os
+import re
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+# ----------------------------------------------------------------------
+PRECOMPILED_DIRNAME                         = ".Common_LLVM.precompiled"
+
+PREFIX_HEADER                               = Path("share") / "Common_LLVM" / "libcxx_common.h"
+
+# Precompiled headers can only be used by translation units compiled with the same language standard
+# and predefined macros (which include the macros defined by optimization levels), so a precompiled
+# header is created for each variant.
+VARIANTS: List[Tuple[str, str]]             = [
+    (standard, optimization)
+    for standard in ["c++17", "c++20"]
+    for optimization in ["O0", "O2"]
+]
+
+PCH_DIR_ENV_VAR                             = "COMMON_LLVM_LIBCXX_PCH_DIR"
+MODULE_CACHE_ENV_VAR                        = "COMMON_LLVM_MODULE_CACHE_DIR"
+
+
+# ----------------------------------------------------------------------
+def GetPrecompiledHeaderFilename(
+    precompiled_dir: Path,
+    standard: str,
+    optimization: str,
+) -> Path:
+    return precompiled_dir / "libcxx_common.{}.{}.pch".format(standard, optimization)
+
+
+# ----------------------------------------------------------------------
+def GetModuleCacheDir(
+    precompiled_dir: Path,
+) -> Path:
+    return precompiled_dir / "modules"
+
+
+# ----------------------------------------------------------------------
+def IsUpToDate(
+    output_dir: Path,
+) -> bool:
+    """Returns True if the precompiled headers exist and none of the files that they depend on have changed"""
+
+    precompiled_dir = output_dir / PRECOMPILED_DIRNAME
+
+    try:
+        with (precompiled_dir / _STAMP_FILENAME).open() as f:
+            inputs = json.load(f)["inputs"]
+
+        for filename, (size, mtime_ns) in inputs.items():
+            stat = os.stat(filename)
+
+            if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+                return False
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+    return all(
+        GetPrecompiledHeaderFilename(precompiled_dir, standard, optimization).is_file()
+        for standard, optimization in VARIANTS
+    )
+
+
+# ----------------------------------------------------------------------
+def RecordInputs(
+    precompiled_dir: Path,
+    clang_filename: Path,
+    dependency_filenames: List[Path],
+) -> None:
+    """\
+    Records the files that the precompiled headers depend on (the compiler and the headers listed in the
+    dependency files written by `-MD`); the precompiled headers are only exposed during activation once
+    this information has been recorded.
+    """
+
+    inputs: Dict[str, Tuple[int, int]] = {}
+
+    for filename in [str(clang_filename.resolve())] + [
+        filename
+        for dependency_filename in dependency_filenames
+        for filename in _ParseDependencyFile(dependency_filename)
+    ]:
+        if filename in inputs:
+            continue
+
+        stat = os.stat(filename)
+        inputs[filename] = (stat.st_size, stat.st_mtime_ns)
+
+    stamp_filename = precompiled_dir / _STAMP_FILENAME
+    temp_filename = stamp_filename.with_name(stamp_filename.name + ".tmp")
+
+    with temp_filename.open("w") as f:
+        json.dump({"inputs": inputs}, f)
+
+    os.replace(temp_filename, stamp_filename)
+
+
+# ----------------------------------------------------------------------
+def GetEnvironmentVariables(
+    output_dir: Path,
+) -> Dict[str, str]:
+    """Returns the environment variables set during activation (if the precompiled headers have been created)"""
+
+    precompiled_dir = output_dir / PRECOMPILED_DIRNAME
+
+    if not (precompiled_dir / _STAMP_FILENAME).is_file():
+        return {}
+
+    return {
+        PCH_DIR_ENV_VAR: str(precompiled_dir),
+        MODULE_CACHE_ENV_VAR: str(GetModuleCacheDir(precompiled_dir)),
+    }
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_STAMP_FILENAME                             = "inputs.json"
+
+
+# ----------------------------------------------------------------------
+def _ParseDependencyFile(
+    dependency_filename: Path,
+) -> List[str]:
+    """Returns the prerequisites in a make-style dependency file"""
+
+    content = dependency_filename.read_text().replace("\\\n", " ")
+
+    # Skip the target
+    content = content.split(": ", 1)[-1]
+
+    return [
+        item.replace("\\ ", " ")
+        for item in re.split(r"(?<!\\)\s+", content)
+        if item
+    ]
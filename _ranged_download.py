@@ -0,0 +1,297 @@
+# ----------------------------------------------------------------------
+# |
+# |  _ranged_download.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-17 13:34:52
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""Resumable downloads that fetch segments of a file concurrently via HTTP Range requests"""
+
+import hashlib
+import http.client
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.request
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Set
+
+
+# ----------------------------------------------------------------------
+from _archive_pipeline import CHUNK_SIZE, DownloadFile, DownloadResult
+del sys.modules["_archive_pipeline"]
+
+from _trace import DOWNLOADED_COUNTER, RecordBytes
+del sys.modules["_trace"]
+
+
+# ----------------------------------------------------------------------
+# The number of concurrent connections used when downloading a file (a value of 1 disables ranged
+# downloads).
+NUM_CONNECTIONS_ENV_VAR                     = "COMMON_LLVM_DOWNLOAD_CONNECTIONS"
+
+DEFAULT_NUM_CONNECTIONS                     = 4
+DEFAULT_SEGMENT_SIZE                        = 16 * 1024 * 1024
+
+
+# ----------------------------------------------------------------------
+def GetNumConnections() -> int:
+    value = os.getenv(NUM_CONNECTIONS_ENV_VAR)
+    if value is None:
+        return DEFAULT_NUM_CONNECTIONS
+
+    try:
+        num_connections = int(value)
+    except ValueError as ex:
+        raise Exception("'{}' is not a valid value for '{}'; an integer was expected.".format(value, NUM_CONNECTIONS_ENV_VAR)) from ex
+
+    return max(1, num_connections)
+
+
+# ----------------------------------------------------------------------
+def DownloadFileRanged(
+    url: str,
+    destination: Path,
+    *,
+    num_connections: Optional[int]=None,
+    segment_size: int=DEFAULT_SEGMENT_SIZE,
+    max_retries: int=5,
+    timeout: float=30.0,
+) -> DownloadResult:
+    """\
+    Downloads `url` to `destination` using concurrent Range requests.
+
+    Content is written to `<destination>.partial` and the segments that have been completed are
+    recorded in `<destination>.partial.json`; a subsequent call after an interrupted download only
+    fetches the segments that are missing. Dropped connections are retried from the last byte received.
+    The download falls back to a single connection if the server doesn't support Range requests.
+    """
+
+    if num_connections is None:
+        num_connections = GetNumConnections()
+
+    partial_filename = destination.with_name(destination.name + ".partial")
+    state_filename = destination.with_name(destination.name + ".partial.json")
+
+    probe = _Probe(url, timeout) if num_connections > 1 else None
+
+    if probe is None:
+        partial_filename.unlink(missing_ok=True)
+        state_filename.unlink(missing_ok=True)
+
+        return DownloadFile(url, destination)
+
+    state = _State.Load(state_filename)
+
+    if (
+        state is None
+        or state.url != url
+        or state.size != probe.size
+        or state.validator != probe.validator
+        or state.segment_size != segment_size
+        or not partial_filename.is_file()
+        or partial_filename.stat().st_size != probe.size
+    ):
+        state = _State(url, probe.size, probe.validator, segment_size)
+
+        with partial_filename.open("wb") as f:
+            f.truncate(probe.size)
+
+        state.Save(state_filename)
+
+    num_segments = (probe.size + segment_size - 1) // segment_size
+    state_lock = threading.Lock()
+
+    # ----------------------------------------------------------------------
+    def DownloadSegment(
+        index: int,
+    ) -> None:
+        offset = index * segment_size
+        end = min(offset + segment_size, probe.size) - 1
+
+        num_attempts = 0
+
+        with partial_filename.open("r+b") as f:
+            while offset <= end:
+                try:
+                    request = urllib.request.Request(url, headers={"Range": "bytes={}-{}".format(offset, end)})
+
+                    with urllib.request.urlopen(request, timeout=timeout) as response:
+                        if response.status != 206:
+                            raise _RangeRequestsNotSupportedException(url)
+
+                        f.seek(offset)
+
+                        while offset <= end:
+                            chunk = response.read(min(CHUNK_SIZE, end - offset + 1))
+                            if not chunk:
+                                raise http.client.IncompleteRead(b"", end - offset + 1)
+
+                            f.write(chunk)
+                            offset += len(chunk)
+
+                except (OSError, http.client.HTTPException):
+                    num_attempts += 1
+                    if num_attempts > max_retries:
+                        raise
+
+                    time.sleep(min(0.25 * 2 ** num_attempts, 10.0))
+
+        with state_lock:
+            state.completed.add(index)
+            state.Save(state_filename)
+
+    # ----------------------------------------------------------------------
+
+    pending_segments = [index for index in range(num_segments) if index not in state.completed]
+
+    if pending_segments:
+        with ThreadPoolExecutor(max_workers=min(num_connections, len(pending_segments))) as executor:
+            futures = [executor.submit(DownloadSegment, index) for index in pending_segments]
+
+            # Let all of the segments run to completion (or failure) so that as much progress as
+            # possible is recorded for the next attempt.
+            wait(futures)
+
+            for future in futures:
+                exception = future.exception()
+
+                if isinstance(exception, _RangeRequestsNotSupportedException):
+                    partial_filename.unlink(missing_ok=True)
+                    state_filename.unlink(missing_ok=True)
+
+                    return DownloadFile(url, destination)
+
+                if exception is not None:
+                    raise exception
+
+        RecordBytes(
+            DOWNLOADED_COUNTER,
+            sum(min(segment_size, probe.size - index * segment_size) for index in pending_segments),
+        )
+
+    # Segments arrive out of order, so the content is hashed once it is complete
+    hasher = hashlib.sha256()
+
+    with partial_filename.open("rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+
+            hasher.update(chunk)
+
+    os.replace(partial_filename, destination)
+    state_filename.unlink(missing_ok=True)
+
+    return DownloadResult(hasher.hexdigest(), probe.size)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+class _RangeRequestsNotSupportedException(Exception):
+    pass
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class _ProbeResult(object):
+    size: int
+    validator: Optional[str]                # ETag or Last-Modified; used to detect changes between attempts
+
+
+# ----------------------------------------------------------------------
+@dataclass
+class _State(object):
+    url: str
+    size: int
+    validator: Optional[str]
+    segment_size: int
+    completed: Set[int]                     = field(default_factory=set)
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def Load(
+        cls,
+        filename: Path,
+    ) -> Optional["_State"]:
+        if not filename.is_file():
+            return None
+
+        try:
+            with filename.open() as f:
+                content = json.load(f)
+
+            return cls(
+                content["url"],
+                content["size"],
+                content["validator"],
+                content["segment_size"],
+                set(content["completed"]),
+            )
+
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    # ----------------------------------------------------------------------
+    def Save(
+        self,
+        filename: Path,
+    ) -> None:
+        temp_filename = filename.with_name(filename.name + ".tmp")
+
+        with temp_filename.open("w") as f:
+            json.dump(
+                {
+                    "url": self.url,
+                    "size": self.size,
+                    "validator": self.validator,
+                    "segment_size": self.segment_size,
+                    "completed": sorted(self.completed),
+                },
+                f,
+            )
+
+        os.replace(temp_filename, filename)
+
+
+# ----------------------------------------------------------------------
+_content_range_regex                        = re.compile(r"^bytes\s+0-0/(?P<size>\d+)$")
+
+
+# ----------------------------------------------------------------------
+def _Probe(
+    url: str,
+    timeout: float,
+) -> Optional[_ProbeResult]:
+    """Returns information about the content if the server supports Range requests"""
+
+    request = urllib.request.Request(url, headers={"Range": "bytes=0-0"})
+
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        if response.status != 206:
+            return None
+
+        match = _content_range_regex.match(response.headers.get("Content-Range", ""))
+        if not match:
+            return None
+
+        return _ProbeResult(
+            int(match.group("size")),
+            response.headers.get("ETag") or response.headers.get("Last-Modified"),
+        )
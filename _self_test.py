@@ -0,0 +1,476 @@
+# ----------------------------------------------------------------------
+# |
+# |  _self_test.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 13:05:18
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Self-tests of an installed toolchain, run by setup after installation. Each test compiles and runs a
+small program that exercises a part of the toolchain built by `Tools/LLVM/build_linux.sh`:
+
+    hello:           clang++ and libc++ (iostreams)
+    builtins:        compiler-rt builtins (128-bit arithmetic and conversions)
+    exceptions:      libunwind and libc++abi (unwinding through frames, exception_ptr)
+    threads_atomics: libc++ threads, mutexes, atomics, and futures
+    lld:             lld-specific link options
+    thinlto:         ThinLTO with lld
+    asan:            AddressSanitizer detects a heap buffer overflow
+    ubsan:           UndefinedBehaviorSanitizer (with the libc++ ABI) detects signed overflow
+
+The tests are independent of each other, so they run concurrently (each test is a compiler invocation
+followed by the test program, so the work happens in child processes) and each has its own timeout.
+The tests can be run outside of setup:
+
+    python _self_test.py <output_dir> [<test name> ...]
+"""
+
+import hashlib
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# ----------------------------------------------------------------------
+from _trace import Subprocess as TraceSubprocess
+del sys.modules["_trace"]
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class SelfTestCase(object):
+    name: str
+    source: str
+    compile_args: List[str]
+    expected_output: str                    # The complete output, or text within the output when `expect_failure` is True
+
+    expect_failure: bool                    = field(kw_only=True, default=False)
+    env: Dict[str, str]                     = field(kw_only=True, default_factory=dict)
+    timeout: float                          = field(kw_only=True, default=60.0)     # Seconds to compile and run the test
+
+    # ----------------------------------------------------------------------
+    @property
+    def key(self) -> str:
+        """Identifies the content of the test; results are cached by key, so a modified test is run again"""
+
+        hasher = hashlib.sha256()
+
+        for value in [
+            self.name,
+            self.source,
+            *self.compile_args,
+            self.expected_output,
+            str(self.expect_failure),
+            *("{}={}".format(env_name, env_value) for env_name, env_value in sorted(self.env.items())),
+            repr(self.timeout),
+        ]:
+            hasher.update(value.encode("utf-8"))
+            hasher.update(b"\0")
+
+        return "{}-{}".format(self.name, hasher.hexdigest()[:16])
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class SelfTestResult(object):
+    case: SelfTestCase
+    passed: bool
+    stage: str                              # "compile" or "run"
+    output: str
+    execution_time: float
+
+    # ----------------------------------------------------------------------
+    def __str__(self) -> str:
+        return "'{}' {} ({:.2f}s)".format(
+            self.case.name,
+            "passed" if self.passed else "failed during '{}'".format(self.stage),
+            self.execution_time,
+        )
+
+
+# ----------------------------------------------------------------------
+SELF_TEST_CASES: List[SelfTestCase]         = [
+    SelfTestCase(
+        "hello",
+        """\
+        #include <iostream>
+
+        int main() {
+            std::cout << "Hello world!\\n";
+            return 0;
+        }
+        """,
+        [],
+        "Hello world!\n",
+    ),
+    SelfTestCase(
+        "builtins",
+        """\
+        #include <cstdio>
+
+        int main(int argc, char **) {
+            // Values derived from argc can't be folded, so these operations call compiler-rt builtins
+            unsigned __int128 value = (static_cast<unsigned __int128>(0x0123456789abcdefULL) << 64) | static_cast<unsigned>(argc);
+            unsigned __int128 divisor = 1000000007ULL + static_cast<unsigned>(argc);
+
+            unsigned __int128 quotient = value / divisor;
+            unsigned __int128 remainder = value % divisor;
+
+            __int128 negative = -static_cast<__int128>(value >> 1);
+            __int128 signed_remainder = negative % (97 + argc);
+
+            double converted = static_cast<double>(value);
+
+            if (quotient * divisor + remainder != value || remainder >= divisor)
+                return 1;
+
+            if (signed_remainder > 0 || signed_remainder <= -(97 + argc))
+                return 2;
+
+            if (converted < 1.5e36 || converted > 1.52e36)
+                return 3;
+
+            std::printf("builtins\\n");
+            return 0;
+        }
+        """,
+        ["-O2", "-rtlib=compiler-rt"],
+        "builtins\n",
+    ),
+    SelfTestCase(
+        "exceptions",
+        """\
+        #include <cstdio>
+        #include <exception>
+        #include <stdexcept>
+
+        static int num_unwound = 0;
+
+        struct Guard {
+            ~Guard() { ++num_unwound; }
+        };
+
+        [[gnu::noinline]] void Throw(int depth) {
+            Guard guard;
+
+            if (depth == 0)
+                throw std::runtime_error("thrown");
+
+            Throw(depth - 1);
+        }
+
+        int main() {
+            try {
+                Throw(8);
+            } catch (std::exception const &ex) {
+                std::printf("%s %d\\n", ex.what(), num_unwound);
+            }
+
+            std::exception_ptr ptr;
+
+            try {
+                throw 42;
+            } catch (...) {
+                ptr = std::current_exception();
+            }
+
+            try {
+                std::rethrow_exception(ptr);
+            } catch (int value) {
+                std::printf("rethrown %d\\n", value);
+            }
+
+            return 0;
+        }
+        """,
+        ["-O2", "-unwindlib=libunwind"],
+        "thrown 9\nrethrown 42\n",
+    ),
+    SelfTestCase(
+        "threads_atomics",
+        """\
+        #include <atomic>
+        #include <cstdio>
+        #include <future>
+        #include <mutex>
+        #include <thread>
+        #include <vector>
+
+        int main() {
+            std::atomic<long> counter(0);
+            long guarded = 0;
+            std::mutex mutex;
+
+            std::vector<std::thread> threads;
+
+            for (int i = 0; i < 8; ++i) {
+                threads.emplace_back(
+                    [&]() {
+                        for (int j = 0; j < 10000; ++j) {
+                            counter.fetch_add(1, std::memory_order_relaxed);
+
+                            std::lock_guard<std::mutex> lock(mutex);
+                            ++guarded;
+                        }
+                    }
+                );
+            }
+
+            for (auto &thread : threads)
+                thread.join();
+
+            auto future = std::async(std::launch::async, []() { return 42; });
+
+            std::printf("%ld %ld %d\\n", counter.load(), guarded, future.get());
+            return 0;
+        }
+        """,
+        ["-O2", "-pthread"],
+        "80000 80000 42\n",
+    ),
+    SelfTestCase(
+        "lld",
+        """\
+        #include <cstdio>
+
+        [[gnu::noinline]] int Unused() { return 1; }
+        [[gnu::noinline]] int First(int value) { return value * 2; }
+        [[gnu::noinline]] int Second(int value) { return value * 2; }
+
+        int main(int argc, char **) {
+            std::printf("%d\\n", First(argc) + Second(argc));
+            return 0;
+        }
+        """,
+        # Identical code folding isn't supported by the GNU linker
+        ["-O2", "-ffunction-sections", "-fuse-ld=lld", "-Wl,--icf=all", "-Wl,--gc-sections"],
+        "4\n",
+    ),
+    SelfTestCase(
+        "thinlto",
+        """\
+        #include <cstdio>
+        #include <numeric>
+        #include <vector>
+
+        namespace {
+
+        int Sum(std::vector<int> const &values) {
+            return std::accumulate(values.begin(), values.end(), 0);
+        }
+
+        }
+
+        int main(int argc, char **) {
+            std::vector<int> values(100, argc);
+
+            std::printf("%d\\n", Sum(values));
+            return 0;
+        }
+        """,
+        ["-O2", "-flto=thin", "-fuse-ld=lld"],
+        "100\n",
+    ),
+    SelfTestCase(
+        "asan",
+        """\
+        int main(int argc, char **) {
+            int *values = new int[4]();
+
+            values[argc + 3] = 1;
+
+            int result = values[0];
+
+            delete[] values;
+            return result;
+        }
+        """,
+        ["-O1", "-fsanitize=address"],
+        "heap-buffer-overflow",
+        expect_failure=True,
+        # Symbolizing the report is slow and not needed to detect the error
+        env={"ASAN_OPTIONS": "symbolize=0:detect_leaks=0"},
+        timeout=120.0,
+    ),
+    SelfTestCase(
+        "ubsan",
+        """\
+        #include <climits>
+
+        int main(int argc, char **) {
+            int value = INT_MAX;
+
+            value += argc;
+
+            return value == 0;
+        }
+        """,
+        ["-O0", "-fsanitize=undefined", "-fno-sanitize-recover=undefined"],
+        "signed integer overflow",
+        expect_failure=True,
+        timeout=120.0,
+    ),
+]
+
+
+# ----------------------------------------------------------------------
+def RunSelfTests(
+    compiler: Path,
+    working_dir: Path,
+    cases: List[SelfTestCase],
+    *,
+    env: Optional[Dict[str, str]]=None,
+    max_workers: Optional[int]=None,
+) -> List[SelfTestResult]:
+    """Runs the tests concurrently and returns their results in the order of `cases`"""
+
+    # ----------------------------------------------------------------------
+    def Run(
+        case: SelfTestCase,
+    ) -> SelfTestResult:
+        case_dir = working_dir / case.name
+        case_dir.mkdir(parents=True, exist_ok=True)
+
+        (case_dir / "test.cpp").write_text(textwrap.dedent(case.source), encoding="utf-8")
+
+        start_time = time.perf_counter()
+        deadline = start_time + case.timeout
+
+        # ----------------------------------------------------------------------
+        def CreateResult(
+            passed: bool,
+            stage: str,
+            output: str,
+        ) -> SelfTestResult:
+            return SelfTestResult(case, passed, stage, output, time.perf_counter() - start_time)
+
+        # ----------------------------------------------------------------------
+
+        returncode, output = _Execute(
+            [str(compiler), *case.compile_args, "test.cpp", "-o", "test"],
+            case_dir,
+            env,
+            deadline,
+        )
+
+        if returncode != 0:
+            return CreateResult(False, "compile", output)
+
+        run_env = dict(env if env is not None else os.environ)
+        run_env.update(case.env)
+
+        returncode, output = _Execute([str(case_dir / "test")], case_dir, run_env, deadline)
+
+        if returncode is None:
+            return CreateResult(False, "run", output)
+
+        if case.expect_failure:
+            passed = returncode != 0 and case.expected_output in output
+        else:
+            passed = returncode == 0 and output == case.expected_output
+
+        return CreateResult(passed, "run", output)
+
+    # ----------------------------------------------------------------------
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers or os.cpu_count() or 1, len(cases)))) as executor:
+        return list(executor.map(Run, cases))
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+def _Execute(
+    command_line: List[str],
+    cwd: Path,
+    env: Optional[Dict[str, str]],
+    deadline: float,
+) -> Tuple[Optional[int], str]:
+    """Returns the return code (None if the deadline was exceeded) and the output of the command"""
+
+    with TraceSubprocess(" ".join(command_line)) as trace:
+        # Compilers run the linker in a child process, so the process group is terminated on timeout
+        with subprocess.Popen(
+            command_line,
+            cwd=cwd,
+            env=trace.CreateEnvironment(env),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        ) as process:
+            try:
+                content, _ = process.communicate(timeout=max(0.0, deadline - time.perf_counter()))
+
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)  # type: ignore  # pylint: disable=no-member
+
+                content, _ = process.communicate()
+
+                return None, "{}\nThe test did not complete before its timeout.\n".format(
+                    content.decode("utf-8", errors="replace"),
+                )
+
+    return process.returncode, content.decode("utf-8", errors="replace")
+
+
+# ----------------------------------------------------------------------
+def _EntryPoint(
+    args: List[str],
+) -> int:
+    if not args:
+        sys.stderr.write("Usage: python {} <output_dir> [<test name> ...]\n".format(Path(__file__).name))
+        return -1
+
+    import tempfile                                                         # pylint: disable=import-outside-toplevel
+
+    output_dir = Path(args[0])
+
+    cases = [case for case in SELF_TEST_CASES if len(args) == 1 or case.name in args[1:]]
+
+    env = dict(os.environ)
+    env["LD_LIBRARY_PATH"] = str(output_dir / "lib" / "x86_64-unknown-linux-gnu")
+
+    start_time = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        results = RunSelfTests(output_dir / "bin" / "clang++", Path(temp_directory), cases, env=env)
+
+    for result in results:
+        sys.stdout.write("{}\n".format(result))
+
+        if not result.passed:
+            sys.stdout.write(textwrap.indent(result.output.rstrip() + "\n", "    "))
+
+    sys.stdout.write(
+        "\n{} of {} test(s) passed in {:.2f}s (serial time: {:.2f}s).\n".format(
+            sum(1 for result in results if result.passed),
+            len(results),
+            time.perf_counter() - start_time,
+            sum(result.execution_time for result in results),
+        ),
+    )
+
+    return 0 if all(result.passed for result in results) else -1
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+if __name__ == "__main__":
+    sys.exit(_EntryPoint(sys.argv[1:]))
@@ -0,0 +1,161 @@
+# ----------------------------------------------------------------------
+# |
+# |  _toolchain_validation.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-17 14:48:13
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Tracks the self-tests (see `_self_test.py`) that have passed for a toolchain installation, so that tests
+only run when an installation changes (or when the tests themselves change)
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+
+# ----------------------------------------------------------------------
+from _precompiled_headers import PRECOMPILED_DIRNAME
+del sys.modules["_precompiled_headers"]
+
+
+# ----------------------------------------------------------------------
+# Set this environment variable to "1" to validate installations even if they haven't changed
+FORCE_VALIDATION_ENV_VAR                    = "COMMON_LLVM_FORCE_VALIDATION"
+
+VALIDATION_STAMP_FILENAME                   = ".Common_LLVM.validation.json"
+
+
+# ----------------------------------------------------------------------
+def IsValidationForced() -> bool:
+    return os.getenv(FORCE_VALIDATION_ENV_VAR) == "1"
+
+
+# ----------------------------------------------------------------------
+def CalculateFingerprint(
+    output_dir: Path,
+    version: str,
+) -> str:
+    """\
+    Calculates a fingerprint of an installed toolchain that is cheap enough to calculate on every
+    setup. It is based on:
+
+        - `version`
+        - The name, size, mtime, and inode of each top-level item in `output_dir`
+        - The content of small top-level files (which includes installer version stamps)
+        - The content of the clang binary
+    """
+
+    hasher = hashlib.sha256()
+
+    hasher.update(version.encode("utf-8"))
+
+    if output_dir.is_dir():
+        for item in sorted(output_dir.iterdir()):
+            # Content created after validation doesn't change the installation
+            if item.name in [VALIDATION_STAMP_FILENAME, PRECOMPILED_DIRNAME]:
+                continue
+
+            stat = item.lstat()
+
+            hasher.update(
+                "\n{}|{}|{}|{}".format(item.name, stat.st_size, stat.st_mtime_ns, stat.st_ino).encode("utf-8"),
+            )
+
+            if item.is_file() and stat.st_size <= _SMALL_FILE_SIZE:
+                hasher.update(item.read_bytes())
+
+    clang_filename = output_dir / "bin" / "clang"
+
+    if clang_filename.exists():
+        hasher.update(b"\nclang|")
+
+        with clang_filename.resolve().open("rb") as f:
+            while True:
+                chunk = f.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+# ----------------------------------------------------------------------
+def GetValidatedCases(
+    output_dir: Path,
+    fingerprint: str,
+) -> Set[str]:
+    """Returns the keys of the self-tests that have passed for the installation with `fingerprint`"""
+
+    stamp = _ReadStamp(output_dir)
+
+    if stamp is None or stamp.get("fingerprint", None) != fingerprint:
+        return set()
+
+    cases = stamp.get("cases", None)
+
+    # The installation is validated again if the stamp is corrupt
+    if not isinstance(cases, list) or not all(isinstance(case, str) for case in cases):
+        return set()
+
+    return set(cases)
+
+
+# ----------------------------------------------------------------------
+def RecordValidation(
+    output_dir: Path,
+    fingerprint: str,
+    case_keys: Iterable[str],               # Keys of the self-tests that have passed
+) -> None:
+    stamp_filename = output_dir / VALIDATION_STAMP_FILENAME
+    temp_filename = stamp_filename.with_name(stamp_filename.name + ".tmp")
+
+    with temp_filename.open("w") as f:
+        json.dump(
+            {
+                "fingerprint": fingerprint,
+                "validated": datetime.now().isoformat(),
+                "cases": sorted(case_keys),
+            },
+            f,
+        )
+
+    os.replace(temp_filename, stamp_filename)
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_CHUNK_SIZE                                 = 1024 * 1024
+_SMALL_FILE_SIZE                            = 4096
+
+
+# ----------------------------------------------------------------------
+def _ReadStamp(
+    output_dir: Path,
+) -> Optional[Dict[str, Any]]:
+    stamp_filename = output_dir / VALIDATION_STAMP_FILENAME
+
+    try:
+        with stamp_filename.open() as f:
+            stamp = json.load(f)
+
+    except (OSError, ValueError):
+        return None
+
+    return stamp if isinstance(stamp, dict) else None
@@ -0,0 +1,614 @@
+# ----------------------------------------------------------------------
+# |
+# |  _trace.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-19 10:27:45
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Opt-in timing traces of setup and activation.
+
+Set the environment variable `COMMON_LLVM_TRACE` to a directory to record every phase (each nested
+`DoneManager` block created with `Nested`, along with the phases recorded explicitly by this
+repository), the bytes downloaded and extracted within each phase, and the wall and CPU time of
+subprocesses. When setup or
+activation completes, the trace is written to the directory as a Chrome trace (viewable with
+chrome://tracing or https://ui.perfetto.dev) and a summary table is displayed:
+
+    <trace_dir>/setup-<YYYYMMDD-HHMMSS>-<pid>.json
+    <trace_dir>/activate-<YYYYMMDD-HHMMSS>-<pid>.json
+
+Modules within this repository are removed from `sys.modules` once they have been imported, so each
+module that imports this one has its own copy of it. Events are therefore appended to a file that is
+shared by all copies (identified by state registered in `sys.modules` under a name that is never
+removed) rather than collected in memory. Subprocesses only contribute events to the session when
+they are created with an environment from `Subprocess.CreateEnvironment`.
+
+This module is imported during activation, so it only imports modules that have already been
+imported by the activation framework (everything else is imported when tracing is enabled).
+"""
+
+import os
+import sys
+import threading
+import time
+import types
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# ----------------------------------------------------------------------
+# Set this environment variable to a directory to write traces of setup and activation to it
+TRACE_ENV_VAR                               = "COMMON_LLVM_TRACE"
+
+DOWNLOADED_COUNTER                          = "downloaded"
+EXTRACTED_COUNTER                           = "extracted"
+
+
+# ----------------------------------------------------------------------
+def IsEnabled() -> bool:
+    return bool(os.getenv(TRACE_ENV_VAR))
+
+
+# ----------------------------------------------------------------------
+class Phase(object):
+    """Records the start and end of a block of work when a trace session is active"""
+
+    CATEGORY                                = "phase"
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        name: str,
+        **args: Any,
+    ):
+        self.name                           = name
+        self.args                           = args
+
+        self._start_time: Optional[float]   = None
+
+    # ----------------------------------------------------------------------
+    def __enter__(self) -> "Phase":
+        if _state.events_filename is not None:
+            self._start_time = time.time()
+
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if self._start_time is None:
+            return
+
+        if exc_type is not None:
+            self.args["exception"] = exc_type.__name__
+
+        _WriteEvent(
+            {
+                "name": self.name,
+                "cat": self.CATEGORY,
+                "ph": "X",
+                "ts": _ToMicroseconds(self._start_time),
+                "dur": _ToMicroseconds(time.time() - self._start_time),
+                "args": self.args,
+            },
+        )
+
+
+# ----------------------------------------------------------------------
+class Subprocess(Phase):
+    """\
+    Records the wall time of a block that runs a subprocess and the CPU time of the subprocesses
+    that completed within it. The CPU time is only available for the process as a whole, so it
+    includes subprocesses run concurrently by other threads.
+    """
+
+    CATEGORY                                = "subprocess"
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        name: str,
+        **args: Any,
+    ):
+        super(Subprocess, self).__init__(name, **args)
+
+        self._start_cpu_times: Optional[List[float]]        = None
+
+    # ----------------------------------------------------------------------
+    def __enter__(self) -> "Subprocess":
+        super(Subprocess, self).__enter__()
+
+        self._start_cpu_times = _GetChildCpuTimes() if self._start_time is not None else None
+
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if self._start_cpu_times is not None:
+            end_cpu_times = _GetChildCpuTimes()
+            assert end_cpu_times is not None
+
+            self.args["cpu_user"] = round(end_cpu_times[0] - self._start_cpu_times[0], 6)
+            self.args["cpu_system"] = round(end_cpu_times[1] - self._start_cpu_times[1], 6)
+
+        super(Subprocess, self).__exit__(exc_type, exc_value, exc_traceback)
+
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def CreateEnvironment(
+        env: Optional[Dict[str, str]]=None,     # `os.environ` if None
+    ) -> Optional[Dict[str, str]]:
+        """\
+        Returns the environment for a subprocess whose phases are part of the active session (for
+        example, a compiler that runs a shim that installs a component); other subprocesses don't
+        contribute to the session.
+        """
+
+        if _state.events_filename is None:
+            return env
+
+        env = dict(os.environ if env is None else env)
+        env[_EVENTS_ENV_VAR] = _state.events_filename
+
+        return env
+
+
+# ----------------------------------------------------------------------
+def RecordBytes(
+    counter: str,                           # DOWNLOADED_COUNTER or EXTRACTED_COUNTER
+    num_bytes: int,
+) -> None:
+    """Attributes bytes to the innermost phase of the calling thread"""
+
+    if _state.events_filename is None or not num_bytes:
+        return
+
+    _WriteEvent(
+        {
+            "name": counter,
+            "cat": "bytes",
+            "ph": "i",
+            "s": "t",
+            "ts": _ToMicroseconds(time.time()),
+            "args": {"bytes": num_bytes},
+        },
+    )
+
+
+# ----------------------------------------------------------------------
+def Nested(
+    dm: Any,                                # DoneManager
+    heading: str,
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """Returns `dm.Nested(heading, ...)`, which is recorded as a phase when a session is active"""
+
+    context = dm.Nested(heading, *args, **kwargs)
+
+    if _state.events_filename is None:
+        return context
+
+    return _NestedPhase(context, heading.strip())
+
+
+# ----------------------------------------------------------------------
+class Session(object):
+    """\
+    Traces setup or activation when tracing is enabled; the trace is written and the summary displayed
+    with `dm` when the session ends.
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        name: str,                          # "setup" or "activate"
+        dm: Any,                            # DoneManager
+    ):
+        self.name                           = name
+        self.dm                             = dm
+
+        self._phase: Optional[Phase]        = None
+        self._events_filename: Optional[Path]               = None
+
+    # ----------------------------------------------------------------------
+    def __enter__(self) -> "Session":
+        trace_dir = os.getenv(TRACE_ENV_VAR)
+
+        # Nested sessions (for example, activation invoked by setup) are part of the outer session
+        if not trace_dir or _state.events_filename is not None:
+            return self
+
+        trace_dir_path = Path(trace_dir).resolve()
+        trace_dir_path.mkdir(parents=True, exist_ok=True)
+
+        self._events_filename = trace_dir_path / ".{}-{}-{}.events".format(self.name, os.getpid(), time.time_ns())
+        self._events_filename.touch()
+
+        _state.events_filename = str(self._events_filename)
+
+        self._phase = Phase(self.name).__enter__()
+
+        return self
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if self._events_filename is None:
+            return
+
+        assert self._phase is not None
+
+        try:
+            self._phase.__exit__(exc_type, exc_value, exc_traceback)
+
+        finally:
+            _state.events_filename = None
+
+        events = _ReadEvents(self._events_filename)
+
+        self._events_filename.unlink()
+
+        trace_filename = self._events_filename.parent / "{}-{}-{}.json".format(
+            self.name,
+            time.strftime("%Y%m%d-%H%M%S"),
+            os.getpid(),
+        )
+
+        # The summary annotates the phase events with their totals, so it is created first
+        summary = CreateSummary(events)
+
+        _WriteTrace(trace_filename, events)
+
+        with self.dm.YieldStream() as stream:
+            stream.write("\n{}\n\nThe trace has been written to '{}'.\n\n".format(summary, trace_filename))
+
+
+# ----------------------------------------------------------------------
+def CreateSummary(
+    events: List[Dict[str, Any]],
+) -> str:
+    """\
+    Returns a table of the phases in `events`, nested by thread. The bytes and subprocess times of a
+    phase include those of the phases nested within it; they are also added to the arguments of the
+    phase events, where trace viewers display them when a phase is selected.
+    """
+
+    phases = _CreatePhases(events)
+
+    rows: List[List[str]] = []
+
+    # ----------------------------------------------------------------------
+    def AddRows(
+        phase: "_PhaseInfo",
+        depth: int,
+    ) -> None:
+        name = "{}{}".format("  " * depth, phase.name)
+        if len(name) > _MAX_NAME_LENGTH:
+            name = name[:_MAX_NAME_LENGTH - 3] + "..."
+
+        rows.append(
+            [
+                name,
+                "{:.3f}".format(phase.duration),
+                _FormatBytes(phase.totals[DOWNLOADED_COUNTER]),
+                _FormatBytes(phase.totals[EXTRACTED_COUNTER]),
+                str(phase.num_subprocesses) if phase.num_subprocesses else "",
+                "{:.3f}".format(phase.subprocess_wall) if phase.num_subprocesses else "",
+                "{:.3f}".format(phase.subprocess_cpu) if phase.num_subprocesses else "",
+            ],
+        )
+
+        for child in phase.children:
+            AddRows(child, depth + 1)
+
+    # ----------------------------------------------------------------------
+
+    for root in phases:
+        AddRows(root, 0)
+
+    # Totals of all threads
+    subprocess_events = [event for event in events if event.get("cat") == Subprocess.CATEGORY]
+
+    rows.append(
+        [
+            "Total",
+            "{:.3f}".format(
+                (max(event["ts"] + event.get("dur", 0) for event in events) - min(event["ts"] for event in events)) / 1000000
+                if events else 0.0,
+            ),
+            _FormatBytes(sum(event["args"]["bytes"] for event in events if event["name"] == DOWNLOADED_COUNTER and event.get("cat") == "bytes")),
+            _FormatBytes(sum(event["args"]["bytes"] for event in events if event["name"] == EXTRACTED_COUNTER and event.get("cat") == "bytes")),
+            str(len(subprocess_events)),
+            "{:.3f}".format(sum(event["dur"] for event in subprocess_events) / 1000000),
+            "{:.3f}".format(sum(_GetCpuTime(event) for event in subprocess_events)),
+        ],
+    )
+
+    headers = ["Phase", "Wall (s)", "Downloaded", "Extracted", "Subprocesses", "Subprocess wall (s)", "Subprocess CPU (s)"]
+
+    widths = [max(len(headers[index]), *(len(row[index]) for row in rows)) for index in range(len(headers))]
+
+    # ----------------------------------------------------------------------
+    def FormatRow(
+        values: List[str],
+    ) -> str:
+        return "  ".join(
+            value.ljust(width) if index == 0 else value.rjust(width)
+            for index, (value, width) in enumerate(zip(values, widths))
+        ).rstrip()
+
+    # ----------------------------------------------------------------------
+
+    separator = "  ".join("-" * width for width in widths)
+
+    return "\n".join(
+        [
+            FormatRow(headers),
+            separator,
+            *(FormatRow(row) for row in rows[:-1]),
+            separator,
+            FormatRow(rows[-1]),
+        ],
+    )
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# Set by `Subprocess.CreateEnvironment` to the file that events are appended to
+_EVENTS_ENV_VAR                             = "_COMMON_LLVM_TRACE_EVENTS"
+
+# Name of the state shared by all copies of this module
+_STATE_MODULE_NAME                          = "_common_llvm_trace_state"
+
+_MAX_NAME_LENGTH                            = 80
+
+_write_lock                                 = threading.Lock()
+
+
+# ----------------------------------------------------------------------
+if _STATE_MODULE_NAME not in sys.modules:
+    _new_state = types.ModuleType(_STATE_MODULE_NAME)
+
+    # The file that events are appended to while a session is active. Subprocesses that are part of a
+    # session write to the session's file, but don't pass it to their own subprocesses.
+    _new_state.events_filename = os.environ.pop(_EVENTS_ENV_VAR, None) or None  # type: ignore
+
+    sys.modules[_STATE_MODULE_NAME] = _new_state
+
+    del _new_state
+
+_state: Any                                 = sys.modules[_STATE_MODULE_NAME]
+
+
+# ----------------------------------------------------------------------
+class _NestedPhase(object):
+    """Records a nested `DoneManager` block (and its result) as a phase"""
+
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        context: Any,
+        name: str,
+    ):
+        self._context                       = context
+        self._phase                         = Phase(name)
+        self._dm: Any                       = None
+
+    # ----------------------------------------------------------------------
+    def __enter__(self):
+        self._phase.__enter__()
+
+        self._dm = self._context.__enter__()
+        return self._dm
+
+    # ----------------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        try:
+            return self._context.__exit__(exc_type, exc_value, exc_traceback)
+
+        finally:
+            if self._dm is not None:
+                self._phase.args["result"] = self._dm.result
+
+            self._phase.__exit__(exc_type, exc_value, exc_traceback)
+
+
+# ----------------------------------------------------------------------
+class _PhaseInfo(object):
+    # ----------------------------------------------------------------------
+    def __init__(
+        self,
+        event: Dict[str, Any],
+    ):
+        self.event                          = event
+        self.name                           = event["name"]
+        self.start                          = event["ts"]
+        self.end                            = event["ts"] + event["dur"]
+        self.duration                       = event["dur"] / 1000000
+
+        self.children: List[_PhaseInfo]     = []
+
+        self.totals: Dict[str, int]         = {DOWNLOADED_COUNTER: 0, EXTRACTED_COUNTER: 0}
+        self.num_subprocesses               = 0
+        self.subprocess_wall                = 0.0
+        self.subprocess_cpu                 = 0.0
+
+    # ----------------------------------------------------------------------
+    def Contains(
+        self,
+        event: Dict[str, Any],
+    ) -> bool:
+        return self.start <= event["ts"] and event["ts"] + event.get("dur", 0) <= self.end
+
+
+# ----------------------------------------------------------------------
+def _ToMicroseconds(
+    seconds: float,
+) -> int:
+    return int(seconds * 1000000)
+
+
+# ----------------------------------------------------------------------
+def _GetChildCpuTimes() -> Optional[List[float]]:
+    try:
+        import resource                                                     # pylint: disable=import-outside-toplevel
+    except ImportError:
+        # Not available on Windows
+        return None
+
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    return [usage.ru_utime, usage.ru_stime]
+
+
+# ----------------------------------------------------------------------
+def _GetCpuTime(
+    event: Dict[str, Any],
+) -> float:
+    return event["args"].get("cpu_user", 0.0) + event["args"].get("cpu_system", 0.0)
+
+
+# ----------------------------------------------------------------------
+def _WriteEvent(
+    event: Dict[str, Any],
+) -> None:
+    events_filename = _state.events_filename
+    if events_filename is None:
+        return
+
+    import json                                                             # pylint: disable=import-outside-toplevel
+
+    event["pid"] = os.getpid()
+    event["tid"] = threading.get_native_id()
+
+    content = json.dumps(event, default=str) + "\n"
+
+    # Each event is written with a single call so that events written by other copies of this module
+    # (which have their own locks) aren't interleaved.
+    with _write_lock:
+        with open(events_filename, "a", encoding="utf-8") as f:
+            f.write(content)
+
+
+# ----------------------------------------------------------------------
+def _ReadEvents(
+    events_filename: Path,
+) -> List[Dict[str, Any]]:
+    import json                                                             # pylint: disable=import-outside-toplevel
+
+    with events_filename.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ----------------------------------------------------------------------
+def _CreatePhases(
+    events: List[Dict[str, Any]],
+) -> List[_PhaseInfo]:
+    """Returns the root phases of each thread (ordered by start time) with their nested phases and totals"""
+
+    roots: List[_PhaseInfo] = []
+
+    events_by_thread: Dict[Any, List[Dict[str, Any]]] = {}
+
+    for event in events:
+        events_by_thread.setdefault((event["pid"], event["tid"]), []).append(event)
+
+    for thread_events in events_by_thread.values():
+        # Outer phases first when phases start at the same time
+        thread_events.sort(key=lambda event: (event["ts"], -event.get("dur", 0)))
+
+        stack: List[_PhaseInfo] = []
+
+        for event in thread_events:
+            while stack and not stack[-1].Contains(event):
+                stack.pop()
+
+            if event.get("cat") == Phase.CATEGORY:
+                phase = _PhaseInfo(event)
+
+                if stack:
+                    stack[-1].children.append(phase)
+                else:
+                    roots.append(phase)
+
+                stack.append(phase)
+                continue
+
+            for phase in stack:
+                if event.get("cat") == Subprocess.CATEGORY:
+                    phase.num_subprocesses += 1
+                    phase.subprocess_wall += event["dur"] / 1000000
+                    phase.subprocess_cpu += _GetCpuTime(event)
+
+                elif event.get("cat") == "bytes":
+                    phase.totals[event["name"]] += event["args"]["bytes"]
+
+    # ----------------------------------------------------------------------
+    def Annotate(
+        phase: _PhaseInfo,
+    ) -> None:
+        for counter, value in phase.totals.items():
+            if value:
+                phase.event["args"]["{}_bytes".format(counter)] = value
+
+        if phase.num_subprocesses:
+            phase.event["args"]["subprocesses"] = phase.num_subprocesses
+            phase.event["args"]["subprocess_cpu"] = round(phase.subprocess_cpu, 6)
+
+        for child in phase.children:
+            Annotate(child)
+
+    # ----------------------------------------------------------------------
+
+    for root in roots:
+        Annotate(root)
+
+    roots.sort(key=lambda phase: phase.start)
+
+    return roots
+
+
+# ----------------------------------------------------------------------
+def _WriteTrace(
+    trace_filename: Path,
+    events: List[Dict[str, Any]],
+) -> None:
+    import json                                                             # pylint: disable=import-outside-toplevel
+
+    temp_filename = trace_filename.with_suffix(".tmp")
+
+    with temp_filename.open("w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    os.replace(temp_filename, trace_filename)
+
+
+# ----------------------------------------------------------------------
+def _FormatBytes(
+    num_bytes: int,
+) -> str:
+    if not num_bytes:
+        return ""
+
+    if num_bytes < 1024:
+        return "{} B".format(num_bytes)
+
+    value = num_bytes / 1024
+
+    for units in ["KB", "MB"]:
+        if value < 1024:
+            return "{:.1f} {}".format(value, units)
+
+        value /= 1024
+
+    return "{:.2f} GB".format(value)
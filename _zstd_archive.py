@@ -0,0 +1,237 @@
+# ----------------------------------------------------------------------
+# |
+# |  _zstd_archive.py
+# |
+# |  David Brownell <db@DavidBrownell.com>
+# |      2026-10-18 08:21:37
+# |
+# ----------------------------------------------------------------------
+# |
+# |  Copyright David Brownell 2026
+# |  Distributed under the Boost Software License, Version 1.0. See
+# |  accompanying file LICENSE_1_0.txt or copy at
+# |  http://www.boost.org/LICENSE_1_0.txt.
+# |
+# ----------------------------------------------------------------------
+"""\
+Extracts seekable, multi-frame zstd tar archives (as created by `Tools/LLVM/CreateSeekableArchive.py`)
+across multiple cores.
+
+Each zstd frame contains complete tar members, so frames can be decompressed and their files written
+independently of each other. The frames are described by a seek table stored in a skippable frame at
+the end of the file (https://github.com/facebook/zstd/blob/dev/contrib/seekable_format/zstd_seekable_compression_format.md),
+so the archive remains a valid zstd file that can be extracted with `tar --zstd -xf`.
+"""
+
+import io
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tarfile
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Set
+
+try:
+    import zstandard                                                        # type: ignore  # pylint: disable=import-error
+except ImportError:
+    zstandard = None  # pylint: disable=invalid-name
+
+
+# ----------------------------------------------------------------------
+from _archive_pipeline import ExtractTar
+del sys.modules["_archive_pipeline"]
+
+from _trace import EXTRACTED_COUNTER, RecordBytes, Subprocess as TraceSubprocess
+del sys.modules["_trace"]
+
+
+# ----------------------------------------------------------------------
+ARCHIVE_SUFFIX                              = ".tar.zst"
+
+SKIPPABLE_FRAME_MAGIC                       = 0x184D2A5E
+SEEKABLE_MAGIC                              = 0x8F92EAB1
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class Frame(object):
+    offset: int
+    compressed_size: int
+    decompressed_size: int
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class ExtractionInfo(object):
+    num_frames: int
+    num_workers: int
+    compressed_bytes: int
+    decompressed_bytes: int
+
+
+# ----------------------------------------------------------------------
+def ReadSeekTable(
+    archive_filename: Path,
+) -> List[Frame]:
+    with archive_filename.open("rb") as f:
+        f.seek(-_FOOTER_SIZE, os.SEEK_END)
+        num_frames, descriptor, magic = struct.unpack("<IBI", f.read(_FOOTER_SIZE))
+
+        if magic != SEEKABLE_MAGIC:
+            raise Exception("'{}' is not a seekable zstd archive.".format(archive_filename))
+
+        entry_size = 12 if descriptor & 0x80 else 8
+        table_size = num_frames * entry_size
+
+        f.seek(-(_FOOTER_SIZE + table_size + _SKIPPABLE_HEADER_SIZE), os.SEEK_END)
+        frame_magic, frame_size = struct.unpack("<II", f.read(_SKIPPABLE_HEADER_SIZE))
+
+        if frame_magic != SKIPPABLE_FRAME_MAGIC or frame_size != table_size + _FOOTER_SIZE:
+            raise Exception("The seek table in '{}' is corrupt.".format(archive_filename))
+
+        table = f.read(table_size)
+
+    frames: List[Frame] = []
+    offset = 0
+
+    for index in range(num_frames):
+        compressed_size, decompressed_size = struct.unpack_from("<II", table, index * entry_size)
+
+        frames.append(Frame(offset, compressed_size, decompressed_size))
+        offset += compressed_size
+
+    return frames
+
+
+# ----------------------------------------------------------------------
+def ExtractSeekableArchive(
+    archive_filename: Path,
+    output_dir: Path,
+    *,
+    max_workers: Optional[int]=None,
+    members: Optional[Set[str]]=None,       # Relative paths of the files to extract; all files are extracted if None
+) -> ExtractionInfo:
+    """Decompresses frames and writes their files concurrently"""
+
+    if zstandard is None and shutil.which("zstd") is None:
+        raise Exception("The 'zstandard' python package or the 'zstd' executable is required to extract '{}'.".format(archive_filename))
+
+    frames = ReadSeekTable(archive_filename)
+
+    num_workers = max(1, min(max_workers or os.cpu_count() or 1, len(frames)))
+
+    # ----------------------------------------------------------------------
+    def ExtractFrame(
+        frame: Frame,
+    ) -> None:
+        with _OpenFrame(archive_filename, frame) as stream:
+            with tarfile.open(fileobj=stream, mode="r|") as tar:  # type: ignore
+                selected = None if members is None else SelectMembers(tar, members)
+
+                ExtractTar(tar, output_dir, members=selected)
+
+    # ----------------------------------------------------------------------
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        # Largest frames first, so that a single large frame doesn't start last
+        for _ in executor.map(ExtractFrame, sorted(frames, key=lambda frame: -frame.decompressed_size)):
+            pass
+
+    extraction_info = ExtractionInfo(
+        len(frames),
+        num_workers,
+        sum(frame.compressed_size for frame in frames),
+        sum(frame.decompressed_size for frame in frames),
+    )
+
+    RecordBytes(EXTRACTED_COUNTER, extraction_info.decompressed_bytes)
+
+    return extraction_info
+
+
+# ----------------------------------------------------------------------
+def SelectMembers(
+    tar: tarfile.TarFile,
+    members: Set[str],
+) -> Iterator[tarfile.TarInfo]:
+    """\
+    Yields the members of a tar archive (which may be a stream) whose relative paths are in `members`.
+    Each member is extracted before the next one is read, so this works with streams.
+    """
+
+    for member in tar:
+        name = member.name[2:] if member.name.startswith("./") else member.name
+
+        if name in members:
+            yield member
+
+
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+# ----------------------------------------------------------------------
+_FOOTER_SIZE                                = 9
+_SKIPPABLE_HEADER_SIZE                      = 8
+_READ_SIZE                                  = 1024 * 1024
+
+
+# ----------------------------------------------------------------------
+@contextmanager
+def _OpenFrame(
+    archive_filename: Path,
+    frame: Frame,
+) -> Iterator[BinaryIO]:
+    """Yields a stream of the decompressed content of a single frame"""
+
+    # Only the frame's content is provided to the decompressor, as readers may otherwise continue
+    # decompressing subsequent frames.
+    with archive_filename.open("rb") as f:
+        f.seek(frame.offset)
+        compressed = f.read(frame.compressed_size)
+
+    if zstandard is not None:
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(compressed)) as reader:
+            yield reader  # type: ignore
+
+        return
+
+    with TraceSubprocess("zstd --decompress", offset=frame.offset), subprocess.Popen(
+        ["zstd", "--decompress", "--stdout", "--quiet"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    ) as process:
+        assert process.stdin is not None
+        assert process.stdout is not None
+
+        # ----------------------------------------------------------------------
+        def Feed():
+            assert process.stdin is not None
+
+            try:
+                process.stdin.write(compressed)
+            finally:
+                process.stdin.close()
+
+        # ----------------------------------------------------------------------
+
+        feed_thread = threading.Thread(target=Feed, daemon=True)
+        feed_thread.start()
+
+        yield process.stdout  # type: ignore
+
+        # Consume anything that the tar reader didn't need (for example, padding)
+        while process.stdout.read(_READ_SIZE):
+            pass
+
+        feed_thread.join()
+
+    if process.returncode != 0:
+        raise Exception("Decompressing the frame at offset {} in '{}' failed.".format(frame.offset, archive_filename))